@@ -0,0 +1,54 @@
+"""
+Backfill der NQ-Futures-Historie über Twelve Data
+
+Lädt einen Zeitraum seitenweise und parallel (data.history_loader) und schreibt ihn in die
+Cache-Datei, die NQDataFetcher.get_nq_futures_data(interval, range) liest. Vorhandene Bars in der
+Datei bleiben erhalten, neu geladene ersetzen sie.
+
+Beispiel:
+    TWELVE_DATA_API_KEY=... python backfill_nq.py --interval 1m --range 3mo --workers 4
+    python backfill_nq.py --interval 1m --range 1mo --base-url http://127.0.0.1:8080 --rate-limit 600
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from data.history_loader import DEFAULT_RATE_LIMIT, DEFAULT_WORKERS, RateLimiter, TwelveDataHistoryLoader
+from data.http_client import HttpClient
+from data.nq_integration import RANGE_DAYS, NQDataFetcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill der NQ-Futures-Historie über Twelve Data")
+    parser.add_argument("--interval", default="1m", help="Zeitintervall, z.B. 1m oder 5m")
+    parser.add_argument("--range", default="3mo", choices=sorted(RANGE_DAYS, key=RANGE_DAYS.get),
+                        help="Zeitraum (bestimmt auch die Cache-Datei)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Parallele Anfragen")
+    parser.add_argument("--rate-limit", type=float, default=DEFAULT_RATE_LIMIT, help="Anfragen je Minute")
+    parser.add_argument("--cache-dir", default=None, help="Cache-Verzeichnis (Standard: data/cache)")
+    parser.add_argument("--base-url", default=None,
+                        help="Ersetzt Schema und Host der API, z.B. für einen lokalen Fake-Server")
+    parser.add_argument("--api-key", default=None, help="API-Schlüssel (Standard: TWELVE_DATA_API_KEY)")
+    args = parser.parse_args()
+
+    fetcher = NQDataFetcher(cache_dir=args.cache_dir)
+    cache_file = fetcher._get_cache_file(args.interval, args.range)
+    http_client = HttpClient(pool_size=args.workers, base_url=args.base_url)
+    loader = TwelveDataHistoryLoader(api_key=args.api_key, http_client=http_client, max_workers=args.workers,
+                                     rate_limiter=RateLimiter(args.rate_limit))
+
+    end = pd.Timestamp.now().floor('min')
+    start_time = time.perf_counter()
+    df = loader.backfill(args.interval, end - pd.Timedelta(days=RANGE_DAYS[args.range]), end, cache_file)
+    elapsed = time.perf_counter() - start_time
+    http_client.close()
+
+    print(f"{len(df)} Bars ({df.index.min()} bis {df.index.max()}) in {elapsed:.1f} s, "
+          f"{http_client.request_count} Anfragen")
+    print(f"Geschrieben: {cache_file}")
+
+
+if __name__ == "__main__":
+    main()
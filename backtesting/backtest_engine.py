@@ -10,21 +10,27 @@ import matplotlib.pyplot as plt
 import os
 from pathlib import Path
 
+from backtesting.result_store import make_result_key
+from utils.range_index import PriceRangeIndex
+
 class BacktestEngine:
     """
     Engine zum Backtesten von Handelsstrategien mit historischen Daten
     """
     
-    def __init__(self, initial_capital=50000.0, commission=0.001):
+    def __init__(self, initial_capital=50000.0, commission=0.001, result_store=None):
         """
         Initialisiert die Backtesting-Engine
         
         Args:
             initial_capital (float): Anfangskapital für den Backtest
             commission (float): Provisionsrate pro Trade (z.B. 0.001 für 0.1%)
+            result_store (BacktestResultStore, optional): Speicher, aus dem wiederholte Backtests
+                direkt beantwortet und in den neue Ergebnisse geschrieben werden
         """
         self.initial_capital = initial_capital
         self.commission = commission
+        self.result_store = result_store
         self.reset()
         
     def reset(self):
@@ -37,7 +43,39 @@ class BacktestEngine:
         self.equity_curve = []
         self.current_trade = None
         
-    def run(self, data, strategy, verbose=False):
+    def get_config(self, fill_resolver=None):
+        """
+        Gibt die ergebnisrelevante Konfiguration der Engine zurück
+        
+        Args:
+            fill_resolver (IntrabarFillResolver, optional): Resolver des Backtests
+            
+        Returns:
+            dict: Konfiguration (Teil des Schlüssels im Ergebnisspeicher)
+        """
+        return {
+            'engine': type(self).__qualname__,
+            'initial_capital': float(self.initial_capital),
+            'commission': float(self.commission),
+            'intrabar_timeframe': fill_resolver.lower_timeframe if fill_resolver is not None else None,
+        }
+    
+    def get_result_key(self, data, strategy, fill_resolver=None, data_fingerprint=None):
+        """
+        Berechnet den Schlüssel eines Backtests im Ergebnisspeicher
+        
+        Args:
+            data (pandas.DataFrame): DataFrame mit historischen Preisdaten
+            strategy: Strategie-Objekt
+            fill_resolver (IntrabarFillResolver, optional): Resolver des Backtests
+            data_fingerprint (str, optional): Vorab berechneter Fingerabdruck der Daten
+            
+        Returns:
+            str: Inhaltsadressierter Schlüssel
+        """
+        return make_result_key(data, strategy, self.get_config(fill_resolver), data_fingerprint)
+        
+    def run(self, data, strategy, verbose=False, progress_callback=None, fill_resolver=None, symbol=None):
         """
         Führt einen Backtest mit einer bestimmten Strategie durch
         
@@ -45,6 +83,10 @@ class BacktestEngine:
             data (pandas.DataFrame): DataFrame mit historischen Preisdaten
             strategy: Strategie-Objekt mit generate_signals-Methode
             verbose (bool): Ob detaillierte Ausgaben angezeigt werden sollen
+            progress_callback (callable, optional): Wird mit (aktueller Bar, Anzahl Bars, Meldung) aufgerufen
+            fill_resolver (IntrabarFillResolver, optional): Prüft Stop-Loss und Take-Profit gegen Low/High
+                statt gegen den Schlusskurs und löst Bars, die beide berühren, über Intrabar-Daten auf
+            symbol (str, optional): Symbol für den Ergebnisspeicher (Standard: data.attrs['symbol'])
             
         Returns:
             dict: Ergebnisse des Backtests
@@ -52,6 +94,15 @@ class BacktestEngine:
         # Setze Engine zurück
         self.reset()
         
+        # Wiederholte Backtests direkt aus dem Ergebnisspeicher beantworten
+        input_data = data
+        if self.result_store is not None:
+            result_key = self.get_result_key(data, strategy, fill_resolver)
+            cached = self.result_store.load(result_key, data)
+            if cached is not None:
+                self.trades = cached['trades']
+                return cached
+        
         # Generiere Handelssignale
         signals = strategy.generate_signals(data)
         
@@ -63,107 +114,110 @@ class BacktestEngine:
             data = signals
             
         # Initialisiere Ergebnisarrays
-        equity = np.zeros(len(data))
-        positions = np.zeros(len(data))
+        n = len(data)
+        equity = np.zeros(n)
+        positions = np.zeros(n)
         equity[0] = self.capital
-        
-        # Durchlaufe jeden Zeitpunkt
-        for i in range(1, len(data)):
-            # Aktueller Preis
-            current_price = data['Close'].iloc[i]
-            prev_price = data['Close'].iloc[i-1]
-            
-            # Aktuelles Signal
-            signal = data['Signal'].iloc[i]
-            
-            # Aktualisiere Position basierend auf Signal
-            if signal == 1 and self.position == 0:  # Kaufsignal
-                # Berechne Anzahl der Aktien, die gekauft werden können
-                shares = self._calculate_position_size(current_price)
-                
-                # Kaufe Aktien
-                cost = shares * current_price * (1 + self.commission)
-                self.capital -= cost
-                self.position = shares
-                
-                # Zeichne Trade auf
-                self.current_trade = {
-                    'entry_date': data.index[i],
-                    'entry_price': current_price,
-                    'shares': shares,
-                    'type': 'long',
-                    'stop_loss': strategy.calculate_stop_loss(data, i) if hasattr(strategy, 'calculate_stop_loss') else None,
-                    'take_profit': strategy.calculate_take_profit(data, i) if hasattr(strategy, 'calculate_take_profit') else None
-                }
-                
-                if verbose:
-                    print(f"KAUF: {data.index[i]}, Preis: {current_price:.2f}, Anteile: {shares:.2f}, Kapital: {self.capital:.2f}")
-                    
-            elif signal == -1 and self.position > 0:  # Verkaufssignal
-                # Verkaufe Aktien
-                proceeds = self.position * current_price * (1 - self.commission)
-                self.capital += proceeds
-                
-                # Berechne Gewinn/Verlust
-                if self.current_trade:
-                    self.current_trade['exit_date'] = data.index[i]
-                    self.current_trade['exit_price'] = current_price
-                    self.current_trade['profit'] = proceeds - (self.current_trade['shares'] * self.current_trade['entry_price'] * (1 + self.commission))
-                    self.current_trade['profit_pct'] = (current_price / self.current_trade['entry_price']) - 1
-                    self.trades.append(self.current_trade)
-                    self.current_trade = None
-                
-                self.position = 0
-                
-                if verbose:
-                    print(f"VERKAUF: {data.index[i]}, Preis: {current_price:.2f}, Kapital: {self.capital:.2f}")
-                    
-            # Überprüfe Stop-Loss und Take-Profit, wenn eine Position besteht
-            elif self.position > 0 and self.current_trade:
-                # Überprüfe Stop-Loss
-                if self.current_trade['stop_loss'] is not None and current_price <= self.current_trade['stop_loss']:
-                    # Verkaufe Aktien zum Stop-Loss-Preis
-                    proceeds = self.position * self.current_trade['stop_loss'] * (1 - self.commission)
-                    self.capital += proceeds
-                    
-                    # Berechne Gewinn/Verlust
-                    self.current_trade['exit_date'] = data.index[i]
-                    self.current_trade['exit_price'] = self.current_trade['stop_loss']
-                    self.current_trade['profit'] = proceeds - (self.current_trade['shares'] * self.current_trade['entry_price'] * (1 + self.commission))
-                    self.current_trade['profit_pct'] = (self.current_trade['stop_loss'] / self.current_trade['entry_price']) - 1
-                    self.current_trade['exit_reason'] = 'stop_loss'
-                    self.trades.append(self.current_trade)
-                    self.current_trade = None
-                    
-                    self.position = 0
-                    
-                    if verbose:
-                        print(f"STOP-LOSS: {data.index[i]}, Preis: {self.current_trade['stop_loss']:.2f}, Kapital: {self.capital:.2f}")
-                
-                # Überprüfe Take-Profit
-                elif self.current_trade['take_profit'] is not None and current_price >= self.current_trade['take_profit']:
-                    # Verkaufe Aktien zum Take-Profit-Preis
-                    proceeds = self.position * self.current_trade['take_profit'] * (1 - self.commission)
-                    self.capital += proceeds
-                    
-                    # Berechne Gewinn/Verlust
-                    self.current_trade['exit_date'] = data.index[i]
-                    self.current_trade['exit_price'] = self.current_trade['take_profit']
-                    self.current_trade['profit'] = proceeds - (self.current_trade['shares'] * self.current_trade['entry_price'] * (1 + self.commission))
-                    self.current_trade['profit_pct'] = (self.current_trade['take_profit'] / self.current_trade['entry_price']) - 1
-                    self.current_trade['exit_reason'] = 'take_profit'
-                    self.trades.append(self.current_trade)
-                    self.current_trade = None
-                    
-                    self.position = 0
-                    
-                    if verbose:
-                        print(f"TAKE-PROFIT: {data.index[i]}, Preis: {self.current_trade['take_profit']:.2f}, Kapital: {self.capital:.2f}")
-            
-            # Aktualisiere Equity und Positionen
-            equity[i] = self.capital + (self.position * current_price)
-            positions[i] = self.position
-            
+        progress_step = max(1, n // 100)
+        next_progress = progress_step
+
+        # Statt jeden Bar zu prüfen, springt die Simulation von Ereignis zu Ereignis:
+        # Einstiege an Kaufsignalen, Ausstiege am nächsten Verkaufssignal oder am ersten Bar,
+        # an dem der Schlusskurs Stop-Loss bzw. Take-Profit erreicht (Suche über den Bereichsindex)
+        close = data['Close'].to_numpy(dtype=float)
+        signal = data['Signal'].to_numpy(dtype=float)
+        buy_bars = np.flatnonzero(signal == 1)
+        sell_bars = np.flatnonzero(signal == -1)
+        range_index = PriceRangeIndex(data)
+        if fill_resolver is None:
+            stop_index = take_index = range_index.close
+        else:
+            stop_index, take_index = range_index.low, range_index.high
+
+        i = 1
+        while i < n:
+            # Nächstes Kaufsignal, bis dahin bleibt das Kapital unverändert
+            k = np.searchsorted(buy_bars, i)
+            entry = int(buy_bars[k]) if k < len(buy_bars) else n
+            equity[i:entry] = self.capital
+            if entry >= n:
+                break
+
+            # Kaufe Aktien
+            entry_price = close[entry]
+            shares = self._calculate_position_size(entry_price)
+            cost = shares * entry_price * (1 + self.commission)
+            self.capital -= cost
+            self.position = shares
+
+            # Zeichne Trade auf
+            self.current_trade = {
+                'entry_date': data.index[entry],
+                'entry_price': entry_price,
+                'shares': shares,
+                'type': 'long',
+                'stop_loss': strategy.calculate_stop_loss(data, entry) if hasattr(strategy, 'calculate_stop_loss') else None,
+                'take_profit': strategy.calculate_take_profit(data, entry) if hasattr(strategy, 'calculate_take_profit') else None
+            }
+
+            if verbose:
+                print(f"KAUF: {data.index[entry]}, Preis: {entry_price:.2f}, Anteile: {shares:.2f}, Kapital: {self.capital:.2f}")
+
+            # Ausstieg: Verkaufssignal hat Vorrang vor Stop-Loss, Stop-Loss vor Take-Profit,
+            # sofern der Resolver einen Bar, der beide Niveaus berührt, nicht anders auflöst
+            k = np.searchsorted(sell_bars, entry + 1)
+            sell_bar = int(sell_bars[k]) if k < len(sell_bars) else n
+            stop_bar = take_bar = n
+            if self.current_trade['stop_loss'] is not None:
+                hit = stop_index.first_below(entry + 1, self.current_trade['stop_loss'], sell_bar)
+                stop_bar = hit if hit >= 0 else n
+            if self.current_trade['take_profit'] is not None:
+                hit = take_index.first_above(entry + 1, self.current_trade['take_profit'], min(sell_bar, stop_bar + 1))
+                take_bar = hit if hit >= 0 else n
+            if fill_resolver is not None and stop_bar == take_bar < n:
+                if fill_resolver.resolve(data, stop_bar, self.current_trade['stop_loss'],
+                                         self.current_trade['take_profit']) == 'take_profit':
+                    stop_bar = n
+            exit_bar = min(sell_bar, stop_bar, take_bar)
+
+            # Aktualisiere Equity und Positionen während der Haltedauer
+            equity[entry:exit_bar] = self.capital + self.position * close[entry:exit_bar]
+            positions[entry:exit_bar] = self.position
+            if exit_bar >= n:
+                break
+
+            if exit_bar == sell_bar:
+                exit_price, exit_reason, label = close[exit_bar], None, "VERKAUF"
+            elif exit_bar == stop_bar:
+                exit_price, exit_reason, label = self.current_trade['stop_loss'], 'stop_loss', "STOP-LOSS"
+            else:
+                exit_price, exit_reason, label = self.current_trade['take_profit'], 'take_profit', "TAKE-PROFIT"
+
+            # Verkaufe Aktien
+            proceeds = self.position * exit_price * (1 - self.commission)
+            self.capital += proceeds
+
+            # Berechne Gewinn/Verlust
+            self.current_trade['exit_date'] = data.index[exit_bar]
+            self.current_trade['exit_price'] = exit_price
+            self.current_trade['profit'] = proceeds - (self.current_trade['shares'] * self.current_trade['entry_price'] * (1 + self.commission))
+            self.current_trade['profit_pct'] = (exit_price / self.current_trade['entry_price']) - 1
+            if exit_reason is not None:
+                self.current_trade['exit_reason'] = exit_reason
+            self.trades.append(self.current_trade)
+            self.current_trade = None
+            self.position = 0
+
+            if verbose:
+                print(f"{label}: {data.index[exit_bar]}, Preis: {exit_price:.2f}, Kapital: {self.capital:.2f}")
+
+            equity[exit_bar] = self.capital
+            i = exit_bar + 1
+
+            if progress_callback is not None and i >= next_progress:
+                progress_callback(min(i, n), n, "Backtest läuft")
+                next_progress = (i // progress_step + 1) * progress_step
+
         # Erstelle Equity-Kurve
         equity_curve = pd.Series(equity, index=data.index)
         positions_series = pd.Series(positions, index=data.index)
@@ -180,6 +234,10 @@ class BacktestEngine:
             'data': data
         }
         
+        if self.result_store is not None:
+            self.result_store.save(result_key, results, input_data, strategy, self.get_config(fill_resolver),
+                                   symbol or input_data.attrs.get('symbol'))
+        
         return results
     
     def _calculate_position_size(self, price):
@@ -243,6 +301,8 @@ class BacktestEngine:
             hold_times = [(t['exit_date'] - t['entry_date']).days for t in self.trades]
             avg_hold_time = np.mean(hold_times) if hold_times else 0
         else:
+            winning_trades = []
+            losing_trades = []
             win_rate = 0
             avg_profit = 0
             avg_loss = 0
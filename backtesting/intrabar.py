@@ -0,0 +1,194 @@
+"""
+Intrabar-Auflösung für Backtests
+Entscheidet bei Bars, die Stop-Loss und Take-Profit gleichzeitig berühren, anhand von Daten
+eines kleineren Zeitrahmens, welches Niveau zuerst erreicht wurde
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.intrabar")
+
+STOP_LOSS = 'stop_loss'
+TAKE_PROFIT = 'take_profit'
+
+
+def find_ambiguous_bars(data: pd.DataFrame, stop_loss, take_profit, direction: int = 1) -> np.ndarray:
+    """
+    Ermittelt vektorisiert die Bars, deren Spanne Stop-Loss und Take-Profit zugleich enthält
+
+    Args:
+        data: DataFrame mit High- und Low-Spalte (Groß- oder Kleinschreibung)
+        stop_loss: Stop-Loss als Skalar oder Array je Bar
+        take_profit: Take-Profit als Skalar oder Array je Bar
+        direction: 1 für Long-, -1 für Short-Positionen
+
+    Returns:
+        np.ndarray: Positionen der mehrdeutigen Bars
+    """
+    high, low = _get_high_low(data)
+    if direction == 1:
+        both = (low <= stop_loss) & (high >= take_profit)
+    else:
+        both = (high >= stop_loss) & (low <= take_profit)
+    return np.flatnonzero(both)
+
+
+def _get_high_low(data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    columns = {col.lower(): col for col in data.columns if isinstance(col, str)}
+    return (data[columns['high']].to_numpy(dtype=float), data[columns['low']].to_numpy(dtype=float))
+
+
+class IntrabarFillResolver:
+    """
+    Löst mehrdeutige Bars über Daten eines kleineren Zeitrahmens auf
+
+    Die Daten werden erst geladen, wenn ein Bar tatsächlich mehrdeutig ist, und nur für den
+    Zeitraum dieses Bars. Geladene Abschnitte werden zwischengespeichert, sodass der Aufwand mit
+    der Anzahl der mehrdeutigen Bars wächst und nicht mit der Länge der Historie. Quellen ohne
+    Zeitraumabfragen (supports_date_range = False, z.B. Yahoo Finance) werden stattdessen einmal
+    ohne Zeitraum abgefragt; die Bars werden aus diesem Fenster ausgeschnitten. Lässt sich die
+    Reihenfolge nicht bestimmen (keine Daten oder beide Niveaus im selben Teil-Bar), wird
+    konservativ der Stop-Loss angenommen.
+    """
+
+    def __init__(self, data_source, symbol: str, lower_timeframe: str = '1m', max_cached_slices: int = 256):
+        """
+        Initialisiert den Resolver
+
+        Args:
+            data_source: Datenquelle mit get_data(symbol, timeframe, start_date, end_date)
+            symbol: Symbol des Assets
+            lower_timeframe: Zeitrahmen der Daten zur Auflösung
+            max_cached_slices: Maximale Anzahl zwischengespeicherter Abschnitte
+        """
+        self.data_source = data_source
+        self.symbol = symbol
+        self.lower_timeframe = lower_timeframe
+        self.max_cached_slices = max_cached_slices
+        self.fetches = 0
+        self.hits = 0
+        self.range_queries = getattr(data_source, 'supports_date_range', True)
+        self._slices: "OrderedDict[Tuple[pd.Timestamp, pd.Timestamp], pd.DataFrame]" = OrderedDict()
+        self._window: Optional[pd.DataFrame] = None
+        self._coverage_warned = False
+        self._lock = threading.Lock()
+        self._window_lock = threading.Lock()
+
+    @staticmethod
+    def get_bar_bounds(index: pd.DatetimeIndex, bar: int) -> Tuple[pd.Timestamp, pd.Timestamp]:
+        """
+        Bestimmt Beginn und Ende eines Bars
+
+        Args:
+            index: Zeitstempel der Bars
+            bar: Position des Bars
+
+        Returns:
+            Tuple[pd.Timestamp, pd.Timestamp]: Beginn (inklusive) und Ende (exklusive)
+        """
+        start = index[bar]
+        if bar + 1 < len(index):
+            return start, index[bar + 1]
+        if bar > 0:
+            return start, start + (start - index[bar - 1])
+        return start, start + pd.Timedelta(days=1)
+
+    def get_slice(self, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        """
+        Gibt die Daten des kleineren Zeitrahmens für [start, end) zurück und lädt sie bei Bedarf
+
+        Args:
+            start: Beginn des Bars
+            end: Ende des Bars (exklusive)
+
+        Returns:
+            pd.DataFrame: Daten des kleineren Zeitrahmens (leer, wenn keine verfügbar sind)
+        """
+        key = (start, end)
+        with self._lock:
+            cached = self._slices.get(key)
+            if cached is not None:
+                self._slices.move_to_end(key)
+                self.hits += 1
+                return cached
+
+        lower = self._fetch(start, end) if self.range_queries else self._get_window()
+        if not lower.empty:
+            lower = lower[(lower.index >= start) & (lower.index < end)]
+        if lower.empty and not self.range_queries and not self._coverage_warned:
+            self._coverage_warned = True
+            logger.warning(f"Intrabar-Daten von {self.symbol} ({self.lower_timeframe}) decken {start} - {end} "
+                           f"nicht ab; die Quelle liefert nur das aktuelle Fenster, es wird der Stop-Loss angenommen")
+
+        with self._lock:
+            self._slices[key] = lower
+            while len(self._slices) > self.max_cached_slices:
+                self._slices.popitem(last=False)
+        return lower
+
+    def _fetch(self, start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """
+        Lädt Daten des kleineren Zeitrahmens, ohne Zeitraum das aktuelle Fenster der Quelle
+
+        Args:
+            start: Beginn des Zeitraums (optional)
+            end: Ende des Zeitraums (optional)
+
+        Returns:
+            pd.DataFrame: Geladene Daten (leer, wenn keine verfügbar sind)
+        """
+        try:
+            self.fetches += 1
+            lower = self.data_source.get_data(self.symbol, self.lower_timeframe, start, end)
+        except Exception as e:
+            logger.warning(f"Intrabar-Daten für {self.symbol} ({start} - {end}) nicht verfügbar: {str(e)}")
+            lower = None
+        return pd.DataFrame() if lower is None or lower.empty else lower
+
+    def _get_window(self) -> pd.DataFrame:
+        """
+        Gibt das einmalig geladene Fenster einer Quelle ohne Zeitraumabfragen zurück
+
+        Returns:
+            pd.DataFrame: Daten des kleineren Zeitrahmens
+        """
+        with self._window_lock:
+            if self._window is None:
+                self._window = self._fetch()
+            return self._window
+
+    def resolve(self, data: pd.DataFrame, bar: int, stop_loss: float, take_profit: float,
+                direction: int = 1) -> str:
+        """
+        Entscheidet, ob in einem mehrdeutigen Bar Stop-Loss oder Take-Profit zuerst erreicht wurde
+
+        Args:
+            data: DataFrame des Backtests
+            bar: Position des mehrdeutigen Bars
+            stop_loss: Stop-Loss der Position
+            take_profit: Take-Profit der Position
+            direction: 1 für Long-, -1 für Short-Positionen
+
+        Returns:
+            str: 'stop_loss' oder 'take_profit'
+        """
+        lower = self.get_slice(*self.get_bar_bounds(data.index, bar))
+        if lower.empty:
+            return STOP_LOSS
+
+        high, low = _get_high_low(lower)
+        if direction == 1:
+            stop_hits, take_hits = np.flatnonzero(low <= stop_loss), np.flatnonzero(high >= take_profit)
+        else:
+            stop_hits, take_hits = np.flatnonzero(high >= stop_loss), np.flatnonzero(low <= take_profit)
+
+        if take_hits.size and (not stop_hits.size or take_hits[0] < stop_hits[0]):
+            return TAKE_PROFIT
+        return STOP_LOSS
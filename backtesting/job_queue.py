@@ -0,0 +1,449 @@
+"""
+Job-Queue für lang laufende Backtests
+Führt Backtests und Optimierungen außerhalb des Dash-Request-Threads in einem Prozess-Pool aus
+"""
+
+import logging
+import threading
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from backtesting.job_store import JOB_CANCELLED, JOB_FAILED, JOB_FINISHED, JobStore
+from utils.settings import get_env_setting
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.job_queue")
+
+
+class JobCancelledError(Exception):
+    """
+    Wird im Worker ausgelöst, wenn ein laufender Job abgebrochen wurde
+    """
+    pass
+
+
+class JobProgress:
+    """
+    Fortschritts-Callback, der an den Job übergeben wird
+
+    Schreibt den Fortschritt in den geteilten Job-Speicher und bricht den Job mit
+    JobCancelledError ab, sobald ein Abbruch angefordert wurde, auch aus einem anderen
+    Server-Prozess.
+    """
+
+    def __init__(self, job_id: str, store: JobStore):
+        """
+        Initialisiert den Fortschritts-Callback
+
+        Args:
+            job_id: ID des Jobs
+            store: Geteilter Job-Speicher
+        """
+        self.job_id = job_id
+        self.store = store
+
+    @property
+    def cancelled(self) -> bool:
+        return self.store.is_cancel_requested(self.job_id)
+
+    def __call__(self, current: int, total: int, message: str = "") -> None:
+        """
+        Meldet den Fortschritt des Jobs
+
+        Args:
+            current: Anzahl bereits verarbeiteter Schritte
+            total: Gesamtanzahl der Schritte
+            message: Optionale Statusmeldung
+
+        Raises:
+            JobCancelledError: Wenn der Job abgebrochen wurde
+        """
+        if self.cancelled:
+            raise JobCancelledError(f"Job {self.job_id} wurde abgebrochen")
+        self.store.set_progress(self.job_id, current, total, message)
+
+
+def _execute_job(func: Callable, progress: JobProgress, args: tuple, kwargs: dict) -> None:
+    """
+    Führt eine Job-Funktion im Worker aus und legt Status und Ergebnis im Job-Speicher ab
+    """
+    try:
+        progress(0, 1, "Gestartet")
+        result = func(*args, progress_callback=progress, **kwargs)
+        progress(1, 1, "Abgeschlossen")
+    except JobCancelledError:
+        progress.store.finish(progress.job_id, JOB_CANCELLED)
+    except Exception as e:
+        progress.store.finish(progress.job_id, JOB_FAILED, error=str(e))
+    else:
+        progress.store.finish(progress.job_id, JOB_FINISHED, result=result)
+
+
+class JobQueue:
+    """
+    Warteschlange für Hintergrund-Jobs mit Fortschritt, Abbruch und Ergebnisspeicher
+
+    Jobs werden über eine ID angesprochen, sodass mehrere Benutzer gleichzeitig Jobs
+    einreihen und deren Status unabhängig voneinander abfragen können. Status, Fortschritt,
+    Abbruchanforderungen und Ergebnisse liegen im geteilten JobStore; Abfragen und Abbrüche
+    funktionieren daher in jedem Server-Prozess, nicht nur in dem, der den Job ausführt.
+
+    Solange die Queue Jobs hat, aktualisiert ein Hintergrund-Thread alle heartbeat_interval
+    Sekunden deren Heartbeat. Jobs ohne Heartbeat seit stale_timeout Sekunden stammen von einem
+    beendeten Worker und werden beim Start und bei jedem Heartbeat als fehlgeschlagen markiert.
+    """
+
+    def __init__(self, max_workers: int = 2, use_processes: bool = True, max_jobs: int = 100,
+                 store: Optional[JobStore] = None, heartbeat_interval: float = 10.0,
+                 stale_timeout: float = 60.0):
+        """
+        Initialisiert die Job-Queue
+
+        Args:
+            max_workers: Maximale Anzahl parallel laufender Jobs
+            use_processes: Ob ein Prozess-Pool (True) oder ein Thread-Pool (False) verwendet wird
+            max_jobs: Maximale Anzahl gespeicherter Jobs (abgeschlossene werden zuerst entfernt)
+            store: Job-Speicher (Standard: JobStore unter backtesting/results)
+            heartbeat_interval: Abstand zwischen zwei Heartbeats in Sekunden
+            stale_timeout: Sekunden ohne Heartbeat, nach denen ein Job als fehlgeschlagen gilt
+        """
+        self.max_workers = max_workers
+        self.use_processes = use_processes
+        self.max_jobs = max_jobs
+        self.store = store if store is not None else JobStore()
+        self.heartbeat_interval = heartbeat_interval
+        self.stale_timeout = stale_timeout
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+        self._heartbeat_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.store.fail_stale(stale_timeout)
+
+    def _ensure_executor(self) -> Executor:
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="backtest-job")
+        return self._executor
+
+    def _ensure_heartbeat(self) -> None:
+        if self._heartbeat_thread is None:
+            self._stop_event.clear()
+            self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name="job-heartbeat",
+                                                      daemon=True)
+            self._heartbeat_thread.start()
+
+    def _heartbeat_loop(self) -> None:
+        while not self._stop_event.wait(self.heartbeat_interval):
+            with self._lock:
+                job_ids = list(self._futures)
+                if not job_ids:
+                    self._heartbeat_thread = None
+                    return
+            try:
+                self.store.heartbeat(job_ids)
+                self.store.fail_stale(self.stale_timeout)
+            except Exception as e:
+                logger.error(f"Fehler beim Heartbeat der Jobs: {str(e)}")
+
+    def submit(self, func: Callable, *args, job_id: Optional[str] = None, **kwargs) -> str:
+        """
+        Reiht einen Job ein
+
+        Die Funktion muss einen Keyword-Parameter progress_callback akzeptieren, ein
+        JSON-serialisierbares Ergebnis liefern und bei Verwendung eines Prozess-Pools auf
+        Modulebene definiert sein.
+
+        Args:
+            func: Auszuführende Funktion
+            *args: Positionsargumente für die Funktion
+            job_id: Optionale Job-ID (Standard: zufällige UUID)
+            **kwargs: Keyword-Argumente für die Funktion
+
+        Returns:
+            str: ID des Jobs
+        """
+        job_id = job_id or uuid.uuid4().hex
+        name = getattr(func, '__name__', str(func))
+        self.store.create(job_id, name)
+        with self._lock:
+            executor = self._ensure_executor()
+            future = executor.submit(_execute_job, func, JobProgress(job_id, self.store), args, kwargs)
+            self._futures[job_id] = future
+            self._ensure_heartbeat()
+        self.store.evict(self.max_jobs)
+
+        future.add_done_callback(lambda f, jid=job_id: self._on_done(jid, f))
+        logger.info(f"Job {job_id} ({name}) eingereiht")
+        return job_id
+
+    def _on_done(self, job_id: str, future: Future) -> None:
+        with self._lock:
+            self._futures.pop(job_id, None)
+        # Verworfene Jobs und abgestürzte Worker-Prozesse melden ihr Ende nicht selbst
+        if future.cancelled():
+            self.store.finish(job_id, JOB_CANCELLED)
+        elif future.exception() is not None:
+            self.store.finish(job_id, JOB_FAILED, error=str(future.exception()))
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Gibt den Status eines Jobs zurück
+
+        Args:
+            job_id: ID des Jobs
+
+        Returns:
+            Optional[Dict[str, Any]]: Status mit Fortschritt (0-1), Meldung und ggf. Fehler
+                oder None, wenn der Job unbekannt ist
+        """
+        return self.store.get(job_id)
+
+    def get_result(self, job_id: str) -> Any:
+        """
+        Gibt das Ergebnis eines erfolgreich abgeschlossenen Jobs zurück
+
+        Args:
+            job_id: ID des Jobs
+
+        Returns:
+            Any: Ergebnis des Jobs oder None, wenn der Job (noch) kein Ergebnis hat
+        """
+        return self.store.get_result(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Bricht einen Job ab
+
+        Wartende Jobs werden verworfen, laufende Jobs brechen beim nächsten
+        Fortschritts-Callback ab. Der Job kann in einem anderen Server-Prozess laufen.
+
+        Args:
+            job_id: ID des Jobs
+
+        Returns:
+            bool: True, wenn der Abbruch angefordert wurde, sonst False
+        """
+        if not self.store.request_cancel(job_id):
+            return False
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.cancel()
+        logger.info(f"Abbruch für Job {job_id} angefordert")
+        return True
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """
+        Gibt den Status aller bekannten Jobs zurück
+
+        Returns:
+            List[Dict[str, Any]]: Liste der Job-Status, neueste zuerst
+        """
+        return self.store.list_jobs()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Beendet den Pool und verwirft wartende Jobs
+
+        Args:
+            wait: Ob auf laufende Jobs gewartet werden soll
+        """
+        self._stop_event.set()
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+            self._heartbeat_thread = None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _load_backtest_data(symbol: str, timeframe: str, start_date: Optional[str], end_date: Optional[str],
+                        data_source: str) -> pd.DataFrame:
+    """
+    Lädt Preisdaten für einen Backtest und bringt sie in das Spaltenformat der Strategien
+    """
+    from data.data_source import DataSourceFactory
+    from data.ohlcv import title_view
+
+    source = DataSourceFactory.create_data_source(data_source)
+    df = title_view(source.get_data(symbol, timeframe, start_date, end_date))
+    df.attrs['symbol'] = symbol
+    return df
+
+
+def _create_strategy(strategy_name: str):
+    """
+    Erstellt eine Beispielstrategie anhand ihres Namens im Dashboard
+    """
+    from strategy.example_strategies import (
+        BollingerBandsStrategy, MACDStrategy, MovingAverageCrossover, RSIStrategy
+    )
+
+    strategies = {
+        'ma_crossover': MovingAverageCrossover,
+        'rsi': RSIStrategy,
+        'macd': MACDStrategy,
+        'bollinger': BollingerBandsStrategy,
+    }
+    if strategy_name not in strategies:
+        raise ValueError(f"Unbekannte Strategie: {strategy_name}")
+    return strategies[strategy_name]()
+
+
+def run_backtest_job(strategy_name: str, symbol: str, timeframe: str = '1d',
+                     params: Optional[Dict[str, Any]] = None, start_date: Optional[str] = None,
+                     end_date: Optional[str] = None, initial_capital: float = 50000.0,
+                     commission: float = 0.001, data_source: str = 'yahoo',
+                     intrabar_timeframe: Optional[str] = None, use_result_store: bool = False,
+                     progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    """
+    Führt einen Backtest als Hintergrund-Job aus
+
+    Args:
+        strategy_name: Name der Strategie (ma_crossover, rsi, macd, bollinger)
+        symbol: Symbol des Assets
+        timeframe: Zeitrahmen
+        params: Parameter der Strategie (optional)
+        start_date: Startdatum (optional)
+        end_date: Enddatum (optional)
+        initial_capital: Anfangskapital
+        commission: Provisionsrate pro Trade
+        data_source: Typ der Datenquelle ('yahoo' oder 'mock')
+        intrabar_timeframe: Zeitrahmen zur Auflösung von Bars, die Stop-Loss und Take-Profit
+            berühren (z.B. '1m', optional)
+        use_result_store: Ergebnisse aus dem globalen Ergebnisspeicher lesen und dort ablegen
+        progress_callback: Fortschritts-Callback der Job-Queue
+
+    Returns:
+        Dict[str, Any]: JSON-serialisierbare Ergebnisse (Metriken, Trades, Equity-Kurve)
+    """
+    from backtesting.backtest_engine import BacktestEngine
+    from backtesting.intrabar import IntrabarFillResolver
+    from backtesting.result_store import get_result_store
+    from data.data_source import DataSourceFactory
+
+    strategy = _create_strategy(strategy_name)
+    if params:
+        strategy.set_parameters(**params)
+
+    data = _load_backtest_data(symbol, timeframe, start_date, end_date, data_source)
+    fill_resolver = None
+    if intrabar_timeframe:
+        fill_resolver = IntrabarFillResolver(DataSourceFactory.create_data_source(data_source), symbol,
+                                             intrabar_timeframe)
+    engine = BacktestEngine(initial_capital=initial_capital, commission=commission,
+                            result_store=get_result_store() if use_result_store else None)
+    results = engine.run(data, strategy, progress_callback=progress_callback, fill_resolver=fill_resolver)
+
+    trades = [
+        {
+            'entry_date': str(trade['entry_date']),
+            'exit_date': str(trade.get('exit_date', '')),
+            'entry_price': float(trade['entry_price']),
+            'exit_price': float(trade.get('exit_price', float('nan'))),
+            'shares': float(trade['shares']),
+            'profit': float(trade.get('profit', 0.0)),
+            'exit_reason': trade.get('exit_reason', 'signal'),
+        }
+        for trade in results['trades']
+    ]
+    equity_curve = results['equity_curve']
+
+    return {
+        'symbol': symbol,
+        'strategy': strategy.name,
+        'timeframe': timeframe,
+        'metrics': {key: float(value) for key, value in results['metrics'].items()},
+        'trades': trades,
+        'equity_curve': {
+            'dates': [str(date) for date in equity_curve.index],
+            'values': equity_curve.astype(float).tolist(),
+        },
+    }
+
+
+def run_optimization_job(strategy_name: str, symbol: str, param_grid: Dict[str, list], timeframe: str = '1d',
+                         metric: str = 'total_return', start_date: Optional[str] = None,
+                         end_date: Optional[str] = None, initial_capital: float = 50000.0,
+                         commission: float = 0.001, data_source: str = 'yahoo', use_result_store: bool = False,
+                         checkpoint_dir: Optional[str] = None, progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+    """
+    Führt eine Parameteroptimierung als Hintergrund-Job aus
+
+    Args:
+        strategy_name: Name der Strategie (ma_crossover, rsi, macd, bollinger)
+        symbol: Symbol des Assets
+        param_grid: Parameternamen mit Listen zu testender Werte
+        timeframe: Zeitrahmen
+        metric: Metrik, die optimiert werden soll
+        start_date: Startdatum (optional)
+        end_date: Enddatum (optional)
+        initial_capital: Anfangskapital
+        commission: Provisionsrate pro Trade
+        data_source: Typ der Datenquelle ('yahoo' oder 'mock')
+        use_result_store: Bereits gespeicherte Kombinationen überspringen und neue Ergebnisse ablegen
+        checkpoint_dir: Verzeichnis für das Checkpoint-Log, über das ein abgebrochener Sweep fortgesetzt wird (optional)
+        progress_callback: Fortschritts-Callback der Job-Queue
+
+    Returns:
+        Dict[str, Any]: Beste Parameter, bester Metrikwert und alle Ergebnisse
+    """
+    from backtesting.backtest_engine import BacktestEngine
+    from backtesting.result_store import get_result_store
+
+    strategy = _create_strategy(strategy_name)
+    data = _load_backtest_data(symbol, timeframe, start_date, end_date, data_source)
+    engine = BacktestEngine(initial_capital=initial_capital, commission=commission,
+                            result_store=get_result_store() if use_result_store else None)
+    best_params, best_value, results = strategy.optimize(data, param_grid, metric=metric,
+                                                         backtest_engine=engine,
+                                                         progress_callback=progress_callback,
+                                                         checkpoint_dir=checkpoint_dir)
+
+    return {
+        'symbol': symbol,
+        'strategy': strategy.name,
+        'metric': metric,
+        'best_params': best_params,
+        'best_value': float(best_value),
+        'results': [
+            {'params': result['params'], 'metrics': {k: float(v) for k, v in result['metrics'].items()}}
+            for result in results
+        ],
+    }
+
+
+# Globale Job-Queue für das Dashboard
+_job_queue: Optional[JobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue(max_workers: int = 2, use_processes: bool = True) -> JobQueue:
+    """
+    Gibt die globale Job-Queue zurück und erstellt sie bei Bedarf
+
+    Jeder Server-Prozess hat eine eigene Queue; alle teilen sich den Job-Speicher. Heartbeat und
+    Zeitlimit für Jobs beendeter Worker über TRADING_DASHBOARD_JOB_HEARTBEAT_INTERVAL und
+    _JOB_STALE_TIMEOUT (Sekunden).
+
+    Args:
+        max_workers: Maximale Anzahl parallel laufender Jobs
+        use_processes: Ob ein Prozess-Pool verwendet wird
+
+    Returns:
+        JobQueue: Globale Job-Queue
+    """
+    global _job_queue
+    with _job_queue_lock:
+        if _job_queue is None:
+            _job_queue = JobQueue(max_workers=max_workers, use_processes=use_processes,
+                                  heartbeat_interval=get_env_setting("JOB_HEARTBEAT_INTERVAL", 10.0, float),
+                                  stale_timeout=get_env_setting("JOB_STALE_TIMEOUT", 60.0, float))
+        return _job_queue
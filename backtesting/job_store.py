@@ -0,0 +1,293 @@
+"""
+Geteilter Speicher für den Zustand der Hintergrund-Jobs
+Status, Fortschritt, Abbruchanforderungen und Ergebnisse liegen je Job-ID in SQLite, sodass jeder
+Worker-Prozess des Servers (gunicorn) Jobs abfragen und abbrechen kann, die ein anderer
+Worker eingereiht hat. Die Queue, die einen Job ausführt, aktualisiert regelmäßig dessen
+Heartbeat; Jobs ohne aktuellen Heartbeat stammen von beendeten Workern und werden als
+fehlgeschlagen markiert.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.job_store")
+
+# Status-Werte eines Jobs
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_FINISHED = 'finished'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+# Status, in denen ein Job abgeschlossen ist
+FINISHED_STATES = (JOB_FINISHED, JOB_FAILED, JOB_CANCELLED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    current INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 1,
+    message TEXT NOT NULL DEFAULT '',
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    submitted_at REAL NOT NULL,
+    finished_at REAL,
+    heartbeat_at REAL,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_submitted_at ON jobs (submitted_at);
+"""
+
+_STATUS_COLUMNS = "job_id, name, status, current, total, message, error, cancel_requested, submitted_at, finished_at"
+
+
+def _encode_result(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Ergebnis ist nicht JSON-serialisierbar: {type(value).__name__}")
+
+
+class JobStore:
+    """
+    SQLite-Speicher für den Zustand der Jobs
+
+    Jede Operation öffnet eine eigene Verbindung. Der Speicher kann daher aus Threads,
+    Worker-Prozessen des Job-Pools und Worker-Prozessen des Servers gleichzeitig genutzt
+    werden; Objekte der Klasse lassen sich an Prozesse übergeben.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialisiert den Speicher
+
+        Args:
+            path: Pfad der SQLite-Datei (Standard: backtesting/results/backtest_jobs.sqlite)
+        """
+        if path is None:
+            path = Path(os.path.dirname(os.path.abspath(__file__))) / 'results' / 'backtest_jobs.sqlite'
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            # Speicher älterer Versionen haben noch keine Heartbeat-Spalte
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(jobs)")]
+            if 'heartbeat_at' not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat_at REAL")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Öffnet eine Verbindung, führt den Block als Transaktion aus und schließt die Verbindung
+        """
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create(self, job_id: str, name: str) -> None:
+        """
+        Legt einen wartenden Job an
+
+        Args:
+            job_id: ID des Jobs
+            name: Name der Job-Funktion
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO jobs (job_id, name, status, submitted_at, heartbeat_at) "
+                         "VALUES (?, ?, ?, ?, ?)", (job_id, name, JOB_QUEUED, now, now))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Gibt den gespeicherten Zustand eines Jobs zurück (ohne Ergebnis)
+
+        Args:
+            job_id: ID des Jobs
+
+        Returns:
+            Optional[Dict[str, Any]]: Zustand oder None, wenn der Job unbekannt ist
+        """
+        with self._connect() as conn:
+            row = conn.execute(f"SELECT {_STATUS_COLUMNS} FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_status(row) if row is not None else None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """
+        Gibt den Zustand aller Jobs zurück
+
+        Returns:
+            List[Dict[str, Any]]: Zustände, neueste zuerst
+        """
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT {_STATUS_COLUMNS} FROM jobs ORDER BY submitted_at DESC").fetchall()
+        return [self._to_status(row) for row in rows]
+
+    @staticmethod
+    def _to_status(row) -> Dict[str, Any]:
+        job_id, name, status, current, total, message, error, cancel_requested, submitted_at, finished_at = row
+        return {
+            'job_id': job_id,
+            'name': name,
+            'status': status,
+            'progress': current / total if total else 0.0,
+            'message': message,
+            'error': error,
+            'cancel_requested': bool(cancel_requested),
+            'submitted_at': datetime.fromtimestamp(submitted_at),
+            'finished_at': datetime.fromtimestamp(finished_at) if finished_at is not None else None,
+        }
+
+    def set_progress(self, job_id: str, current: int, total: int, message: str = "") -> None:
+        """
+        Speichert den Fortschritt eines Jobs und markiert ihn als laufend
+
+        Args:
+            job_id: ID des Jobs
+            current: Anzahl bereits verarbeiteter Schritte
+            total: Gesamtanzahl der Schritte
+            message: Statusmeldung
+        """
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET current = ?, total = ?, message = ?, status = ? "
+                         "WHERE job_id = ? AND status IN (?, ?)",
+                         (int(current), int(total), message, JOB_RUNNING, job_id, JOB_QUEUED, JOB_RUNNING))
+
+    def finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None) -> None:
+        """
+        Schließt einen Job ab
+
+        Bereits abgeschlossene Jobs bleiben unverändert.
+
+        Args:
+            job_id: ID des Jobs
+            status: JOB_FINISHED, JOB_FAILED oder JOB_CANCELLED
+            result: Ergebnis des Jobs (JSON-serialisierbar, nur bei JOB_FINISHED)
+            error: Fehlermeldung (optional)
+        """
+        payload = None
+        if status == JOB_FINISHED:
+            try:
+                payload = json.dumps(result, default=_encode_result)
+            except (TypeError, ValueError) as e:
+                status, error = JOB_FAILED, str(e)
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? "
+                         "WHERE job_id = ? AND status NOT IN (?, ?, ?)",
+                         (status, payload, error, time.time(), job_id, *FINISHED_STATES))
+
+    def get_result(self, job_id: str) -> Any:
+        """
+        Gibt das Ergebnis eines erfolgreich abgeschlossenen Jobs zurück
+
+        Args:
+            job_id: ID des Jobs
+
+        Returns:
+            Any: Ergebnis oder None, wenn der Job (noch) kein Ergebnis hat
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT result FROM jobs WHERE job_id = ? AND status = ?",
+                               (job_id, JOB_FINISHED)).fetchone()
+        return json.loads(row[0]) if row is not None and row[0] is not None else None
+
+    def request_cancel(self, job_id: str) -> bool:
+        """
+        Fordert den Abbruch eines wartenden oder laufenden Jobs an
+
+        Args:
+            job_id: ID des Jobs
+
+        Returns:
+            bool: True, wenn der Abbruch angefordert wurde, sonst False
+        """
+        with self._connect() as conn:
+            cursor = conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE job_id = ? AND status IN (?, ?)",
+                                  (job_id, JOB_QUEUED, JOB_RUNNING))
+            return cursor.rowcount > 0
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        """
+        Prüft, ob für einen Job ein Abbruch angefordert wurde
+
+        Args:
+            job_id: ID des Jobs
+
+        Returns:
+            bool: True bei angefordertem Abbruch
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return bool(row[0]) if row is not None else False
+
+    def heartbeat(self, job_ids: Iterable[str]) -> None:
+        """
+        Meldet, dass die wartenden oder laufenden Jobs noch von einer aktiven Queue ausgeführt werden
+
+        Args:
+            job_ids: IDs der Jobs
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany("UPDATE jobs SET heartbeat_at = ? WHERE job_id = ? AND status IN (?, ?)",
+                             [(now, job_id, JOB_QUEUED, JOB_RUNNING) for job_id in job_ids])
+
+    def fail_stale(self, max_age: float) -> int:
+        """
+        Markiert wartende und laufende Jobs ohne Heartbeat seit max_age Sekunden als fehlgeschlagen
+
+        Solche Jobs gehören zu einem beendeten Worker und würden sonst für immer als laufend gelten.
+
+        Args:
+            max_age: Maximales Alter des letzten Heartbeats in Sekunden
+
+        Returns:
+            int: Anzahl markierter Jobs
+        """
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? "
+                "WHERE status IN (?, ?) AND COALESCE(heartbeat_at, submitted_at) < ?",
+                (JOB_FAILED, "Worker wurde beendet", now, JOB_QUEUED, JOB_RUNNING, now - max_age))
+            stale = cursor.rowcount
+        if stale:
+            logger.warning(f"{stale} Jobs ohne Heartbeat als fehlgeschlagen markiert")
+        return stale
+
+    def evict(self, max_jobs: int) -> int:
+        """
+        Entfernt die ältesten abgeschlossenen Jobs, bis höchstens max_jobs Jobs gespeichert sind
+
+        Args:
+            max_jobs: Maximale Anzahl gespeicherter Jobs
+
+        Returns:
+            int: Anzahl entfernter Jobs
+        """
+        with self._connect() as conn:
+            total = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            excess = total - max_jobs
+            if excess <= 0:
+                return 0
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE job_id IN (SELECT job_id FROM jobs WHERE status IN (?, ?, ?) "
+                "ORDER BY submitted_at LIMIT ?)", (*FINISHED_STATES, excess))
+            removed = cursor.rowcount
+        if removed:
+            logger.debug(f"{removed} abgeschlossene Jobs aus dem Job-Speicher entfernt")
+        return removed
@@ -0,0 +1,382 @@
+"""
+Persistenter Speicher für Backtest-Ergebnisse
+Legt Ergebnisse in SQLite ab, adressiert über einen Hash aus Daten, Strategie, Engine-Konfiguration
+und Code-Version, sodass wiederholte Backtests und Sweep-Punkte direkt aus dem Speicher kommen
+"""
+
+import hashlib
+import inspect
+import io
+import json
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.result_store")
+
+# Module, deren Quelltext in die Code-Version eingeht (zusätzlich zu den Modulen der Strategie)
+CODE_VERSION_MODULES = ('backtesting.backtest_engine', 'backtesting.intrabar', 'utils.range_index')
+
+# Metriken mit eigener, indizierter Spalte; alle übrigen sind über json_extract abfragbar
+INDEXED_METRICS = ('total_return', 'annual_return', 'sharpe_ratio', 'max_drawdown', 'win_rate', 'profit_factor')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS backtest_results (
+    key TEXT PRIMARY KEY,
+    symbol TEXT,
+    strategy TEXT NOT NULL,
+    params TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    total_return REAL,
+    annual_return REAL,
+    sharpe_ratio REAL,
+    max_drawdown REAL,
+    win_rate REAL,
+    profit_factor REAL,
+    metrics TEXT NOT NULL,
+    trades TEXT NOT NULL,
+    series BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_symbol_sharpe ON backtest_results (symbol, sharpe_ratio);
+CREATE INDEX IF NOT EXISTS idx_results_symbol_return ON backtest_results (symbol, total_return);
+CREATE INDEX IF NOT EXISTS idx_results_strategy_sharpe ON backtest_results (strategy, sharpe_ratio);
+"""
+
+_code_versions: Dict[str, str] = {}
+
+
+def fingerprint_data(data: pd.DataFrame) -> str:
+    """
+    Berechnet einen Fingerabdruck der Preisdaten (Index, Spalten und Werte)
+
+    Args:
+        data: DataFrame mit Preisdaten
+
+    Returns:
+        str: SHA-256-Hash als Hex-String
+    """
+    digest = hashlib.sha256(json.dumps([str(col) for col in data.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def get_code_version(strategy=None) -> str:
+    """
+    Berechnet die Code-Version aus dem Quelltext der Engine und der Strategie-Module
+
+    Args:
+        strategy: Strategie, deren Klassenhierarchie einbezogen wird (optional)
+
+    Returns:
+        str: SHA-256-Hash als Hex-String
+    """
+    modules = list(CODE_VERSION_MODULES)
+    if strategy is not None:
+        modules += [cls.__module__ for cls in type(strategy).__mro__ if cls.__module__ not in ('builtins', 'abc')]
+
+    digest = hashlib.sha256()
+    for name in dict.fromkeys(modules):
+        version = _code_versions.get(name)
+        if version is None:
+            module = sys.modules.get(name)
+            try:
+                source = inspect.getsource(module) if module is not None else name
+            except (OSError, TypeError):
+                source = name
+            version = hashlib.sha256(source.encode()).hexdigest()
+            _code_versions[name] = version
+        digest.update(version.encode())
+    return digest.hexdigest()
+
+
+def make_result_key(data: pd.DataFrame, strategy, engine_config: Dict[str, Any],
+                    data_fingerprint: Optional[str] = None) -> str:
+    """
+    Erstellt den inhaltsadressierten Schlüssel eines Backtests
+
+    Args:
+        data: DataFrame mit Preisdaten
+        strategy: Strategie-Objekt (Klasse und Attribute inkl. Parameter gehen in den Schlüssel ein)
+        engine_config: Konfiguration der Engine (z.B. initial_capital, commission)
+        data_fingerprint: Vorab berechneter Fingerabdruck der Daten (optional)
+
+    Returns:
+        str: SHA-256-Hash als Hex-String
+    """
+    spec = {
+        'data': data_fingerprint or fingerprint_data(data),
+        'strategy': f"{type(strategy).__module__}.{type(strategy).__qualname__}",
+        'attributes': vars(strategy),
+        'engine': engine_config,
+        'code': get_code_version(strategy),
+    }
+    payload = json.dumps(spec, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, pd.Timestamp):
+        return {'__timestamp__': value.isoformat()}
+    if isinstance(value, np.generic):
+        return value.item()
+    return repr(value)
+
+
+def _decode_value(value: Dict[str, Any]) -> Any:
+    if '__timestamp__' in value:
+        return pd.Timestamp(value['__timestamp__'])
+    return value
+
+
+def _encode_series(results: Dict[str, Any], input_data: pd.DataFrame) -> Optional[bytes]:
+    # Spaltenweise Ablage: Equity, Positionen und die von der Strategie ergänzten oder geänderten
+    # Spalten; Index und unveränderte Eingangsspalten kommen beim Laden aus den Eingangsdaten
+    data = results['data']
+    if not data.index.equals(input_data.index):
+        return None
+    added = [col for col in data.columns
+             if col not in input_data.columns or not data[col].equals(input_data[col])]
+    arrays = {
+        'equity_curve': results['equity_curve'].to_numpy(),
+        'positions': results['positions'].to_numpy(),
+    }
+    for position, col in enumerate(added):
+        arrays[f"column_{position}"] = data[col].to_numpy()
+    # Objekt-Spalten (z.B. Strings) ließen sich nur per Pickle ablegen, das np.load ablehnt;
+    # allow_pickle ist erst ab NumPy 2.1 ein Parameter von np.savez
+    if any(array.dtype.hasobject for array in arrays.values()):
+        return None
+    meta = {'columns': [str(col) for col in data.columns], 'added': [str(col) for col in added]}
+    arrays['meta'] = np.array(json.dumps(meta))
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def _decode_series(blob: bytes, data: pd.DataFrame) -> Dict[str, Any]:
+    with np.load(io.BytesIO(blob), allow_pickle=False) as arrays:
+        meta = json.loads(str(arrays['meta']))
+        index = data.index
+        frame = data.copy()
+        for position, col in enumerate(meta['added']):
+            frame[col] = arrays[f"column_{position}"]
+        frame = frame[[col for col in frame.columns if str(col) in meta['columns']]]
+        return {
+            'equity_curve': pd.Series(arrays['equity_curve'], index=index),
+            'positions': pd.Series(arrays['positions'], index=index),
+            'data': frame,
+        }
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if np.isnan(value) else value
+
+
+def _metric_column(metric: str) -> str:
+    if metric in INDEXED_METRICS:
+        return metric
+    if not metric.replace('_', '').isalnum():
+        raise ValueError(f"Ungültiger Metrikname: {metric}")
+    return f"json_extract(metrics, '$.{metric}')"
+
+
+class BacktestResultStore:
+    """
+    SQLite-Speicher für Backtest-Ergebnisse
+
+    Metriken, Parameter und Trades liegen als Spalten bzw. JSON vor, Equity-Kurve, Positionen
+    und Signalspalten spaltenweise als NumPy-Archiv. Die wichtigsten Metriken sind indiziert,
+    sodass z.B. die besten Ergebnisse eines Symbols nach Sharpe Ratio direkt abfragbar sind.
+    Jede Operation öffnet eine eigene Verbindung, der Speicher kann daher aus Threads und
+    Prozessen der Job-Queue gleichzeitig genutzt werden.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialisiert den Speicher
+
+        Args:
+            path: Pfad der SQLite-Datei (Standard: backtesting/results/backtest_results.sqlite)
+        """
+        if path is None:
+            path = Path(os.path.dirname(os.path.abspath(__file__))) / 'results' / 'backtest_results.sqlite'
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Öffnet eine Verbindung, führt den Block als Transaktion aus und schließt die Verbindung
+        """
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def save(self, key: str, results: Dict[str, Any], input_data: pd.DataFrame, strategy,
+             engine_config: Dict[str, Any], symbol: Optional[str] = None) -> bool:
+        """
+        Speichert die Ergebnisse eines Backtests
+
+        Args:
+            key: Schlüssel aus make_result_key
+            results: Ergebnisse von BacktestEngine.run
+            input_data: Eingangsdaten des Backtests (unveränderte Spalten werden nicht gespeichert)
+            strategy: Strategie-Objekt
+            engine_config: Konfiguration der Engine
+            symbol: Symbol der Daten (optional)
+
+        Returns:
+            bool: True, wenn die Ergebnisse gespeichert wurden
+        """
+        series = _encode_series(results, input_data)
+        if series is None:
+            logger.debug(f"Ergebnis {key[:12]} enthält nicht speicherbare Spalten und wird nicht abgelegt")
+            return False
+
+        metrics = results['metrics']
+        row = (
+            key, symbol, type(strategy).__qualname__,
+            json.dumps(strategy.get_parameters() if hasattr(strategy, 'get_parameters') else {},
+                       sort_keys=True, default=_encode_value),
+            json.dumps(engine_config, sort_keys=True), time.time(),
+            *[_to_float(metrics.get(metric)) for metric in INDEXED_METRICS],
+            json.dumps(metrics, default=_encode_value),
+            json.dumps(results['trades'], default=_encode_value),
+            sqlite3.Binary(series),
+        )
+        with self._connect() as conn:
+            conn.execute(f"INSERT OR REPLACE INTO backtest_results VALUES ({', '.join('?' * len(row))})", row)
+        return True
+
+    def load(self, key: str, data: pd.DataFrame) -> Optional[Dict[str, Any]]:
+        """
+        Lädt die Ergebnisse eines Backtests
+
+        Args:
+            key: Schlüssel aus make_result_key
+            data: Eingangsdaten des Backtests (für die Ergebnis-Spalte 'data')
+
+        Returns:
+            Optional[Dict[str, Any]]: Ergebnisse wie von BacktestEngine.run oder None
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT metrics, trades, series FROM backtest_results WHERE key = ?",
+                               (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        results = _decode_series(row[2], data)
+        results['metrics'] = json.loads(row[0])
+        results['trades'] = json.loads(row[1], object_hook=_decode_value)
+        return results
+
+    def get_metrics(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Lädt nur die Metriken eines Backtests (für Sweeps)
+
+        Args:
+            key: Schlüssel aus make_result_key
+
+        Returns:
+            Optional[Dict[str, Any]]: Metriken oder None
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT metrics FROM backtest_results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def query_top(self, metric: str = 'sharpe_ratio', symbol: Optional[str] = None,
+                  strategy: Optional[str] = None, limit: int = 10, ascending: bool = False) -> pd.DataFrame:
+        """
+        Gibt die besten gespeicherten Ergebnisse nach einer Metrik zurück
+
+        Args:
+            metric: Metrik für die Sortierung
+            symbol: Nur Ergebnisse dieses Symbols (optional)
+            strategy: Nur Ergebnisse dieser Strategie-Klasse (optional)
+            limit: Maximale Anzahl Ergebnisse
+            ascending: Aufsteigend sortieren (z.B. für max_drawdown)
+
+        Returns:
+            pd.DataFrame: Schlüssel, Symbol, Strategie, Parameter, Metrikwert und Zeitpunkt
+
+        Raises:
+            ValueError: Wenn der Metrikname ungültig ist
+        """
+        column = _metric_column(metric)
+        conditions, args = [f"{column} IS NOT NULL"], []
+        if symbol is not None:
+            conditions.append("symbol = ?")
+            args.append(symbol)
+        if strategy is not None:
+            conditions.append("strategy = ?")
+            args.append(strategy)
+        query = (f"SELECT key, symbol, strategy, params, {column} AS value, created_at FROM backtest_results "
+                 f"WHERE {' AND '.join(conditions)} ORDER BY value {'ASC' if ascending else 'DESC'} LIMIT ?")
+
+        with self._connect() as conn:
+            rows = conn.execute(query, (*args, limit)).fetchall()
+        df = pd.DataFrame(rows, columns=['key', 'symbol', 'strategy', 'params', metric, 'created_at'])
+        df['params'] = [json.loads(params) for params in df['params']]
+        return df
+
+    def count(self) -> int:
+        """
+        Gibt die Anzahl gespeicherter Ergebnisse zurück
+
+        Returns:
+            int: Anzahl der Ergebnisse
+        """
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM backtest_results").fetchone()[0]
+
+
+# Globaler Ergebnisspeicher
+_result_store: Optional[BacktestResultStore] = None
+_result_store_lock = threading.Lock()
+
+
+def get_result_store(path: Optional[str] = None) -> BacktestResultStore:
+    """
+    Gibt den globalen Ergebnisspeicher zurück und erstellt ihn bei Bedarf
+
+    Args:
+        path: Pfad der SQLite-Datei (nur beim ersten Aufruf wirksam)
+
+    Returns:
+        BacktestResultStore: Ergebnisspeicher
+    """
+    global _result_store
+    with _result_store_lock:
+        if _result_store is None:
+            _result_store = BacktestResultStore(path)
+        return _result_store
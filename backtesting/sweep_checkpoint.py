@@ -0,0 +1,235 @@
+"""
+Checkpoints für Parameter-Sweeps
+Schreibt jede abgeschlossene Kombination eines Sweeps sofort in ein Append-only-Log (JSONL),
+sodass abgebrochene Optimierungen mit derselben Sweep-Spezifikation dort fortgesetzt werden,
+wo sie aufgehört haben
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.sweep_checkpoint")
+
+# Anzahl der letzten Einträge, aus denen der Durchsatz geschätzt wird
+THROUGHPUT_WINDOW = 50
+
+
+def _default_directory() -> Path:
+    return Path(os.path.dirname(os.path.abspath(__file__))) / 'results' / 'sweeps'
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    return repr(value)
+
+
+def make_sweep_id(spec: Dict[str, Any]) -> str:
+    """
+    Berechnet die ID eines Sweeps aus seiner Spezifikation
+
+    Args:
+        spec: Sweep-Spezifikation (Strategie, Parameterraster, Daten, Engine-Konfiguration)
+
+    Returns:
+        str: Hash der Spezifikation (Hex-String)
+    """
+    payload = json.dumps(spec, sort_keys=True, default=_encode_value)
+    return hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+
+class SweepCheckpoint:
+    """
+    Append-only-Log eines Parameter-Sweeps
+
+    Die erste Zeile enthält die Spezifikation und die Anzahl der Kombinationen, jede weitere
+    Zeile eine abgeschlossene Kombination mit Position im Raster, Parametern, Metriken und
+    Zeitstempel oder den Beginn einer fortgesetzten Sitzung. Jede Zeile wird sofort auf die
+    Platte geschrieben; eine beim Abbruch nur teilweise geschriebene letzte Zeile wird beim
+    Laden ignoriert.
+    """
+
+    def __init__(self, spec: Dict[str, Any], total: int, directory: Optional[str] = None):
+        """
+        Initialisiert den Checkpoint und lädt bereits abgeschlossene Kombinationen
+
+        Args:
+            spec: Sweep-Spezifikation (bestimmt die Log-Datei)
+            total: Anzahl der Kombinationen des Sweeps
+            directory: Verzeichnis der Logs (Standard: backtesting/results/sweeps)
+        """
+        self.spec = spec
+        self.total = total
+        self.sweep_id = make_sweep_id(spec)
+        self.directory = Path(directory) if directory is not None else _default_directory()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / f"sweep_{self.sweep_id}.jsonl"
+        self._lock = threading.Lock()
+        self._records = self._load()
+
+        # Jeder Lauf beginnt eine neue Sitzung; der Durchsatz wird nur aus der laufenden Sitzung
+        # geschätzt, damit Pausen zwischen Abbruch und Fortsetzung die Restzeit nicht verfälschen
+        self.session_started = time.time()
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            self._append({'type': 'header', 'sweep_id': self.sweep_id, 'spec': spec, 'total': total,
+                          'created_at': self.session_started})
+        else:
+            self._terminate_partial_line()
+            self._append({'type': 'session', 'started_at': self.session_started})
+        if self._records:
+            logger.info(f"Sweep {self.sweep_id}: setze nach {len(self._records)}/{total} Kombinationen fort")
+
+    def _load(self) -> Dict[int, Dict[str, Any]]:
+        return {record['index']: record for record in read_sweep_log(self.path) if record.get('type') == 'result'}
+
+    def _terminate_partial_line(self) -> None:
+        # Eine beim Abbruch nur teilweise geschriebene Zeile abschließen, damit neue Einträge
+        # nicht an sie angehängt werden
+        with open(self.path, 'rb+') as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, default=_encode_value) + "\n"
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def is_done(self, index: int) -> bool:
+        """
+        Prüft, ob eine Kombination bereits abgeschlossen ist
+
+        Args:
+            index: Position der Kombination im Raster
+
+        Returns:
+            bool: True, wenn die Kombination im Log steht
+        """
+        return index in self._records
+
+    def get_result(self, index: int) -> Optional[Dict[str, Any]]:
+        """
+        Gibt das gespeicherte Ergebnis einer Kombination zurück
+
+        Args:
+            index: Position der Kombination im Raster
+
+        Returns:
+            Optional[Dict[str, Any]]: Ergebnis mit 'params' und 'metrics' oder None
+        """
+        record = self._records.get(index)
+        return {'params': record['params'], 'metrics': record['metrics']} if record is not None else None
+
+    def record(self, index: int, params: Dict[str, Any], metrics: Dict[str, Any]) -> None:
+        """
+        Schreibt eine abgeschlossene Kombination in das Log
+
+        Args:
+            index: Position der Kombination im Raster
+            params: Parameter der Kombination
+            metrics: Metriken des Backtests
+        """
+        record = {'type': 'result', 'index': index, 'params': params, 'metrics': metrics,
+                  'completed_at': time.time()}
+        self._append(record)
+        self._records[index] = record
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Gibt den Fortschritt des Sweeps zurück
+
+        Returns:
+            Dict[str, Any]: completed, total, throughput (Kombinationen/s), eta_seconds und finished
+        """
+        return _summarize(self.sweep_id, self.total, list(self._records.values()), self.session_started)
+
+
+def read_sweep_log(path) -> List[Dict[str, Any]]:
+    """
+    Liest alle vollständigen Einträge eines Sweep-Logs
+
+    Args:
+        path: Pfad der Log-Datei
+
+    Returns:
+        List[Dict[str, Any]]: Header und Ergebnisse in Schreibreihenfolge
+    """
+    path = Path(path)
+    if not path.exists():
+        return []
+
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"Unvollständiger Eintrag in {path.name} wird ignoriert")
+    return records
+
+
+def _summarize(sweep_id: str, total: int, results: List[Dict[str, Any]], session_started: float) -> Dict[str, Any]:
+    completed = len(results)
+    times = sorted(record['completed_at'] for record in results if record['completed_at'] >= session_started)
+    times = times[-THROUGHPUT_WINDOW:]
+    throughput = (len(times) - 1) / (times[-1] - times[0]) if len(times) > 1 and times[-1] > times[0] else None
+    remaining = max(total - completed, 0)
+    if remaining == 0:
+        eta = 0.0
+    else:
+        eta = remaining / throughput if throughput else None
+    return {
+        'sweep_id': sweep_id,
+        'completed': completed,
+        'total': total,
+        'throughput': throughput,
+        'eta_seconds': eta,
+        'finished': remaining == 0,
+    }
+
+
+def get_sweep_status(path) -> Optional[Dict[str, Any]]:
+    """
+    Gibt den Fortschritt eines Sweeps anhand seines Logs zurück (z.B. aus einem anderen Prozess)
+
+    Args:
+        path: Pfad der Log-Datei
+
+    Returns:
+        Optional[Dict[str, Any]]: Status wie SweepCheckpoint.status() oder None, wenn das Log fehlt
+    """
+    records = read_sweep_log(path)
+    if not records or records[0].get('type') != 'header':
+        return None
+    results = {record['index']: record for record in records[1:] if record.get('type') == 'result'}
+    sessions = [record['started_at'] for record in records if record.get('type') == 'session']
+    session_started = sessions[-1] if sessions else records[0]['created_at']
+    return _summarize(records[0]['sweep_id'], records[0]['total'], list(results.values()), session_started)
+
+
+def list_sweeps(directory: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Gibt den Fortschritt aller Sweeps eines Verzeichnisses zurück
+
+    Args:
+        directory: Verzeichnis der Logs (Standard: backtesting/results/sweeps)
+
+    Returns:
+        List[Dict[str, Any]]: Status je Sweep, zuletzt geänderte zuerst
+    """
+    directory = Path(directory) if directory is not None else _default_directory()
+    paths = sorted(directory.glob('sweep_*.jsonl'), key=lambda p: p.stat().st_mtime, reverse=True)
+    statuses = [get_sweep_status(path) for path in paths]
+    return [status for status in statuses if status is not None]
@@ -0,0 +1,135 @@
+"""
+Benchmark für den HTTP-Client der Datenquellen
+
+Startet einen lokalen Stub-Server, der eine Twelve-Data-ähnliche Zeitreihe gzip-komprimiert
+ausliefert, und vergleicht einzelne requests.get-Aufrufe (neue Verbindung je Anfrage) mit dem
+gepoolten HttpClient (data.http_client).
+
+Beispiel:
+    python benchmark_http.py --requests 500 --threads 8 --latency 0.002
+"""
+
+import argparse
+import gzip
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+import requests
+
+from data.http_client import HttpClient
+
+
+def make_payload(points: int) -> bytes:
+    """
+    Erzeugt eine gzip-komprimierte Zeitreihe im Format von Twelve Data
+
+    Args:
+        points: Anzahl der Datenpunkte
+
+    Returns:
+        bytes: Komprimierter JSON-Body
+    """
+    values = [{'datetime': f"2024-01-01 00:{i % 60:02d}:00", 'open': '100.0', 'high': '101.0', 'low': '99.0',
+               'close': '100.5', 'volume': '1000'} for i in range(points)]
+    return gzip.compress(json.dumps({'values': values, 'status': 'ok'}).encode())
+
+
+def start_stub_server(payload: bytes, latency: float) -> ThreadingHTTPServer:
+    """
+    Startet den Stub-Server in einem Hintergrund-Thread
+
+    Args:
+        payload: Komprimierter Body jeder Antwort
+        latency: Künstliche Verzögerung je Verbindungsaufbau in Sekunden (simuliert TCP/TLS-Handshake)
+
+    Returns:
+        ThreadingHTTPServer: Laufender Server (connections zählt die geöffneten Verbindungen)
+    """
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Header und Body werden getrennt geschrieben; ohne TCP_NODELAY verzögert Nagle
+        # zusammen mit verzögerten ACKs jede Antwort auf einer offenen Verbindung
+        disable_nagle_algorithm = True
+
+        def setup(self):
+            super().setup()
+            self.server.connections += 1
+            time.sleep(latency)
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    server.connections = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(fetch: Callable[[], object], num_requests: int, threads: int) -> float:
+    """
+    Führt die Anfragen aus und misst die Gesamtdauer
+
+    Args:
+        fetch: Funktion für eine Anfrage
+        num_requests: Anzahl der Anfragen
+        threads: Anzahl paralleler Threads
+
+    Returns:
+        float: Dauer in Sekunden
+    """
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda _: fetch(), range(num_requests)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für den HTTP-Client der Datenquellen")
+    parser.add_argument("--requests", type=int, default=500, help="Anzahl der Anfragen")
+    parser.add_argument("--threads", type=int, default=8, help="Parallele Threads")
+    parser.add_argument("--points", type=int, default=500, help="Datenpunkte je Antwort")
+    parser.add_argument("--latency", type=float, default=0.002,
+                        help="Verzögerung je Verbindungsaufbau in Sekunden")
+    args = parser.parse_args()
+
+    server = start_stub_server(make_payload(args.points), args.latency)
+    url = "https://api.twelvedata.com/time_series"
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    params = {'symbol': 'NQ', 'interval': '1min'}
+
+    # Ohne Pool: neue Verbindung je Anfrage
+    server.connections = 0
+    plain_url = base_url + "/time_series"
+    plain = run(lambda: requests.get(plain_url, params=params, timeout=30).json(), args.requests, args.threads)
+    plain_connections = server.connections
+
+    # Mit Pool: Verbindungen werden wiederverwendet
+    server.connections = 0
+    client = HttpClient(pool_size=args.threads, base_url=base_url)
+    pooled = run(lambda: client.get_json(url, params=params), args.requests, args.threads)
+    pooled_connections = server.connections
+    client.close()
+    server.shutdown()
+
+    print(f"{args.requests} Anfragen, {args.threads} Threads, {args.latency * 1000:.1f} ms je Verbindungsaufbau")
+    print(f"{'Variante':<24}{'Zeit s':>10}{'Anfragen/s':>14}{'Verbindungen':>14}")
+    print(f"{'requests.get':<24}{plain:>10.3f}{args.requests / plain:>14,.0f}{plain_connections:>14}")
+    print(f"{'HttpClient (Pool)':<24}{pooled:>10.3f}{args.requests / pooled:>14,.0f}{pooled_connections:>14}")
+    print(f"Faktor: {plain / pooled:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Benchmark für die Indikatorberechnung
+
+Vergleicht die Indikator-Pipeline (data.indicator_pipeline) mit dem bisherigen
+DataProcessor.add_indicators, das jeden Indikator einzeln berechnet und die Spalten nacheinander
+in eine Kopie der Daten einfügt.
+
+Beispiel:
+    python benchmark_indicators.py --bars 200000 --symbols 20
+"""
+
+import argparse
+import time
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from data.data_processor import DataProcessor
+from data.indicator_pipeline import IndicatorPipeline
+
+
+def generate_data(num_symbols: int, bars: int, seed: int = 42) -> Dict[str, pd.DataFrame]:
+    """
+    Erzeugt OHLCV-Daten für mehrere Symbole
+
+    Args:
+        num_symbols: Anzahl der Symbole
+        bars: Anzahl der Bars je Symbol
+        seed: Startwert des Zufallsgenerators
+
+    Returns:
+        Dict[str, pd.DataFrame]: OHLCV-Daten je Symbol
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2020-01-01', periods=bars, freq='1min')
+    data = {}
+    for i in range(num_symbols):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, bars)))
+        spread = np.abs(rng.normal(0, 0.05, bars))
+        data[f"SYM{i:03d}"] = pd.DataFrame({
+            'Open': close + rng.normal(0, 0.02, bars),
+            'High': close + spread,
+            'Low': close - spread,
+            'Close': close,
+            'Volume': rng.integers(100, 10000, bars).astype(float),
+        }, index=index)
+    return data
+
+
+def legacy_add_indicators(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Bisheriger Pfad aus DataProcessor.add_indicators: jeder Indikator einzeln, Spalten nacheinander
+    """
+    df = data.copy()
+    df['SMA_20'] = DataProcessor.calculate_sma(df, window=20)
+    df['SMA_50'] = DataProcessor.calculate_sma(df, window=50)
+    df['SMA_200'] = DataProcessor.calculate_sma(df, window=200)
+    df['EMA_12'] = DataProcessor.calculate_ema(df, window=12)
+    df['EMA_26'] = DataProcessor.calculate_ema(df, window=26)
+    df['RSI_14'] = DataProcessor.calculate_rsi(df, window=14)
+    macd, signal, hist = DataProcessor.calculate_macd(df)
+    df['MACD'] = macd
+    df['MACD_Signal'] = signal
+    df['MACD_Hist'] = hist
+    middle, upper, lower = DataProcessor.calculate_bollinger_bands(df)
+    df['BB_Middle'] = middle
+    df['BB_Upper'] = upper
+    df['BB_Lower'] = lower
+    df['ATR_14'] = DataProcessor.calculate_atr(df, window=14)
+    return df
+
+
+def time_call(func: Callable[[], object], repeat: int) -> float:
+    """
+    Misst die beste Laufzeit aus mehreren Wiederholungen
+
+    Args:
+        func: Auszuführende Funktion
+        repeat: Anzahl der Wiederholungen
+
+    Returns:
+        float: Beste Laufzeit in Sekunden
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für die Indikatorberechnung")
+    parser.add_argument("--symbols", type=int, default=20, help="Anzahl der Symbole")
+    parser.add_argument("--bars", type=int, default=100000, help="Bars je Symbol")
+    parser.add_argument("--repeat", type=int, default=3, help="Wiederholungen je Variante")
+    args = parser.parse_args()
+
+    data = generate_data(args.symbols, args.bars)
+    full = IndicatorPipeline()
+    subset = IndicatorPipeline(['EMA_12', 'MACD', 'RSI_14'])
+
+    # Ergebnisse vorab abgleichen, damit nur gleichwertige Pfade verglichen werden
+    for df in data.values():
+        pd.testing.assert_frame_equal(full.apply(df), legacy_add_indicators(df))
+
+    variants = {
+        "add_indicators (bisher)": lambda: [legacy_add_indicators(df) for df in data.values()],
+        "Pipeline: Standardsatz": lambda: [full.apply(df) for df in data.values()],
+        "Pipeline: EMA_12, MACD, RSI_14": lambda: [subset.apply(df) for df in data.values()],
+    }
+
+    bars = args.symbols * args.bars
+    print(f"{args.symbols} Symbole, {bars} Bars")
+    print(f"{'Variante':<34}{'Zeit s':>10}{'Bars/s':>14}{'Faktor':>10}")
+    timings = {name: time_call(func, args.repeat) for name, func in variants.items()}
+    baseline = timings[next(iter(variants))]
+    for name, elapsed in timings.items():
+        print(f"{name:<34}{elapsed:>10.3f}{bars / elapsed:>14,.0f}{baseline / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
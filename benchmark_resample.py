@@ -0,0 +1,118 @@
+"""
+Benchmark für das OHLCV-Resampling
+
+Vergleicht den NumPy-Resampler (data.resampler) mit dem bisherigen pandas-Pfad
+(fünf resample()-Aufrufe je Symbol) und mit resample().agg() auf synthetischen Minutendaten.
+
+Beispiel:
+    python benchmark_resample.py --symbols 100 --days 20 --timeframe 5m
+"""
+
+import argparse
+import time
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from data.resampler import TIMEFRAME_FREQS, resample_ohlcv
+
+AGGREGATIONS = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+
+
+def generate_minute_data(num_symbols: int, days: int, seed: int = 42) -> Dict[str, pd.DataFrame]:
+    """
+    Erzeugt Minutendaten während der Handelszeiten für mehrere Symbole
+
+    Args:
+        num_symbols: Anzahl der Symbole
+        days: Anzahl der Kalendertage
+        seed: Startwert des Zufallsgenerators
+
+    Returns:
+        Dict[str, pd.DataFrame]: OHLCV-Daten je Symbol
+    """
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01 09:30', periods=days * 24 * 60, freq='1min')
+    index = index[(index.dayofweek < 5) & (index.hour >= 9) & (index.hour < 16)]
+
+    data = {}
+    for i in range(num_symbols):
+        close = 100 + np.cumsum(rng.normal(0, 0.05, len(index)))
+        spread = np.abs(rng.normal(0, 0.05, len(index)))
+        data[f"SYM{i:03d}"] = pd.DataFrame({
+            'open': close + rng.normal(0, 0.02, len(index)),
+            'high': close + spread,
+            'low': close - spread,
+            'close': close,
+            'volume': rng.integers(100, 10000, len(index)).astype(float),
+        }, index=index)
+    return data
+
+
+def legacy_resample(df: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """
+    Bisheriger pandas-Pfad aus DataUtils.resample_ohlc: ein resample() je Spalte
+    """
+    resampled = pd.DataFrame()
+    resampled['open'] = df['open'].resample(freq).first()
+    resampled['high'] = df['high'].resample(freq).max()
+    resampled['low'] = df['low'].resample(freq).min()
+    resampled['close'] = df['close'].resample(freq).last()
+    resampled['volume'] = df['volume'].resample(freq).sum()
+    return resampled.dropna()
+
+
+def time_call(func: Callable[[], object], repeat: int) -> float:
+    """
+    Misst die beste Laufzeit aus mehreren Wiederholungen
+
+    Args:
+        func: Auszuführende Funktion
+        repeat: Anzahl der Wiederholungen
+
+    Returns:
+        float: Beste Laufzeit in Sekunden
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für das OHLCV-Resampling")
+    parser.add_argument("--symbols", type=int, default=100, help="Anzahl der Symbole")
+    parser.add_argument("--days", type=int, default=20, help="Kalendertage Minutendaten je Symbol")
+    parser.add_argument("--timeframe", default="5m", choices=sorted(TIMEFRAME_FREQS), help="Ziel-Zeitrahmen")
+    parser.add_argument("--repeat", type=int, default=3, help="Wiederholungen je Variante")
+    args = parser.parse_args()
+
+    data = generate_minute_data(args.symbols, args.days)
+    freq = TIMEFRAME_FREQS[args.timeframe]
+    bars = sum(len(df) for df in data.values())
+
+    # Ergebnisse vorab abgleichen, damit nur gleichwertige Pfade verglichen werden
+    fast = resample_ohlcv(data, args.timeframe)
+    for symbol, df in data.items():
+        reference = df.resample(freq).agg(AGGREGATIONS).dropna(subset=['open'])
+        pd.testing.assert_frame_equal(fast[symbol], reference, check_freq=False, check_names=False)
+
+    variants = {
+        "pandas: 5x resample je Symbol": lambda: {s: legacy_resample(df, freq) for s, df in data.items()},
+        "pandas: resample().agg je Symbol": lambda: {s: df.resample(freq).agg(AGGREGATIONS) for s, df in data.items()},
+        "numpy: resample_ohlcv (ein Aufruf)": lambda: resample_ohlcv(data, args.timeframe),
+    }
+
+    print(f"{args.symbols} Symbole, {bars} Minuten-Bars -> {args.timeframe}")
+    print(f"{'Variante':<38}{'Zeit s':>10}{'Bars/s':>14}{'Faktor':>10}")
+    timings = {name: time_call(func, args.repeat) for name, func in variants.items()}
+    baseline = timings[next(iter(variants))]
+    for name, elapsed in timings.items():
+        print(f"{name:<38}{elapsed:>10.3f}{bars / elapsed:>14,.0f}{baseline / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,7 @@ from abc import ABC, abstractmethod
 
 # Importiere Hilfsfunktionen
 from utils.helpers import DateTimeUtils, DataUtils
+from utils.range_index import PriceRangeIndex
 
 # Logger konfigurieren
 logger = logging.getLogger("trading_dashboard.strategy")
@@ -67,6 +68,144 @@ class Strategy(ABC):
         """
         pass
     
+    def _run_backtest(self, df: pd.DataFrame, initial_capital: float = 10000.0,
+                      fill_resolver=None) -> Dict[str, Any]:
+        """
+        Gemeinsamer Backtest für signalbasierte Strategien mit prozentualem Stop-Loss und Take-Profit
+
+        Die Simulation springt von Ereignis zu Ereignis: Ohne Position zum nächsten Signal, mit
+        Position über den Bereichsindex (utils.range_index) direkt zum ersten Bar, an dem der
+        Schlusskurs Stop-Loss oder Take-Profit erreicht. Der Aufwand wächst damit mit der Anzahl
+        der Trades statt mit der Anzahl der Bars.
+
+        Args:
+            df: DataFrame mit OHLCV-Daten
+            initial_capital: Anfangskapital
+            fill_resolver: IntrabarFillResolver (optional), prüft Stop Loss und Take Profit gegen
+                Low/High und löst Bars, die beide berühren, über Intrabar-Daten auf
+
+        Returns:
+            Dict[str, Any]: Dictionary mit Backtest-Ergebnissen
+        """
+        try:
+            # Generiere Signale
+            signals_df = self.generate_signals(df)
+
+            # Extrahiere Parameter
+            sl_pct = self.get_parameter('sl_pct') / 100
+            tp_pct = self.get_parameter('tp_pct') / 100
+
+            # Initialisiere Variablen
+            n = len(signals_df)
+            close = signals_df['close'].to_numpy(dtype=float)
+            signal = signals_df['signal'].to_numpy(dtype=float)
+            entry_bars = np.flatnonzero((signal == 1) | (signal == -1))
+            range_index = PriceRangeIndex(signals_df)
+            if fill_resolver is None:
+                low_index = high_index = range_index.close
+            else:
+                low_index, high_index = range_index.low, range_index.high
+            capital = initial_capital
+            trades = []
+            equity_curve = np.full(n, float(capital))
+
+            i = 1
+            while i < n:
+                # Nächstes Signal eröffnet einen Trade, bis dahin bleibt das Kapital unverändert
+                k = np.searchsorted(entry_bars, i)
+                entry = int(entry_bars[k]) if k < len(entry_bars) else n
+                equity_curve[i:entry] = capital
+                if entry >= n:
+                    break
+
+                position = int(signal[entry])
+                entry_price = close[entry]
+                entry_date = signals_df.index[entry]
+                trade_type = 'long' if position == 1 else 'short'
+
+                # Ersten Bar suchen, an dem Stop Loss bzw. Take Profit ausgelöst wird
+                if position == 1:
+                    stop_loss = entry_price * (1 - sl_pct)
+                    take_profit = entry_price * (1 + tp_pct)
+                    stop_bar = low_index.first_below(entry + 1, stop_loss)
+                    stop_bar = stop_bar if stop_bar >= 0 else n
+                    take_bar = high_index.first_above(entry + 1, take_profit, stop_bar + 1)
+                else:
+                    stop_loss = entry_price * (1 + sl_pct)
+                    take_profit = entry_price * (1 - tp_pct)
+                    stop_bar = high_index.first_above(entry + 1, stop_loss)
+                    stop_bar = stop_bar if stop_bar >= 0 else n
+                    take_bar = low_index.first_below(entry + 1, take_profit, stop_bar + 1)
+                take_bar = take_bar if take_bar >= 0 else n
+                if fill_resolver is not None and stop_bar == take_bar < n:
+                    if fill_resolver.resolve(signals_df, stop_bar, stop_loss, take_profit, position) == 'take_profit':
+                        stop_bar = n
+                exit_bar = min(stop_bar, take_bar)
+
+                # Aktualisiere Equity-Kurve während der Haltedauer
+                ratio = close[entry:exit_bar] / entry_price
+                equity_curve[entry:exit_bar] = capital * (ratio if position == 1 else 2 - ratio)
+
+                if exit_bar >= n:
+                    # Schließe offene Position am Ende des Backtests
+                    exit_bar, exit_price, exit_reason = n - 1, close[-1], 'end_of_backtest'
+                elif stop_bar <= take_bar:
+                    exit_price, exit_reason = stop_loss, 'stop_loss'
+                else:
+                    exit_price, exit_reason = take_profit, 'take_profit'
+
+                if position == 1:
+                    profit = (exit_price / entry_price - 1) * capital
+                else:
+                    profit = (entry_price / exit_price - 1) * capital
+                capital += profit
+                trades.append({
+                    'entry_date': entry_date,
+                    'entry_price': entry_price,
+                    'exit_date': signals_df.index[exit_bar],
+                    'exit_price': exit_price,
+                    'type': trade_type,
+                    'profit': profit,
+                    'exit_reason': exit_reason
+                })
+                if exit_reason == 'end_of_backtest':
+                    break
+
+                # Am Ausstiegsbar kann direkt ein neuer Trade eröffnet werden
+                equity_curve[exit_bar] = capital
+                i = exit_bar
+
+            # Speichere Trades
+            self.trades = trades
+
+            # Berechne Performance-Metriken
+            equity_series = pd.Series(equity_curve, index=signals_df.index)
+            self.performance_metrics = self._calculate_performance_metrics(equity_series)
+
+            return {
+                'signals': signals_df,
+                'trades': trades,
+                'equity_curve': equity_series,
+                'performance_metrics': self.performance_metrics
+            }
+
+        except Exception as e:
+            logger.error(f"Fehler beim Backtest: {str(e)}")
+            return {
+                'signals': df,
+                'trades': [],
+                'equity_curve': pd.Series([initial_capital], index=[df.index[0]]),
+                'performance_metrics': {
+                    'total_return': 0.0,
+                    'annualized_return': 0.0,
+                    'volatility': 0.0,
+                    'sharpe_ratio': 0.0,
+                    'max_drawdown': 0.0,
+                    'win_rate': 0.0,
+                    'profit_factor': 0.0
+                }
+            }
+
     def set_parameter(self, name: str, value: Any) -> None:
         """
         Setzt einen Parameter der Strategie
@@ -269,183 +408,20 @@ class MovingAverageCrossoverStrategy(Strategy):
             logger.error(f"Fehler bei der Generierung von Handelssignalen: {str(e)}")
             return df
     
-    def backtest(self, df: pd.DataFrame, initial_capital: float = 10000.0) -> Dict[str, Any]:
+    def backtest(self, df: pd.DataFrame, initial_capital: float = 10000.0,
+                 fill_resolver=None) -> Dict[str, Any]:
         """
         Führt einen Backtest der Strategie durch
         
         Args:
             df: DataFrame mit OHLCV-Daten
             initial_capital: Anfangskapital
+            fill_resolver: IntrabarFillResolver für Bars, die Stop Loss und Take Profit berühren (optional)
             
         Returns:
             Dict[str, Any]: Dictionary mit Backtest-Ergebnissen
         """
-        try:
-            # Generiere Signale
-            signals_df = self.generate_signals(df)
-            
-            # Extrahiere Parameter
-            sl_pct = self.get_parameter('sl_pct') / 100
-            tp_pct = self.get_parameter('tp_pct') / 100
-            
-            # Initialisiere Variablen
-            capital = initial_capital
-            position = 0
-            entry_price = 0
-            stop_loss = 0
-            take_profit = 0
-            trades = []
-            equity_curve = [capital]
-            
-            # Durchlaufe alle Datenpunkte
-            for i in range(1, len(signals_df)):
-                current_date = signals_df.index[i]
-                current_price = signals_df['close'].iloc[i]
-                current_signal = signals_df['signal'].iloc[i]
-                
-                # Prüfe, ob ein offener Trade geschlossen werden soll
-                if position != 0:
-                    # Prüfe Stop Loss und Take Profit
-                    if position == 1:  # Long-Position
-                        if current_price <= stop_loss:  # Stop Loss ausgelöst
-                            profit = (stop_loss / entry_price - 1) * capital
-                            capital += profit
-                            trades.append({
-                                'entry_date': entry_date,
-                                'entry_price': entry_price,
-                                'exit_date': current_date,
-                                'exit_price': stop_loss,
-                                'type': 'long',
-                                'profit': profit,
-                                'exit_reason': 'stop_loss'
-                            })
-                            position = 0
-                        elif current_price >= take_profit:  # Take Profit ausgelöst
-                            profit = (take_profit / entry_price - 1) * capital
-                            capital += profit
-                            trades.append({
-                                'entry_date': entry_date,
-                                'entry_price': entry_price,
-                                'exit_date': current_date,
-                                'exit_price': take_profit,
-                                'type': 'long',
-                                'profit': profit,
-                                'exit_reason': 'take_profit'
-                            })
-                            position = 0
-                    elif position == -1:  # Short-Position
-                        if current_price >= stop_loss:  # Stop Loss ausgelöst
-                            profit = (entry_price / stop_loss - 1) * capital
-                            capital += profit
-                            trades.append({
-                                'entry_date': entry_date,
-                                'entry_price': entry_price,
-                                'exit_date': current_date,
-                                'exit_price': stop_loss,
-                                'type': 'short',
-                                'profit': profit,
-                                'exit_reason': 'stop_loss'
-                            })
-                            position = 0
-                        elif current_price <= take_profit:  # Take Profit ausgelöst
-                            profit = (entry_price / take_profit - 1) * capital
-                            capital += profit
-                            trades.append({
-                                'entry_date': entry_date,
-                                'entry_price': entry_price,
-                                'exit_date': current_date,
-                                'exit_price': take_profit,
-                                'type': 'short',
-                                'profit': profit,
-                                'exit_reason': 'take_profit'
-                            })
-                            position = 0
-                
-                # Prüfe, ob ein neuer Trade eröffnet werden soll
-                if position == 0 and current_signal != 0:
-                    if current_signal == 1:  # Kaufsignal
-                        position = 1
-                        entry_price = current_price
-                        entry_date = current_date
-                        stop_loss = entry_price * (1 - sl_pct)
-                        take_profit = entry_price * (1 + tp_pct)
-                    elif current_signal == -1:  # Verkaufssignal
-                        position = -1
-                        entry_price = current_price
-                        entry_date = current_date
-                        stop_loss = entry_price * (1 + sl_pct)
-                        take_profit = entry_price * (1 - tp_pct)
-                
-                # Aktualisiere Equity-Kurve
-                if position == 1:
-                    equity = capital * (current_price / entry_price)
-                elif position == -1:
-                    equity = capital * (2 - current_price / entry_price)
-                else:
-                    equity = capital
-                
-                equity_curve.append(equity)
-            
-            # Schließe offene Position am Ende des Backtests
-            if position != 0:
-                current_date = signals_df.index[-1]
-                current_price = signals_df['close'].iloc[-1]
-                
-                if position == 1:  # Long-Position
-                    profit = (current_price / entry_price - 1) * capital
-                    capital += profit
-                    trades.append({
-                        'entry_date': entry_date,
-                        'entry_price': entry_price,
-                        'exit_date': current_date,
-                        'exit_price': current_price,
-                        'type': 'long',
-                        'profit': profit,
-                        'exit_reason': 'end_of_backtest'
-                    })
-                elif position == -1:  # Short-Position
-                    profit = (entry_price / current_price - 1) * capital
-                    capital += profit
-                    trades.append({
-                        'entry_date': entry_date,
-                        'entry_price': entry_price,
-                        'exit_date': current_date,
-                        'exit_price': current_price,
-                        'type': 'short',
-                        'profit': profit,
-                        'exit_reason': 'end_of_backtest'
-                    })
-            
-            # Speichere Trades
-            self.trades = trades
-            
-            # Berechne Performance-Metriken
-            equity_series = pd.Series(equity_curve, index=signals_df.index[:len(equity_curve)])
-            self.performance_metrics = self._calculate_performance_metrics(equity_series)
-            
-            return {
-                'signals': signals_df,
-                'trades': trades,
-                'equity_curve': equity_series,
-                'performance_metrics': self.performance_metrics
-            }
-        
-        except Exception as e:
-            logger.error(f"Fehler beim Backtest: {str(e)}")
-            return {
-                'signals': df,
-                'trades': [],
-                'equity_curve': pd.Series([initial_capital], index=[df.index[0]]),
-                'performance_metrics': {
-                    'total_return': 0.0,
-                    'annualized_return': 0.0,
-                    'volatility': 0.0,
-                    'sharpe_ratio': 0.0,
-                    'max_drawdown': 0.0,
-                    'win_rate': 0.0,
-                    'profit_factor': 0.0
-                }
-            }
+        return self._run_backtest(df, initial_capital, fill_resolver)
 
 class RSIStrategy(Strategy):
     """
@@ -558,183 +534,20 @@ class RSIStrategy(Strategy):
             logger.error(f"Fehler bei der Generierung von Handelssignalen: {str(e)}")
             return df
     
-    def backtest(self, df: pd.DataFrame, initial_capital: float = 10000.0) -> Dict[str, Any]:
+    def backtest(self, df: pd.DataFrame, initial_capital: float = 10000.0,
+                 fill_resolver=None) -> Dict[str, Any]:
         """
         Führt einen Backtest der Strategie durch
         
         Args:
             df: DataFrame mit OHLCV-Daten
             initial_capital: Anfangskapital
+            fill_resolver: IntrabarFillResolver für Bars, die Stop Loss und Take Profit berühren (optional)
             
         Returns:
             Dict[str, Any]: Dictionary mit Backtest-Ergebnissen
         """
-        try:
-            # Generiere Signale
-            signals_df = self.generate_signals(df)
-            
-            # Extrahiere Parameter
-            sl_pct = self.get_parameter('sl_pct') / 100
-            tp_pct = self.get_parameter('tp_pct') / 100
-            
-            # Initialisiere Variablen
-            capital = initial_capital
-            position = 0
-            entry_price = 0
-            stop_loss = 0
-            take_profit = 0
-            trades = []
-            equity_curve = [capital]
-            
-            # Durchlaufe alle Datenpunkte
-            for i in range(1, len(signals_df)):
-                current_date = signals_df.index[i]
-                current_price = signals_df['close'].iloc[i]
-                current_signal = signals_df['signal'].iloc[i]
-                
-                # Prüfe, ob ein offener Trade geschlossen werden soll
-                if position != 0:
-                    # Prüfe Stop Loss und Take Profit
-                    if position == 1:  # Long-Position
-                        if current_price <= stop_loss:  # Stop Loss ausgelöst
-                            profit = (stop_loss / entry_price - 1) * capital
-                            capital += profit
-                            trades.append({
-                                'entry_date': entry_date,
-                                'entry_price': entry_price,
-                                'exit_date': current_date,
-                                'exit_price': stop_loss,
-                                'type': 'long',
-                                'profit': profit,
-                                'exit_reason': 'stop_loss'
-                            })
-                            position = 0
-                        elif current_price >= take_profit:  # Take Profit ausgelöst
-                            profit = (take_profit / entry_price - 1) * capital
-                            capital += profit
-                            trades.append({
-                                'entry_date': entry_date,
-                                'entry_price': entry_price,
-                                'exit_date': current_date,
-                                'exit_price': take_profit,
-                                'type': 'long',
-                                'profit': profit,
-                                'exit_reason': 'take_profit'
-                            })
-                            position = 0
-                    elif position == -1:  # Short-Position
-                        if current_price >= stop_loss:  # Stop Loss ausgelöst
-                            profit = (entry_price / stop_loss - 1) * capital
-                            capital += profit
-                            trades.append({
-                                'entry_date': entry_date,
-                                'entry_price': entry_price,
-                                'exit_date': current_date,
-                                'exit_price': stop_loss,
-                                'type': 'short',
-                                'profit': profit,
-                                'exit_reason': 'stop_loss'
-                            })
-                            position = 0
-                        elif current_price <= take_profit:  # Take Profit ausgelöst
-                            profit = (entry_price / take_profit - 1) * capital
-                            capital += profit
-                            trades.append({
-                                'entry_date': entry_date,
-                                'entry_price': entry_price,
-                                'exit_date': current_date,
-                                'exit_price': take_profit,
-                                'type': 'short',
-                                'profit': profit,
-                                'exit_reason': 'take_profit'
-                            })
-                            position = 0
-                
-                # Prüfe, ob ein neuer Trade eröffnet werden soll
-                if position == 0 and current_signal != 0:
-                    if current_signal == 1:  # Kaufsignal
-                        position = 1
-                        entry_price = current_price
-                        entry_date = current_date
-                        stop_loss = entry_price * (1 - sl_pct)
-                        take_profit = entry_price * (1 + tp_pct)
-                    elif current_signal == -1:  # Verkaufssignal
-                        position = -1
-                        entry_price = current_price
-                        entry_date = current_date
-                        stop_loss = entry_price * (1 + sl_pct)
-                        take_profit = entry_price * (1 - tp_pct)
-                
-                # Aktualisiere Equity-Kurve
-                if position == 1:
-                    equity = capital * (current_price / entry_price)
-                elif position == -1:
-                    equity = capital * (2 - current_price / entry_price)
-                else:
-                    equity = capital
-                
-                equity_curve.append(equity)
-            
-            # Schließe offene Position am Ende des Backtests
-            if position != 0:
-                current_date = signals_df.index[-1]
-                current_price = signals_df['close'].iloc[-1]
-                
-                if position == 1:  # Long-Position
-                    profit = (current_price / entry_price - 1) * capital
-                    capital += profit
-                    trades.append({
-                        'entry_date': entry_date,
-                        'entry_price': entry_price,
-                        'exit_date': current_date,
-                        'exit_price': current_price,
-                        'type': 'long',
-                        'profit': profit,
-                        'exit_reason': 'end_of_backtest'
-                    })
-                elif position == -1:  # Short-Position
-                    profit = (entry_price / current_price - 1) * capital
-                    capital += profit
-                    trades.append({
-                        'entry_date': entry_date,
-                        'entry_price': entry_price,
-                        'exit_date': current_date,
-                        'exit_price': current_price,
-                        'type': 'short',
-                        'profit': profit,
-                        'exit_reason': 'end_of_backtest'
-                    })
-            
-            # Speichere Trades
-            self.trades = trades
-            
-            # Berechne Performance-Metriken
-            equity_series = pd.Series(equity_curve, index=signals_df.index[:len(equity_curve)])
-            self.performance_metrics = self._calculate_performance_metrics(equity_series)
-            
-            return {
-                'signals': signals_df,
-                'trades': trades,
-                'equity_curve': equity_series,
-                'performance_metrics': self.performance_metrics
-            }
-        
-        except Exception as e:
-            logger.error(f"Fehler beim Backtest: {str(e)}")
-            return {
-                'signals': df,
-                'trades': [],
-                'equity_curve': pd.Series([initial_capital], index=[df.index[0]]),
-                'performance_metrics': {
-                    'total_return': 0.0,
-                    'annualized_return': 0.0,
-                    'volatility': 0.0,
-                    'sharpe_ratio': 0.0,
-                    'max_drawdown': 0.0,
-                    'win_rate': 0.0,
-                    'profit_factor': 0.0
-                }
-            }
+        return self._run_backtest(df, initial_capital, fill_resolver)
 
 class StrategyFactory:
     """
@@ -3,7 +3,7 @@ Trading Dashboard App mit verbesserten Funktionen
 """
 
 import dash
-from dash import html, dcc, callback, Input, Output, State
+from dash import html, dcc, callback, Input, Output, State, ClientsideFunction
 import dash_bootstrap_components as dbc
 from dash_iconify import DashIconify
 import plotly.graph_objects as go
@@ -25,6 +25,9 @@ from dashboard.chart_utils import (
 # Importiere Fehlerbehandlung
 from dashboard.error_handler import ErrorHandler
 
+# Importiere Health-Endpunkte für den Produktionsserver
+from dashboard.server import register_health_routes
+
 # Logger konfigurieren
 logging.basicConfig(
     level=logging.INFO,
@@ -62,6 +65,9 @@ app = dash.Dash(
 
 app.title = "Trading Dashboard"
 
+# Flask-Server für WSGI-Server (gunicorn/waitress), siehe wsgi.py
+server = app.server
+
 # Definiere Header
 header = dbc.Navbar(
     dbc.Container(
@@ -115,12 +121,16 @@ def create_asset_buttons():
     }
     
     asset_buttons = []
+    assigned = set()  # Jedes Asset nur in der ersten passenden Gruppe (IDs müssen eindeutig sein)
     
     for group_name, assets in asset_groups.items():
         asset_buttons.append(html.H6(group_name, className="mt-2 mb-1"))
         group_buttons = []
         
         for asset in assets:
+            if asset["value"] in assigned:
+                continue
+            assigned.add(asset["value"])
             group_buttons.append(
                 dbc.Button(
                     asset["label"],
@@ -380,6 +390,14 @@ chart_card = dbc.Card(
                         className="me-2",
                     ),
                 ], width="auto"),
+                dbc.Col([
+                    dbc.Switch(
+                        id="live-mode-switch",
+                        label="Live",
+                        value=False,
+                        className="mt-1",
+                    ),
+                ], width="auto"),
                 dbc.Col([
                     dbc.ButtonGroup(
                         [
@@ -466,6 +484,9 @@ app.layout = dbc.Container(
         dcc.Store(id="active-timeframe-store", data="1d"),  # Standardmäßig 1 Tag
         dcc.Store(id="active-asset-store", data="AAPL"),  # Standardmäßig Apple
         dcc.Store(id="asset-options", data=get_available_assets()),
+        dcc.Store(id="live-chart-store"),  # Revision und Typ des aktuell gezeichneten Charts
+        dcc.Store(id="live-cursor-store"),  # Letzte an den Chart gesendete Live-Kerze
+        dcc.Interval(id="live-update-interval", interval=5000, disabled=True),
         
         # Header
         header,
@@ -512,7 +533,9 @@ app.layout = dbc.Container(
 )
 
 # Callback für Asset-Buttons mit visueller Rückmeldung
-@app.callback(
+# Reiner UI-Zustand: läuft clientseitig (assets/js/ui_callbacks.js) ohne Request an den Server
+app.clientside_callback(
+    ClientsideFunction(namespace="ui", function_name="updateAssetSelection"),
     [Output({"type": "asset-button", "index": dash.dependencies.ALL}, "color"),
      Output({"type": "asset-button", "index": dash.dependencies.ALL}, "outline"),
      Output("symbol-input", "value"),
@@ -523,58 +546,10 @@ app.layout = dbc.Container(
      State("symbol-input", "value"),
      State("active-asset-store", "data")]
 )
-def update_asset_selection(n_clicks, ids, current_value, current_active_asset):
-    ctx = dash.callback_context
-    if not ctx.triggered:
-        # Initialer Zustand: AAPL ist standardmäßig ausgewählt
-        colors = ["primary" if id["index"] == "AAPL" else "secondary" for id in ids]
-        outlines = [False if id["index"] == "AAPL" else True for id in ids]
-        return colors, outlines, current_value, current_value, "yahoo"  # Yahoo als Standard-Datenquelle
-    
-    button_id = ctx.triggered[0]["prop_id"].split(".")[0]
-    if button_id == "":
-        colors = ["primary" if id["index"] == current_active_asset else "secondary" for id in ids]
-        outlines = [False if id["index"] == current_active_asset else True for id in ids]
-        return colors, outlines, current_value, current_active_asset, get_datasource_for_asset(current_active_asset)
-    
-    # Extrahiere den Asset-Wert aus der Button-ID
-    try:
-        button_data = json.loads(button_id)
-        if button_data["type"] == "asset-button":
-            selected_asset = button_data["index"]
-            
-            # Setze alle Buttons auf den Standardzustand und den ausgewählten auf aktiv
-            colors = ["primary" if id["index"] == selected_asset else "secondary" for id in ids]
-            outlines = [False if id["index"] == selected_asset else True for id in ids]
-            
-            # Bestimme die passende Datenquelle für das Asset
-            datasource = get_datasource_for_asset(selected_asset)
-            
-            return colors, outlines, selected_asset, selected_asset, datasource
-    except:
-        pass
-    
-    # Fallback: Behalte den aktuellen Zustand bei
-    colors = ["primary" if id["index"] == current_active_asset else "secondary" for id in ids]
-    outlines = [False if id["index"] == current_active_asset else True for id in ids]
-    return colors, outlines, current_value, current_active_asset, get_datasource_for_asset(current_active_asset)
 
-# Hilfsfunktion zur Bestimmung der passenden Datenquelle für ein Asset
-def get_datasource_for_asset(asset):
-    """
-    Bestimmt die passende Datenquelle basierend auf dem Asset-Typ.
-    """
-    if "BTC" in asset or "ETH" in asset:
-        return "yahoo"  # Yahoo Finance für Kryptowährungen
-    elif "USD" in asset or "JPY" in asset or "EUR" in asset or "GBP" in asset:
-        return "yahoo"  # Yahoo Finance für Forex
-    elif "NQ" in asset:
-        return "nq"     # NQ-Datenquelle für NQ Futures
-    else:
-        return "yahoo"  # Yahoo Finance für Aktien (Standard)
-
-# Callback für Zeitrahmen-Buttons mit visueller Rückmeldung
-@app.callback(
+# Callback für Zeitrahmen-Buttons mit visueller Rückmeldung (clientseitig)
+app.clientside_callback(
+    ClientsideFunction(namespace="ui", function_name="updateTimeframeSelection"),
     [Output("timeframe-1m", "color"),
      Output("timeframe-1m", "outline"),
      Output("timeframe-2m", "color"),
@@ -614,59 +589,12 @@ def get_datasource_for_asset(asset):
      Input("timeframe-all", "n_clicks")],
     [State("active-timeframe-store", "data")]
 )
-def update_timeframe_selection(clicks_1m, clicks_2m, clicks_3m, clicks_5m, clicks_15m, clicks_30m, 
-                              clicks_1h, clicks_4h, clicks_1d, clicks_1w, clicks_1mo, clicks_all, 
-                              current_timeframe):
-    ctx = dash.callback_context
-    if not ctx.triggered:
-        # Initialer Zustand: 1d ist standardmäßig ausgewählt
-        return set_timeframe_button_states("1d")
-    
-    button_id = ctx.triggered[0]["prop_id"].split(".")[0]
-    
-    # Bestimme den ausgewählten Zeitrahmen basierend auf der Button-ID
-    timeframe_mapping = {
-        "timeframe-1m": "1m",
-        "timeframe-2m": "2m",
-        "timeframe-3m": "3m",
-        "timeframe-5m": "5m",
-        "timeframe-15m": "15m",
-        "timeframe-30m": "30m",
-        "timeframe-1h": "1h",
-        "timeframe-4h": "4h",
-        "timeframe-1d": "1d",
-        "timeframe-1w": "1w",
-        "timeframe-1mo": "1mo",
-        "timeframe-all": "max"
-    }
-    
-    selected_timeframe = timeframe_mapping.get(button_id, current_timeframe)
-    return set_timeframe_button_states(selected_timeframe)
 
-# Hilfsfunktion zum Setzen der Zustände der Zeitrahmen-Buttons
-def set_timeframe_button_states(selected_timeframe):
-    """
-    Setzt die Farben und Outline-Zustände der Zeitrahmen-Buttons basierend auf dem ausgewählten Zeitrahmen.
-    """
-    timeframes = ["1m", "2m", "3m", "5m", "15m", "30m", "1h", "4h", "1d", "1w", "1mo", "max"]
-    colors = []
-    outlines = []
-    
-    for tf in timeframes:
-        if tf == selected_timeframe:
-            colors.append("primary")
-            outlines.append(False)
-        else:
-            colors.append("primary")
-            outlines.append(True)
-    
-    # Füge den ausgewählten Zeitrahmen als letzten Rückgabewert hinzu
-    return colors[0], outlines[0], colors[1], outlines[1], colors[2], outlines[2], colors[3], outlines[3], \
-           colors[4], outlines[4], colors[5], outlines[5], colors[6], outlines[6], colors[7], outlines[7], \
-           colors[8], outlines[8], colors[9], outlines[9], colors[10], outlines[10], colors[11], outlines[11], \
-           selected_timeframe
+# Registriere die Chart-Callbacks (Chart-Aufbau, Zeichenwerkzeuge, Live-Modus)
+import dashboard.chart_callbacks  # noqa: E402,F401
 
-# Hier würden die Callbacks folgen...
+# Health- und Readiness-Endpunkte (/health, /ready)
+register_health_routes(app)
 
 if __name__ == "__main__":
     app.run(debug=True, host="0.0.0.0", port=8050)
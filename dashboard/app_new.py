@@ -32,6 +32,16 @@ from dashboard.components import (
     colors
 )
 
+# Importiere die Job-Queue für Hintergrund-Backtests
+from backtesting.job_queue import get_job_queue, run_backtest_job
+from backtesting.job_store import (
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_FINISHED,
+    JOB_FAILED,
+    JOB_CANCELLED,
+)
+
 # Lade das dunkle Template für Plotly
 load_figure_template("darkly")
 
@@ -139,6 +149,10 @@ app.layout = html.Div(
         dcc.Store(id="backtest-results-store"),
         dcc.Store(id="active-timeframe-store", data="1d"),  # Standardmäßig 1 Tag
         dcc.Store(id="active-tab-store", data="strategien"),  # Speichert den aktiven Tab
+        dcc.Store(id="strategy-job-store", storage_type="session"),  # Job-ID des Strategie-Backtests
+        dcc.Store(id="backtest-job-store", storage_type="session"),  # Job-ID des Backtesting-Tabs
+        dcc.Interval(id="strategy-job-interval", interval=1000, disabled=True),
+        dcc.Interval(id="backtest-job-interval", interval=1000, disabled=True),
 
         # URL-Routing
         dcc.Location(id="url", refresh=False),
@@ -588,98 +602,64 @@ def update_strategy_params(strategy):
     else:
         return html.Div("Keine Parameter verfügbar")
 
-# Callback für Trades-Tabelle
-@callback(
-    Output("trades-table-container", "children"),
-    Input("run-strategy-button", "n_clicks"),
-)
-def update_trades_table(n_clicks):
+# Zuordnung der Eingabefelder aus update_strategy_params zu den Strategieparametern
+STRATEGY_PARAM_INPUTS = {
+    "ma1-input": "short_window",
+    "ma2-input": "long_window",
+    "rsi-period-input": "rsi_window",
+    "rsi-overbought-input": "overbought",
+    "rsi-oversold-input": "oversold",
+    "macd-fast-input": "fast",
+    "macd-slow-input": "slow",
+    "macd-signal-input": "signal",
+    "bollinger-period-input": "window",
+    "bollinger-std-input": "num_std",
+}
+
+
+def collect_strategy_params(children):
     """
-    Aktualisiert die Trades-Tabelle nach dem Ausführen einer Strategie.
+    Liest die aktuellen Werte der Parameterfelder aus dem serialisierten Komponentenbaum.
     """
-    if n_clicks is None:
-        # Zeige eine leere Tabelle, wenn noch keine Strategie ausgeführt wurde
-        return dash_table.DataTable(
-            id="trades-table",
-            columns=[
-                {"name": "Datum", "id": "date"},
-                {"name": "Typ", "id": "type"},
-                {"name": "Preis", "id": "price"},
-                {"name": "Menge", "id": "quantity"},
-                {"name": "Gewinn/Verlust", "id": "pnl"},
-            ],
-            data=[],
-            style_header={
-                "backgroundColor": colors['card'],
-                "color": colors['text'],
-                "fontWeight": "bold",
-                "border": f"1px solid {colors['grid']}",
-            },
-            style_cell={
-                "backgroundColor": colors['background'],
-                "color": colors['text'],
-                "border": f"1px solid {colors['grid']}",
-                "padding": "10px",
-                "textAlign": "left",
-            },
-            style_data_conditional=[
-                {
-                    "if": {"filter_query": "{type} = 'Kauf'"},
-                    "backgroundColor": "rgba(16, 185, 129, 0.1)",
-                },
-                {
-                    "if": {"filter_query": "{type} = 'Verkauf'"},
-                    "backgroundColor": "rgba(239, 68, 68, 0.1)",
-                },
-                {
-                    "if": {"filter_query": "{pnl} contains '+'"},
-                    "color": colors['success'],
-                },
-                {
-                    "if": {"filter_query": "{pnl} contains '-'"},
-                    "color": colors['danger'],
-                },
-            ],
-            page_size=5,
-        )
-    
-    # Generiere Beispiel-Trades
-    np.random.seed(42)  # Für reproduzierbare Ergebnisse
-    
-    trades = []
-    current_date = datetime.now() - timedelta(days=180)
-    
-    for i in range(25):
-        # Zufälliges Datum innerhalb der letzten 180 Tage
-        trade_date = current_date + timedelta(days=np.random.randint(1, 7))
-        current_date = trade_date
-        
-        # Zufälliger Trade-Typ
-        trade_type = "Kauf" if i % 2 == 0 else "Verkauf"
-        
-        # Zufälliger Preis
-        price = np.random.uniform(150, 200)
-        
-        # Zufällige Menge
-        quantity = np.random.randint(1, 10) * 10
-        
-        # Zufälliger Gewinn/Verlust (nur für Verkäufe)
-        pnl = ""
-        if trade_type == "Verkauf":
-            pnl_value = np.random.normal(100, 300)
-            pnl = f"+{pnl_value:.2f} €" if pnl_value >= 0 else f"{pnl_value:.2f} €"
-        
-        trades.append({
-            "date": trade_date.strftime("%d.%m.%Y %H:%M"),
-            "type": trade_type,
-            "price": f"{price:.2f} €",
-            "quantity": quantity,
-            "pnl": pnl,
+    params = {}
+    if isinstance(children, list):
+        for child in children:
+            params.update(collect_strategy_params(child))
+    elif isinstance(children, dict):
+        props = children.get("props", {})
+        component_id = props.get("id")
+        if component_id in STRATEGY_PARAM_INPUTS and props.get("value") is not None:
+            params[STRATEGY_PARAM_INPUTS[component_id]] = props["value"]
+        params.update(collect_strategy_params(props.get("children")))
+    return params
+
+
+def create_trades_table(trades):
+    """
+    Erstellt die Trades-Tabelle aus den Trades eines Backtest-Jobs.
+    """
+    rows = []
+    for trade in trades:
+        rows.append({
+            "date": pd.Timestamp(trade["entry_date"]).strftime("%d.%m.%Y %H:%M"),
+            "type": "Kauf",
+            "price": f"{trade['entry_price']:.2f} €",
+            "quantity": round(trade["shares"], 2),
+            "pnl": "",
         })
-    
+        if trade["exit_date"]:
+            pnl_value = trade["profit"]
+            rows.append({
+                "date": pd.Timestamp(trade["exit_date"]).strftime("%d.%m.%Y %H:%M"),
+                "type": "Verkauf",
+                "price": f"{trade['exit_price']:.2f} €",
+                "quantity": round(trade["shares"], 2),
+                "pnl": f"+{pnl_value:.2f} €" if pnl_value >= 0 else f"{pnl_value:.2f} €",
+            })
+
     # Sortiere Trades nach Datum (neueste zuerst)
-    trades.sort(key=lambda x: datetime.strptime(x["date"], "%d.%m.%Y %H:%M"), reverse=True)
-    
+    rows.sort(key=lambda x: datetime.strptime(x["date"], "%d.%m.%Y %H:%M"), reverse=True)
+
     return dash_table.DataTable(
         id="trades-table",
         columns=[
@@ -689,7 +669,7 @@ def update_trades_table(n_clicks):
             {"name": "Menge", "id": "quantity"},
             {"name": "Gewinn/Verlust", "id": "pnl"},
         ],
-        data=trades,
+        data=rows,
         style_header={
             "backgroundColor": colors['card'],
             "color": colors['text'],
@@ -724,6 +704,176 @@ def update_trades_table(n_clicks):
         page_size=5,
     )
 
+
+def format_job_status(status):
+    """
+    Erstellt einen lesbaren Statustext für einen Hintergrund-Job.
+    """
+    labels = {
+        JOB_QUEUED: "In Warteschlange",
+        JOB_RUNNING: "Läuft",
+        JOB_FINISHED: "Abgeschlossen",
+        JOB_FAILED: "Fehlgeschlagen",
+        JOB_CANCELLED: "Abgebrochen",
+    }
+    text = f"{labels.get(status['status'], status['status'])} ({status['progress']:.0%})"
+    if status['error']:
+        text += f": {status['error']}"
+    return text
+
+
+# Callback zum Starten eines Strategie-Jobs
+@callback(
+    Output("strategy-job-store", "data"),
+    Output("strategy-job-interval", "disabled", allow_duplicate=True),
+    Input("run-strategy-button", "n_clicks"),
+    State("strategy-select", "value"),
+    State("asset-select", "value"),
+    State("active-timeframe-store", "data"),
+    State("strategy-params", "children"),
+    prevent_initial_call=True,
+)
+def start_strategy_job(n_clicks, strategy, symbol, timeframe, params_children):
+    """
+    Reiht den Backtest der gewählten Strategie in die Job-Queue ein, statt ihn im Request auszuführen.
+    """
+    if not n_clicks:
+        raise PreventUpdate
+
+    job_id = get_job_queue().submit(
+        run_backtest_job,
+        strategy or "ma_crossover",
+        symbol or "AAPL",
+        timeframe=timeframe or "1d",
+        params=collect_strategy_params(params_children),
+        use_result_store=True,
+    )
+    return {"job_id": job_id}, False
+
+
+# Callback für Trades-Tabelle
+@callback(
+    Output("trades-table-container", "children"),
+    Output("strategy-job-interval", "disabled"),
+    Input("strategy-job-interval", "n_intervals"),
+    State("strategy-job-store", "data"),
+)
+def update_trades_table(n_intervals, job):
+    """
+    Aktualisiert die Trades-Tabelle anhand des Status des Strategie-Jobs.
+    """
+    status = get_job_queue().get_status(job["job_id"]) if job else None
+    if status is None:
+        # Zeige eine leere Tabelle, wenn noch keine Strategie ausgeführt wurde
+        return create_trades_table([]), True
+
+    if status["status"] in (JOB_QUEUED, JOB_RUNNING):
+        progress = dbc.Progress(value=status["progress"] * 100, striped=True, animated=True, className="mb-2")
+        return html.Div([progress, html.Div(format_job_status(status), className="small text-muted")]), False
+
+    if status["status"] == JOB_FINISHED:
+        result = get_job_queue().get_result(job["job_id"])
+        return create_trades_table(result["trades"]), True
+
+    return dbc.Alert(format_job_status(status), color="danger" if status["error"] else "secondary"), True
+
+
+# Callback zum Starten eines Backtest-Jobs
+@callback(
+    Output("backtest-job-store", "data"),
+    Output("backtest-job-interval", "disabled", allow_duplicate=True),
+    Input("run-backtest-button", "n_clicks"),
+    State("backtest-strategy-select", "value"),
+    State("backtest-asset-select", "value"),
+    State("backtest-start-date", "value"),
+    State("backtest-end-date", "value"),
+    prevent_initial_call=True,
+)
+def start_backtest_job(n_clicks, strategy, symbol, start_date, end_date):
+    """
+    Reiht einen Backtest aus dem Backtesting-Tab in die Job-Queue ein.
+    """
+    if not n_clicks:
+        raise PreventUpdate
+
+    job_id = get_job_queue().submit(
+        run_backtest_job,
+        strategy or "ma_crossover",
+        symbol or "AAPL",
+        start_date=start_date,
+        end_date=end_date,
+        use_result_store=True,
+    )
+    return {"job_id": job_id}, False
+
+
+# Callback für den Fortschritt und die Ergebnisse des Backtest-Jobs
+@callback(
+    Output("backtest-progress", "value"),
+    Output("backtest-job-status", "children"),
+    Output("backtest-performance-chart", "figure"),
+    Output("backtest-metrics-table", "data"),
+    Output("backtest-cancel-button", "disabled"),
+    Output("backtest-job-interval", "disabled"),
+    Input("backtest-job-interval", "n_intervals"),
+    State("backtest-job-store", "data"),
+    prevent_initial_call=True,
+)
+def update_backtest_results(n_intervals, job):
+    """
+    Fragt den Status des Backtest-Jobs ab und zeigt nach Abschluss Equity-Kurve und Metriken an.
+    """
+    status = get_job_queue().get_status(job["job_id"]) if job else None
+    if status is None:
+        return 0, "", dash.no_update, dash.no_update, True, True
+
+    if status["status"] in (JOB_QUEUED, JOB_RUNNING):
+        return status["progress"] * 100, format_job_status(status), dash.no_update, dash.no_update, False, False
+
+    if status["status"] != JOB_FINISHED:
+        return status["progress"] * 100, format_job_status(status), dash.no_update, dash.no_update, True, True
+
+    result = get_job_queue().get_result(job["job_id"])
+    fig = go.Figure(go.Scatter(
+        x=result["equity_curve"]["dates"],
+        y=result["equity_curve"]["values"],
+        mode="lines",
+        name="Equity",
+        line=dict(color=colors['primary']),
+    ))
+    fig.update_layout(**chart_style['layout'])
+
+    metrics = result["metrics"]
+    metrics_data = [
+        {"metric": "Gesamtrendite", "value": f"{metrics['total_return']:.1%}"},
+        {"metric": "Jährliche Rendite", "value": f"{metrics['annual_return']:.1%}"},
+        {"metric": "Sharpe Ratio", "value": f"{metrics['sharpe_ratio']:.2f}"},
+        {"metric": "Max. Drawdown", "value": f"{metrics['max_drawdown']:.1%}"},
+        {"metric": "Gewinnrate", "value": f"{metrics['win_rate']:.0%}"},
+        {"metric": "Profit Factor", "value": f"{metrics['profit_factor']:.2f}"},
+    ]
+    return 100, format_job_status(status), fig, metrics_data, True, True
+
+
+# Callback zum Abbrechen des Backtest-Jobs
+@callback(
+    Output("backtest-job-status", "children", allow_duplicate=True),
+    Input("backtest-cancel-button", "n_clicks"),
+    State("backtest-job-store", "data"),
+    prevent_initial_call=True,
+)
+def cancel_backtest_job(n_clicks, job):
+    """
+    Fordert den Abbruch des laufenden Backtest-Jobs an.
+    """
+    if not n_clicks or not job:
+        raise PreventUpdate
+
+    if get_job_queue().cancel(job["job_id"]):
+        return "Abbruch angefordert..."
+    return dash.no_update
+
+
 # Wenn dieses Skript direkt ausgeführt wird
 if __name__ == "__main__":
     app.run_server(debug=True, host="0.0.0.0", port=8050)
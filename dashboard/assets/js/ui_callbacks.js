@@ -0,0 +1,131 @@
+/* Clientseitige Callbacks für den reinen Button-Zustand des Trading Dashboards
+ *
+ * Diese Callbacks ändern nur Farben und Outline-Zustände und laufen daher im Browser,
+ * statt für jeden Klick einen Request an den Server zu schicken.
+ */
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+  ui: {
+    /* Zeitrahmen-Buttons: 12 Inputs (n_clicks), State active-timeframe-store
+     * Rückgabe: color/outline für jeden Button und der ausgewählte Zeitrahmen */
+    updateTimeframeSelection: function () {
+      const timeframes = ["1m", "2m", "3m", "5m", "15m", "30m", "1h", "4h", "1d", "1w", "1mo", "max"];
+      const buttonIds = timeframes.map(function (tf) {
+        return tf === "max" ? "timeframe-all" : "timeframe-" + tf;
+      });
+      const currentTimeframe = arguments[arguments.length - 1];
+      const triggered = window.dash_clientside.callback_context.triggered;
+
+      let selected = "1d";  // Initialer Zustand: 1d ist standardmäßig ausgewählt
+      if (triggered.length && triggered[0].prop_id !== ".") {
+        const index = buttonIds.indexOf(triggered[0].prop_id.split(".")[0]);
+        selected = index >= 0 ? timeframes[index] : currentTimeframe;
+      }
+
+      const result = [];
+      timeframes.forEach(function (tf) {
+        result.push("primary", tf !== selected);
+      });
+      result.push(selected);
+      return result;
+    },
+
+    /* Chart-Typ-Buttons: der zuletzt geklickte Typ ist aktiv, Standard ist Candlestick */
+    updateChartTypeButtons: function () {
+      const buttonIds = ["line-chart-button", "candlestick-chart-button", "ohlc-chart-button"];
+      const triggered = window.dash_clientside.callback_context.triggered;
+
+      let active = "candlestick-chart-button";
+      if (triggered.length && triggered[0].prop_id !== ".") {
+        active = triggered[0].prop_id.split(".")[0];
+      }
+
+      const result = [];
+      buttonIds.forEach(function (id) {
+        result.push("primary", id !== active);
+      });
+      return result;
+    },
+
+    /* Zeichenwerkzeug-Buttons: ein erneuter Klick auf das aktive Werkzeug deaktiviert es */
+    updateDrawingToolButtons: function (trendline, horizontal, rectangle, fibonacci, deleteClicks, activeTool) {
+      const tools = ["trendline", "horizontal", "rectangle", "fibonacci"];
+      const triggered = window.dash_clientside.callback_context.triggered;
+      const buttonId = triggered.length ? triggered[0].prop_id.split(".")[0] : "";
+
+      let newActiveTool = null;
+      if (buttonId === "delete-drawing-button") {
+        newActiveTool = "delete";
+      } else {
+        const tool = buttonId.replace("-button", "");
+        if (tools.indexOf(tool) >= 0 && activeTool !== tool) {
+          newActiveTool = tool;
+        }
+      }
+
+      const result = [];
+      tools.forEach(function (tool) {
+        const isActive = tool === newActiveTool;
+        result.push(isActive ? "primary" : "secondary", !isActive);
+      });
+      const deleteActive = newActiveTool === "delete";
+      result.push(deleteActive ? "danger" : "secondary", !deleteActive);
+      result.push(newActiveTool);
+      return result;
+    },
+
+    /* Asset-Buttons: markiert das gewählte Asset, setzt das Symbol und wählt die Datenquelle */
+    updateAssetSelection: function (nClicks, ids, currentValue, currentActiveAsset) {
+      const ctx = window.dash_clientside.callback_context;
+      const triggered = ctx.triggered;
+
+      let selected = currentActiveAsset;
+      let symbol = currentValue;
+      if (!triggered.length || triggered[0].prop_id === ".") {
+        // Initialer Zustand: AAPL ist standardmäßig ausgewählt
+        const highlighted = "AAPL";
+        return [
+          ids.map(function (id) { return id.index === highlighted ? "primary" : "secondary"; }),
+          ids.map(function (id) { return id.index !== highlighted; }),
+          currentValue,
+          currentValue,
+          "yahoo"
+        ];
+      }
+
+      // Nur echte Klicks übernehmen (beim Neuaufbau der Buttons ist n_clicks leer)
+      if (triggered[0].value) {
+        try {
+          const buttonId = JSON.parse(triggered[0].prop_id.split(".n_clicks")[0]);
+          if (buttonId.type === "asset-button") {
+            selected = buttonId.index;
+            symbol = buttonId.index;
+          }
+        } catch (e) {
+          // Fallback: Behalte den aktuellen Zustand bei
+        }
+      }
+
+      return [
+        ids.map(function (id) { return id.index === selected ? "primary" : "secondary"; }),
+        ids.map(function (id) { return id.index !== selected; }),
+        symbol,
+        selected,
+        window.dash_clientside.ui.getDatasourceForAsset(selected || "")
+      ];
+    },
+
+    /* Bestimmt die passende Datenquelle für ein Asset */
+    getDatasourceForAsset: function (asset) {
+      const contains = function (part) { return asset.indexOf(part) >= 0; };
+      if (contains("BTC") || contains("ETH")) {
+        return "yahoo";  // Yahoo Finance für Kryptowährungen
+      } else if (contains("USD") || contains("JPY") || contains("EUR") || contains("GBP")) {
+        return "yahoo";  // Yahoo Finance für Forex
+      } else if (contains("NQ")) {
+        return "nq";     // NQ-Datenquelle für NQ Futures
+      }
+      return "yahoo";    // Yahoo Finance für Aktien (Standard)
+    }
+  }
+});
@@ -2,12 +2,13 @@
 Verbesserte Chart-Callbacks mit Fehlerbehandlung
 """
 
+import uuid
 import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import dash
-from dash import html, dcc, callback, Input, Output, State
+from dash import html, dcc, callback, clientside_callback, ClientsideFunction, Input, Output, State, Patch
 from dash.exceptions import PreventUpdate
 import logging
 
@@ -16,17 +17,115 @@ from dashboard.error_handler import ErrorHandler
 
 # Importiere Chart-Utilities
 from dashboard.chart_utils import (
+    colors,
     generate_mock_data,
     create_interactive_chart,
     get_available_assets,
     get_available_timeframes
 )
 
+# Importiere Live-Feed
+from data.live_feed import get_live_poller
+
+# Importiere vorgeladene Chart-Daten
+from dashboard.warmup import get_chart_data_cache
+
 # Logger konfigurieren
 logger = logging.getLogger("trading_dashboard.chart_callbacks")
 
+# Maximale Anzahl Kerzen, die im Live-Modus im Chart gehalten werden
+LIVE_WINDOW = 2000
+
+# Position der Indikator-Linien im Chart (nach Preis-Trace 0 und Volumen-Trace 1)
+LIVE_OVERLAY_TRACE = 2
+LIVE_OVERLAY_COLORS = (colors['warning'], colors['secondary'])
+
+
+def _get_live_chart_state(chart_type=None):
+    """
+    Beschreibt einen neu gezeichneten Chart für den Live-Modus
+
+    Jeder Chart erhält eine neue Revision, damit der Live-Modus seine Arrays nach dem
+    Neuzeichnen neu synchronisiert. Ohne chart_type (Fehler- oder Fallback-Chart) werden keine
+    Live-Kerzen angehängt.
+    """
+    return {"revision": uuid.uuid4().hex, "chart_type": chart_type}
+
+
+def _get_live_arrays(bars, chart_type, overlay_names):
+    """
+    Gibt je Trace die Arrays zurück, die der Live-Modus schreibt, als (Trace, Pfad, Werte)
+
+    Jede Trace erhält nur die Attribute, die sie tatsächlich hat: Candlestick und OHLC
+    open/high/low/close, die Linie y, das Volumen y und die Balkenfarben.
+    """
+    x = [ts.isoformat() for ts in bars.index]
+    if chart_type == "line":
+        arrays = [(0, ("x",), x), (0, ("y",), bars['close'].tolist())]
+    else:
+        arrays = [(0, ("x",), x)] + [(0, (col,), bars[col].tolist()) for col in ("open", "high", "low", "close")]
+
+    volume_colors = np.where(bars['close'] < bars['open'], colors['danger'], colors['success'])
+    arrays += [
+        (1, ("x",), x),
+        (1, ("y",), bars['volume'].tolist()),
+        (1, ("marker", "color"), volume_colors.tolist()),
+    ]
+    for offset, name in enumerate(overlay_names):
+        values = bars[name].astype(object).where(bars[name].notna(), None).tolist()
+        arrays += [(LIVE_OVERLAY_TRACE + offset, ("x",), x), (LIVE_OVERLAY_TRACE + offset, ("y",), values)]
+    return arrays
+
+
+def _get_patch_location(patch, trace, path):
+    location = patch["data"][trace]
+    for key in path[:-1]:
+        location = location[key]
+    return location, path[-1]
+
+
+def build_live_patch(bars, chart_type, overlay_names, count=None, insert_overlays=False):
+    """
+    Erstellt das Patch-Update des Preischarts für neue Live-Kerzen
+
+    Ohne count werden die Arrays ersetzt (Synchronisation nach dem Zeichnen des Charts). Plotly
+    überträgt numerische Spalten als typisierte Arrays, an die sich keine Listen anhängen
+    lassen; nach dem Ersetzen sind es Listen. Mit count werden die Kerzen angehängt und die
+    ältesten entfernt, sobald der Chart mehr als LIVE_WINDOW Kerzen enthielte.
+
+    Args:
+        bars: Neue Kerzen mit OHLCV- und Indikatorspalten (BarRingBuffer.since/to_frame)
+        chart_type: Chart-Typ ("line", "candlestick", "ohlc")
+        overlay_names: Indikatorspalten, die als Linien über dem Preis gezeichnet werden
+        count: Anzahl der Kerzen, die der Chart bereits enthält (None: Arrays ersetzen)
+        insert_overlays: Ob die Indikator-Linien neu in den Chart eingefügt werden
+
+    Returns:
+        Patch: Update für die figure-Eigenschaft des Charts
+    """
+    patch = Patch()
+    if insert_overlays:
+        for offset, name in enumerate(overlay_names):
+            patch["data"].insert(LIVE_OVERLAY_TRACE + offset, {
+                "type": "scatter", "mode": "lines", "name": name, "x": [], "y": [],
+                "xaxis": "x", "yaxis": "y",
+                "line": {"color": LIVE_OVERLAY_COLORS[offset % len(LIVE_OVERLAY_COLORS)], "width": 1},
+            })
+
+    overflow = 0 if count is None else max(count + len(bars) - LIVE_WINDOW, 0)
+    for trace, path, values in _get_live_arrays(bars, chart_type, overlay_names):
+        location, key = _get_patch_location(patch, trace, path)
+        if count is None:
+            location[key] = values
+        else:
+            location[key].extend(values)
+            for _ in range(overflow):
+                del location[key][0]
+    return patch
+
 @callback(
     Output("price-chart", "figure"),
+    Output("live-chart-store", "data"),
     Input("symbol-input", "value"),
     Input("line-chart-button", "n_clicks"),
     Input("candlestick-chart-button", "n_clicks"),
@@ -77,7 +176,7 @@ def update_interactive_chart(asset, line_clicks, candlestick_clicks, ohlc_clicks
         # Generiere Daten für das ausgewählte Asset und den Zeitrahmen
         try:
             logger.info(f"Generiere Daten für {asset} mit Zeitrahmen {timeframe} und Datenquelle {data_source}")
-            df = generate_mock_data(asset, timeframe, data_source=data_source)
+            df = get_chart_data_cache().get_data(asset, timeframe, data_source=data_source)
             
             if df is None or df.empty:
                 logger.warning(f"Keine Daten für {asset} mit Zeitrahmen {timeframe}")
@@ -97,11 +196,11 @@ def update_interactive_chart(asset, line_clicks, candlestick_clicks, ohlc_clicks
                     showarrow=False,
                     font=dict(color="#EF4444", size=14)
                 )
-                return fig
+                return fig, _get_live_chart_state()
             
             # Erstelle den interaktiven Chart
             fig = create_interactive_chart(df, asset, chart_type, timeframe, drawing_data)
-            return fig
+            return fig, _get_live_chart_state(chart_type)
             
         except Exception as e:
             logger.error(f"Fehler beim Generieren der Daten: {str(e)}")
@@ -145,7 +244,7 @@ def update_interactive_chart(asset, line_clicks, candlestick_clicks, ohlc_clicks
                 except Exception as fallback_error:
                     logger.error(f"Fehler beim Laden der Fallback-Daten: {str(fallback_error)}")
             
-            return fig
+            return fig, _get_live_chart_state()
     
     except Exception as e:
         logger.error(f"Unerwarteter Fehler im Chart-Callback: {str(e)}")
@@ -159,9 +258,11 @@ def update_interactive_chart(asset, line_clicks, candlestick_clicks, ohlc_clicks
             showarrow=False,
             font=dict(color="#EF4444", size=14)
         )
-        return fig
+        return fig, _get_live_chart_state()
 
-@callback(
+# Zeichenwerkzeug-Buttons: reiner UI-Zustand, clientseitig (assets/js/ui_callbacks.js)
+clientside_callback(
+    ClientsideFunction(namespace="ui", function_name="updateDrawingToolButtons"),
     Output("trendline-button", "color"),
     Output("trendline-button", "outline"),
     Output("horizontal-button", "color"),
@@ -180,65 +281,6 @@ def update_interactive_chart(asset, line_clicks, candlestick_clicks, ohlc_clicks
     Input("delete-drawing-button", "n_clicks"),
     State("active-drawing-tool-store", "data"),
 )
-def update_drawing_tool_buttons(trendline_clicks, horizontal_clicks, rectangle_clicks, fibonacci_clicks, delete_clicks, active_tool):
-    """
-    Aktualisiert die Farben der Zeichenwerkzeug-Buttons basierend auf dem ausgewählten Werkzeug.
-    """
-    try:
-        ctx = dash.callback_context
-        if not ctx.triggered:
-            # Standardmäßig ist kein Werkzeug ausgewählt
-            return "secondary", True, "secondary", True, "secondary", True, "secondary", True, "secondary", True, None
-        
-        button_id = ctx.triggered[0]["prop_id"].split(".")[0]
-        
-        # Setze alle Buttons auf inaktiv
-        trendline_color, trendline_outline = "secondary", True
-        horizontal_color, horizontal_outline = "secondary", True
-        rectangle_color, rectangle_outline = "secondary", True
-        fibonacci_color, fibonacci_outline = "secondary", True
-        delete_color, delete_outline = "secondary", True
-        new_active_tool = None
-        
-        # Aktiviere den geklickten Button
-        if button_id == "trendline-button":
-            if active_tool == "trendline":
-                # Wenn bereits aktiv, deaktiviere
-                pass
-            else:
-                trendline_color, trendline_outline = "primary", False
-                new_active_tool = "trendline"
-        elif button_id == "horizontal-button":
-            if active_tool == "horizontal":
-                # Wenn bereits aktiv, deaktiviere
-                pass
-            else:
-                horizontal_color, horizontal_outline = "primary", False
-                new_active_tool = "horizontal"
-        elif button_id == "rectangle-button":
-            if active_tool == "rectangle":
-                # Wenn bereits aktiv, deaktiviere
-                pass
-            else:
-                rectangle_color, rectangle_outline = "primary", False
-                new_active_tool = "rectangle"
-        elif button_id == "fibonacci-button":
-            if active_tool == "fibonacci":
-                # Wenn bereits aktiv, deaktiviere
-                pass
-            else:
-                fibonacci_color, fibonacci_outline = "primary", False
-                new_active_tool = "fibonacci"
-        elif button_id == "delete-drawing-button":
-            delete_color, delete_outline = "danger", False
-            new_active_tool = "delete"
-        
-        return trendline_color, trendline_outline, horizontal_color, horizontal_outline, rectangle_color, rectangle_outline, fibonacci_color, fibonacci_outline, delete_color, delete_outline, new_active_tool
-    
-    except Exception as e:
-        logger.error(f"Fehler beim Aktualisieren der Zeichenwerkzeug-Buttons: {str(e)}")
-        # Fallback: Alle Buttons inaktiv
-        return "secondary", True, "secondary", True, "secondary", True, "secondary", True, "secondary", True, None
 
 @callback(
     Output("asset-options", "data"),
@@ -267,7 +309,9 @@ def update_asset_options(search_value):
         logger.error(f"Fehler beim Aktualisieren der Asset-Optionen: {str(e)}")
         return []
 
-@callback(
+# Chart-Typ-Buttons: reiner UI-Zustand, clientseitig (assets/js/ui_callbacks.js)
+clientside_callback(
+    ClientsideFunction(namespace="ui", function_name="updateChartTypeButtons"),
     Output("line-chart-button", "color"),
     Output("line-chart-button", "outline"),
     Output("candlestick-chart-button", "color"),
@@ -278,34 +322,77 @@ def update_asset_options(search_value):
     Input("candlestick-chart-button", "n_clicks"),
     Input("ohlc-chart-button", "n_clicks"),
 )
-def update_chart_type_buttons(line_clicks, candlestick_clicks, ohlc_clicks):
+
+@callback(
+    Output("live-update-interval", "disabled"),
+    Input("live-mode-switch", "value"),
+)
+def toggle_live_mode(live_enabled):
+    """
+    Aktiviert oder deaktiviert das Live-Update-Intervall.
+
+    Die prozessweiten Poller laufen für andere Nutzer weiter; Symbole ohne Live-Updates
+    verwirft der Poller nach seinem Idle-Timeout.
+    """
+    return not live_enabled
+
+@callback(
+    Output("price-chart", "figure", allow_duplicate=True),
+    Output("live-cursor-store", "data"),
+    Input("live-update-interval", "n_intervals"),
+    State("symbol-input", "value"),
+    State("active-timeframe-store", "data"),
+    State("data-source", "value"),
+    State("live-chart-store", "data"),
+    State("live-cursor-store", "data"),
+    prevent_initial_call=True,
+)
+def stream_live_candles(n_intervals, asset, timeframe, data_source, chart, cursor):
     """
-    Aktualisiert die Farben der Chart-Typ-Buttons basierend auf dem ausgewählten Typ.
+    Hängt neue Kerzen aus dem Live-Feed an den bestehenden Chart an, ohne ihn neu zu zeichnen.
+
+    Der Live-Feed gehört zur gewählten Datenquelle und zum gewählten Zeitrahmen. Nach jedem
+    Neuzeichnen des Charts werden dessen Arrays einmal durch die gepufferten Kerzen ersetzt,
+    danach werden nur neue Kerzen samt SMA und EMA angehängt.
     """
+    if not asset or not chart or not chart.get("chart_type"):
+        raise PreventUpdate
+
     try:
-        ctx = dash.callback_context
-        if not ctx.triggered:
-            # Standardmäßig ist Candlestick ausgewählt
-            return "primary", True, "primary", False, "primary", True
-        
-        button_id = ctx.triggered[0]["prop_id"].split(".")[0]
-        
-        # Setze alle Buttons auf inaktiv
-        line_color, line_outline = "primary", True
-        candlestick_color, candlestick_outline = "primary", True
-        ohlc_color, ohlc_outline = "primary", True
-        
-        # Aktiviere den geklickten Button
-        if button_id == "line-chart-button":
-            line_color, line_outline = "primary", False
-        elif button_id == "candlestick-chart-button":
-            candlestick_color, candlestick_outline = "primary", False
-        elif button_id == "ohlc-chart-button":
-            ohlc_color, ohlc_outline = "primary", False
-        
-        return line_color, line_outline, candlestick_color, candlestick_outline, ohlc_color, ohlc_outline
-    
+        poller = get_live_poller(source_type=data_source, timeframe=timeframe)
+        # Jeder Tick hält das Abonnement am Leben; erst danach starten, damit der Thread
+        # nicht mangels Symbolen sofort endet
+        buffer = poller.subscribe(asset)
+        poller.start()
+        overlay_names = buffer.indicators.names[:2]
+        key = [data_source, asset, timeframe]
+        cursor = cursor or {}
+
+        if cursor.get("revision") != chart["revision"] or cursor.get("key") != key or cursor.get("last") is None:
+            # Erster Tick nach dem Zeichnen des Charts oder nach einem Wechsel: Arrays ersetzen
+            bars = buffer.to_frame().tail(LIVE_WINDOW)
+            if bars.empty:
+                raise PreventUpdate
+            insert_overlays = cursor.get("overlays") != chart["revision"]
+            patch = build_live_patch(bars, chart["chart_type"], overlay_names, insert_overlays=insert_overlays)
+            count = len(bars)
+        else:
+            bars = buffer.since(pd.Timestamp(cursor["last"]))
+            if bars.empty:
+                raise PreventUpdate
+            patch = build_live_patch(bars, chart["chart_type"], overlay_names, count=cursor["count"])
+            count = min(cursor["count"] + len(bars), LIVE_WINDOW)
+
+        return patch, {
+            "revision": chart["revision"],
+            "key": key,
+            "last": bars.index[-1].isoformat(),
+            "count": count,
+            "overlays": chart["revision"],
+        }
+
+    except PreventUpdate:
+        raise
     except Exception as e:
-        logger.error(f"Fehler beim Aktualisieren der Chart-Typ-Buttons: {str(e)}")
-        # Fallback: Candlestick aktiv
-        return "primary", True, "primary", False, "primary", True
+        logger.error(f"Fehler beim Live-Update des Charts: {str(e)}")
+        raise PreventUpdate
@@ -17,6 +17,8 @@ from dashboard.error_handler import ErrorHandler
 # Importiere NQ-Integration
 sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
 from data.nq_integration import NQDataFetcher
+from data.ohlcv import OHLCVSchemaError, to_ohlcv
+from data.trading_calendar import get_exchange_for_symbol, get_trading_calendar
 
 # Logger konfigurieren
 logger = logging.getLogger("trading_dashboard.chart_utils")
@@ -66,6 +68,24 @@ chart_style = {
     }
 }
 
+# Minimaler und maximaler Zeitraum in Tagen für Mock-Daten je Zeitrahmen
+MOCK_DAYS_LIMITS = {
+    "1m": (None, 7),
+    "2m": (None, 10),
+    "3m": (None, 12),
+    "5m": (None, 15),
+    "15m": (None, 20),
+    "30m": (None, 25),
+    "1h": (None, 30),
+    "4h": (None, 60),
+    "1d": (None, None),
+    "1wk": (365, None),  # Mindestens 1 Jahr für wöchentliche Daten
+    "1mo": (365 * 2, None),  # Mindestens 2 Jahre für monatliche Daten
+}
+
+# Alternative Bezeichnungen für Zeitrahmen
+MOCK_INTERVAL_ALIASES = {"60m": "1h", "1w": "1wk"}
+
 def generate_mock_data(symbol, timeframe, days_back=180, data_source="yahoo"):
     """
     Generiert Mock-Daten für den Chart basierend auf Symbol und Zeitrahmen.
@@ -125,37 +145,14 @@ def generate_mock_data(symbol, timeframe, days_back=180, data_source="yahoo"):
             
             df = nq_fetcher.get_nq_futures_data(interval=interval, range_val=range_val)
             
-            # Wenn Daten erfolgreich abgerufen wurden
+            # Wenn Daten erfolgreich abgerufen wurden, in das kanonische OHLCV-Schema bringen
             if not df.empty:
-                # Standardisiere Spaltennamen
-                if 'date' not in df.columns and isinstance(df.index, pd.DatetimeIndex):
-                    df['date'] = df.index
-                
-                # Stelle sicher, dass alle erforderlichen Spalten vorhanden sind
-                required_columns = ['open', 'high', 'low', 'close', 'volume']
-                column_mapping = {
-                    'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'volume'
-                }
-                
-                # Konvertiere Spaltennamen zu Kleinbuchstaben
-                df.columns = [col.lower() if col in column_mapping.values() else col for col in df.columns]
-                
-                # Füge fehlende Spalten hinzu
-                for col in required_columns:
-                    if col not in df.columns:
-                        # Versuche, die Spalte mit Großbuchstaben zu finden
-                        cap_col = col.capitalize()
-                        if cap_col in df.columns:
-                            df[col] = df[cap_col]
-                        else:
-                            # Fallback: Fülle mit Dummy-Daten
-                            if col == 'volume':
-                                df[col] = 1000000
-                            else:
-                                df[col] = df['close'] if 'close' in df.columns else df.iloc[:, 0]
-                
-                logger.info(f"NQ-Daten erfolgreich abgerufen: {len(df)} Datenpunkte")
-                return df
+                try:
+                    df = to_ohlcv(df)
+                    logger.info(f"NQ-Daten erfolgreich abgerufen: {len(df)} Datenpunkte")
+                    return df
+                except OHLCVSchemaError as e:
+                    logger.warning(f"NQ-Daten unvollständig: {str(e)}")
             
             # Wenn keine Daten abgerufen werden konnten, verwende Fallback
             logger.warning("Keine NQ-Daten verfügbar, verwende Fallback-Daten")
@@ -171,177 +168,21 @@ def generate_mock_data(symbol, timeframe, days_back=180, data_source="yahoo"):
                 logger.error(f"Fehler beim Abrufen echter Daten: {str(e)}")
                 logger.info("Verwende Fallback-Mock-Daten")
         
-        # Bestimme den Zeitrahmen
-        if timeframe == "1m":
-            interval = "1m"
-            days_back = min(days_back, 7)  # Begrenze auf 7 Tage für 1-Minuten-Daten
-        elif timeframe == "2m":
-            interval = "2m"
-            days_back = min(days_back, 10)  # Begrenze auf 10 Tage für 2-Minuten-Daten
-        elif timeframe == "3m":
-            interval = "3m"
-            days_back = min(days_back, 12)  # Begrenze auf 12 Tage für 3-Minuten-Daten
-        elif timeframe == "5m":
-            interval = "5m"
-            days_back = min(days_back, 15)  # Begrenze auf 15 Tage für 5-Minuten-Daten
-        elif timeframe == "15m":
-            interval = "15m"
-            days_back = min(days_back, 20)  # Begrenze auf 20 Tage für 15-Minuten-Daten
-        elif timeframe == "30m":
-            interval = "30m"
-            days_back = min(days_back, 25)  # Begrenze auf 25 Tage für 30-Minuten-Daten
-        elif timeframe == "60m" or timeframe == "1h":
-            interval = "1h"
-            days_back = min(days_back, 30)  # Begrenze auf 30 Tage für stündliche Daten
-        elif timeframe == "4h":
-            interval = "4h"
-            days_back = min(days_back, 60)  # Begrenze auf 60 Tage für 4-Stunden-Daten
-        elif timeframe == "1d":
-            interval = "1d"
-        elif timeframe == "1wk" or timeframe == "1w":
-            interval = "1wk"
-            days_back = max(days_back, 365)  # Mindestens 1 Jahr für wöchentliche Daten
-        elif timeframe == "1mo":
-            interval = "1mo"
-            days_back = max(days_back, 365*2)  # Mindestens 2 Jahre für monatliche Daten
-        else:
+        # Bestimme den Zeitrahmen und begrenze den Zeitraum
+        interval = MOCK_INTERVAL_ALIASES.get(timeframe, timeframe)
+        if interval not in MOCK_DAYS_LIMITS:
             interval = "1d"
+        min_days, max_days = MOCK_DAYS_LIMITS[interval]
+        if max_days is not None:
+            days_back = min(days_back, max_days)
+        if min_days is not None:
+            days_back = max(days_back, min_days)
         
-        # Generiere Datenpunkte basierend auf dem Zeitrahmen
+        # Generiere Datenpunkte gemäß den Handelszeiten der Börse des Symbols
         end_date = datetime.now()
         start_date = end_date - timedelta(days=days_back)
-        
-        if interval == "1m":
-            # Für 1-Minuten-Daten nur Handelszeiten (9:30-16:00 ET)
-            trading_hours = []
-            current_date = start_date
-            while current_date <= end_date:
-                if current_date.weekday() < 5:  # Montag bis Freitag
-                    for hour in range(9, 16):
-                        minute_start = 30 if hour == 9 else 0
-                        minute_end = 60
-                        for minute in range(minute_start, minute_end):
-                            trading_time = current_date.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                            if trading_time <= end_date:
-                                trading_hours.append(trading_time)
-                current_date += timedelta(days=1)
-            date_range = pd.DatetimeIndex(trading_hours)
-        elif interval == "2m":
-            # Für 2-Minuten-Daten
-            trading_hours = []
-            current_date = start_date
-            while current_date <= end_date:
-                if current_date.weekday() < 5:  # Montag bis Freitag
-                    for hour in range(9, 16):
-                        minute_start = 30 if hour == 9 else 0
-                        minute_end = 60
-                        for minute in range(minute_start, minute_end, 2):
-                            trading_time = current_date.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                            if trading_time <= end_date:
-                                trading_hours.append(trading_time)
-                current_date += timedelta(days=1)
-            date_range = pd.DatetimeIndex(trading_hours)
-        elif interval == "3m":
-            # Für 3-Minuten-Daten
-            trading_hours = []
-            current_date = start_date
-            while current_date <= end_date:
-                if current_date.weekday() < 5:  # Montag bis Freitag
-                    for hour in range(9, 16):
-                        minute_start = 30 if hour == 9 else 0
-                        minute_end = 60
-                        for minute in range(minute_start, minute_end, 3):
-                            trading_time = current_date.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                            if trading_time <= end_date:
-                                trading_hours.append(trading_time)
-                current_date += timedelta(days=1)
-            date_range = pd.DatetimeIndex(trading_hours)
-        elif interval == "5m":
-            # Für 5-Minuten-Daten
-            trading_hours = []
-            current_date = start_date
-            while current_date <= end_date:
-                if current_date.weekday() < 5:  # Montag bis Freitag
-                    for hour in range(9, 16):
-                        minute_start = 30 if hour == 9 else 0
-                        minute_end = 60
-                        for minute in range(minute_start, minute_end, 5):
-                            trading_time = current_date.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                            if trading_time <= end_date:
-                                trading_hours.append(trading_time)
-                current_date += timedelta(days=1)
-            date_range = pd.DatetimeIndex(trading_hours)
-        elif interval == "15m":
-            # Für 15-Minuten-Daten
-            trading_hours = []
-            current_date = start_date
-            while current_date <= end_date:
-                if current_date.weekday() < 5:  # Montag bis Freitag
-                    for hour in range(9, 16):
-                        minute_start = 30 if hour == 9 else 0
-                        minute_end = 60
-                        for minute in range(minute_start, minute_end, 15):
-                            trading_time = current_date.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                            if trading_time <= end_date:
-                                trading_hours.append(trading_time)
-                current_date += timedelta(days=1)
-            date_range = pd.DatetimeIndex(trading_hours)
-        elif interval == "30m":
-            # Für 30-Minuten-Daten
-            trading_hours = []
-            current_date = start_date
-            while current_date <= end_date:
-                if current_date.weekday() < 5:  # Montag bis Freitag
-                    for hour in range(9, 16):
-                        minute = 30 if hour == 9 else 0
-                        if minute < 60:  # Nur hinzufügen, wenn es eine gültige Minute ist
-                            trading_time = current_date.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                            if trading_time <= end_date:
-                                trading_hours.append(trading_time)
-                        if hour != 9:  # Für 9 Uhr nur 9:30, für andere Stunden auch XX:30
-                            trading_time = current_date.replace(hour=hour, minute=30, second=0, microsecond=0)
-                            if trading_time <= end_date:
-                                trading_hours.append(trading_time)
-                current_date += timedelta(days=1)
-            date_range = pd.DatetimeIndex(trading_hours)
-        elif interval == "1h" or interval == "60m":
-            # Für 1-Stunden-Daten
-            trading_hours = []
-            current_date = start_date
-            while current_date <= end_date:
-                if current_date.weekday() < 5:  # Montag bis Freitag
-                    for hour in range(9, 16):
-                        minute = 30 if hour == 9 else 0  # 9:30 für die erste Stunde
-                        trading_time = current_date.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                        if trading_time <= end_date:
-                            trading_hours.append(trading_time)
-                current_date += timedelta(days=1)
-            date_range = pd.DatetimeIndex(trading_hours)
-        elif interval == "4h":
-            # Für 4-Stunden-Daten
-            trading_hours = []
-            current_date = start_date
-            while current_date <= end_date:
-                if current_date.weekday() < 5:  # Montag bis Freitag
-                    # 9:30 und 13:30 (zwei 4-Stunden-Blöcke während des Handelstages)
-                    for hour, minute in [(9, 30), (13, 30)]:
-                        trading_time = current_date.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                        if trading_time <= end_date:
-                            trading_hours.append(trading_time)
-                current_date += timedelta(days=1)
-            date_range = pd.DatetimeIndex(trading_hours)
-        elif interval == "1d":
-            # Für Tages-Daten
-            date_range = pd.date_range(start=start_date, end=end_date, freq='B')  # 'B' für Business Days
-        elif interval == "1wk" or interval == "1w":
-            # Für Wochen-Daten
-            date_range = pd.date_range(start=start_date, end=end_date, freq='W-FRI')  # Freitag als Ende der Woche
-        elif interval == "1mo":
-            # Für Monats-Daten
-            date_range = pd.date_range(start=start_date, end=end_date, freq='BM')  # Business Month End
-        else:
-            # Fallback auf Tages-Daten
-            date_range = pd.date_range(start=start_date, end=end_date, freq='B')
+        calendar = get_trading_calendar(get_exchange_for_symbol(symbol))
+        date_range = calendar.get_index(interval, start_date, end_date)
         
         # Generiere zufällige Preisdaten basierend auf dem Symbol
         np.random.seed(hash(symbol) % 2**32)  # Verwende das Symbol als Seed für Reproduzierbarkeit
@@ -406,28 +247,20 @@ def generate_mock_data(symbol, timeframe, days_back=180, data_source="yahoo"):
         open_price = low + np.random.uniform(0, 1, n) * (high - low)
         
         # Stelle sicher, dass OHLC-Beziehungen eingehalten werden
-        for i in range(n):
-            high[i] = max(open_price[i], close[i], high[i])
-            low[i] = min(open_price[i], close[i], low[i])
+        high = np.maximum.reduce([open_price, close, high])
+        low = np.minimum.reduce([open_price, close, low])
         
         # Generiere Volumendaten
-        volume = np.random.uniform(base_price * 10000, base_price * 100000, n)
+        volume = np.random.uniform(base_price * 10000, base_price * 100000, n).astype(np.int64)
         
-        # Erstelle DataFrame
+        # Erstelle DataFrame im kanonischen OHLCV-Schema (Zeitstempel nur im Index)
         df = pd.DataFrame({
-            'date': date_range,
             'open': open_price,
             'high': high,
             'low': low,
             'close': close,
             'volume': volume
-        })
-        
-        # Setze 'date' als Index
-        df.set_index('date', inplace=True)
-        
-        # Füge 'date' als Spalte hinzu (für Plotly)
-        df['date'] = df.index
+        }, index=pd.DatetimeIndex(date_range, name='date'))
         
         logger.info(f"Mock-Daten für {symbol} mit Zeitrahmen {timeframe} generiert: {len(df)} Datenpunkte")
         return df
@@ -470,21 +303,9 @@ def create_interactive_chart(df, symbol, chart_type="candlestick", timeframe="1d
             )
             return fig
         
-        # Standardisiere Spaltennamen (falls nötig)
-        column_mapping = {
-            'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'volume',
-            'open': 'open', 'high': 'high', 'low': 'low', 'close': 'close', 'volume': 'volume'
-        }
-        
-        # Überprüfe und konvertiere Spaltennamen
-        df_columns = df.columns.tolist()
-        for old_col, new_col in column_mapping.items():
-            if old_col in df_columns and new_col not in df_columns:
-                df[new_col] = df[old_col]
-        
-        # Stelle sicher, dass 'date' vorhanden ist
-        if 'date' not in df.columns and isinstance(df.index, pd.DatetimeIndex):
-            df['date'] = df.index
+        # Kanonisches OHLCV-Schema (ohne Kopie, wenn die Daten es bereits erfüllen)
+        df = to_ohlcv(df)
+        dates = df.index
         
         # Bestimme die Währung oder Einheit basierend auf dem Symbol
         currency_map = {
@@ -528,7 +349,7 @@ def create_interactive_chart(df, symbol, chart_type="candlestick", timeframe="1d
         if chart_type == "line":
             fig.add_trace(
                 go.Scatter(
-                    x=df['date'],
+                    x=dates,
                     y=df['close'],
                     mode='lines',
                     name=symbol,
@@ -539,7 +360,7 @@ def create_interactive_chart(df, symbol, chart_type="candlestick", timeframe="1d
         elif chart_type == "candlestick":
             fig.add_trace(
                 go.Candlestick(
-                    x=df['date'],
+                    x=dates,
                     open=df['open'],
                     high=df['high'],
                     low=df['low'],
@@ -553,7 +374,7 @@ def create_interactive_chart(df, symbol, chart_type="candlestick", timeframe="1d
         elif chart_type == "ohlc":
             fig.add_trace(
                 go.Ohlc(
-                    x=df['date'],
+                    x=dates,
                     open=df['open'],
                     high=df['high'],
                     low=df['low'],
@@ -566,12 +387,11 @@ def create_interactive_chart(df, symbol, chart_type="candlestick", timeframe="1d
             )
         
         # Volumen-Chart
-        colors_volume = [colors['danger'] if df['close'][i] < df['open'][i] else colors['success'] 
-                        for i in range(len(df))]
+        colors_volume = np.where(df['close'] < df['open'], colors['danger'], colors['success'])
         
         fig.add_trace(
             go.Bar(
-                x=df['date'],
+                x=dates,
                 y=df['volume'],
                 name='Volumen',
                 marker=dict(color=colors_volume, opacity=0.7),
@@ -596,9 +416,9 @@ def create_interactive_chart(df, symbol, chart_type="candlestick", timeframe="1d
                 elif drawing['type'] == 'horizontal':
                     fig.add_shape(
                         type="line",
-                        x0=df['date'].min(),
+                        x0=dates.min(),
                         y0=drawing['y0'],
-                        x1=df['date'].max(),
+                        x1=dates.max(),
                         y1=drawing['y0'],
                         line=dict(color=colors['warning'], width=2, dash='dash'),
                         row=1, col=1
@@ -4,7 +4,7 @@ Verbesserte Komponenten ohne Symbol-Spalte und mit erweiterten Zeiteinheiten
 
 import dash
 import dash_bootstrap_components as dbc
-from dash import html, dcc
+from dash import html, dcc, dash_table
 from dash_iconify import DashIconify
 
 # Farben für das Dashboard
@@ -488,7 +488,7 @@ def create_trades_card():
             dbc.CardHeader("Trade-Historie"),
             dbc.CardBody(
                 [
-                    dash_table.DataTable(
+                    html.Div(id="trades-table-container", children=dash_table.DataTable(
                         id="trades-table",
                         columns=[
                             {"name": "Datum", "id": "date"},
@@ -568,7 +568,7 @@ def create_trades_card():
                             },
                         ],
                         page_size=5,
-                    ),
+                    )),
                 ]
             ),
         ],
@@ -635,6 +635,22 @@ def create_backtesting_content():
                                                 color="primary",
                                                 className="w-100 mb-3",
                                             ),
+                                            dbc.Button(
+                                                "Backtest abbrechen",
+                                                id="backtest-cancel-button",
+                                                color="secondary",
+                                                outline=True,
+                                                disabled=True,
+                                                className="w-100 mb-3",
+                                            ),
+                                            dbc.Progress(
+                                                id="backtest-progress",
+                                                value=0,
+                                                striped=True,
+                                                animated=True,
+                                                className="mb-2",
+                                            ),
+                                            html.Div(id="backtest-job-status", className="small text-muted"),
                                         ],
                                         md=4,
                                     ),
@@ -787,7 +803,7 @@ def create_settings_content():
                                     dbc.Col(
                                         [
                                             html.H5("Darstellung"),
-                                            dbc.FormGroup(
+                                            html.Div(
                                                 [
                                                     dbc.Label("Farbschema"),
                                                     dbc.Select(
@@ -801,7 +817,7 @@ def create_settings_content():
                                                     ),
                                                 ]
                                             ),
-                                            dbc.FormGroup(
+                                            html.Div(
                                                 [
                                                     dbc.Label("Chart-Standardtyp"),
                                                     dbc.Select(
@@ -816,7 +832,7 @@ def create_settings_content():
                                                     ),
                                                 ]
                                             ),
-                                            dbc.FormGroup(
+                                            html.Div(
                                                 [
                                                     dbc.Label("Standard-Zeitrahmen"),
                                                     dbc.Select(
@@ -843,7 +859,7 @@ def create_settings_content():
                                     dbc.Col(
                                         [
                                             html.H5("Backtesting"),
-                                            dbc.FormGroup(
+                                            html.Div(
                                                 [
                                                     dbc.Label("Anfangskapital"),
                                                     dbc.InputGroup(
@@ -861,7 +877,7 @@ def create_settings_content():
                                                     ),
                                                 ]
                                             ),
-                                            dbc.FormGroup(
+                                            html.Div(
                                                 [
                                                     dbc.Label("Kommission pro Trade"),
                                                     dbc.InputGroup(
@@ -880,7 +896,7 @@ def create_settings_content():
                                                     ),
                                                 ]
                                             ),
-                                            dbc.FormGroup(
+                                            html.Div(
                                                 [
                                                     dbc.Label("Slippage"),
                                                     dbc.InputGroup(
@@ -925,7 +941,7 @@ def create_settings_content():
                                     dbc.Col(
                                         [
                                             html.H5("API-Einstellungen"),
-                                            dbc.FormGroup(
+                                            html.Div(
                                                 [
                                                     dbc.Label("Primäre Datenquelle"),
                                                     dbc.Select(
@@ -940,7 +956,7 @@ def create_settings_content():
                                                     ),
                                                 ]
                                             ),
-                                            dbc.FormGroup(
+                                            html.Div(
                                                 [
                                                     dbc.Label("API-Schlüssel (falls erforderlich)"),
                                                     dbc.Input(
@@ -957,7 +973,7 @@ def create_settings_content():
                                     dbc.Col(
                                         [
                                             html.H5("Cache-Einstellungen"),
-                                            dbc.FormGroup(
+                                            html.Div(
                                                 [
                                                     dbc.Label("Cache verwenden"),
                                                     dbc.Checklist(
@@ -971,7 +987,7 @@ def create_settings_content():
                                                     ),
                                                 ]
                                             ),
-                                            dbc.FormGroup(
+                                            html.Div(
                                                 [
                                                     dbc.Label("Cache-Dauer für Tagesdaten"),
                                                     dbc.InputGroup(
@@ -989,7 +1005,7 @@ def create_settings_content():
                                                     ),
                                                 ]
                                             ),
-                                            dbc.FormGroup(
+                                            html.Div(
                                                 [
                                                     dbc.Label("Cache-Dauer für Intraday-Daten"),
                                                     dbc.InputGroup(
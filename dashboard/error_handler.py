@@ -11,6 +11,9 @@ from datetime import datetime, timedelta
 import traceback
 import logging
 
+from data.circuit_breaker import get_last_known_good
+from data.trading_calendar import get_trading_calendar
+
 # Konfiguriere Logging
 logging.basicConfig(
     level=logging.INFO,
@@ -125,6 +128,9 @@ class ErrorHandler:
         """
         Liefert Fallback-Daten für den Fall, dass keine aktuellen Daten verfügbar sind
         
+        Die Daten werden je Asset-Typ und Zeitrahmen einmal geladen bzw. erzeugt und danach aus
+        dem Last-known-good-Speicher (data.circuit_breaker) geliefert.
+        
         Args:
             asset_type: Typ des Assets (Aktie, Krypto, Forex)
             timeframe: Zeitrahmen der Daten
@@ -134,6 +140,12 @@ class ErrorHandler:
         """
         logger.info(f"Verwende Fallback-Daten für {asset_type} mit Zeitrahmen {timeframe}")
         
+        # Bereits geladene oder erzeugte Fallback-Daten kommen aus dem Speicher
+        lkg_key = f"fallback_{asset_type}_{timeframe}"
+        df = get_last_known_good().get(lkg_key)
+        if df is not None:
+            return df
+        
         # Lade gecachte Daten, falls vorhanden
         cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'cache')
         
@@ -152,6 +164,7 @@ class ErrorHandler:
             if os.path.exists(file_path):
                 df = pd.read_csv(file_path, index_col=0, parse_dates=True)
                 logger.info(f"Fallback-Daten geladen: {len(df)} Datenpunkte")
+                get_last_known_good().put(lkg_key, df)
                 return df
         except Exception as e:
             logger.error(f"Fehler beim Laden der Fallback-Daten: {e}")
@@ -160,17 +173,19 @@ class ErrorHandler:
         logger.info("Generiere synthetische Fallback-Daten")
         
         end_date = datetime.now()
+        interval = timeframe
         if timeframe == "1h":
             start_date = end_date - timedelta(days=7)
-            freq = "H"
         elif timeframe == "1d":
             start_date = end_date - timedelta(days=365)
-            freq = "D"
         else:
             start_date = end_date - timedelta(days=365*2)
-            freq = "W"
+            interval = "1w"
         
-        date_range = pd.date_range(start=start_date, end=end_date, freq=freq)
+        # Zeitstempel gemäß den Handelszeiten der Börse des Asset-Typs
+        exchanges = {"Aktien": "US", "Krypto": "CRYPTO", "Forex": "FX", "Futures": "CME"}
+        calendar = get_trading_calendar(exchanges.get(asset_type, "US"))
+        date_range = calendar.get_index(interval, start_date, end_date)
         
         # Basis-Preis je nach Asset-Typ
         if asset_type == "Aktien":
@@ -184,42 +199,27 @@ class ErrorHandler:
         else:
             base_price = 100.0
         
-        # Generiere synthetische OHLCV-Daten
-        np.random.seed(42)  # Für reproduzierbare Ergebnisse
-        
-        price_data = []
-        current_price = base_price
-        
-        for i in range(len(date_range)):
-            daily_return = np.random.normal(0.0001, 0.02)
-            current_price *= (1 + daily_return)
-            
-            high_low_range = current_price * 0.02
-            open_price = current_price * (1 + np.random.normal(0, 0.005))
-            close_price = current_price
-            high_price = max(open_price, close_price) + abs(np.random.normal(0, high_low_range/2))
-            low_price = min(open_price, close_price) - abs(np.random.normal(0, high_low_range/2))
-            
-            volume = np.random.randint(1000000, 10000000)
-            
-            price_data.append({
-                'date': date_range[i],
-                'Open': open_price,
-                'High': high_price,
-                'Low': low_price,
-                'Close': close_price,
-                'Volume': volume,
-                'Adj Close': close_price
-            })
-        
-        df = pd.DataFrame(price_data)
-        df.set_index('date', inplace=True)
-        
-        # Speichere die synthetischen Daten im Cache für zukünftige Verwendung
-        try:
-            os.makedirs(cache_dir, exist_ok=True)
-            df.to_csv(os.path.join(cache_dir, f"synthetic_{asset_type}_{timeframe}.csv"))
-        except Exception as e:
-            logger.error(f"Fehler beim Speichern der synthetischen Daten: {e}")
+        # Generiere synthetische OHLCV-Daten vektorisiert (reproduzierbar über einen festen Seed)
+        rng = np.random.RandomState(42)
+        n = len(date_range)
+        
+        close_price = base_price * np.cumprod(1 + rng.normal(0.0001, 0.02, n))
+        high_low_range = close_price * 0.02
+        open_price = close_price * (1 + rng.normal(0, 0.005, n))
+        high_price = np.maximum(open_price, close_price) + np.abs(rng.normal(0, high_low_range / 2))
+        low_price = np.minimum(open_price, close_price) - np.abs(rng.normal(0, high_low_range / 2))
+        volume = rng.randint(1000000, 10000000, n)
+        
+        df = pd.DataFrame({
+            'Open': open_price,
+            'High': high_price,
+            'Low': low_price,
+            'Close': close_price,
+            'Volume': volume,
+            'Adj Close': close_price
+        }, index=pd.DatetimeIndex(date_range, name='date'))
+        
+        # Im Speicher halten statt bei jedem Fehler neu zu erzeugen und als CSV zu schreiben
+        get_last_known_good().put(lkg_key, df)
         
         return df
@@ -0,0 +1,161 @@
+"""
+Produktionsserver für das Trading Dashboard
+Stellt die Dash-App über einen WSGI-Server mit mehreren Workern bereit (gunicorn oder waitress)
+"""
+
+import logging
+import multiprocessing
+import os
+import platform
+from typing import Any, Dict, Optional
+
+from flask import jsonify
+
+from utils.settings import ENV_PREFIX, get_env_setting
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.server")
+
+
+def get_server_options(host: Optional[str] = None, port: Optional[int] = None, workers: Optional[int] = None,
+                       threads: Optional[int] = None, preload: Optional[bool] = None,
+                       timeout: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Ermittelt die Serverkonfiguration aus Argumenten und Umgebungsvariablen
+
+    Explizit übergebene Werte haben Vorrang vor den Umgebungsvariablen
+    TRADING_DASHBOARD_HOST, _PORT, _WORKERS, _THREADS, _PRELOAD und _TIMEOUT.
+
+    Args:
+        host: Adresse, an die der Server gebunden wird
+        port: Port des Servers
+        workers: Anzahl der Worker-Prozesse (Standard: 2 * CPU-Kerne + 1)
+        threads: Anzahl der Threads pro Worker
+        preload: Ob die App vor dem Forken der Worker geladen wird
+        timeout: Timeout für Requests in Sekunden
+
+    Returns:
+        Dict[str, Any]: Serverkonfiguration
+    """
+    return {
+        'host': host or get_env_setting("HOST", "0.0.0.0"),
+        'port': port or get_env_setting("PORT", 8050, int),
+        'workers': workers or get_env_setting("WORKERS", multiprocessing.cpu_count() * 2 + 1, int),
+        'threads': threads or get_env_setting("THREADS", 4, int),
+        'preload': get_env_setting("PRELOAD", True, bool) if preload is None else preload,
+        'timeout': timeout or get_env_setting("TIMEOUT", 120, int),
+    }
+
+
+def register_health_routes(app) -> None:
+    """
+    Registriert Health- und Readiness-Endpunkte am Flask-Server der Dash-App
+
+    /health meldet, dass der Prozess antwortet. /ready prüft zusätzlich, ob Layout und
+    Callbacks geladen sind, das Cache-Verzeichnis beschreibbar ist und das Warm-up abgeschlossen ist.
+
+    Args:
+        app: Dash-App
+    """
+    server = app.server
+
+    @server.route("/health")
+    def health():
+        return jsonify(status="ok")
+
+    @server.route("/ready")
+    def ready():
+        from dash._callback import GLOBAL_CALLBACK_MAP
+        from dashboard.warmup import get_chart_data_cache
+        from utils.helpers import CacheManager
+
+        cache_dir = CacheManager().cache_dir
+        checks = {
+            'layout': app.layout is not None,
+            'callbacks': bool(app.callback_map or GLOBAL_CALLBACK_MAP),
+            'cache': os.path.isdir(cache_dir) and os.access(cache_dir, os.W_OK),
+            'warmup': get_chart_data_cache().is_warm,
+        }
+        is_ready = all(checks.values())
+        return jsonify(status="ready" if is_ready else "not_ready", checks=checks), 200 if is_ready else 503
+
+
+def post_fork(server, worker) -> None:
+    """
+    gunicorn-Hook nach dem Forken eines Workers
+
+    Threads überleben das Forken nicht. Die im Master vorgeladenen Daten werden vererbt,
+    die Aktualisierung im Hintergrund muss aber in jedem Worker neu gestartet werden.
+    """
+    from dashboard.warmup import get_chart_data_cache
+    get_chart_data_cache().restart_refresh()
+
+
+def run_gunicorn(options: Dict[str, Any]) -> None:
+    """
+    Startet die App mit gunicorn (Linux/macOS)
+
+    Args:
+        options: Serverkonfiguration aus get_server_options
+    """
+    from gunicorn.app.base import BaseApplication
+
+    class DashboardApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f"{options['host']}:{options['port']}")
+            self.cfg.set('workers', options['workers'])
+            self.cfg.set('threads', options['threads'])
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('preload_app', options['preload'])
+            self.cfg.set('timeout', options['timeout'])
+            self.cfg.set('post_fork', post_fork)
+
+        def load(self):
+            from wsgi import server
+            return server
+
+    DashboardApplication().run()
+
+
+def run_waitress(options: Dict[str, Any]) -> None:
+    """
+    Startet die App mit waitress (plattformunabhängig, ein Prozess mit mehreren Threads)
+
+    Args:
+        options: Serverkonfiguration aus get_server_options
+    """
+    from waitress import serve
+    from wsgi import server
+
+    # waitress arbeitet mit einem Prozess, daher werden alle Worker-Threads dort gebündelt
+    serve(server, host=options['host'], port=options['port'],
+          threads=options['workers'] * options['threads'], channel_timeout=options['timeout'])
+
+
+def run_production_server(**kwargs) -> None:
+    """
+    Startet den passenden Produktionsserver für die aktuelle Plattform
+
+    Args:
+        **kwargs: Optionen für get_server_options
+
+    Raises:
+        RuntimeError: Wenn weder gunicorn noch waitress installiert ist
+    """
+    options = get_server_options(**kwargs)
+    logger.info(f"Starte Produktionsserver mit {options}")
+
+    if platform.system() != "Windows":
+        try:
+            import gunicorn  # noqa: F401
+            run_gunicorn(options)
+            return
+        except ImportError:
+            logger.warning("gunicorn nicht installiert, versuche waitress")
+
+    try:
+        import waitress  # noqa: F401
+    except ImportError:
+        raise RuntimeError("Für den Produktionsbetrieb wird gunicorn oder waitress benötigt "
+                           "(pip install -r requirements.txt)")
+    run_waitress(options)
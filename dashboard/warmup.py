@@ -0,0 +1,247 @@
+"""
+Warm-up und Prefetch der Chart-Daten
+Lädt die Daten der Watchlist beim Serverstart vorab und aktualisiert sie regelmäßig im
+Hintergrund, sodass der erste Chart aus dem Speicher kommt
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from dashboard.chart_utils import generate_mock_data, get_available_assets
+from utils.settings import get_env_setting
+from data.memory_cache import freeze_frame
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.warmup")
+
+# Zeitrahmen, die beim Start standardmäßig vorgeladen werden
+DEFAULT_WARMUP_TIMEFRAMES = ["5m", "1h", "1d"]
+DEFAULT_MAX_ENTRIES = 256
+
+
+class ChartDataCache:
+    """
+    Speicher für vorgeladene Chart-Daten
+
+    Einträge werden über (Symbol, Zeitrahmen, Datenquelle) angesprochen. Fehlende oder
+    veraltete Einträge werden beim Abruf synchron nachgeladen. Die Anzahl der Einträge ist
+    begrenzt; der am längsten nicht verwendete Eintrag wird verdrängt.
+    """
+
+    def __init__(self, max_workers: int = 4, max_age: float = 900.0, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialisiert den Cache
+
+        Args:
+            max_workers: Maximale Anzahl paralleler Ladevorgänge beim Warm-up
+            max_age: Maximales Alter eines Eintrags in Sekunden
+            max_entries: Maximale Anzahl gespeicherter Einträge
+        """
+        self.max_workers = max_workers
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.is_warm = False
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str, str], Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_interval: Optional[float] = None
+        self._warmup_args: Tuple = ()
+
+    def _load(self, symbol: str, timeframe: str, data_source: str) -> Optional[Dict]:
+        """
+        Lädt die Daten eines Eintrags
+        """
+        df = generate_mock_data(symbol, timeframe, data_source=data_source)
+        if df is None or df.empty:
+            return None
+
+        key = (symbol, timeframe, data_source)
+        entry = {'data': freeze_frame(df), 'loaded_at': time.time()}
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def _get_entry(self, symbol: str, timeframe: str, data_source: str) -> Optional[Dict]:
+        with self._lock:
+            key = (symbol, timeframe, data_source)
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry['loaded_at'] <= self.max_age:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        return self._load(symbol, timeframe, data_source)
+
+    def get_data(self, symbol: str, timeframe: str, data_source: str = "yahoo") -> Optional[pd.DataFrame]:
+        """
+        Gibt die OHLCV-Daten für den Chart zurück
+
+        Args:
+            symbol: Symbol des Assets
+            timeframe: Zeitrahmen
+            data_source: Datenquelle
+
+        Returns:
+            Optional[pd.DataFrame]: Schreibgeschützte Daten im Format von generate_mock_data oder None
+        """
+        entry = self._get_entry(symbol, timeframe, data_source)
+        return entry['data'].copy(deep=False) if entry is not None else None
+
+    def warm_up(self, symbols: Optional[List[str]] = None, timeframes: Optional[List[str]] = None,
+                data_source: str = "yahoo") -> int:
+        """
+        Lädt die Daten für alle Kombinationen aus Symbolen und Zeitrahmen parallel vor
+
+        Args:
+            symbols: Symbole (Standard: alle Assets aus get_available_assets)
+            timeframes: Zeitrahmen (Standard: DEFAULT_WARMUP_TIMEFRAMES)
+            data_source: Datenquelle
+
+        Returns:
+            int: Anzahl erfolgreich geladener Einträge
+        """
+        symbols = symbols or [asset["value"] for asset in get_available_assets()]
+        timeframes = timeframes or DEFAULT_WARMUP_TIMEFRAMES
+        self._warmup_args = (symbols, timeframes, data_source)
+        jobs = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+
+        start = time.time()
+        loaded = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="warmup") as executor:
+            futures = [executor.submit(self._load, symbol, timeframe, data_source) for symbol, timeframe in jobs]
+            for (symbol, timeframe), future in zip(jobs, futures):
+                try:
+                    if future.result() is not None:
+                        loaded += 1
+                except Exception as e:
+                    logger.error(f"Fehler beim Vorladen von {symbol} ({timeframe}): {str(e)}")
+
+        self.is_warm = True
+        logger.info(f"Warm-up abgeschlossen: {loaded}/{len(jobs)} Einträge in {time.time() - start:.2f}s")
+        return loaded
+
+    def start_refresh(self, interval: float) -> None:
+        """
+        Startet die regelmäßige Aktualisierung der vorgeladenen Einträge im Hintergrund
+
+        Args:
+            interval: Abstand zwischen zwei Aktualisierungen in Sekunden
+        """
+        if self._refresh_thread is not None and self._refresh_thread.is_alive():
+            return
+        self._refresh_interval = interval
+        self._stop_event.clear()
+        self._refresh_thread = threading.Thread(target=self._refresh_loop, name="warmup-refresh", daemon=True)
+        self._refresh_thread.start()
+
+    def restart_refresh(self) -> None:
+        """
+        Startet den Aktualisierungs-Thread neu, z.B. in einem geforkten Worker-Prozess
+        """
+        if self._refresh_interval is not None:
+            self._refresh_thread = None
+            self.start_refresh(self._refresh_interval)
+
+    def stop_refresh(self) -> None:
+        """
+        Beendet die Aktualisierung im Hintergrund
+        """
+        self._stop_event.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join(timeout=5)
+        self._refresh_thread = None
+
+    def _refresh_loop(self) -> None:
+        while not self._stop_event.wait(self._refresh_interval):
+            try:
+                self.warm_up(*self._warmup_args)
+            except Exception as e:
+                logger.error(f"Fehler bei der Aktualisierung der vorgeladenen Daten: {str(e)}")
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Gibt Statistiken über den Cache zurück
+
+        Returns:
+            Dict[str, float]: Anzahl Einträge, Treffer, Fehlzugriffe und Trefferquote
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total else 0.0,
+            }
+
+
+# Globaler Cache für das Dashboard
+_chart_data_cache: Optional[ChartDataCache] = None
+_chart_data_cache_lock = threading.Lock()
+
+
+def get_chart_data_cache() -> ChartDataCache:
+    """
+    Gibt den globalen Chart-Daten-Cache zurück und erstellt ihn bei Bedarf
+
+    Returns:
+        ChartDataCache: Globaler Cache
+    """
+    global _chart_data_cache
+    with _chart_data_cache_lock:
+        if _chart_data_cache is None:
+            _chart_data_cache = ChartDataCache(
+                max_workers=get_env_setting("WARMUP_WORKERS", 4, int),
+                max_age=get_env_setting("WARMUP_MAX_AGE", 900.0, float),
+                max_entries=get_env_setting("WARMUP_MAX_ENTRIES", DEFAULT_MAX_ENTRIES, int),
+            )
+        return _chart_data_cache
+
+
+def start_warmup(block: bool = True) -> Optional[threading.Thread]:
+    """
+    Führt das Warm-up gemäß Konfiguration aus und startet die Aktualisierung im Hintergrund
+
+    Gesteuert über TRADING_DASHBOARD_WARMUP (an/aus), _WARMUP_TIMEFRAMES (kommagetrennt),
+    _WARMUP_SOURCE, _WARMUP_WORKERS, _WARMUP_MAX_AGE, _WARMUP_MAX_ENTRIES und _WARMUP_REFRESH
+    (Sekunden, 0 = aus).
+
+    Args:
+        block: Ob auf das Ende des ersten Warm-ups gewartet wird (z.B. vor dem Forken der Worker)
+
+    Returns:
+        Optional[threading.Thread]: Thread des Warm-ups, wenn block False ist
+    """
+    cache = get_chart_data_cache()
+    if not get_env_setting("WARMUP", True, bool):
+        cache.is_warm = True
+        return None
+
+    timeframes = [tf.strip() for tf in get_env_setting("WARMUP_TIMEFRAMES", ",".join(DEFAULT_WARMUP_TIMEFRAMES)).split(",")
+                  if tf.strip()]
+    data_source = get_env_setting("WARMUP_SOURCE", "yahoo")
+    refresh = get_env_setting("WARMUP_REFRESH", 600.0, float)
+
+    def run():
+        cache.warm_up(timeframes=timeframes, data_source=data_source)
+        if refresh > 0:
+            cache.start_refresh(refresh)
+
+    if block:
+        run()
+        return None
+    thread = threading.Thread(target=run, name="warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,192 @@
+"""
+Bar-Pyramide für das Trading Dashboard
+Hält die feinste verfügbare Zeitreihe einmal im Speicher und leitet alle gröberen Zeitrahmen
+daraus ab, statt jeden Zeitrahmen einzeln abzurufen oder zu generieren
+"""
+
+import logging
+import threading
+from typing import Dict, List, Union
+
+import pandas as pd
+
+from data.resampler import TIMEFRAME_FREQS, SessionAnchor, get_timeframe_freq, resample_ohlcv
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.bar_pyramid")
+
+# Ungefähre Dauer je Zeitrahmen, um zu prüfen, ob ein Zeitrahmen aus der Basis ableitbar ist
+LEVEL_DURATIONS = {
+    '1min': pd.Timedelta(minutes=1),
+    '2min': pd.Timedelta(minutes=2),
+    '3min': pd.Timedelta(minutes=3),
+    '5min': pd.Timedelta(minutes=5),
+    '15min': pd.Timedelta(minutes=15),
+    '30min': pd.Timedelta(minutes=30),
+    '1h': pd.Timedelta(hours=1),
+    '4h': pd.Timedelta(hours=4),
+    '1D': pd.Timedelta(days=1),
+    'W': pd.Timedelta(weeks=1),
+    'MS': pd.Timedelta(days=28),
+}
+
+
+def _normalize_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Bringt eine OHLCV-Reihe auf einen sortierten, zeitzonenfreien DatetimeIndex
+
+    Zeitzonenbehaftete Indizes werden wie im übrigen Projekt auf die lokale Uhrzeit reduziert.
+    """
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df = df.set_index('date') if 'date' in df.columns else df.copy()
+        df.index = pd.to_datetime(df.index)
+    if df.index.tz is not None:
+        df = df.copy()
+        df.index = df.index.tz_localize(None)
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind='stable')
+    return df
+
+
+def aggregate_ohlcv(df: pd.DataFrame, timeframe: str, session: Union[str, SessionAnchor, None] = None) -> pd.DataFrame:
+    """
+    Aggregiert OHLCV-Daten vektorisiert auf einen gröberen Zeitrahmen
+
+    Args:
+        df: DataFrame mit OHLCV-Spalten (open/high/low/close/volume, beliebige Groß-/Kleinschreibung)
+        timeframe: Ziel-Zeitrahmen (Schlüssel aus TIMEFRAME_FREQS)
+        session: Handelssitzung für die Verankerung, z.B. 'NQ' (Schlüssel aus data.resampler.SESSIONS)
+
+    Returns:
+        pd.DataFrame: Aggregierte Daten mit denselben Spaltennamen wie die Eingabe
+
+    Raises:
+        ResampleError: Wenn der Zeitrahmen unbekannt ist oder OHLC-Spalten fehlen
+    """
+    return resample_ohlcv(_normalize_frame(df), timeframe, session)
+
+
+class BarPyramid:
+    """
+    Mehrstufige Bar-Pyramide auf Basis einer einzigen Zeitreihe
+
+    Die Basisreihe wird einmal gehalten, abgeleitete Zeitrahmen werden beim ersten Abruf
+    berechnet und zwischengespeichert. Neue Basis-Bars aktualisieren die gespeicherten
+    Zeitrahmen inkrementell ab dem letzten, möglicherweise unvollständigen Bucket.
+    """
+
+    def __init__(self, base: pd.DataFrame, base_timeframe: str = '1m',
+                 session: Union[str, SessionAnchor, None] = None):
+        """
+        Initialisiert die Bar-Pyramide
+
+        Args:
+            base: OHLCV-Daten im feinsten verfügbaren Zeitrahmen
+            base_timeframe: Zeitrahmen der Basisreihe (Schlüssel aus TIMEFRAME_FREQS)
+            session: Handelssitzung, an der abgeleitete Bars verankert werden, z.B. 'NQ'
+                (ohne Angabe: Mitternacht)
+        """
+        self.base_timeframe = base_timeframe
+        self.session = session
+        self._base_duration = LEVEL_DURATIONS[get_timeframe_freq(base_timeframe)]
+        self._base = _normalize_frame(base)
+        self._levels: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def base(self) -> pd.DataFrame:
+        """
+        Kopie der Basisreihe
+        """
+        with self._lock:
+            return self._base.copy()
+
+    def supports(self, timeframe: str) -> bool:
+        """
+        Prüft, ob ein Zeitrahmen aus der Basisreihe ableitbar ist
+
+        Args:
+            timeframe: Zeitrahmen
+
+        Returns:
+            bool: True, wenn der Zeitrahmen bekannt und nicht feiner als die Basis ist
+        """
+        freq = TIMEFRAME_FREQS.get(timeframe)
+        return freq is not None and LEVEL_DURATIONS[freq] >= self._base_duration
+
+    def cached_levels(self) -> List[str]:
+        """
+        Gibt die bereits berechneten Zeitrahmen zurück
+
+        Returns:
+            List[str]: Zeitrahmen mit gespeicherten Daten
+        """
+        with self._lock:
+            return [self._timeframe_for(freq) for freq in self._levels]
+
+    def get(self, timeframe: str) -> pd.DataFrame:
+        """
+        Gibt die Daten für einen Zeitrahmen zurück und berechnet sie bei Bedarf
+
+        Args:
+            timeframe: Zeitrahmen (Schlüssel aus TIMEFRAME_FREQS)
+
+        Returns:
+            pd.DataFrame: Kopie der aggregierten Daten
+
+        Raises:
+            ValueError: Wenn der Zeitrahmen unbekannt oder feiner als die Basisreihe ist
+        """
+        if not self.supports(timeframe):
+            raise ValueError(f"Zeitrahmen {timeframe} ist nicht aus der Basis {self.base_timeframe} ableitbar")
+
+        freq = TIMEFRAME_FREQS[timeframe]
+        with self._lock:
+            if freq == TIMEFRAME_FREQS[self.base_timeframe]:
+                return self._base.copy()
+            level = self._levels.get(freq)
+            if level is None:
+                level = aggregate_ohlcv(self._base, timeframe, self.session)
+                self._levels[freq] = level
+            return level.copy()
+
+    def append(self, bars: pd.DataFrame) -> int:
+        """
+        Übernimmt neue Basis-Bars und aktualisiert die gespeicherten Zeitrahmen inkrementell
+
+        Bars vor dem letzten bekannten Zeitstempel werden ignoriert, der letzte Bar wird durch
+        die neue Version ersetzt (er kann beim vorherigen Abruf unvollständig gewesen sein).
+        Jeder gespeicherte Zeitrahmen wird nur ab dem Bucket neu aggregiert, in den der
+        erste neue Bar fällt.
+
+        Args:
+            bars: Neue OHLCV-Daten im Zeitrahmen der Basisreihe
+
+        Returns:
+            int: Anzahl der übernommenen Bars
+        """
+        bars = _normalize_frame(bars)
+        with self._lock:
+            if not self._base.empty:
+                bars = bars[bars.index >= self._base.index[-1]]
+            if bars.empty:
+                return 0
+
+            first_new = bars.index[0]
+            kept = self._base[self._base.index < first_new]
+            self._base = pd.concat([kept, bars[self._base.columns.intersection(bars.columns)]])
+
+            for freq, level in self._levels.items():
+                # Neu berechnen ab dem Bucket, in den der erste neue Bar fällt
+                position = level.index.searchsorted(first_new, side='right') - 1
+                cutoff = level.index[position] if position >= 0 else self._base.index[0]
+                tail = aggregate_ohlcv(self._base[self._base.index >= cutoff], self._timeframe_for(freq),
+                                       self.session)
+                self._levels[freq] = pd.concat([level[level.index < cutoff], tail])
+
+        logger.debug(f"{len(bars)} Bars in die Bar-Pyramide ({self.base_timeframe}) übernommen")
+        return len(bars)
+
+    @staticmethod
+    def _timeframe_for(freq: str) -> str:
+        return next(timeframe for timeframe, level_freq in TIMEFRAME_FREQS.items() if level_freq == freq)
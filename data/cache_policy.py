@@ -0,0 +1,205 @@
+"""
+Cache-Richtlinie mit Stale-while-revalidate
+Legt je Zeitrahmen fest, wie lange gecachte Daten frisch sind und wie lange sie danach noch
+ausgeliefert werden dürfen, während sie im Hintergrund neu abgerufen werden. Erst wenn auch
+dieses Fenster abgelaufen ist, wartet eine Anfrage auf den Abruf.
+"""
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from utils.settings import get_env_setting
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.cache_policy")
+
+FRESH = 'fresh'
+STALE = 'stale'
+EXPIRED = 'expired'
+
+# Frische (max_age) und zusätzliches Fenster für veraltete Daten (stale_ttl) in Sekunden je Einheit
+DEFAULT_MAX_AGE = {'m': 3600, 'h': 3600, 'd': 86400, 'wk': 86400, 'mo': 86400}
+DEFAULT_STALE_TTL = {'m': 86400, 'h': 86400, 'd': 7 * 86400, 'wk': 7 * 86400, 'mo': 7 * 86400}
+
+_overrides: Dict[str, Dict[str, float]] = {'max_age': {}, 'stale_ttl': {}}
+_overrides_loaded = False
+_overrides_lock = threading.Lock()
+
+
+def _get_unit(timeframe: str) -> str:
+    timeframe = timeframe.lower()
+    if timeframe.endswith('mo'):
+        return 'mo'
+    if timeframe.endswith('wk') or timeframe.endswith('w'):
+        return 'wk'
+    if timeframe.endswith('d'):
+        return 'd'
+    if timeframe.endswith('h'):
+        return 'h'
+    return 'm'
+
+
+def _parse_setting(value: str) -> Dict[str, float]:
+    # Format: '1d=43200,5m=300'
+    parsed = {}
+    for item in value.split(','):
+        if '=' in item:
+            timeframe, seconds = item.split('=', 1)
+            parsed[timeframe.strip()] = float(seconds)
+    return parsed
+
+
+def _load_overrides() -> None:
+    global _overrides_loaded
+    with _overrides_lock:
+        if not _overrides_loaded:
+            _overrides_loaded = True
+            _overrides['max_age'].update(_parse_setting(get_env_setting("CACHE_MAX_AGE", "")))
+            _overrides['stale_ttl'].update(_parse_setting(get_env_setting("CACHE_STALE_TTL", "")))
+
+
+def set_cache_policy(timeframe: str, max_age: Optional[float] = None, stale_ttl: Optional[float] = None) -> None:
+    """
+    Legt Frische und Stale-Fenster für einen Zeitrahmen fest
+
+    Args:
+        timeframe: Zeitrahmen, z.B. '5m' oder '1d'
+        max_age: Sekunden, die Daten als frisch gelten
+        stale_ttl: Sekunden nach max_age, in denen veraltete Daten noch ausgeliefert werden
+    """
+    _load_overrides()
+    with _overrides_lock:
+        if max_age is not None:
+            _overrides['max_age'][timeframe] = float(max_age)
+        if stale_ttl is not None:
+            _overrides['stale_ttl'][timeframe] = float(stale_ttl)
+
+
+def get_max_age(timeframe: str) -> float:
+    """
+    Gibt zurück, wie lange gecachte Daten eines Zeitrahmens frisch sind
+
+    Konfiguration über TRADING_DASHBOARD_CACHE_MAX_AGE, z.B. '1d=43200,5m=300'.
+
+    Args:
+        timeframe: Zeitrahmen, z.B. '5m' oder '1d'
+
+    Returns:
+        float: Sekunden
+    """
+    _load_overrides()
+    return _overrides['max_age'].get(timeframe, DEFAULT_MAX_AGE[_get_unit(timeframe)])
+
+
+def get_stale_ttl(timeframe: str) -> float:
+    """
+    Gibt zurück, wie lange veraltete Daten nach Ablauf der Frische noch ausgeliefert werden
+
+    Konfiguration über TRADING_DASHBOARD_CACHE_STALE_TTL im selben Format (0 schaltet
+    Stale-while-revalidate für den Zeitrahmen ab).
+
+    Args:
+        timeframe: Zeitrahmen, z.B. '5m' oder '1d'
+
+    Returns:
+        float: Sekunden
+    """
+    _load_overrides()
+    return _overrides['stale_ttl'].get(timeframe, DEFAULT_STALE_TTL[_get_unit(timeframe)])
+
+
+def get_cache_state(timeframe: str, age: float, max_age: Optional[float] = None) -> str:
+    """
+    Bewertet gecachte Daten anhand ihres Alters
+
+    Args:
+        timeframe: Zeitrahmen der Daten
+        age: Alter der Daten in Sekunden
+        max_age: Frische in Sekunden (Standard: get_max_age(timeframe))
+
+    Returns:
+        str: 'fresh', 'stale' (ausliefern und im Hintergrund aktualisieren) oder 'expired'
+    """
+    max_age = get_max_age(timeframe) if max_age is None else max_age
+    if age < max_age:
+        return FRESH
+    if age < max_age + get_stale_ttl(timeframe):
+        return STALE
+    return EXPIRED
+
+
+class BackgroundRefresher:
+    """
+    Führt Cache-Aktualisierungen in einem begrenzten Thread-Pool aus
+
+    Je Schlüssel läuft höchstens eine Aktualisierung; weitere Anforderungen für denselben
+    Schlüssel werden verworfen, solange sie läuft. Fehler werden protokolliert, die veralteten
+    Daten bleiben dann im Cache.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        """
+        Initialisiert den Refresher
+
+        Args:
+            max_workers: Anzahl paralleler Aktualisierungen
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cache-refresh")
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def schedule(self, key: str, refresh: Callable[[], object]) -> Optional[Future]:
+        """
+        Plant eine Aktualisierung
+
+        Args:
+            key: Schlüssel der gecachten Daten
+            refresh: Abruf, der den Cache neu schreibt
+
+        Returns:
+            Optional[Future]: Future der Aktualisierung oder None, wenn für key bereits eine läuft
+        """
+        with self._lock:
+            if key in self._pending:
+                return None
+            future = self._executor.submit(refresh)
+            self._pending[key] = future
+        logger.info(f"Veraltete Daten für {key} ausgeliefert, Aktualisierung im Hintergrund geplant")
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return future
+
+    def _finish(self, key: str, future: Future) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+        if future.exception() is not None:
+            logger.warning(f"Hintergrundaktualisierung für {key} fehlgeschlagen: {str(future.exception())}")
+
+    def pending(self) -> int:
+        """
+        Gibt die Anzahl laufender oder wartender Aktualisierungen zurück
+
+        Returns:
+            int: Anzahl
+        """
+        with self._lock:
+            return len(self._pending)
+
+
+_refresher: Optional[BackgroundRefresher] = None
+_refresher_lock = threading.Lock()
+
+
+def get_background_refresher() -> BackgroundRefresher:
+    """
+    Gibt den prozessweit geteilten Refresher zurück (Threads: TRADING_DASHBOARD_CACHE_REFRESH_WORKERS)
+
+    Returns:
+        BackgroundRefresher: Geteilter Refresher
+    """
+    global _refresher
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = BackgroundRefresher(get_env_setting("CACHE_REFRESH_WORKERS", 2, int))
+        return _refresher
@@ -0,0 +1,267 @@
+"""
+Circuit Breaker und Last-known-good-Speicher für Upstream-Datenquellen
+Ein Circuit Breaker je Upstream (Manus-API, yfinance, Twelve Data) zählt aufeinanderfolgende
+Fehler. Ab einer Schwelle wird der Upstream für eine Wartezeit übersprungen, statt bei jedem
+Aufruf erneut in Timeouts zu laufen; danach lässt der Breaker einen einzelnen Probeaufruf durch.
+Als Fehler zählen nur Ausfälle des Upstreams (Verbindungsfehler, Timeouts, 5xx-Antworten), nicht
+Anfragen ohne Daten für ein Symbol. Der Last-known-good-Speicher hält die zuletzt erfolgreich
+abgerufenen Daten je Symbol im Speicher, damit sie bei einem Ausfall sofort ausgeliefert werden
+können.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import pandas as pd
+
+from utils.settings import get_env_setting
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.circuit_breaker")
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Namen der Upstreams
+YAHOO_API = 'yahoo_api'
+YFINANCE = 'yfinance'
+TWELVE_DATA = 'twelve_data'
+
+DEFAULT_FAILURE_THRESHOLD = 3
+DEFAULT_RESET_TIMEOUT = 60.0
+DEFAULT_LKG_ENTRIES = 256
+
+
+class CircuitBreaker:
+    """
+    Circuit Breaker für einen Upstream
+
+    closed: Aufrufe laufen durch, Fehler werden gezählt. open: nach failure_threshold Fehlern in
+    Folge werden Aufrufe reset_timeout Sekunden lang abgelehnt. half_open: danach darf genau ein
+    Probeaufruf durch; Erfolg schließt den Breaker, ein Fehler öffnet ihn erneut.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        """
+        Initialisiert den Circuit Breaker
+
+        Args:
+            name: Name des Upstreams (für Logs)
+            failure_threshold: Anzahl Fehler in Folge, nach der der Breaker öffnet
+            reset_timeout: Sekunden, die der Breaker offen bleibt
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.rejected = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """
+        Aktueller Zustand ('closed', 'open' oder 'half_open')
+        """
+        with self._lock:
+            return self._get_state()
+
+    def _get_state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return OPEN
+        return HALF_OPEN
+
+    def allow(self) -> bool:
+        """
+        Prüft, ob ein Aufruf des Upstreams erlaubt ist
+
+        Returns:
+            bool: True, wenn der Aufruf ausgeführt werden soll; das Ergebnis muss danach mit
+                record_success() oder record_failure() gemeldet werden
+        """
+        with self._lock:
+            state = self._get_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """
+        Meldet einen erfolgreichen Aufruf und schließt den Breaker
+        """
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"Circuit Breaker {self.name} geschlossen")
+            self.failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """
+        Meldet einen fehlgeschlagenen Aufruf und öffnet den Breaker bei Erreichen der Schwelle
+        """
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                if self._opened_at is None or self._probing:
+                    logger.warning(f"Circuit Breaker {self.name} geöffnet nach {self.failures} Fehlern, "
+                                   f"Upstream wird {self.reset_timeout:.0f} s übersprungen")
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+
+    def record_error(self, error: BaseException) -> None:
+        """
+        Meldet einen Aufruf, der mit einer Ausnahme endete
+
+        Nur Ausfälle des Upstreams (siehe is_upstream_failure) zählen als Fehler; alle anderen
+        Ausnahmen folgen auf eine Antwort des Upstreams und gelten für den Breaker als Erfolg.
+
+        Args:
+            error: Ausgelöste Ausnahme
+        """
+        if is_upstream_failure(error):
+            self.record_failure()
+        else:
+            self.record_success()
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """
+    Prüft, ob eine Ausnahme auf einen Ausfall des Upstreams hinweist
+
+    Als Ausfall gelten Verbindungsfehler, Timeouts und Antworten mit 5xx-Status. Ungültige oder
+    leere Antworten, z.B. für ein unbekanntes Symbol, sind normale Fehlschläge einer Anfrage.
+
+    Args:
+        error: Ausgelöste Ausnahme
+
+    Returns:
+        bool: True bei Verbindungsfehlern, Timeouts und 5xx-Antworten
+    """
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status is None:
+        status = getattr(error, 'code', None)
+    if isinstance(status, int):
+        return status >= 500
+    # Dekodierfehler (z.B. requests.JSONDecodeError) sind zugleich OSError und ValueError
+    if isinstance(error, ValueError):
+        return False
+    return isinstance(error, OSError)
+
+
+class LastKnownGoodStore:
+    """
+    Zuletzt erfolgreich abgerufene Daten je Schlüssel (z.B. Symbol und Zeitrahmen) im Speicher
+
+    Die Anzahl der Einträge ist begrenzt; der am längsten nicht verwendete Eintrag wird verdrängt.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_LKG_ENTRIES):
+        """
+        Initialisiert den Speicher
+
+        Args:
+            max_entries: Maximale Anzahl gespeicherter DataFrames
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """
+        Speichert einen Snapshot (leere DataFrames werden ignoriert)
+
+        Args:
+            key: Schlüssel, z.B. Symbol und Zeitrahmen
+            df: Erfolgreich abgerufene Daten
+        """
+        if df is None or df.empty:
+            return
+        with self._lock:
+            self._entries[key] = df.copy()
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Gibt eine Kopie des Snapshots zurück
+
+        Args:
+            key: Schlüssel, z.B. Symbol und Zeitrahmen
+
+        Returns:
+            Optional[pd.DataFrame]: Kopie der Daten oder None
+        """
+        with self._lock:
+            df = self._entries.get(key)
+            if df is None:
+                return None
+            self._entries.move_to_end(key)
+        return df.copy()
+
+    def clear(self) -> None:
+        """
+        Entfernt alle Snapshots
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+_last_known_good: Optional[LastKnownGoodStore] = None
+_last_known_good_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """
+    Gibt den prozessweit geteilten Circuit Breaker eines Upstreams zurück
+
+    Konfiguration über TRADING_DASHBOARD_CIRCUIT_FAILURE_THRESHOLD und
+    TRADING_DASHBOARD_CIRCUIT_RESET_TIMEOUT (Sekunden).
+
+    Args:
+        name: Name des Upstreams, z.B. 'yfinance'
+
+    Returns:
+        CircuitBreaker: Geteilter Breaker
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=get_env_setting("CIRCUIT_FAILURE_THRESHOLD", DEFAULT_FAILURE_THRESHOLD, int),
+                reset_timeout=get_env_setting("CIRCUIT_RESET_TIMEOUT", DEFAULT_RESET_TIMEOUT, float),
+            )
+        return breaker
+
+
+def get_last_known_good() -> LastKnownGoodStore:
+    """
+    Gibt den prozessweit geteilten Last-known-good-Speicher zurück
+    (Größe: TRADING_DASHBOARD_LKG_MAX_ENTRIES)
+
+    Returns:
+        LastKnownGoodStore: Geteilter Speicher
+    """
+    global _last_known_good
+    with _last_known_good_lock:
+        if _last_known_good is None:
+            _last_known_good = LastKnownGoodStore(get_env_setting("LKG_MAX_ENTRIES", DEFAULT_LKG_ENTRIES, int))
+        return _last_known_good
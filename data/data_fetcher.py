@@ -14,14 +14,20 @@ from pathlib import Path
 # Importiere yfinance global, damit es in allen Methoden verfügbar ist
 import yfinance as yf
 
-# Versuche, die Manus API zu importieren, ansonsten verwende nur yfinance
-try:
-    sys.path.append('/opt/.manus/.sandbox-runtime')
-    from data_api import ApiClient
-    
-    # Teste, ob die API tatsächlich funktioniert
+from data.cache_policy import EXPIRED, STALE, get_background_refresher, get_cache_state
+from data.circuit_breaker import YAHOO_API, YFINANCE, get_circuit_breaker, get_last_known_good, is_upstream_failure
+from data.http_client import get_api_client
+from data.single_flight import get_single_flight
+from data.timestamps import epoch_to_index, get_symbol_timezone, normalize_frame
+from utils.helpers import CacheManager
+
+# Prüfe, ob die Manus API verfügbar ist und tatsächlich funktioniert, ansonsten verwende nur yfinance
+client = get_api_client()
+if client is None:
+    API_AVAILABLE = False
+    print("Manus API nicht verfügbar, verwende yfinance als Fallback")
+else:
     try:
-        client = ApiClient()
         test_response = client.call_api('YahooFinance/get_stock_chart', query={
             'symbol': 'AAPL',
             'interval': '1d',
@@ -36,21 +42,19 @@ try:
     except Exception as e:
         API_AVAILABLE = False
         print(f"Manus API-Test fehlgeschlagen: {e}. Verwende yfinance als Fallback")
-except ImportError:
-    API_AVAILABLE = False
-    print("Manus API nicht verfügbar, verwende yfinance als Fallback")
 
 class DataFetcher:
     """
     Klasse zum Abrufen und Verwalten von Handelsdaten
     """
-    def __init__(self, cache_dir=None):
+    def __init__(self, cache_dir=None, api_client=None):
         """
         Initialisiert den DataFetcher
         
         Args:
             cache_dir (str, optional): Verzeichnis für den Daten-Cache. 
                                       Standardmäßig wird ein 'cache' Verzeichnis im data-Ordner verwendet.
+            api_client (optional): Client mit call_api(api, query) (Standard: geteilter Manus-API-Client)
         """
         if cache_dir is None:
             # Standardverzeichnis für den Cache
@@ -61,9 +65,8 @@ class DataFetcher:
         # Stelle sicher, dass das Cache-Verzeichnis existiert
         os.makedirs(self.cache_dir, exist_ok=True)
         
-        # Initialisiere API-Client, wenn verfügbar
-        if API_AVAILABLE:
-            self.client = ApiClient()
+        # Verwende den übergebenen oder den geteilten API-Client, wenn verfügbar
+        self.client = api_client if api_client is not None else (get_api_client() if API_AVAILABLE else None)
         
     def get_stock_data(self, symbol, interval='1d', range='1y', use_cache=True, force_refresh=False):
         """
@@ -79,40 +82,65 @@ class DataFetcher:
         Returns:
             pandas.DataFrame: DataFrame mit den Aktiendaten
         """
+        # Gleichzeitige Abrufe desselben Symbols (auch aus anderen Worker-Prozessen) zusammenfassen
+        key = f"{symbol}_{interval}_{range}_{use_cache}_{force_refresh}"
+        return get_single_flight().do(
+            key, lambda: self._get_stock_data(symbol, interval, range, use_cache, force_refresh), self.cache_dir)
+    
+    def _get_stock_data(self, symbol, interval, range, use_cache, force_refresh):
+        """
+        Ruft Aktiendaten aus dem Cache oder über die API bzw. yfinance ab
+        
+        Veraltete Cache-Daten innerhalb des Stale-Fensters werden sofort zurückgegeben und im
+        Hintergrund neu abgerufen (siehe data.cache_policy).
+        """
         cache_file = self.cache_dir / f"{symbol}_{interval}_{range}.csv"
         
         # Prüfe, ob Cache verwendet werden soll und Datei existiert
         if use_cache and cache_file.exists() and not force_refresh:
-            # Prüfe, ob Cache aktuell ist (für tägliche Daten nicht älter als 1 Tag)
-            cache_age = datetime.now() - datetime.fromtimestamp(cache_file.stat().st_mtime)
-            if interval in ['1d', '1wk', '1mo'] and cache_age.days < 1:
-                print(f"Verwende gecachte Daten für {symbol}")
-                return pd.read_csv(cache_file, index_col=0, parse_dates=True)
-            elif interval.endswith('m') and cache_age.seconds < 3600:  # Für Minutendaten: 1 Stunde Cache
+            # Prüfe das Alter des Caches anhand der Richtlinie für den Zeitrahmen
+            state = get_cache_state(interval, time.time() - cache_file.stat().st_mtime)
+            if state != EXPIRED:
                 print(f"Verwende gecachte Daten für {symbol}")
-                return pd.read_csv(cache_file, index_col=0, parse_dates=True)
-        
-        # Daten abrufen
-        if API_AVAILABLE:
+                data = pd.read_csv(cache_file, index_col=0, parse_dates=True)
+                get_last_known_good().put(f"{symbol}_{interval}_{range}", data)
+                if state == STALE:
+                    get_background_refresher().schedule(
+                        str(cache_file), lambda: self.get_stock_data(symbol, interval, range, use_cache, True))
+                return data
+
+        # Daten abrufen; Upstreams mit offenem Circuit Breaker werden übersprungen
+        lkg_key = f"{symbol}_{interval}_{range}"
+        for upstream, fetch in ((YAHOO_API, self._fetch_data_from_api), (YFINANCE, self._fetch_data_from_yfinance)):
+            if upstream == YAHOO_API and self.client is None:
+                continue
+            breaker = get_circuit_breaker(upstream)
+            if not breaker.allow():
+                print(f"{upstream} übersprungen: Circuit Breaker offen")
+                continue
             try:
-                data = self._fetch_data_from_api(symbol, interval, range)
-                if data is not None and not data.empty:
-                    # Speichere Daten im Cache
-                    if use_cache:
-                        data.to_csv(cache_file)
-                    return data
+                data = fetch(symbol, interval, range)
             except Exception as e:
-                print(f"Fehler beim Abrufen der Daten über API: {e}")
-                print("Verwende yfinance als Fallback...")
-        
-        # Fallback zu yfinance
-        data = self._fetch_data_from_yfinance(symbol, interval, range)
-        
-        # Speichere Daten im Cache
-        if use_cache and data is not None and not data.empty:
-            data.to_csv(cache_file)
-            
-        return data
+                print(f"Fehler beim Abrufen der Daten über {upstream}: {e}")
+                breaker.record_error(e)
+                continue
+            # Eine Antwort ohne Daten (z.B. unbekanntes Symbol) ist kein Ausfall des Upstreams
+            breaker.record_success()
+            if data is None or data.empty:
+                continue
+            get_last_known_good().put(lkg_key, data)
+
+            # Speichere Daten im Cache
+            if use_cache:
+                CacheManager.write_csv_atomic(data, cache_file)
+            return data
+
+        # Alle Upstreams fehlgeschlagen: zuletzt erfolgreich abgerufene Daten verwenden
+        data = get_last_known_good().get(lkg_key)
+        if data is not None:
+            print(f"Verwende zuletzt erfolgreich abgerufene Daten für {symbol}")
+            return data
+        return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume', 'Adj Close'])
     
     def _fetch_data_from_api(self, symbol, interval, range):
         """
@@ -149,9 +177,8 @@ class DataFetcher:
                     'Adj Close': adjclose
                 }
                 
-                # Konvertiere Zeitstempel zu Datetime
-                # Behebe das tzinfo-Problem durch explizite Konvertierung ohne Zeitzoneninformation
-                index = pd.to_datetime([datetime.fromtimestamp(ts).replace(tzinfo=None) for ts in timestamps])
+                # Konvertiere Zeitstempel vektorisiert in lokale Börsenzeit ohne Zeitzoneninformation
+                index = epoch_to_index(timestamps, get_symbol_timezone(symbol))
                 
                 # Erstelle DataFrame
                 df = pd.DataFrame(data, index=index)
@@ -165,6 +192,9 @@ class DataFetcher:
             
         except Exception as e:
             print(f"Fehler beim Abrufen der Daten über API: {e}")
+            # Ausfälle des Upstreams werden für den Circuit Breaker weitergereicht
+            if is_upstream_failure(e):
+                raise
             return pd.DataFrame()
     
     def _fetch_data_from_yfinance(self, symbol, interval, range):
@@ -218,14 +248,17 @@ class DataFetcher:
                 # Versuche den direkten Download
                 df = yf.download(symbol, start=start_str, end=end_str, interval=interval)
             
-            # Standardisiere Spaltennamen
+            # Standardisiere Spaltennamen und Zeitstempel
             if not df.empty:
-                df.columns = [col if col != 'Stock Splits' else 'Splits' for col in df.columns]
+                df = normalize_frame(df, get_symbol_timezone(symbol))
             
             return df
             
         except Exception as e:
             print(f"Fehler beim Abrufen der Daten über yfinance: {e}")
+            # Ausfälle des Upstreams werden für den Circuit Breaker weitergereicht
+            if is_upstream_failure(e):
+                raise
             # Erstelle einen leeren DataFrame mit den erwarteten Spalten
             return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume', 'Adj Close'])
     
@@ -259,7 +292,7 @@ class DataFetcher:
         Returns:
             dict: Dictionary mit technischen Indikatoren
         """
-        if not API_AVAILABLE:
+        if self.client is None:
             print("Technische Indikatoren sind nur über die Manus API verfügbar")
             return {}
             
@@ -6,6 +6,23 @@ Verantwortlich für die Verarbeitung und Analyse von Handelsdaten
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+from data.indicator_pipeline import DEFAULT_INDICATORS, IndicatorPipeline
+from utils.kernels import ewma, wilder_smooth
+
+@lru_cache(maxsize=32)
+def get_indicator_pipeline(indicators):
+    """
+    Gibt die (zwischengespeicherte) Pipeline für eine Auswahl von Indikatoren zurück
+    
+    Args:
+        indicators (tuple): Indikator-Spezifikationen
+        
+    Returns:
+        IndicatorPipeline: Pipeline mit aufgelöstem Abhängigkeitsgraphen
+    """
+    return IndicatorPipeline(indicators)
 
 class DataProcessor:
     """
@@ -27,37 +44,44 @@ class DataProcessor:
         return data['Close'].rolling(window=window).mean()
     
     @staticmethod
-    def calculate_ema(data, window=20):
+    def calculate_ema(data, window=20, seed='first'):
         """
         Berechnet den Exponential Moving Average (EMA)
         
         Args:
             data (pandas.DataFrame): DataFrame mit Preisdaten
             window (int): Fenstergröße für den gleitenden Durchschnitt
+            seed (str): Startwert, 'first' (erster Schlusskurs) oder 'sma' (SMA der ersten window Werte)
             
         Returns:
             pandas.Series: Serie mit EMA-Werten
         """
+        if seed == 'sma':
+            return pd.Series(ewma(data['Close'], 2.0 / (window + 1), window), index=data.index)
         return data['Close'].ewm(span=window, adjust=False).mean()
     
     @staticmethod
-    def calculate_rsi(data, window=14):
+    def calculate_rsi(data, window=14, smoothing='sma'):
         """
         Berechnet den Relative Strength Index (RSI)
         
         Args:
             data (pandas.DataFrame): DataFrame mit Preisdaten
             window (int): Fenstergröße für den RSI
+            smoothing (str): 'sma' (gleitender Mittelwert) oder 'wilder' (Wilder-Glättung)
             
         Returns:
             pandas.Series: Serie mit RSI-Werten
         """
         delta = data['Close'].diff()
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-        
-        avg_gain = gain.rolling(window=window).mean()
-        avg_loss = loss.rolling(window=window).mean()
+        if smoothing == 'wilder':
+            avg_gain = pd.Series(wilder_smooth(delta.clip(lower=0), window), index=data.index)
+            avg_loss = pd.Series(wilder_smooth((-delta).clip(lower=0), window), index=data.index)
+        else:
+            gain = delta.where(delta > 0, 0)
+            loss = -delta.where(delta < 0, 0)
+            avg_gain = gain.rolling(window=window).mean()
+            avg_loss = loss.rolling(window=window).mean()
         
         rs = avg_gain / avg_loss
         rsi = 100 - (100 / (1 + rs))
@@ -109,13 +133,14 @@ class DataProcessor:
         return middle_band, upper_band, lower_band
     
     @staticmethod
-    def calculate_atr(data, window=14):
+    def calculate_atr(data, window=14, smoothing='sma'):
         """
         Berechnet den Average True Range (ATR)
         
         Args:
             data (pandas.DataFrame): DataFrame mit Preisdaten
             window (int): Fenstergröße für den ATR
+            smoothing (str): 'sma' (gleitender Mittelwert) oder 'wilder' (Wilder-Glättung)
             
         Returns:
             pandas.Series: Serie mit ATR-Werten
@@ -127,22 +152,33 @@ class DataProcessor:
         ranges = pd.concat([high_low, high_close, low_close], axis=1)
         true_range = ranges.max(axis=1)
         
+        if smoothing == 'wilder':
+            return pd.Series(wilder_smooth(true_range, window), index=data.index)
         return true_range.rolling(window=window).mean()
     
     @staticmethod
-    def calculate_support_resistance(data, window=10):
+    def calculate_support_resistance(data, window=10, end=None, range_index=None):
         """
         Berechnet einfache Support- und Widerstandsniveaus
         
         Args:
             data (pandas.DataFrame): DataFrame mit Preisdaten
             window (int): Fenstergröße für die Berechnung
+            end (int, optional): Position nach dem letzten Bar des Fensters (Standard: Ende der Daten)
+            range_index (PriceRangeIndex, optional): Vorberechneter Bereichsindex über data,
+                beschleunigt wiederholte Abfragen über beliebige Fenster
             
         Returns:
             tuple: (Support-Level, Widerstand-Level)
         """
+        end = len(data) if end is None else end
+        start = max(end - window, 0)
+        
+        if range_index is not None:
+            return range_index.low.min(start, end), range_index.high.max(start, end)
+        
         # Einfache Methode: Verwende lokale Minima und Maxima
-        recent_data = data.tail(window)
+        recent_data = data.iloc[start:end]
         support = recent_data['Low'].min()
         resistance = recent_data['High'].max()
         
@@ -175,47 +211,22 @@ class DataProcessor:
         return stop_loss, take_profit
     
     @staticmethod
-    def add_indicators(data):
+    def add_indicators(data, indicators=None):
         """
-        Fügt gängige technische Indikatoren zu einem DataFrame hinzu
+        Fügt technische Indikatoren zu einem DataFrame hinzu
+        
+        Die Berechnung läuft über die IndicatorPipeline: Gemeinsame Zwischenergebnisse wie die
+        EMAs für MACD werden nur einmal berechnet und alle Spalten in einem Schritt angehängt.
         
         Args:
             data (pandas.DataFrame): DataFrame mit Preisdaten
+            indicators (list, optional): Angeforderte Indikatoren, z.B. ['SMA_20', 'RSI_14', 'MACD']
+                (Standard: SMA 20/50/200, EMA 12/26, RSI 14, MACD, Bollinger Bands und ATR 14)
             
         Returns:
             pandas.DataFrame: DataFrame mit hinzugefügten Indikatoren
         """
-        # Kopiere Daten, um das Original nicht zu verändern
-        df = data.copy()
-        
-        # Füge SMA hinzu
-        df['SMA_20'] = DataProcessor.calculate_sma(df, window=20)
-        df['SMA_50'] = DataProcessor.calculate_sma(df, window=50)
-        df['SMA_200'] = DataProcessor.calculate_sma(df, window=200)
-        
-        # Füge EMA hinzu
-        df['EMA_12'] = DataProcessor.calculate_ema(df, window=12)
-        df['EMA_26'] = DataProcessor.calculate_ema(df, window=26)
-        
-        # Füge RSI hinzu
-        df['RSI_14'] = DataProcessor.calculate_rsi(df, window=14)
-        
-        # Füge MACD hinzu
-        macd, signal, hist = DataProcessor.calculate_macd(df)
-        df['MACD'] = macd
-        df['MACD_Signal'] = signal
-        df['MACD_Hist'] = hist
-        
-        # Füge Bollinger Bands hinzu
-        middle, upper, lower = DataProcessor.calculate_bollinger_bands(df)
-        df['BB_Middle'] = middle
-        df['BB_Upper'] = upper
-        df['BB_Lower'] = lower
-        
-        # Füge ATR hinzu
-        df['ATR_14'] = DataProcessor.calculate_atr(df, window=14)
-        
-        return df
+        return get_indicator_pipeline(tuple(indicators) if indicators is not None else DEFAULT_INDICATORS).apply(data)
     
     @staticmethod
     def normalize_data(data):
@@ -13,6 +13,15 @@ from abc import ABC, abstractmethod
 
 # Importiere Hilfsfunktionen
 from utils.helpers import DateTimeUtils, DataUtils, CacheManager
+from data.resampler import TIMEFRAME_FREQS
+from data.trading_calendar import get_exchange_for_symbol, get_trading_calendar
+from data.cache_policy import FRESH, STALE, get_background_refresher, get_cache_state, get_max_age, get_stale_ttl
+from data.circuit_breaker import YAHOO_API, get_circuit_breaker, get_last_known_good
+from data.http_client import get_api_client
+from data.memory_cache import get_memory_cache
+from data.ohlcv import to_ohlcv
+from data.single_flight import get_single_flight
+from data.timestamps import epoch_to_index, get_symbol_timezone
 
 # Logger konfigurieren
 logger = logging.getLogger("trading_dashboard.data_source")
@@ -24,14 +33,17 @@ class DataSource(ABC):
     Diese Klasse definiert die Schnittstelle für alle Datenquellen im Trading Dashboard.
     Konkrete Implementierungen müssen die abstrakten Methoden implementieren.
     """
+
+    # Ob get_data beliebige Zeiträume über start_date und end_date liefern kann
+    supports_date_range = True
     
-    def __init__(self, cache_enabled: bool = True, cache_duration: int = 86400):
+    def __init__(self, cache_enabled: bool = True, cache_duration: Optional[int] = None):
         """
         Initialisiert die Datenquelle
         
         Args:
             cache_enabled: Ob Caching aktiviert ist
-            cache_duration: Cache-Dauer in Sekunden (Standard: 24 Stunden)
+            cache_duration: Cache-Dauer in Sekunden (Standard: je Zeitrahmen aus data.cache_policy)
         """
         self.cache_enabled = cache_enabled
         self.cache_duration = cache_duration
@@ -96,7 +108,8 @@ class DataSource(ABC):
         return f"{symbol}_{timeframe}_{start_str}_{end_str}"
     
     def _get_from_cache(self, symbol: str, timeframe: str, start_date: Optional[Union[str, datetime]] = None, 
-                       end_date: Optional[Union[str, datetime]] = None) -> Optional[pd.DataFrame]:
+                       end_date: Optional[Union[str, datetime]] = None,
+                       refresh: Optional[Callable[[], Any]] = None) -> Optional[pd.DataFrame]:
         """
         Versucht, Daten aus dem Cache zu laden
         
@@ -105,6 +118,9 @@ class DataSource(ABC):
             timeframe: Zeitrahmen
             start_date: Startdatum (optional)
             end_date: Enddatum (optional)
+            refresh: Abruf, der den Cache neu schreibt (optional); ist er angegeben, werden
+                veraltete Daten innerhalb des Stale-Fensters zurückgegeben und refresh im
+                Hintergrund ausgeführt
             
         Returns:
             Optional[pd.DataFrame]: DataFrame mit OHLCV-Daten oder None, wenn nicht im Cache
@@ -112,13 +128,57 @@ class DataSource(ABC):
         if not self.cache_enabled:
             return None
         
+        cached_data = self._get_from_memory(symbol, timeframe, start_date, end_date)
+        if cached_data is not None:
+            return cached_data
+        
         cache_key = self._get_cache_key(symbol, timeframe, start_date, end_date)
+        cache_age = self.cache_manager.get_cache_age(cache_key)
+        if cache_age is None:
+            return None
         
-        if self.cache_manager.is_cache_valid(cache_key, self.cache_duration):
-            return self.cache_manager.get_from_cache(cache_key)
+        state = get_cache_state(timeframe, cache_age, self.cache_duration)
+        if state == FRESH:
+            cached_data = self.cache_manager.get_from_cache(cache_key)
+            if cached_data is not None:
+                # Im Speicher halten, solange die Daten frisch sind
+                get_memory_cache().put(self._get_memory_key(cache_key), cached_data,
+                                       self._get_max_age(timeframe) - cache_age)
+            return cached_data
+        if state == STALE and refresh is not None:
+            cached_data = self.cache_manager.get_from_cache(cache_key)
+            if cached_data is not None:
+                get_background_refresher().schedule(self.cache_manager.get_cache_file_path(cache_key), refresh)
+            return cached_data
         
         return None
     
+    def _get_from_memory(self, symbol: str, timeframe: str, start_date: Optional[Union[str, datetime]] = None,
+                         end_date: Optional[Union[str, datetime]] = None) -> Optional[pd.DataFrame]:
+        """
+        Versucht, frische Daten aus dem In-Process-Cache (L1) zu laden
+        
+        Args:
+            symbol: Symbol des Assets
+            timeframe: Zeitrahmen
+            start_date: Startdatum (optional)
+            end_date: Enddatum (optional)
+            
+        Returns:
+            Optional[pd.DataFrame]: Schreibgeschützte Daten oder None, wenn nicht im Speicher
+        """
+        if not self.cache_enabled:
+            return None
+        cache_key = self._get_cache_key(symbol, timeframe, start_date, end_date)
+        return get_memory_cache().get(self._get_memory_key(cache_key))
+    
+    def _get_memory_key(self, cache_key: str) -> str:
+        # Das Cache-Verzeichnis gehört zum Schlüssel, da sich der L1-Cache über alle Instanzen teilt
+        return f"{self.cache_manager.cache_dir}:{cache_key}"
+    
+    def _get_max_age(self, timeframe: str) -> float:
+        return self.cache_duration if self.cache_duration is not None else get_max_age(timeframe)
+    
     def _save_to_cache(self, df: pd.DataFrame, symbol: str, timeframe: str, 
                       start_date: Optional[Union[str, datetime]] = None, 
                       end_date: Optional[Union[str, datetime]] = None) -> bool:
@@ -139,7 +199,10 @@ class DataSource(ABC):
             return False
         
         cache_key = self._get_cache_key(symbol, timeframe, start_date, end_date)
-        return self.cache_manager.save_to_cache(cache_key, df)
+        max_age = self._get_max_age(timeframe)
+        get_memory_cache().put(self._get_memory_key(cache_key), df, max_age)
+        # Nach Frische und Stale-Fenster ist der Eintrag wertlos und darf verdrängt werden
+        return self.cache_manager.save_to_cache(cache_key, df, ttl=max_age + get_stale_ttl(timeframe))
 
 class MockDataSource(DataSource):
     """
@@ -169,6 +232,9 @@ class MockDataSource(DataSource):
                 logger.info(f"Daten für {symbol} ({timeframe}) aus Cache geladen")
                 return cached_data
             
+            # Unter dem angefragten Schlüssel speichern, nicht unter den berechneten Datumsangaben
+            requested_dates = (start_date, end_date)
+            
             # Bestimme Start- und Enddatum
             if end_date is None:
                 end_date = datetime.now()
@@ -182,50 +248,9 @@ class MockDataSource(DataSource):
             elif isinstance(start_date, str):
                 start_date = DateTimeUtils.parse_date_string(start_date)
             
-            # Bestimme Frequenz basierend auf Zeitrahmen
-            freq_map = {
-                '1m': '1min',
-                '2m': '2min',
-                '5m': '5min',
-                '15m': '15min',
-                '30m': '30min',
-                '1h': '1H',
-                '1d': '1D',
-                '1w': '1W',
-                '1mo': '1M'
-            }
-            
-            freq = freq_map.get(timeframe, '1D')
-            
-            # Generiere Datenpunkte
-            if timeframe in ['1m', '2m', '5m', '15m', '30m', '1h']:
-                # Für Intraday-Daten nur Handelszeiten (9:30-16:00 ET)
-                trading_hours = []
-                current_date = start_date
-                while current_date <= end_date:
-                    if current_date.weekday() < 5:  # Montag bis Freitag
-                        for hour in range(9, 16):
-                            minute_start = 30 if hour == 9 else 0
-                            minute_end = 60
-                            step = int(timeframe.replace('m', '')) if timeframe.endswith('m') else 60
-                            for minute in range(minute_start, minute_end, step):
-                                trading_time = current_date.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                                if trading_time <= end_date:
-                                    trading_hours.append(trading_time)
-                    current_date += timedelta(days=1)
-                date_range = pd.DatetimeIndex(trading_hours)
-            elif timeframe == '1d':
-                # Für Tagesdaten nur Handelstage (Montag bis Freitag)
-                trading_days = []
-                current_date = start_date
-                while current_date <= end_date:
-                    if current_date.weekday() < 5:  # Montag bis Freitag
-                        trading_days.append(current_date)
-                    current_date += timedelta(days=1)
-                date_range = pd.DatetimeIndex(trading_days)
-            else:
-                # Für andere Zeitrahmen
-                date_range = pd.date_range(start=start_date, end=end_date, freq=freq)
+            # Generiere Datenpunkte gemäß den Handelszeiten der Börse des Symbols
+            calendar = get_trading_calendar(get_exchange_for_symbol(symbol))
+            date_range = calendar.get_index(timeframe if timeframe in TIMEFRAME_FREQS else '1d', start_date, end_date)
             
             # Generiere synthetische OHLCV-Daten
             np.random.seed(hash(symbol) % 100)  # Unterschiedliche Seed für jedes Symbol
@@ -289,11 +314,10 @@ class MockDataSource(DataSource):
                     'volume': volume
                 })
             
-            df = pd.DataFrame(price_data)
-            df.set_index('date', inplace=True)
+            df = to_ohlcv(pd.DataFrame(price_data))
             
             # Speichere die Daten im Cache
-            self._save_to_cache(df, symbol, timeframe, start_date, end_date)
+            self._save_to_cache(df, symbol, timeframe, *requested_dates)
             
             logger.info(f"Synthetische Daten für {symbol} ({timeframe}) generiert: {len(df)} Datenpunkte")
             return df
@@ -348,6 +372,22 @@ class YahooFinanceDataSource(DataSource):
     
     Diese Klasse ruft Daten von der Yahoo Finance API ab.
     """
+
+    # Die API liefert je Zeitrahmen nur das aktuelle Fenster; Anfragen mit Zeitraum fallen auf
+    # die letzten gültigen Daten bzw. Mock-Daten zurück
+    supports_date_range = False
+    
+    def __init__(self, cache_enabled: bool = True, cache_duration: Optional[int] = None, api_client=None):
+        """
+        Initialisiert die Datenquelle
+        
+        Args:
+            cache_enabled: Ob Caching aktiviert ist
+            cache_duration: Cache-Dauer in Sekunden (Standard: je Zeitrahmen aus data.cache_policy)
+            api_client: Client mit call_api(api, query) (Standard: geteilter Manus-API-Client)
+        """
+        super().__init__(cache_enabled, cache_duration)
+        self.api_client = api_client
     
     def get_data(self, symbol: str, timeframe: str, start_date: Optional[Union[str, datetime]] = None, 
                 end_date: Optional[Union[str, datetime]] = None) -> pd.DataFrame:
@@ -363,11 +403,33 @@ class YahooFinanceDataSource(DataSource):
         Returns:
             pd.DataFrame: DataFrame mit OHLCV-Daten
         """
+        # Treffer im Speicher brauchen weder Single-Flight noch Festplatte
+        cached_data = self._get_from_memory(symbol, timeframe, start_date, end_date)
+        if cached_data is not None:
+            return cached_data
+        
+        # Gleichzeitige Abrufe desselben Symbols (auch aus anderen Worker-Prozessen) zusammenfassen
+        key = f"{self._get_cache_key(symbol, timeframe, start_date, end_date)}_{self.cache_enabled}"
+        return get_single_flight().do(key, lambda: self._get_data(symbol, timeframe, start_date, end_date),
+                                      self.cache_manager.cache_dir)
+    
+    def _get_data(self, symbol: str, timeframe: str, start_date: Optional[Union[str, datetime]] = None, 
+                  end_date: Optional[Union[str, datetime]] = None, use_cache: bool = True) -> pd.DataFrame:
+        """
+        Ruft Daten aus dem Cache oder über die API ab (Mock-Daten als Fallback)
+        
+        Veraltete Cache-Daten innerhalb des Stale-Fensters werden sofort zurückgegeben und im
+        Hintergrund mit use_cache=False neu abgerufen.
+        """
+        cache_key = self._get_cache_key(symbol, timeframe, start_date, end_date)
         try:
             # Versuche, Daten aus dem Cache zu laden
-            cached_data = self._get_from_cache(symbol, timeframe, start_date, end_date)
+            cached_data = None if not use_cache else self._get_from_cache(
+                symbol, timeframe, start_date, end_date,
+                refresh=lambda: self._get_data(symbol, timeframe, start_date, end_date, use_cache=False))
             if cached_data is not None:
                 logger.info(f"Daten für {symbol} ({timeframe}) aus Cache geladen")
+                get_last_known_good().put(cache_key, cached_data)
                 return cached_data
             
             # Konvertiere Zeitrahmen zum Yahoo Finance-Format
@@ -396,62 +458,78 @@ class YahooFinanceDataSource(DataSource):
                 elif timeframe in ['15m', '30m', '1h']:
                     range_val = '1mo'  # Für Stunden-Daten maximal 1 Monat
                 
-                # Verwende die Yahoo Finance API mit range-Parameter
-                try:
-                    # Importiere die API-Client-Bibliothek
-                    sys.path.append('/opt/.manus/.sandbox-runtime')
-                    from data_api import ApiClient
-                    client = ApiClient()
-                    
-                    # Rufe Daten über die API ab
-                    response = client.call_api('YahooFinance/get_stock_chart', query={
-                        'symbol': symbol,
-                        'interval': yahoo_interval,
-                        'range': range_val,
-                        'includePrePost': False,
-                        'includeAdjustedClose': True
-                    })
-                    
-                    # Verarbeite die Antwort
-                    if response and 'chart' in response and 'result' in response['chart'] and response['chart']['result']:
-                        result = response['chart']['result'][0]
-                        
-                        # Extrahiere Zeitstempel und Indikatoren
-                        timestamps = result['timestamp']
-                        quote = result['indicators']['quote'][0]
-                        
-                        # Erstelle DataFrame
-                        df = pd.DataFrame({
-                            'open': quote['open'],
-                            'high': quote['high'],
-                            'low': quote['low'],
-                            'close': quote['close'],
-                            'volume': quote['volume']
+                # Verwende die Yahoo Finance API mit range-Parameter; solange der Circuit Breaker
+                # offen ist, wird sie übersprungen
+                client = self.api_client if self.api_client is not None else get_api_client()
+                breaker = get_circuit_breaker(YAHOO_API)
+                if client is None:
+                    logger.error(f"Fehler beim Abrufen der Daten für {symbol} über API: Kein API-Client verfügbar")
+                elif not breaker.allow():
+                    logger.warning(f"Yahoo Finance API für {symbol} übersprungen: Circuit Breaker offen")
+                else:
+                    try:
+                        # Rufe Daten über die API ab
+                        response = client.call_api('YahooFinance/get_stock_chart', query={
+                            'symbol': symbol,
+                            'interval': yahoo_interval,
+                            'range': range_val,
+                            'includePrePost': False,
+                            'includeAdjustedClose': True
                         })
-                        
-                        # Füge Zeitstempel als Index hinzu
-                        df.index = pd.to_datetime([datetime.fromtimestamp(ts) for ts in timestamps])
-                        df.index.name = 'date'
-                        
-                        # Speichere Daten im Cache
-                        self._save_to_cache(df, symbol, timeframe, start_date, end_date)
-                        
-                        logger.info(f"Daten für {symbol} ({timeframe}) erfolgreich abgerufen: {len(df)} Datenpunkte")
-                        return df
-                    else:
-                        logger.error(f"Fehler beim Abrufen der Daten für {symbol}: Ungültiges Antwortformat")
-                except Exception as api_error:
-                    logger.error(f"Fehler beim Abrufen der Daten für {symbol} über API: {str(api_error)}")
-            
-            # Fallback: Verwende Mock-Daten
+
+                        # Verarbeite die Antwort
+                        if response and 'chart' in response and 'result' in response['chart'] and response['chart']['result']:
+                            result = response['chart']['result'][0]
+
+                            # Extrahiere Zeitstempel und Indikatoren
+                            timestamps = result['timestamp']
+                            quote = result['indicators']['quote'][0]
+
+                            # Erstelle DataFrame
+                            df = pd.DataFrame({
+                                'open': quote['open'],
+                                'high': quote['high'],
+                                'low': quote['low'],
+                                'close': quote['close'],
+                                'volume': quote['volume']
+                            })
+
+                            # Füge Zeitstempel als Index hinzu
+                            df.index = epoch_to_index(timestamps, get_symbol_timezone(symbol), name='date')
+                            df = to_ohlcv(df)
+
+                            # Speichere Daten im Cache und als zuletzt erfolgreich abgerufene Daten
+                            self._save_to_cache(df, symbol, timeframe, start_date, end_date)
+                            get_last_known_good().put(cache_key, df)
+                            breaker.record_success()
+
+                            logger.info(f"Daten für {symbol} ({timeframe}) erfolgreich abgerufen: {len(df)} Datenpunkte")
+                            return df
+                        else:
+                            # Der Upstream hat geantwortet; keine Daten für das Symbol sind kein Ausfall
+                            logger.error(f"Fehler beim Abrufen der Daten für {symbol}: Ungültiges Antwortformat")
+                            breaker.record_success()
+                    except Exception as api_error:
+                        logger.error(f"Fehler beim Abrufen der Daten für {symbol} über API: {str(api_error)}")
+                        breaker.record_error(api_error)
+
+            # Fallback: Verwende die zuletzt erfolgreich abgerufenen Daten, sonst Mock-Daten
+            last_known_good = get_last_known_good().get(cache_key)
+            if last_known_good is not None:
+                logger.warning(f"Verwende zuletzt erfolgreich abgerufene Daten für {symbol} ({timeframe})")
+                return last_known_good
             logger.warning(f"Verwende Mock-Daten für {symbol} ({timeframe})")
             mock_source = MockDataSource(self.cache_enabled, self.cache_duration)
             return mock_source.get_data(symbol, timeframe, start_date, end_date)
-        
+
         except Exception as e:
             logger.error(f"Fehler beim Abrufen der Daten für {symbol}: {str(e)}")
-            
-            # Fallback: Verwende Mock-Daten
+
+            # Fallback: Verwende die zuletzt erfolgreich abgerufenen Daten, sonst Mock-Daten
+            last_known_good = get_last_known_good().get(cache_key)
+            if last_known_good is not None:
+                logger.warning(f"Verwende zuletzt erfolgreich abgerufene Daten für {symbol} ({timeframe})")
+                return last_known_good
             logger.warning(f"Verwende Mock-Daten für {symbol} ({timeframe})")
             mock_source = MockDataSource(self.cache_enabled, self.cache_duration)
             return mock_source.get_data(symbol, timeframe, start_date, end_date)
@@ -486,20 +564,22 @@ class DataSourceFactory:
     """
     
     @staticmethod
-    def create_data_source(source_type: str, cache_enabled: bool = True, cache_duration: int = 86400) -> DataSource:
+    def create_data_source(source_type: str, cache_enabled: bool = True, cache_duration: Optional[int] = None,
+                           api_client=None) -> DataSource:
         """
         Erstellt eine Datenquelle
         
         Args:
             source_type: Typ der Datenquelle ('mock', 'yahoo', etc.)
             cache_enabled: Ob Caching aktiviert ist
-            cache_duration: Cache-Dauer in Sekunden (Standard: 24 Stunden)
+            cache_duration: Cache-Dauer in Sekunden (Standard: je Zeitrahmen aus data.cache_policy)
+            api_client: API-Client für Yahoo Finance (Standard: geteilter Client)
             
         Returns:
             DataSource: Datenquelle
         """
         if source_type == 'yahoo':
-            return YahooFinanceDataSource(cache_enabled, cache_duration)
+            return YahooFinanceDataSource(cache_enabled, cache_duration, api_client)
         else:
             # Standard: Mock-Datenquelle
             return MockDataSource(cache_enabled, cache_duration)
@@ -0,0 +1,291 @@
+"""
+Paginierter Historien-Loader für Twelve Data
+Twelve Data liefert je Anfrage höchstens 5000 Bars, bei Minutendaten also nur wenige Tage. Der
+Loader teilt einen Zeitraum in Fenster zu je einer Seite auf, ruft die Fenster parallel unter
+einem gemeinsamen Rate-Limiter ab und führt die Seiten vektorisiert zusammen (Sortierung und
+Deduplizierung über den Zeitindex). backfill() schreibt das Ergebnis direkt in den CSV-Cache
+von NQDataFetcher.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from utils.settings import get_env_setting
+from data.http_client import HttpClient, get_http_client
+from data.timestamps import normalize_index
+from utils.helpers import CacheManager
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.history_loader")
+
+TWELVE_DATA_URL = "https://api.twelvedata.com/time_series"
+TWELVE_DATA_SYMBOL = "NQ:GLOIU"  # NASDAQ 100 Futures Symbol bei Twelve Data
+
+# Maximale Anzahl Bars je Anfrage
+MAX_OUTPUT_SIZE = 5000
+
+# Anfragen je Minute (kostenloser Plan: 8)
+DEFAULT_RATE_LIMIT = 8
+DEFAULT_WORKERS = 4
+DEFAULT_RETRIES = 3
+
+# Intervall -> (Twelve-Data-Intervall, Dauer eines Bars)
+TWELVE_DATA_INTERVALS = {
+    '1m': ('1min', pd.Timedelta(minutes=1)),
+    '5m': ('5min', pd.Timedelta(minutes=5)),
+    '15m': ('15min', pd.Timedelta(minutes=15)),
+    '30m': ('30min', pd.Timedelta(minutes=30)),
+    '60m': ('1h', pd.Timedelta(hours=1)),
+    '1h': ('1h', pd.Timedelta(hours=1)),
+    '4h': ('4h', pd.Timedelta(hours=4)),
+    '1d': ('1day', pd.Timedelta(days=1)),
+    '1wk': ('1week', pd.Timedelta(weeks=1)),
+    '1mo': ('1month', pd.Timedelta(days=31)),
+}
+
+OHLCV_COLUMNS = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'}
+
+
+class TwelveDataError(RuntimeError):
+    """
+    Fehlerantwort der Twelve Data API
+    """
+
+    def __init__(self, message: str, code: Optional[int] = None):
+        super().__init__(message)
+        self.code = code
+
+
+class RateLimiter:
+    """
+    Token-Bucket für Anfragen an eine API
+
+    Bis zu rate Anfragen dürfen sofort laufen; danach wird je Anfrage so lange gewartet, dass im
+    Mittel höchstens rate Anfragen je per Sekunden stattfinden. Threadsicher.
+    """
+
+    def __init__(self, rate: float, per: float = 60.0):
+        """
+        Initialisiert den Rate-Limiter
+
+        Args:
+            rate: Anzahl erlaubter Anfragen je Zeitraum
+            per: Zeitraum in Sekunden
+        """
+        self.rate = rate
+        self.per = per
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Wartet, bis eine Anfrage erlaubt ist
+
+        Returns:
+            float: Wartezeit in Sekunden
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.per)
+            self._updated = now
+            # Negative Tokens reservieren den nächsten freien Zeitpunkt für diesen Aufrufer
+            self._tokens -= 1
+            wait = -self._tokens * self.per / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_twelve_data_rate_limiter() -> RateLimiter:
+    """
+    Gibt den prozessweit geteilten Rate-Limiter für Twelve Data zurück
+
+    Konfiguration über TRADING_DASHBOARD_TWELVE_DATA_RATE_LIMIT (Anfragen je Minute).
+
+    Returns:
+        RateLimiter: Geteilter Rate-Limiter
+    """
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(get_env_setting("TWELVE_DATA_RATE_LIMIT", DEFAULT_RATE_LIMIT, float))
+        return _rate_limiter
+
+
+class TwelveDataHistoryLoader:
+    """
+    Lädt lange Zeitreihen von Twelve Data seitenweise und parallel
+    """
+
+    def __init__(self, api_key: Optional[str] = None, http_client: Optional[HttpClient] = None,
+                 symbol: str = TWELVE_DATA_SYMBOL, max_workers: int = DEFAULT_WORKERS,
+                 rate_limiter: Optional[RateLimiter] = None, page_size: int = MAX_OUTPUT_SIZE,
+                 retries: int = DEFAULT_RETRIES):
+        """
+        Initialisiert den Loader
+
+        Args:
+            api_key: API-Schlüssel (Standard: Umgebungsvariable TWELVE_DATA_API_KEY)
+            http_client: HTTP-Client (Standard: geteilter Client; für Tests mit base_url auf einen
+                lokalen Fake-Server)
+            symbol: Symbol bei Twelve Data
+            max_workers: Anzahl paralleler Anfragen
+            rate_limiter: Rate-Limiter (Standard: geteilter Limiter für Twelve Data)
+            page_size: Bars je Anfrage (höchstens 5000)
+            retries: Wiederholungen je Fenster, wenn das Rate-Limit der API greift
+        """
+        self.api_key = api_key if api_key is not None else os.getenv("TWELVE_DATA_API_KEY", "")
+        self.http_client = http_client if http_client is not None else get_http_client()
+        self.symbol = symbol
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_twelve_data_rate_limiter()
+        self.page_size = min(page_size, MAX_OUTPUT_SIZE)
+        self.retries = retries
+
+    def split_windows(self, interval: str, start, end) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Teilt einen Zeitraum in Fenster zu höchstens einer Seite
+
+        Args:
+            interval: Zeitintervall, z.B. '1m'
+            start: Beginn des Zeitraums
+            end: Ende des Zeitraums
+
+        Returns:
+            List[Tuple[pd.Timestamp, pd.Timestamp]]: Fenster (Beginn, Ende), aufsteigend
+        """
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        if start >= end:
+            return []
+        # Twelve Data liefert Start und Ende inklusive; Fenster teilen sich den Randbar
+        step = _get_interval(interval)[1] * max(self.page_size - 1, 1)
+        bounds = list(pd.date_range(start, end, freq=step))
+        if bounds[-1] < end:
+            bounds.append(end)
+        return list(zip(bounds[:-1], bounds[1:]))
+
+    def fetch_window(self, interval: str, start=None, end=None) -> pd.DataFrame:
+        """
+        Ruft eine Seite ab
+
+        Args:
+            interval: Zeitintervall, z.B. '1m'
+            start: Beginn des Fensters (ohne Angabe: die letzten page_size Bars)
+            end: Ende des Fensters
+
+        Returns:
+            pd.DataFrame: Rohdaten der Seite (Spalte datetime und Strings), leer ohne Daten
+
+        Raises:
+            TwelveDataError: Bei einer Fehlerantwort der API
+        """
+        params = {
+            "symbol": self.symbol,
+            "interval": _get_interval(interval)[0],
+            "outputsize": self.page_size,
+            "apikey": self.api_key,
+            "format": "JSON",
+        }
+        if start is not None:
+            params["start_date"] = pd.Timestamp(start).strftime('%Y-%m-%d %H:%M:%S')
+        if end is not None:
+            params["end_date"] = pd.Timestamp(end).strftime('%Y-%m-%d %H:%M:%S')
+
+        for attempt in range(self.retries + 1):
+            self.rate_limiter.acquire()
+            data = self.http_client.get_json(TWELVE_DATA_URL, params=params)
+            if "values" in data:
+                return pd.DataFrame(data["values"])
+
+            message = data.get("message", "Unbekannter Fehler")
+            code = data.get("code")
+            if "no data" in message.lower():
+                return pd.DataFrame()
+            if code != 429 or attempt == self.retries:
+                raise TwelveDataError(f"Fehler bei Twelve Data-Anfrage: {message}", code)
+            logger.warning(f"Twelve Data Rate-Limit erreicht, Wiederholung {attempt + 1}/{self.retries}")
+        return pd.DataFrame()
+
+    def load(self, interval: str, start=None, end=None) -> pd.DataFrame:
+        """
+        Lädt einen Zeitraum seitenweise und parallel
+
+        Args:
+            interval: Zeitintervall, z.B. '1m'
+            start: Beginn des Zeitraums (ohne Angabe: nur die letzten page_size Bars)
+            end: Ende des Zeitraums (Standard: jetzt)
+
+        Returns:
+            pd.DataFrame: OHLCV-Daten (Open, High, Low, Close, Volume) mit aufsteigendem,
+                eindeutigem DatetimeIndex
+
+        Raises:
+            TwelveDataError: Bei einer Fehlerantwort der API
+        """
+        if start is None:
+            pages = [self.fetch_window(interval, end=end)]
+        else:
+            windows = self.split_windows(interval, start, end if end is not None else pd.Timestamp.now())
+            logger.info(f"Lade {self.symbol} {interval}: {len(windows)} Seiten mit {self.max_workers} Threads")
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="twelve-data") as executor:
+                pages = list(executor.map(lambda window: self.fetch_window(interval, *window), windows))
+        return _merge_pages(pages)
+
+    def backfill(self, interval: str, start, end=None, cache_file=None) -> pd.DataFrame:
+        """
+        Lädt einen Zeitraum und führt ihn mit der vorhandenen Cache-Datei zusammen
+
+        Args:
+            interval: Zeitintervall, z.B. '1m'
+            start: Beginn des Zeitraums
+            end: Ende des Zeitraums (Standard: jetzt)
+            cache_file: Ziel-CSV, z.B. NQDataFetcher._get_cache_file(interval, range_val)
+
+        Returns:
+            pd.DataFrame: Zusammengeführte Daten, wie sie in den Cache geschrieben wurden
+        """
+        df = self.load(interval, start, end)
+        if cache_file is not None:
+            if os.path.exists(cache_file):
+                existing = pd.read_csv(cache_file, index_col=0, parse_dates=True)
+                # Neu geladene Bars haben Vorrang vor denen im Cache
+                df = _deduplicate(pd.concat([existing, df]))
+            CacheManager.write_csv_atomic(df, cache_file)
+            logger.info(f"{len(df)} Bars in {cache_file} geschrieben")
+        return df
+
+
+def _get_interval(interval: str) -> Tuple[str, pd.Timedelta]:
+    if interval not in TWELVE_DATA_INTERVALS:
+        raise ValueError(f"Intervall wird von Twelve Data nicht unterstützt: {interval}")
+    return TWELVE_DATA_INTERVALS[interval]
+
+
+def _deduplicate(df: pd.DataFrame) -> pd.DataFrame:
+    # Stabile Sortierung, damit bei doppelten Zeitstempeln der zuletzt angehängte Bar gewinnt
+    df = df.sort_index(kind='mergesort')
+    return df[~df.index.duplicated(keep='last')]
+
+
+def _merge_pages(pages: List[pd.DataFrame]) -> pd.DataFrame:
+    pages = [page for page in pages if not page.empty]
+    if not pages:
+        return pd.DataFrame(columns=list(OHLCV_COLUMNS.values()), index=pd.DatetimeIndex([], name='datetime'))
+
+    # Alle Seiten auf einmal konvertieren statt Seite für Seite
+    raw = pd.concat(pages, ignore_index=True)
+    columns = [col for col in OHLCV_COLUMNS if col in raw.columns]
+    df = raw[columns].apply(pd.to_numeric, errors='coerce').rename(columns=OHLCV_COLUMNS)
+    df.index = normalize_index(raw['datetime'].rename('datetime'))
+    return _deduplicate(df)
@@ -0,0 +1,173 @@
+"""
+HTTP-Client für Datenquellen
+Prozessweit geteilte requests.Session mit begrenztem Verbindungspool, Keep-alive, Timeouts und
+komprimierten Antworten. Datenquellen erhalten den Client als Parameter, sodass er in Tests und
+Benchmarks durch einen lokalen Stub-Server ersetzt werden kann.
+"""
+
+import logging
+import sys
+import threading
+from typing import Any, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.settings import get_env_setting
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.http_client")
+
+DEFAULT_POOL_SIZE = 16
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+
+# Pfad der Manus-API-Client-Bibliothek
+MANUS_RUNTIME_PATH = '/opt/.manus/.sandbox-runtime'
+
+
+class HttpClient:
+    """
+    Gepoolter HTTP-Client
+
+    Verbindungen werden je Host offen gehalten und wiederverwendet, sodass Folgeanfragen weder
+    TCP- noch TLS-Aufbau bezahlen. Der Pool ist begrenzt; sind alle Verbindungen belegt, warten
+    weitere Anfragen, statt zusätzliche Verbindungen zu öffnen.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT, base_url: Optional[str] = None):
+        """
+        Initialisiert den Client
+
+        Args:
+            pool_size: Maximale Anzahl offener Verbindungen je Host
+            connect_timeout: Timeout für den Verbindungsaufbau in Sekunden
+            read_timeout: Timeout für das Lesen der Antwort in Sekunden
+            base_url: Ersetzt Schema und Host aller Anfragen, z.B. 'http://127.0.0.1:8080' für
+                einen lokalen Stub-Server
+        """
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.base_url = base_url.rstrip('/') if base_url else None
+        self.request_count = 0
+        self.session = requests.Session()
+        self.session.headers.update({'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive'})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _resolve(self, url: str) -> str:
+        if self.base_url is None:
+            return url
+        parts, base = urlsplit(url), urlsplit(self.base_url)
+        return urlunsplit((base.scheme, base.netloc, base.path + parts.path, parts.query, parts.fragment))
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Führt eine Anfrage über den Verbindungspool aus
+
+        Args:
+            method: HTTP-Methode
+            url: Vollständige URL
+            **kwargs: Weitere Argumente für requests (params, headers, timeout, ...)
+
+        Returns:
+            requests.Response: Antwort
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        self.request_count += 1
+        return self.session.request(method, self._resolve(url), **kwargs)
+
+    def get(self, url: str, params: Optional[dict] = None, **kwargs) -> requests.Response:
+        """
+        Führt eine GET-Anfrage aus
+
+        Args:
+            url: Vollständige URL
+            params: Query-Parameter
+            **kwargs: Weitere Argumente für requests
+
+        Returns:
+            requests.Response: Antwort
+        """
+        return self.request('GET', url, params=params, **kwargs)
+
+    def get_json(self, url: str, params: Optional[dict] = None, **kwargs) -> Any:
+        """
+        Führt eine GET-Anfrage aus und gibt die JSON-Antwort zurück
+
+        Args:
+            url: Vollständige URL
+            params: Query-Parameter
+            **kwargs: Weitere Argumente für requests
+
+        Returns:
+            Any: Dekodierte JSON-Antwort
+
+        Raises:
+            requests.HTTPError: Bei einem Fehlerstatus
+        """
+        response = self.get(url, params=params, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def close(self) -> None:
+        """
+        Schließt alle offenen Verbindungen
+        """
+        self.session.close()
+
+
+_http_client: Optional[HttpClient] = None
+_http_client_lock = threading.Lock()
+
+_api_client = None
+_api_client_loaded = False
+_api_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """
+    Gibt den prozessweit geteilten HTTP-Client zurück
+
+    Konfiguration über TRADING_DASHBOARD_HTTP_POOL_SIZE, _HTTP_CONNECT_TIMEOUT und
+    _HTTP_READ_TIMEOUT (Sekunden).
+
+    Returns:
+        HttpClient: Geteilter Client
+    """
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None:
+            _http_client = HttpClient(
+                pool_size=get_env_setting("HTTP_POOL_SIZE", DEFAULT_POOL_SIZE, int),
+                connect_timeout=get_env_setting("HTTP_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT, float),
+                read_timeout=get_env_setting("HTTP_READ_TIMEOUT", DEFAULT_READ_TIMEOUT, float),
+            )
+        return _http_client
+
+
+def get_api_client():
+    """
+    Gibt den geteilten Manus-API-Client zurück
+
+    Die Bibliothek wird nur beim ersten Aufruf importiert; ist sie nicht verfügbar, wird das
+    ebenfalls gemerkt.
+
+    Returns:
+        ApiClient oder None, wenn die Bibliothek nicht verfügbar ist
+    """
+    global _api_client, _api_client_loaded
+    with _api_client_lock:
+        if not _api_client_loaded:
+            _api_client_loaded = True
+            if MANUS_RUNTIME_PATH not in sys.path:
+                sys.path.append(MANUS_RUNTIME_PATH)
+            try:
+                from data_api import ApiClient
+                _api_client = ApiClient()
+            except Exception as e:
+                logger.info(f"Manus API nicht verfügbar: {str(e)}")
+        return _api_client
@@ -0,0 +1,198 @@
+"""
+Deklarative Indikator-Pipeline
+Berechnet angeforderte Indikatoren über einen Abhängigkeitsgraphen, sodass gemeinsame
+Zwischenergebnisse (EMAs, gleitende Mittel, True Range) nur einmal entstehen, und hängt alle
+Ausgaben als einen vorab allokierten Block an den DataFrame an
+"""
+
+import logging
+import re
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.indicator_pipeline")
+
+# Standardsatz von DataProcessor.add_indicators (Reihenfolge der Spalten)
+DEFAULT_INDICATORS = ('SMA_20', 'SMA_50', 'SMA_200', 'EMA_12', 'EMA_26', 'RSI_14', 'MACD', 'BB', 'ATR_14')
+
+# Indikator-Spezifikationen: Name mit optionalen Parametern, z.B. 'SMA_20', 'MACD_12_26_9', 'BB_20_2'
+_SPEC_PATTERN = re.compile(r'^(SMA|EMA|RSI|ATR|MACD|BB)((?:_\d+(?:\.\d+)?)*)$')
+_DEFAULT_PARAMS = {'RSI': (14,), 'ATR': (14,), 'MACD': (12, 26, 9), 'BB': (20, 2)}
+
+
+def _parse_spec(spec: str) -> List[Tuple[str, str]]:
+    """
+    Übersetzt eine Indikator-Spezifikation in (Spaltenname, Knoten)-Paare
+    """
+    match = _SPEC_PATTERN.match(spec)
+    if match is None:
+        raise ValueError(f"Unbekannter Indikator: {spec}")
+
+    kind = match.group(1)
+    params = tuple(float(p) if '.' in p else int(p) for p in match.group(2).split('_')[1:])
+    params = params or _DEFAULT_PARAMS.get(kind, ())
+
+    if kind in ('SMA', 'EMA', 'RSI', 'ATR'):
+        if len(params) != 1:
+            raise ValueError(f"{kind} erwartet genau ein Fenster: {spec}")
+        return [(f"{kind}_{params[0]}", f"{kind.lower()}:{params[0]}")]
+
+    if kind == 'MACD':
+        if len(params) != 3:
+            raise ValueError(f"MACD erwartet schnell, langsam und Signal: {spec}")
+        suffix = '' if params == _DEFAULT_PARAMS['MACD'] else '_' + '_'.join(map(str, params))
+        key = ':'.join(map(str, params))
+        return [(f"MACD{suffix}", f"macd:{params[0]}:{params[1]}"), (f"MACD_Signal{suffix}", f"macd_signal:{key}"),
+                (f"MACD_Hist{suffix}", f"macd_hist:{key}")]
+
+    if len(params) != 2:
+        raise ValueError(f"BB erwartet Fenster und Anzahl Standardabweichungen: {spec}")
+    suffix = '' if params == _DEFAULT_PARAMS['BB'] else '_' + '_'.join(map(str, params))
+    window, num_std = params
+    return [(f"BB_Middle{suffix}", f"sma:{window}"), (f"BB_Upper{suffix}", f"bb_upper:{window}:{num_std}"),
+            (f"BB_Lower{suffix}", f"bb_lower:{window}:{num_std}")]
+
+
+def _like(series: pd.Series, values: np.ndarray) -> pd.Series:
+    return pd.Series(values, index=series.index)
+
+
+def _node_definition(node: str) -> Tuple[List[str], Callable]:
+    """
+    Gibt Abhängigkeiten und Berechnungsfunktion eines Knotens zurück
+
+    Knoten sind 'name:param1:param2'. Eingänge ('close', 'high', 'low') haben keine Abhängigkeiten
+    und werden von der Pipeline direkt gesetzt.
+    """
+    name, *args = node.split(':')
+    window = int(args[0]) if args else None
+
+    if name == 'sma':
+        return ['close'], lambda close: close.rolling(window=window).mean()
+    if name == 'rolling_std':
+        return ['close'], lambda close: close.rolling(window=window).std()
+    if name == 'ema':
+        return ['close'], lambda close: close.ewm(span=window, adjust=False).mean()
+    if name == 'delta':
+        return ['close'], lambda close: close.diff()
+    if name == 'avg_gain':
+        return ['delta'], lambda delta: _like(delta, np.where(delta > 0, delta, 0.0)).rolling(window=window).mean()
+    if name == 'avg_loss':
+        return ['delta'], lambda delta: _like(delta, np.where(delta < 0, -delta, 0.0)).rolling(window=window).mean()
+    if name == 'rsi':
+        return [f"avg_gain:{window}", f"avg_loss:{window}"], lambda gain, loss: 100 - (100 / (1 + gain / loss))
+    if name == 'true_range':
+        def true_range(high, low, close):
+            # fmax ignoriert NaN wie max(axis=1) (erster Bar ohne Vorschlusskurs)
+            prev_close = close.shift().to_numpy()
+            high, low = high.to_numpy(), low.to_numpy()
+            return _like(close, np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close))))
+        return ['high', 'low', 'close'], true_range
+    if name == 'atr':
+        return ['true_range'], lambda tr: tr.rolling(window=window).mean()
+    if name == 'macd':
+        fast, slow = args[0], args[1]
+        return [f"ema:{fast}", f"ema:{slow}"], lambda ema_fast, ema_slow: ema_fast - ema_slow
+    if name == 'macd_signal':
+        fast, slow, signal = args
+        return [f"macd:{fast}:{slow}"], lambda macd: macd.ewm(span=int(signal), adjust=False).mean()
+    if name == 'macd_hist':
+        key = ':'.join(args)
+        return [f"macd:{args[0]}:{args[1]}", f"macd_signal:{key}"], lambda macd, signal: macd - signal
+    if name in ('bb_upper', 'bb_lower'):
+        num_std = float(args[1]) if '.' in args[1] else int(args[1])
+        sign = 1 if name == 'bb_upper' else -1
+        return ([f"sma:{window}", f"rolling_std:{window}"],
+                lambda middle, std: middle + sign * (std * num_std))
+    raise ValueError(f"Unbekannter Knoten im Indikator-Graphen: {node}")
+
+
+class IndicatorPipeline:
+    """
+    Pipeline für eine feste Auswahl von Indikatoren
+
+    Beim Erstellen werden die Spezifikationen in einen Abhängigkeitsgraphen übersetzt und
+    topologisch sortiert. compute() berechnet jeden Knoten genau einmal (z.B. EMA 12/26 für
+    EMA- und MACD-Spalten, SMA 20 für SMA_20 und BB_Middle) und schreibt die Ausgaben in ein
+    vorab allokiertes 2-D-Array.
+    """
+
+    def __init__(self, indicators: Iterable[str] = DEFAULT_INDICATORS):
+        """
+        Initialisiert die Pipeline
+
+        Args:
+            indicators: Indikator-Spezifikationen, z.B. 'SMA_20', 'EMA_12', 'RSI_14', 'ATR_14',
+                'MACD' bzw. 'MACD_12_26_9' und 'BB' bzw. 'BB_20_2'
+
+        Raises:
+            ValueError: Wenn eine Spezifikation unbekannt ist
+        """
+        self.indicators = tuple(indicators)
+        self.outputs: List[Tuple[str, str]] = []
+        for spec in self.indicators:
+            for column, node in _parse_spec(spec):
+                if column not in dict(self.outputs):
+                    self.outputs.append((column, node))
+        self.columns = [column for column, _ in self.outputs]
+        self.order = self._resolve_order(node for _, node in self.outputs)
+
+    @staticmethod
+    def _resolve_order(targets: Iterable[str]) -> List[str]:
+        # Tiefensuche über die Abhängigkeiten; jeder Knoten erscheint einmal nach seinen Eingängen
+        order: List[str] = []
+        visited = set()
+
+        def visit(node: str) -> None:
+            if node in visited:
+                return
+            visited.add(node)
+            if node not in ('close', 'high', 'low'):
+                for dependency in _node_definition(node)[0]:
+                    visit(dependency)
+            order.append(node)
+
+        for target in targets:
+            visit(target)
+        return order
+
+    def compute(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Berechnet die Indikatoren
+
+        Args:
+            data: DataFrame mit Close (für ATR auch High und Low), Groß- oder Kleinschreibung
+
+        Returns:
+            pd.DataFrame: Indikatoren mit dem Index von data
+        """
+        columns = {col.lower(): col for col in data.columns if isinstance(col, str)}
+        values: Dict[str, pd.Series] = {}
+        for node in self.order:
+            if node in ('close', 'high', 'low'):
+                values[node] = data[columns[node]].astype(float)
+            else:
+                dependencies, func = _node_definition(node)
+                values[node] = func(*(values[dependency] for dependency in dependencies))
+
+        block = np.empty((len(data), len(self.outputs)))
+        for position, (_, node) in enumerate(self.outputs):
+            block[:, position] = values[node].to_numpy()
+        return pd.DataFrame(block, index=data.index, columns=self.columns)
+
+    def apply(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Hängt die Indikatoren in einem Schritt an die Daten an
+
+        Args:
+            data: DataFrame mit Preisdaten (wird nicht verändert)
+
+        Returns:
+            pd.DataFrame: Neuer DataFrame mit Preisdaten und Indikatoren
+        """
+        indicators = self.compute(data)
+        return pd.concat([data.drop(columns=[col for col in self.columns if col in data.columns]), indicators],
+                         axis=1)
@@ -0,0 +1,546 @@
+"""
+Live-Feed-Modul für das Trading Dashboard
+Verantwortlich für das fortlaufende Abrufen neuer Bars und deren Pufferung im Speicher
+"""
+
+import threading
+import time
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from data.data_source import DataSource, DataSourceFactory
+from utils.settings import get_env_setting
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.live_feed")
+
+# Abstand zwischen zwei Bars je Zeitrahmen
+TIMEFRAME_DELTAS = {
+    '1m': timedelta(minutes=1),
+    '2m': timedelta(minutes=2),
+    '3m': timedelta(minutes=3),
+    '5m': timedelta(minutes=5),
+    '15m': timedelta(minutes=15),
+    '30m': timedelta(minutes=30),
+    '1h': timedelta(hours=1),
+    '4h': timedelta(hours=4),
+    '1d': timedelta(days=1),
+    '1w': timedelta(weeks=1),
+}
+
+# Spalten, die im Ring-Puffer gehalten werden
+OHLCV_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class IncrementalIndicators:
+    """
+    Inkrementelle Berechnung von SMA, EMA und RSI
+
+    Jeder neue Schlusskurs aktualisiert den Zustand in O(1). Die Werte entsprechen
+    denen von DataProcessor.calculate_sma, calculate_ema und calculate_rsi.
+    """
+
+    def __init__(self, sma_window: int = 20, ema_span: int = 12, rsi_window: int = 14):
+        """
+        Initialisiert die inkrementellen Indikatoren
+
+        Args:
+            sma_window: Fenstergröße für den SMA
+            ema_span: Spanne für den EMA
+            rsi_window: Fenstergröße für den RSI
+        """
+        self.sma_window = sma_window
+        self.ema_span = ema_span
+        self.rsi_window = rsi_window
+        self.names = [f"SMA_{sma_window}", f"EMA_{ema_span}", f"RSI_{rsi_window}"]
+
+        self._alpha = 2.0 / (ema_span + 1)
+        self._sma_values = deque(maxlen=sma_window)
+        self._sma_sum = 0.0
+        self._ema = None
+        self._prev_close = None
+        self._gains = deque(maxlen=rsi_window)
+        self._losses = deque(maxlen=rsi_window)
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+
+    def update(self, close: float) -> Dict[str, float]:
+        """
+        Verarbeitet einen neuen Schlusskurs
+
+        Args:
+            close: Schlusskurs der neuen Bar
+
+        Returns:
+            Dict[str, float]: Aktuelle Indikatorwerte (NaN während der Aufwärmphase)
+        """
+        # SMA über laufende Summe
+        if len(self._sma_values) == self.sma_window:
+            self._sma_sum -= self._sma_values[0]
+        self._sma_values.append(close)
+        self._sma_sum += close
+        sma = self._sma_sum / self.sma_window if len(self._sma_values) == self.sma_window else np.nan
+
+        # EMA mit adjust=False, beginnend beim ersten Schlusskurs
+        self._ema = close if self._ema is None else self._alpha * close + (1 - self._alpha) * self._ema
+
+        # RSI über einfache gleitende Mittel von Gewinnen und Verlusten
+        # (die erste Bar zählt wie im DataProcessor als Veränderung von 0)
+        rsi = np.nan
+        delta = 0.0 if self._prev_close is None else close - self._prev_close
+        if len(self._gains) == self.rsi_window:
+            self._gain_sum -= self._gains[0]
+            self._loss_sum -= self._losses[0]
+        self._gains.append(max(delta, 0.0))
+        self._losses.append(max(-delta, 0.0))
+        self._gain_sum += self._gains[-1]
+        self._loss_sum += self._losses[-1]
+        if len(self._gains) == self.rsi_window:
+            if self._loss_sum > 0:
+                rsi = 100 - (100 / (1 + self._gain_sum / self._loss_sum))
+            elif self._gain_sum > 0:
+                rsi = 100.0
+        self._prev_close = close
+
+        return dict(zip(self.names, (sma, self._ema, rsi)))
+
+
+class BarRingBuffer:
+    """
+    Ring-Puffer fester Größe für OHLCV-Bars eines Symbols
+
+    Neue Bars überschreiben die ältesten, sobald die Kapazität erreicht ist. Zusätzlich
+    werden die inkrementellen Indikatoren für jede eingefügte Bar mitgeführt.
+    """
+
+    def __init__(self, capacity: int = 5000, indicators: Optional[IncrementalIndicators] = None):
+        """
+        Initialisiert den Ring-Puffer
+
+        Args:
+            capacity: Maximale Anzahl gespeicherter Bars
+            indicators: Inkrementelle Indikatoren (optional, Standard: SMA 20, EMA 12, RSI 14)
+        """
+        self.capacity = capacity
+        self.indicators = indicators or IncrementalIndicators()
+        self.columns = list(OHLCV_FIELDS) + self.indicators.names
+
+        self._timestamps = np.empty(capacity, dtype='datetime64[ns]')
+        self._values = np.full((capacity, len(self.columns)), np.nan)
+        self._start = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        """
+        Gibt den Zeitstempel der jüngsten Bar zurück oder None, wenn der Puffer leer ist
+        """
+        with self._lock:
+            if self._size == 0:
+                return None
+            return pd.Timestamp(self._timestamps[(self._start + self._size - 1) % self.capacity])
+
+    def append(self, timestamp: Union[datetime, pd.Timestamp], bar: Dict[str, float]) -> None:
+        """
+        Fügt eine einzelne Bar hinzu
+
+        Args:
+            timestamp: Zeitstempel der Bar
+            bar: Dictionary mit den OHLCV-Werten
+        """
+        with self._lock:
+            self._append_locked(pd.Timestamp(timestamp), bar)
+
+    def _append_locked(self, timestamp: pd.Timestamp, bar: Dict[str, float]) -> None:
+        position = (self._start + self._size) % self.capacity
+        if self._size == self.capacity:
+            # Puffer voll: älteste Bar überschreiben
+            self._start = (self._start + 1) % self.capacity
+        else:
+            self._size += 1
+
+        row = [float(bar.get(field, np.nan)) for field in OHLCV_FIELDS]
+        row.extend(self.indicators.update(row[3]).values())
+        self._timestamps[position] = timestamp.to_datetime64()
+        self._values[position] = row
+
+    def extend(self, df: pd.DataFrame) -> int:
+        """
+        Übernimmt alle Bars aus einem DataFrame, die jünger als die letzte gespeicherte Bar sind
+
+        Args:
+            df: DataFrame mit OHLCV-Daten und DatetimeIndex (Spaltennamen groß oder klein)
+
+        Returns:
+            int: Anzahl der neu eingefügten Bars
+        """
+        if df is None or df.empty:
+            return 0
+
+        frame = df.rename(columns=str.lower).sort_index()
+        with self._lock:
+            if self._size > 0:
+                last = pd.Timestamp(self._timestamps[(self._start + self._size - 1) % self.capacity])
+                frame = frame[frame.index > last]
+
+            for timestamp, row in zip(frame.index, frame[list(OHLCV_FIELDS)].to_dict('records')):
+                self._append_locked(pd.Timestamp(timestamp), row)
+
+        return len(frame)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Gibt den Pufferinhalt in chronologischer Reihenfolge als DataFrame zurück
+
+        Returns:
+            pd.DataFrame: DataFrame mit OHLCV- und Indikatorspalten
+        """
+        with self._lock:
+            order = (self._start + np.arange(self._size)) % self.capacity
+            return pd.DataFrame(self._values[order], index=pd.DatetimeIndex(self._timestamps[order], name='date'),
+                                columns=self.columns)
+
+    def since(self, timestamp: Optional[Union[datetime, pd.Timestamp]]) -> pd.DataFrame:
+        """
+        Gibt alle Bars zurück, die jünger als der angegebene Zeitstempel sind
+
+        Args:
+            timestamp: Referenzzeitpunkt oder None für den gesamten Puffer
+
+        Returns:
+            pd.DataFrame: DataFrame mit den neuen Bars
+        """
+        frame = self.to_frame()
+        if timestamp is None:
+            return frame
+        return frame[frame.index > pd.Timestamp(timestamp)]
+
+
+class FakeLiveDataSource(DataSource):
+    """
+    Lokale Live-Datenquelle für Tests und Entwicklung
+
+    Erzeugt reproduzierbare Bars als Random Walk. Mit auto_advance wird bei jedem Abruf
+    eine neue Bar angehängt, sodass ohne Netzwerkzugriff ein laufender Feed simuliert wird.
+    """
+
+    def __init__(self, history: int = 200, auto_advance: bool = True, seed: int = 42,
+                 start: Optional[datetime] = None):
+        """
+        Initialisiert die Fake-Datenquelle
+
+        Args:
+            history: Anzahl der Bars, die beim ersten Abruf eines Symbols vorhanden sind
+            auto_advance: Ob bei jedem Abruf eine neue Bar erzeugt wird
+            seed: Seed für den Zufallsgenerator
+            start: Zeitstempel der ersten Bar (Standard: fester Startpunkt für Reproduzierbarkeit)
+        """
+        super().__init__(cache_enabled=False)
+        self.history = history
+        self.auto_advance = auto_advance
+        self.start = start or datetime(2024, 1, 2, 9, 30)
+        self._rng = np.random.default_rng(seed)
+        self._frames: Dict[tuple, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def advance(self, symbol: str, timeframe: str = '1m', n: int = 1) -> pd.DataFrame:
+        """
+        Hängt n neue Bars an die Historie eines Symbols an
+
+        Args:
+            symbol: Symbol des Assets
+            timeframe: Zeitrahmen
+            n: Anzahl neuer Bars
+
+        Returns:
+            pd.DataFrame: Die neu erzeugten Bars
+        """
+        with self._lock:
+            return self._advance_locked(symbol, timeframe, n)
+
+    def _advance_locked(self, symbol: str, timeframe: str, n: int) -> pd.DataFrame:
+        key = (symbol, timeframe)
+        frame = self._frames.get(key)
+        step = TIMEFRAME_DELTAS.get(timeframe, timedelta(minutes=1))
+
+        if frame is None or frame.empty:
+            first = pd.Timestamp(self.start)
+            last_close = 100.0
+        else:
+            first = frame.index[-1] + step
+            last_close = frame['close'].iloc[-1]
+
+        index = pd.date_range(start=first, periods=n, freq=step, name='date')
+        close = last_close * np.cumprod(1 + self._rng.normal(0, 0.001, n))
+        open_price = np.concatenate(([last_close], close[:-1]))
+        spread = np.abs(self._rng.normal(0, 0.0005, n)) * close
+        new_bars = pd.DataFrame({
+            'open': open_price,
+            'high': np.maximum(open_price, close) + spread,
+            'low': np.minimum(open_price, close) - spread,
+            'close': close,
+            'volume': self._rng.integers(1000, 10000, n).astype(np.int64),
+        }, index=index)
+
+        self._frames[key] = new_bars if frame is None else pd.concat([frame, new_bars])
+        return new_bars
+
+    def get_data(self, symbol: str, timeframe: str, start_date: Optional[Union[str, datetime]] = None,
+                end_date: Optional[Union[str, datetime]] = None) -> pd.DataFrame:
+        """
+        Gibt die simulierten Bars eines Symbols zurück
+
+        Args:
+            symbol: Symbol des Assets
+            timeframe: Zeitrahmen
+            start_date: Nur Bars nach diesem Zeitpunkt zurückgeben (optional)
+            end_date: Nur Bars bis zu diesem Zeitpunkt zurückgeben (optional)
+
+        Returns:
+            pd.DataFrame: DataFrame mit OHLCV-Daten
+        """
+        with self._lock:
+            if (symbol, timeframe) not in self._frames:
+                self._advance_locked(symbol, timeframe, self.history)
+            elif self.auto_advance:
+                self._advance_locked(symbol, timeframe, 1)
+            df = self._frames[(symbol, timeframe)]
+
+        if start_date is not None:
+            df = df[df.index > pd.Timestamp(start_date)]
+        if end_date is not None:
+            df = df[df.index <= pd.Timestamp(end_date)]
+        return df.copy()
+
+    def get_available_symbols(self) -> List[Dict[str, str]]:
+        """
+        Gibt eine Liste verfügbarer Symbole zurück
+
+        Returns:
+            List[Dict[str, str]]: Liste von Dictionaries mit Symbol-Informationen
+        """
+        return [{"label": symbol, "value": symbol, "group": "Live"} for symbol, _ in self._frames]
+
+    def get_available_timeframes(self) -> List[Dict[str, str]]:
+        """
+        Gibt eine Liste verfügbarer Zeitrahmen zurück
+
+        Returns:
+            List[Dict[str, str]]: Liste von Dictionaries mit Zeitrahmen-Informationen
+        """
+        return [{"label": tf, "value": tf, "group": "Live"} for tf in TIMEFRAME_DELTAS]
+
+
+class LiveFeedPoller:
+    """
+    Hintergrund-Poller für neue Bars
+
+    Fragt in festen Abständen das aktuelle Fenster der konfigurierten Datenquelle ab und legt
+    die Bars, die jünger als die letzte gepufferte Bar sind, im Ring-Puffer des Symbols ab.
+    Mit idle_timeout werden Symbole, die so lange nicht mehr abonniert wurden, verworfen; ohne
+    Symbole beendet sich der Hintergrund-Thread.
+    """
+
+    def __init__(self, data_source: DataSource, timeframe: str = '1m', poll_interval: float = 5.0,
+                 capacity: int = 5000, idle_timeout: Optional[float] = None):
+        """
+        Initialisiert den Poller
+
+        Args:
+            data_source: Datenquelle, aus der neue Bars abgerufen werden
+            timeframe: Zeitrahmen der Bars
+            poll_interval: Abfrageintervall in Sekunden
+            capacity: Kapazität des Ring-Puffers pro Symbol
+            idle_timeout: Sekunden ohne subscribe, nach denen ein Symbol verworfen wird (optional)
+        """
+        self.data_source = data_source
+        self.timeframe = timeframe
+        self.poll_interval = poll_interval
+        self.capacity = capacity
+        self.idle_timeout = idle_timeout
+        self._buffers: Dict[str, BarRingBuffer] = {}
+        self._last_seen: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def subscribe(self, symbol: str) -> BarRingBuffer:
+        """
+        Registriert ein Symbol für das Polling
+
+        Jeder Aufruf gilt als Lebenszeichen eines Abonnenten und setzt den Idle-Timeout zurück.
+
+        Args:
+            symbol: Symbol des Assets
+
+        Returns:
+            BarRingBuffer: Ring-Puffer des Symbols
+        """
+        with self._lock:
+            if symbol not in self._buffers:
+                self._buffers[symbol] = BarRingBuffer(self.capacity)
+            self._last_seen[symbol] = time.monotonic()
+            return self._buffers[symbol]
+
+    def unsubscribe(self, symbol: str) -> None:
+        """
+        Entfernt ein Symbol aus dem Polling
+
+        Args:
+            symbol: Symbol des Assets
+        """
+        with self._lock:
+            self._buffers.pop(symbol, None)
+            self._last_seen.pop(symbol, None)
+
+    def drop_idle(self) -> List[str]:
+        """
+        Verwirft alle Symbole, die länger als idle_timeout nicht abonniert wurden
+
+        Returns:
+            List[str]: Verworfene Symbole
+        """
+        if self.idle_timeout is None:
+            return []
+        deadline = time.monotonic() - self.idle_timeout
+        with self._lock:
+            idle = [symbol for symbol, seen in self._last_seen.items() if seen < deadline]
+            for symbol in idle:
+                self._buffers.pop(symbol, None)
+                self._last_seen.pop(symbol, None)
+        if idle:
+            logger.info(f"Live-Feed ({self.timeframe}): keine Abonnenten mehr für {', '.join(idle)}")
+        return idle
+
+    def get_buffer(self, symbol: str) -> Optional[BarRingBuffer]:
+        """
+        Gibt den Ring-Puffer eines Symbols zurück
+
+        Args:
+            symbol: Symbol des Assets
+
+        Returns:
+            Optional[BarRingBuffer]: Ring-Puffer oder None, wenn das Symbol nicht abonniert ist
+        """
+        with self._lock:
+            return self._buffers.get(symbol)
+
+    def poll_once(self) -> Dict[str, int]:
+        """
+        Führt einen Abfragezyklus für alle abonnierten Symbole aus
+
+        Returns:
+            Dict[str, int]: Anzahl neuer Bars pro Symbol
+        """
+        with self._lock:
+            buffers = dict(self._buffers)
+
+        new_bars = {}
+        for symbol, buffer in buffers.items():
+            try:
+                # Ohne Zeitraum: Datenquellen wie Yahoo rufen nur dann die API ab; ältere Bars
+                # verwirft der Ring-Puffer
+                df = self.data_source.get_data(symbol, self.timeframe)
+                new_bars[symbol] = buffer.extend(df)
+            except Exception as e:
+                logger.error(f"Fehler beim Abrufen neuer Bars für {symbol}: {str(e)}")
+                new_bars[symbol] = 0
+        return new_bars
+
+    def start(self) -> None:
+        """
+        Startet den Hintergrund-Thread, falls er noch nicht läuft
+
+        Mit idle_timeout sollten die Symbole vorher abonniert werden, sonst endet der Thread sofort.
+        """
+        with self._lock:
+            if self.is_running:
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name="live-feed-poller", daemon=True)
+            self._thread.start()
+        logger.info(f"Live-Feed gestartet (Intervall: {self.poll_interval}s, Zeitrahmen: {self.timeframe})")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stoppt den Hintergrund-Thread
+
+        Args:
+            timeout: Maximale Wartezeit in Sekunden (optional)
+        """
+        self._stop_event.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self.drop_idle()
+            with self._lock:
+                if self.idle_timeout is not None and not self._buffers:
+                    # Ohne Abonnenten endet der Thread; der nächste start() startet ihn neu
+                    self._thread = None
+                    logger.info(f"Live-Feed ohne Abonnenten beendet (Zeitrahmen: {self.timeframe})")
+                    return
+            self.poll_once()
+            self._stop_event.wait(self.poll_interval)
+
+
+# Prozessweite Poller für das Dashboard, je (Datenquelle, Zeitrahmen)
+_pollers: Dict[tuple, LiveFeedPoller] = {}
+_pollers_lock = threading.Lock()
+
+
+def get_live_poller(data_source: Optional[DataSource] = None, source_type: str = 'yahoo',
+                    timeframe: str = '1m', poll_interval: float = 5.0) -> LiveFeedPoller:
+    """
+    Gibt den prozessweiten Live-Feed-Poller einer Datenquelle und eines Zeitrahmens zurück
+    und erstellt ihn bei Bedarf
+
+    Die Ring-Puffer eines Pollers gehören damit zu genau einer Kombination aus Datenquelle,
+    Symbol und Zeitrahmen. Symbole ohne Abonnenten verwirft der Poller nach
+    TRADING_DASHBOARD_LIVE_IDLE_TIMEOUT Sekunden (Standard: 60), danach endet sein Thread.
+
+    Args:
+        data_source: Datenquelle (optional, Standard: über DataSourceFactory erstellt)
+        source_type: Typ der Datenquelle, z.B. der Wert der Datenquellen-Auswahl im Dashboard
+        timeframe: Zeitrahmen der Bars
+        poll_interval: Abfrageintervall in Sekunden
+
+    Returns:
+        LiveFeedPoller: Der gemeinsam genutzte Poller
+    """
+    key = (source_type, timeframe)
+    with _pollers_lock:
+        poller = _pollers.get(key)
+        if poller is None:
+            if data_source is None:
+                data_source = DataSourceFactory.create_data_source(source_type)
+            poller = LiveFeedPoller(data_source, timeframe=timeframe, poll_interval=poll_interval,
+                                    idle_timeout=get_env_setting("LIVE_IDLE_TIMEOUT", 60.0, float))
+            _pollers[key] = poller
+        return poller
+
+
+def stop_live_pollers() -> None:
+    """
+    Stoppt alle prozessweiten Live-Feed-Poller
+    """
+    with _pollers_lock:
+        pollers = list(_pollers.values())
+    for poller in pollers:
+        poller.stop()
@@ -0,0 +1,195 @@
+"""
+In-Process-Cache (L1) vor dem Daten-Cache auf der Festplatte
+Hält DataFrames je Schlüssel im Speicher, damit wiederholte Abrufe derselben Daten nicht jedes
+Mal eine CSV-Datei lesen und parsen. Der Cache ist durch ein Byte-Budget begrenzt (LRU), jeder
+Eintrag hat eine TTL, üblicherweise die Frische des Zeitrahmens aus data.cache_policy.
+Gespeicherte Daten sind schreibgeschützt; Aufrufer erhalten eine flache Kopie, die sich die
+Daten mit dem Eintrag teilt.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from utils.settings import get_env_setting
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.memory_cache")
+
+# Byte-Budget des L1-Caches (Standard: 64 MB)
+DEFAULT_MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+
+
+def freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Gibt einen schreibgeschützten DataFrame mit denselben Werten zurück
+
+    Die Spalten werden einmal in eigene Arrays kopiert, die als nicht beschreibbar markiert
+    sind. Schreibzugriffe auf die Werte schlagen fehl bzw. kopieren bei Copy-on-Write zuerst.
+
+    Args:
+        df: Zu schützende Daten
+
+    Returns:
+        pd.DataFrame: Schreibgeschützte Daten
+    """
+    if not df.columns.is_unique:
+        return df.copy()
+    arrays = {}
+    for col in df.columns:
+        values = df[col].to_numpy(copy=True)
+        values.flags.writeable = False
+        arrays[col] = values
+    frozen = pd.DataFrame(arrays, index=df.index, columns=df.columns, copy=False)
+    frozen.attrs = dict(df.attrs)
+    return frozen
+
+
+def frame_size(df: pd.DataFrame) -> int:
+    """
+    Gibt den Speicherbedarf eines DataFrames in Bytes zurück (inklusive Index und Objekten)
+    """
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class MemoryCache:
+    """
+    Threadsicherer LRU-Cache für DataFrames mit Byte-Budget und TTL je Eintrag
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MEMORY_CACHE_BYTES):
+        """
+        Initialisiert den Cache
+
+        Args:
+            max_bytes: Byte-Budget aller Einträge
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[pd.DataFrame, int, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """
+        Gibt die Daten eines Eintrags zurück
+
+        Args:
+            key: Schlüssel des Eintrags
+
+        Returns:
+            Optional[pd.DataFrame]: Schreibgeschützte Sicht auf die Daten oder None, wenn der
+                Eintrag fehlt oder seine TTL abgelaufen ist
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return entry[0].copy(deep=False)
+
+    def put(self, key: str, df: pd.DataFrame, ttl: float) -> None:
+        """
+        Speichert Daten und verdrängt bei Bedarf die am längsten nicht verwendeten Einträge
+
+        Leere DataFrames, Einträge ohne Lebensdauer und Daten größer als das Budget werden
+        nicht gespeichert.
+
+        Args:
+            key: Schlüssel des Eintrags
+            df: Zu speichernde Daten
+            ttl: Lebensdauer in Sekunden
+        """
+        if df is None or df.empty or ttl <= 0:
+            return
+        size = frame_size(df)
+        if size > self.max_bytes:
+            return
+        frozen = freeze_frame(df)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (frozen, size, time.monotonic() + ttl)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def invalidate(self, key: str) -> None:
+        """
+        Entfernt einen Eintrag
+
+        Args:
+            key: Schlüssel des Eintrags
+        """
+        with self._lock:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """
+        Entfernt alle Einträge und setzt die Statistik zurück
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+            self.hits = self.misses = self.evictions = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        Anteil der Treffer an allen Abrufen (0.0 ohne Abrufe)
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Gibt die Statistik des Caches zurück
+
+        Returns:
+            Dict[str, Any]: Einträge, belegte Bytes, Treffer, Fehltreffer, Trefferquote und Verdrängungen
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hit_ratio,
+                'evictions': self.evictions,
+            }
+
+
+_memory_cache: Optional[MemoryCache] = None
+_memory_cache_lock = threading.Lock()
+
+
+def get_memory_cache() -> MemoryCache:
+    """
+    Gibt den prozessweit geteilten L1-Cache zurück
+    (Budget: TRADING_DASHBOARD_MEMORY_CACHE_BYTES)
+
+    Returns:
+        MemoryCache: Geteilter Cache
+    """
+    global _memory_cache
+    with _memory_cache_lock:
+        if _memory_cache is None:
+            _memory_cache = MemoryCache(get_env_setting("MEMORY_CACHE_BYTES", DEFAULT_MEMORY_CACHE_BYTES, int))
+        return _memory_cache
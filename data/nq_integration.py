@@ -4,24 +4,55 @@ import json
 import pandas as pd
 from datetime import datetime, timedelta
 import time
+import threading
 from pathlib import Path
 import yfinance as yf
-import requests
+
+from data.bar_pyramid import BarPyramid
+from data.cache_policy import EXPIRED, STALE, get_background_refresher, get_cache_state, get_max_age
+from data.circuit_breaker import TWELVE_DATA, YFINANCE, get_circuit_breaker, get_last_known_good
+from data.history_loader import TwelveDataHistoryLoader
+from data.http_client import get_http_client
+from data.single_flight import get_single_flight
+from data.timestamps import get_symbol_timezone, normalize_frame
+from utils.helpers import CacheManager
+
+# Basisreihe (Intervall, Zeitraum), aus der jedes Intervall über die Bar-Pyramide abgeleitet wird
+PYRAMID_BASES = {
+    '1m': ('1m', '5d'), '2m': ('1m', '5d'), '3m': ('1m', '5d'), '5m': ('1m', '5d'),
+    '15m': ('1m', '5d'), '30m': ('1m', '5d'),
+    '60m': ('60m', '3mo'), '1h': ('60m', '3mo'), '4h': ('60m', '3mo'),
+    '1d': ('1d', '5y'), '1wk': ('1d', '5y'), '1mo': ('1d', '5y'),
+}
+
+# Zeitraum in Tagen, um zu prüfen, ob die Basisreihe den angefragten Zeitraum abdeckt
+RANGE_DAYS = {
+    '1d': 1, '5d': 5, '1mo': 31, '3mo': 92, '6mo': 183, '1y': 366, '2y': 731, '5y': 1827,
+}
 
 
 class NQDataFetcher:
     """
     Spezialisierte Klasse zum Abrufen von NASDAQ 100 Futures (NQ) Daten
+
+    Intervalle werden aus einer gemeinsamen Basisreihe je Stufe (1m, 60m, 1d) abgeleitet.
+    Die Bar-Pyramiden werden zwischen allen Instanzen geteilt.
     """
 
-    def __init__(self, cache_dir=None):
+    # Bar-Pyramiden je (Cache-Verzeichnis, Basisintervall, Basiszeitraum)
+    _pyramids = {}
+    _pyramid_lock = threading.Lock()
+
+    def __init__(self, cache_dir=None, http_client=None):
         """
         Initialisiert den NQDataFetcher
 
         Args:
             cache_dir (str, optional): Verzeichnis für den Daten-Cache.
                                       Standardmäßig wird ein 'cache' Verzeichnis im data-Ordner verwendet.
+            http_client (HttpClient, optional): Client für Twelve Data (Standard: geteilter Client)
         """
+        self.http_client = http_client if http_client is not None else get_http_client()
         if cache_dir is None:
             # Standardverzeichnis für den Cache
             self.cache_dir = Path(os.path.dirname(os.path.abspath(__file__))) / 'cache'
@@ -35,8 +66,11 @@ class NQDataFetcher:
         """
         Ruft NQ Futures Daten für ein bestimmtes Zeitintervall ab
 
+        Deckt die Basisreihe des Intervalls den Zeitraum ab, werden die Daten aus der
+        Bar-Pyramide abgeleitet, statt sie einzeln abzurufen.
+
         Args:
-            interval (str): Zeitintervall ('1m', '5m', '15m', '30m', '60m', '1h', '1d', '1wk', '1mo')
+            interval (str): Zeitintervall ('1m', '2m', '3m', '5m', '15m', '30m', '60m', '1h', '4h', '1d', '1wk', '1mo')
             range_val (str): Zeitraum ('1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y', 'max')
             use_cache (bool): Ob der Cache verwendet werden soll
             force_refresh (bool): Ob die Daten unabhängig vom Cache neu abgerufen werden sollen
@@ -44,6 +78,96 @@ class NQDataFetcher:
         Returns:
             pandas.DataFrame: DataFrame mit den NQ Futures Daten
         """
+        base = PYRAMID_BASES.get(interval)
+        if base is not None and range_val in RANGE_DAYS and RANGE_DAYS[range_val] <= RANGE_DAYS[base[1]]:
+            pyramid = self.get_pyramid(*base, use_cache=use_cache, force_refresh=force_refresh)
+            if pyramid is not None:
+                df = pyramid.get(interval)
+                if not df.empty:
+                    df = df[df.index > df.index[-1] - pd.Timedelta(days=RANGE_DAYS[range_val])]
+                return df
+
+        return self._fetch_series(interval, range_val, use_cache=use_cache, force_refresh=force_refresh)
+
+    def get_pyramid(self, base_interval, base_range, use_cache=True, force_refresh=False):
+        """
+        Gibt die Bar-Pyramide für eine Basisreihe zurück und aktualisiert sie bei Bedarf
+
+        Sind die Daten der Pyramide älter als die Cache-Dauer des Zeitrahmens (data.cache_policy),
+        wird die Basisreihe neu abgerufen und nur ab dem letzten bekannten Bar übernommen. Als
+        Ladezeitpunkt gilt der Zeitpunkt des Abrufs; eine seitdem (z.B. im Hintergrund)
+        aktualisierte Cache-Datei wird beim nächsten Aufruf übernommen.
+
+        Args:
+            base_interval (str): Intervall der Basisreihe
+            base_range (str): Zeitraum der Basisreihe
+            use_cache (bool): Ob der Cache verwendet werden soll
+            force_refresh (bool): Ob die Basisreihe unabhängig vom Alter neu abgerufen werden soll
+
+        Returns:
+            BarPyramid: Bar-Pyramide oder None, wenn keine Daten verfügbar sind
+        """
+        key = (str(self.cache_dir), base_interval, base_range)
+        max_age = get_max_age(base_interval)
+
+        cache_file = self._get_cache_file(base_interval, base_range)
+
+        with NQDataFetcher._pyramid_lock:
+            entry = NQDataFetcher._pyramids.get(key)
+        if entry is not None and not force_refresh and time.time() - entry['loaded_at'] < max_age \
+                and self._get_cache_mtime(cache_file, use_cache) == entry['cache_mtime']:
+            return entry['pyramid']
+
+        df = self._fetch_series(base_interval, base_range, use_cache=use_cache, force_refresh=force_refresh)
+        if df.empty:
+            return entry['pyramid'] if entry is not None else None
+
+        if entry is not None:
+            entry['pyramid'].append(df)
+            pyramid = entry['pyramid']
+        else:
+            # Tages-, Wochen- und Monats-Bars beginnen mit der CME-Sitzung um 18:00 New York
+            pyramid = BarPyramid(df, base_interval, session='NQ')
+
+        with NQDataFetcher._pyramid_lock:
+            NQDataFetcher._pyramids[key] = {'pyramid': pyramid, 'loaded_at': time.time(),
+                                            'cache_mtime': self._get_cache_mtime(cache_file, use_cache)}
+        return pyramid
+
+    @staticmethod
+    def _get_cache_mtime(cache_file, use_cache):
+        return cache_file.stat().st_mtime if use_cache and cache_file.exists() else None
+
+    def _fetch_series(self, interval, range_val, use_cache=True, force_refresh=False):
+        """
+        Ruft eine einzelne Zeitreihe über yfinance oder Twelve Data ab (mit CSV-Cache)
+
+        Gleichzeitige Abrufe derselben Reihe, auch aus anderen Worker-Prozessen mit demselben
+        Cache-Verzeichnis, werden zu einem Abruf zusammengefasst.
+
+        Args:
+            interval (str): Zeitintervall
+            range_val (str): Zeitraum
+            use_cache (bool): Ob der Cache verwendet werden soll
+            force_refresh (bool): Ob die Daten unabhängig vom Cache neu abgerufen werden sollen
+
+        Returns:
+            pandas.DataFrame: DataFrame mit den NQ Futures Daten
+        """
+        key = f"NQ_Futures_{interval}_{range_val}_{use_cache}_{force_refresh}"
+        return get_single_flight().do(
+            key, lambda: self._load_series(interval, range_val, use_cache, force_refresh), self.cache_dir)
+
+    def _get_cache_file(self, interval, range_val):
+        return self.cache_dir / f"NQ_Futures_{interval}_{range_val}.csv"
+
+    def _load_series(self, interval, range_val, use_cache, force_refresh):
+        """
+        Lädt eine Zeitreihe aus dem CSV-Cache oder ruft sie über yfinance bzw. Twelve Data ab
+
+        Veraltete Cache-Daten innerhalb des Stale-Fensters werden sofort zurückgegeben und im
+        Hintergrund neu abgerufen (siehe data.cache_policy).
+        """
         # Standardmäßig verwenden wir das generische NQ Futures Symbol
         symbol = "NQ=F"
 
@@ -51,167 +175,109 @@ class NQDataFetcher:
         # Aktuelle verfügbare Kontrakte: NQH24, NQM24, NQU24, NQZ24
         # symbol = "NQH24.CME"  # März 2024 Kontrakt
 
-        cache_file = self.cache_dir / f"NQ_Futures_{interval}_{range_val}.csv"
+        cache_file = self._get_cache_file(interval, range_val)
 
         # Prüfe, ob Cache verwendet werden soll und Datei existiert
         if use_cache and cache_file.exists() and not force_refresh:
-            # Prüfe, ob Cache aktuell ist (für tägliche Daten nicht älter als 1 Tag)
-            cache_age = datetime.now() - datetime.fromtimestamp(cache_file.stat().st_mtime)
-            if interval in ['1d', '1wk', '1mo'] and cache_age.days < 1:
+            # Prüfe das Alter des Caches anhand der Richtlinie für den Zeitrahmen
+            state = get_cache_state(interval, time.time() - cache_file.stat().st_mtime)
+            if state != EXPIRED:
                 print(f"Verwende gecachte NQ Futures Daten")
-                return pd.read_csv(cache_file, index_col=0, parse_dates=True)
-            elif interval.endswith('m') and cache_age.seconds < 3600:  # Für Minutendaten: 1 Stunde Cache
-                print(f"Verwende gecachte NQ Futures Daten")
-                return pd.read_csv(cache_file, index_col=0, parse_dates=True)
-
-        # Versuche zuerst, Daten über yfinance abzurufen
-        try:
-            print(f"Rufe NQ Futures Daten über yfinance ab...")
-
-            # Stelle sicher, dass Intervall korrekt formatiert ist (yfinance verwendet '1h' statt '60m')
-            if interval == '60m':
-                yf_interval = '1h'
-            else:
-                yf_interval = interval
+                df = pd.read_csv(cache_file, index_col=0, parse_dates=True)
+                get_last_known_good().put(f"NQ_Futures_{interval}_{range_val}", df)
+                if state == STALE:
+                    get_background_refresher().schedule(
+                        str(cache_file), lambda: self._fetch_series(interval, range_val, use_cache, True))
+                return df
 
-            ticker = yf.Ticker(symbol)
-            df = ticker.history(period=range_val, interval=yf_interval)
+        # Upstreams nacheinander versuchen; solche mit offenem Circuit Breaker werden übersprungen
+        lkg_key = f"NQ_Futures_{interval}_{range_val}"
+        upstreams = ((YFINANCE, lambda: self._fetch_from_yfinance(symbol, interval, range_val)),
+                     (TWELVE_DATA, lambda: self._fetch_from_twelve_data(interval, range_val)))
+        for upstream, fetch in upstreams:
+            if upstream == TWELVE_DATA and not os.getenv("TWELVE_DATA_API_KEY", ""):
+                # Die Twelve Data API benötigt einen API-Schlüssel: https://twelvedata.com/
+                print(
+                    "Kein API-Schlüssel für Twelve Data gefunden. Bitte setzen Sie die Umgebungsvariable TWELVE_DATA_API_KEY.")
+                continue
+            breaker = get_circuit_breaker(upstream)
+            if not breaker.allow():
+                print(f"{upstream} übersprungen: Circuit Breaker offen")
+                continue
+            try:
+                df = fetch()
+            except Exception as e:
+                print(f"Fehler beim Abrufen der NQ Futures Daten über {upstream}: {e}")
+                breaker.record_error(e)
+                continue
+            # Eine Antwort ohne Daten (z.B. unbekanntes Symbol) ist kein Ausfall des Upstreams
+            breaker.record_success()
+            if df is None or df.empty:
+                continue
+            get_last_known_good().put(lkg_key, df)
+
+            # Speichere Daten im Cache
+            if use_cache:
+                CacheManager.write_csv_atomic(df, cache_file)
+            return df
+
+        # Wenn alle Versuche fehlschlagen, die zuletzt erfolgreich abgerufenen Daten verwenden
+        df = get_last_known_good().get(lkg_key)
+        if df is not None:
+            print("Verwende zuletzt erfolgreich abgerufene NQ Futures Daten")
+            return df
+        print("Alle Versuche, NQ Futures Daten abzurufen, sind fehlgeschlagen.")
+        return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume', 'Adj Close'])
 
-            if df.empty:
-                print(f"Keine Daten für {symbol} mit period={range_val}, interval={yf_interval}.")
-                # Verwende die direkte Download-Methode als Fallback
-                df = yf.download(symbol, period=range_val, interval=yf_interval)
+    def _fetch_from_yfinance(self, symbol, interval, range_val):
+        """
+        Ruft eine Zeitreihe über yfinance ab
 
-            if not df.empty:
-                # Standardisiere Spaltennamen
-                df.columns = [col if col != 'Stock Splits' else 'Splits' for col in df.columns]
+        Returns:
+            pandas.DataFrame: DataFrame mit den Daten (leer, wenn keine Daten verfügbar sind)
+        """
+        print(f"Rufe NQ Futures Daten über yfinance ab...")
 
-                # Speichere Daten im Cache
-                if use_cache:
-                    df.to_csv(cache_file)
+        # Stelle sicher, dass Intervall korrekt formatiert ist (yfinance verwendet '1h' statt '60m')
+        if interval == '60m':
+            yf_interval = '1h'
+        else:
+            yf_interval = interval
 
-                print(f"Erfolgreich NQ Futures Daten abgerufen, {len(df)} Datenpunkte")
-                return df
+        ticker = yf.Ticker(symbol)
+        df = ticker.history(period=range_val, interval=yf_interval)
 
-        except Exception as e:
-            print(f"Fehler beim Abrufen der NQ Futures Daten über yfinance: {e}")
+        if df.empty:
+            print(f"Keine Daten für {symbol} mit period={range_val}, interval={yf_interval}.")
+            # Verwende die direkte Download-Methode als Fallback
+            df = yf.download(symbol, period=range_val, interval=yf_interval)
 
-        # Wenn yfinance fehlschlägt, versuche die Twelve Data API (benötigt einen API-Schlüssel)
-        try:
-            # Diese Beispielimplementierung nutzt die Twelve Data API
-            # Registrieren Sie sich für einen kostenlosen API-Schlüssel: https://twelvedata.com/
-            print("Versuche Twelve Data API als Fallback...")
+        if not df.empty:
+            # Standardisiere Spaltennamen und Zeitstempel
+            df = normalize_frame(df, get_symbol_timezone(symbol))
+            print(f"Erfolgreich NQ Futures Daten abgerufen, {len(df)} Datenpunkte")
 
-            # Setzen Sie Ihren API-Schlüssel hier ein oder in einer .env-Datei
-            api_key = os.getenv("TWELVE_DATA_API_KEY", "")
+        return df
 
-            if not api_key:
-                print(
-                    "Kein API-Schlüssel für Twelve Data gefunden. Bitte setzen Sie die Umgebungsvariable TWELVE_DATA_API_KEY.")
-                return pd.DataFrame()
-
-            # Konvertiere Intervall zum Twelve Data-Format
-            interval_map = {
-                '1m': '1min', '5m': '5min', '15m': '15min', '30m': '30min',
-                '60m': '1h', '1h': '1h', '1d': '1day', '1wk': '1week', '1mo': '1month'
-            }
-            td_interval = interval_map.get(interval, '1day')
-
-            # Bestimme die Anzahl der Datenpunkte basierend auf dem Zeitraum
-            # Free API begrenzt auf 5000 Datenpunkte
-            output_size = 5000
-
-            # Konstruiere die API-URL
-            url = f"https://api.twelvedata.com/time_series"
-            params = {
-                "symbol": "NQ:GLOIU",  # NASDAQ 100 Futures Symbol bei Twelve Data
-                "interval": td_interval,
-                "outputsize": output_size,
-                "apikey": api_key,
-                "format": "JSON"
-            }
-
-            response = requests.get(url, params=params)
-            data = response.json()
-
-            if "values" in data:
-                # Konvertiere JSON zu Pandas DataFrame
-                values = data["values"]
-                df = pd.DataFrame(values)
-
-                # Konvertiere Spalten
-                df["datetime"] = pd.to_datetime(df["datetime"])
-                for col in ["open", "high", "low", "close", "volume"]:
-                    if col in df.columns:
-                        df[col] = pd.to_numeric(df[col])
-
-                # Setze datetime als Index und benenne Spalten um
-                df.set_index("datetime", inplace=True)
-                df.rename(columns={
-                    "open": "Open",
-                    "high": "High",
-                    "low": "Low",
-                    "close": "Close",
-                    "volume": "Volume"
-                }, inplace=True)
-
-                # Sortiere Daten chronologisch
-                df.sort_index(inplace=True)
-
-                # Speichere Daten im Cache
-                if use_cache:
-                    df.to_csv(cache_file)
-
-                print(f"Erfolgreich NQ Futures Daten von Twelve Data abgerufen, {len(df)} Datenpunkte")
-
-                print("\n----- NQ DATA DEBUG -----")
-                print("Datentyp:", type(df))
-                print("Spalten:", df.columns.tolist())
-                print("Index-Typ:", type(df.index))
-                print("Erste Zeilen:")
-                print(df.head(3))
-                print("Datentypen der Spalten:")
-                print(df.dtypes)
-                print("-------------------------\n")
-
-                # Nach dem Abrufen der NQ-Daten, vor der Rückgabe
-                # Standardisiere Spaltennamen (erster Buchstabe groß)
-                column_mapping = {
-                    'open': 'Open',
-                    'high': 'High',
-                    'low': 'Low',
-                    'close': 'Close',
-                    'volume': 'Volume'
-                }
-
-                # Benenne Spalten um, falls nötig
-                for old_col, new_col in column_mapping.items():
-                    if old_col in df.columns:
-                        df.rename(columns={old_col: new_col}, inplace=True)
-
-                    # Nach dem Abrufen der NQ-Daten, vor der Rückgabe
-                    # Stelle sicher, dass der Index ein DatetimeIndex ist
-                if not isinstance(df.index, pd.DatetimeIndex):
-                    df.index = pd.to_datetime(df.index)
-
-                # Stelle sicher, dass die Zeitzone korrekt ist (falls nötig)
-                if df.index.tz is not None:
-                    df.index = df.index.tz_localize(None)
-                
-                # Stelle sicher, dass keine tzinfo-Attribute vorhanden sind
-                df.index = pd.DatetimeIndex([dt.replace(tzinfo=None) if hasattr(dt, 'tzinfo') else dt for dt in df.index])
+    def _fetch_from_twelve_data(self, interval, range_val):
+        """
+        Ruft eine Zeitreihe über die Twelve Data API ab (API-Schlüssel in TWELVE_DATA_API_KEY)
 
+        Der Zeitraum wird seitenweise und parallel geladen (data.history_loader), sodass auch
+        Minutendaten über mehrere Wochen verfügbar sind; für 'max' wird eine Seite geladen.
 
-                return df
-            else:
-                print(f"Fehler bei Twelve Data-Anfrage: {data.get('message', 'Unbekannter Fehler')}")
+        Returns:
+            pandas.DataFrame: DataFrame mit den Daten
+        """
+        print("Versuche Twelve Data API als Fallback...")
 
-        except Exception as e:
-            print(f"Fehler beim Abrufen der Twelve Data API: {e}")
+        loader = TwelveDataHistoryLoader(http_client=self.http_client)
+        end = pd.Timestamp.now().floor('min')
+        start = end - pd.Timedelta(days=RANGE_DAYS[range_val]) if range_val in RANGE_DAYS else None
+        df = loader.load(interval, start, end)
 
-        # Wenn alle Versuche fehlschlagen, gib einen leeren DataFrame zurück
-        print("Alle Versuche, NQ Futures Daten abzurufen, sind fehlgeschlagen.")
-        return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume', 'Adj Close'])
+        print(f"Erfolgreich NQ Futures Daten von Twelve Data abgerufen, {len(df)} Datenpunkte")
+        return df
 
 
 # Beispiel zur Verwendung
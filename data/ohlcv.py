@@ -0,0 +1,143 @@
+"""
+Kanonisches OHLCV-Schema für das Trading Dashboard
+Zeitreihen werden intern als ein typisierter DataFrame geführt: Spalten open, high, low, close
+(float64 oder float32) und volume (int64) mit sortiertem DatetimeIndex 'date' nach der
+Zeitzonen-Richtlinie aus data.timestamps. Module mit Spaltennamen in Großschreibung
+(DataFetcher, BacktestEngine, strategy.example_strategies) erhalten über title_view() eine Sicht
+auf dieselben Daten, ohne dass Spalten kopiert oder dupliziert werden.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from data.timestamps import COLUMN_NAMES, DEFAULT_TIMEZONE, normalize_index
+
+# Spalten des kanonischen Schemas in fester Reihenfolge
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+PRICE_COLUMNS = OHLCV_COLUMNS[:4]
+
+# Erlaubte Datentypen der Preisspalten
+PRICE_DTYPES = ('float64', 'float32')
+
+
+class OHLCVSchemaError(ValueError):
+    """
+    Die Daten lassen sich nicht auf das OHLCV-Schema bringen
+    """
+
+
+def is_ohlcv(df: pd.DataFrame, price_dtype: Optional[str] = None) -> bool:
+    """
+    Prüft, ob ein DataFrame bereits dem kanonischen Schema entspricht
+
+    Args:
+        df: Zu prüfender DataFrame
+        price_dtype: Erwarteter Datentyp der Preisspalten (ohne Angabe: float64 oder float32)
+
+    Returns:
+        bool: True, wenn Spalten, Datentypen und Index dem Schema entsprechen
+    """
+    if not isinstance(df, pd.DataFrame) or tuple(df.columns[:len(OHLCV_COLUMNS)]) != OHLCV_COLUMNS:
+        return False
+    index = df.index
+    if not isinstance(index, pd.DatetimeIndex) or index.tz is not None or not index.is_monotonic_increasing:
+        return False
+    dtypes = (price_dtype,) if price_dtype is not None else PRICE_DTYPES
+    if any(str(df.dtypes[col]) not in dtypes for col in PRICE_COLUMNS):
+        return False
+    return str(df.dtypes['volume']) == 'int64'
+
+
+def to_ohlcv(df: pd.DataFrame, timezone: str = DEFAULT_TIMEZONE, price_dtype: str = 'float64') -> pd.DataFrame:
+    """
+    Bringt OHLCV-Daten einer beliebigen Quelle auf das kanonische Schema
+
+    Spaltennamen werden unabhängig von der Schreibweise erkannt. Eine 'date'-Spalte wird zum
+    Index bzw. entfällt, wenn bereits ein DatetimeIndex vorhanden ist. Weitere Spalten (z.B.
+    adj_close oder Indikatoren) bleiben hinter den OHLCV-Spalten erhalten. DataFrames, die dem
+    Schema bereits entsprechen, werden unverändert zurückgegeben.
+
+    Args:
+        df: OHLCV-Daten mit Spalten in Groß- oder Kleinschreibung
+        timezone: Zielzeitzone für zeitzonenbehaftete Indizes, z.B. get_symbol_timezone(symbol)
+        price_dtype: Datentyp der Preisspalten ('float64' oder 'float32')
+
+    Returns:
+        pd.DataFrame: Daten im kanonischen Schema
+
+    Raises:
+        OHLCVSchemaError: Bei fehlenden OHLC-Spalten, fehlendem Zeitindex oder ungültigem Datentyp
+    """
+    if price_dtype not in PRICE_DTYPES:
+        raise OHLCVSchemaError(f"Ungültiger Datentyp für Preisspalten: {price_dtype}")
+    if is_ohlcv(df, price_dtype):
+        return df
+
+    columns = {col: COLUMN_NAMES[col.lower()][1]
+               for col in df.columns if isinstance(col, str) and col.lower() in COLUMN_NAMES}
+    df = df.rename(columns=columns)
+    missing = [col for col in PRICE_COLUMNS if col not in df.columns]
+    if missing:
+        raise OHLCVSchemaError(f"Fehlende OHLC-Spalten: {missing}")
+
+    if 'date' in df.columns:
+        df = df.drop(columns='date') if isinstance(df.index, pd.DatetimeIndex) else df.set_index('date')
+    try:
+        index = normalize_index(df.index, timezone)
+    except (ValueError, TypeError) as e:
+        raise OHLCVSchemaError(f"Index ist nicht in Zeitstempel konvertierbar: {e}") from e
+    df = df.set_axis(index.rename('date'), axis=0)
+
+    if 'volume' in df.columns:
+        volume = df['volume']
+        if volume.dtype != np.int64:
+            volume = pd.to_numeric(volume, errors='coerce').fillna(0).round().astype(np.int64)
+    else:
+        volume = pd.Series(np.zeros(len(df), dtype=np.int64), index=df.index)
+
+    # astype belässt Spalten, die bereits den Zieltyp haben, ohne Kopie
+    prices = df[list(PRICE_COLUMNS)].astype(price_dtype)
+    extras = [col for col in df.columns if col not in OHLCV_COLUMNS]
+    df = pd.concat([prices, volume.rename('volume'), df[extras]], axis=1)
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind='stable')
+    return df
+
+
+def _relabel(df: pd.DataFrame, position: int) -> pd.DataFrame:
+    view = df.copy(deep=False)
+    view.columns = [COLUMN_NAMES[col.lower()][position] if isinstance(col, str) and col.lower() in COLUMN_NAMES
+                    else col for col in df.columns]
+    return view
+
+
+def title_view(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Gibt eine Sicht mit Spaltennamen in Großschreibung zurück ('Open', ..., 'Adj Close')
+
+    Die Sicht teilt sich die Daten mit df; nur die Spaltenbeschriftung ist neu.
+
+    Args:
+        df: OHLCV-Daten
+
+    Returns:
+        pd.DataFrame: Sicht mit umbenannten Spalten
+    """
+    return _relabel(df, 0)
+
+
+def lower_view(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Gibt eine Sicht mit Spaltennamen in Kleinschreibung zurück ('open', ..., 'adj_close')
+
+    Die Sicht teilt sich die Daten mit df; nur die Spaltenbeschriftung ist neu.
+
+    Args:
+        df: OHLCV-Daten
+
+    Returns:
+        pd.DataFrame: Sicht mit umbenannten Spalten
+    """
+    return _relabel(df, 1)
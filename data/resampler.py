@@ -0,0 +1,340 @@
+"""
+OHLCV-Resampler für das Trading Dashboard
+Aggregiert OHLCV-Daten eines oder mehrerer Symbole in einem Durchlauf über NumPy-Arrays,
+optional verankert an der Eröffnung einer Handelssitzung (z.B. NQ um 18:00 Uhr New York)
+"""
+
+import logging
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.resampler")
+
+# Bucket-Frequenz je Zeitrahmen ('W' und 'MS' werden gesondert verankert)
+TIMEFRAME_FREQS = {
+    '1m': '1min',
+    '2m': '2min',
+    '3m': '3min',
+    '5m': '5min',
+    '15m': '15min',
+    '30m': '30min',
+    '60m': '1h',
+    '1h': '1h',
+    '4h': '4h',
+    '1d': '1D',
+    '1w': 'W',
+    '1wk': 'W',
+    '1mo': 'MS',
+}
+
+# Spalten, die aggregiert werden (Groß- oder Kleinschreibung wie in der Eingabe)
+OHLCV_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class ResampleError(ValueError):
+    """
+    Basisklasse für Fehler beim Resampling
+    """
+
+
+class UnknownTimeframeError(ResampleError):
+    """
+    Der Ziel-Zeitrahmen ist unbekannt
+    """
+
+
+class MissingColumnsError(ResampleError):
+    """
+    Den Eingabedaten fehlen OHLC-Spalten
+    """
+
+
+class InvalidIndexError(ResampleError):
+    """
+    Die Eingabedaten haben keinen gültigen Zeitindex
+    """
+
+
+class SessionAnchor:
+    """
+    Eröffnung einer Handelssitzung, an der Buckets ausgerichtet werden
+
+    Bei einer Eröffnung um 18:00 Uhr beginnt der Tages-Bucket um 18:00 Uhr des Vortags,
+    Wochen beginnen mit der Sitzung am Sonntagabend und Monate mit der ersten Sitzung,
+    deren Handelstag im Monat liegt.
+    """
+
+    def __init__(self, timezone: str, open_time: str = "00:00"):
+        """
+        Initialisiert die Sitzung
+
+        Args:
+            timezone: Zeitzone der Börse (z.B. 'America/New_York')
+            open_time: Eröffnungszeit im Format 'HH:MM'
+        """
+        self.timezone = timezone
+        self.open_time = open_time
+        hours, minutes = (int(part) for part in open_time.split(":"))
+        self.open_offset = pd.Timedelta(hours=hours, minutes=minutes)
+
+    def get_shift(self, freq: str) -> pd.Timedelta:
+        """
+        Verschiebung der Zeitstempel, nach der die Buckets ohne Sitzung berechnet werden
+
+        Args:
+            freq: Bucket-Frequenz aus TIMEFRAME_FREQS
+
+        Returns:
+            pd.Timedelta: Verschiebung (wird von den Bucket-Grenzen wieder abgezogen)
+        """
+        if not self.open_offset:
+            return pd.Timedelta(0)
+        # Wochen und Monate richten sich nach dem Handelstag, der mit der Eröffnung beginnt
+        if freq in ('W', 'MS'):
+            return pd.Timedelta(days=1) - self.open_offset
+        return -self.open_offset
+
+    def __repr__(self) -> str:
+        return f"SessionAnchor({self.timezone!r}, {self.open_time!r})"
+
+
+# Bekannte Handelssitzungen
+SESSIONS = {
+    'NQ': SessionAnchor('America/New_York', '18:00'),
+    'ES': SessionAnchor('America/New_York', '18:00'),
+    'CME': SessionAnchor('America/New_York', '18:00'),
+}
+
+
+def get_timeframe_freq(timeframe: str) -> str:
+    """
+    Gibt die Bucket-Frequenz eines Zeitrahmens zurück
+
+    Args:
+        timeframe: Zeitrahmen (Schlüssel aus TIMEFRAME_FREQS)
+
+    Returns:
+        str: Bucket-Frequenz
+
+    Raises:
+        UnknownTimeframeError: Wenn der Zeitrahmen unbekannt ist
+    """
+    freq = TIMEFRAME_FREQS.get(timeframe)
+    if freq is None:
+        raise UnknownTimeframeError(f"Unbekannter Zeitrahmen für das Resampling: {timeframe}")
+    return freq
+
+
+def get_bucket_boundaries(index: pd.DatetimeIndex, timeframe: str) -> pd.DatetimeIndex:
+    """
+    Berechnet die Startzeitpunkte aller Buckets, die den Zeitraum des Index abdecken
+
+    Minuten- und Stunden-Buckets sind an der Uhrzeit ausgerichtet, Tage an Mitternacht,
+    Wochen am Montag und Monate am Monatsersten.
+
+    Args:
+        index: Sortierter DatetimeIndex ohne Zeitzone
+        timeframe: Ziel-Zeitrahmen (Schlüssel aus TIMEFRAME_FREQS)
+
+    Returns:
+        pd.DatetimeIndex: Aufsteigende Bucket-Grenzen
+    """
+    freq = get_timeframe_freq(timeframe)
+    first, last = index.min(), index.max()
+    if freq == 'W':
+        start = first.normalize() - pd.Timedelta(days=first.weekday())
+        return pd.date_range(start, last, freq='7D')
+    if freq == 'MS':
+        start = first.normalize().replace(day=1)
+        return pd.date_range(start, last, freq='MS')
+    return pd.date_range(first.floor(freq), last, freq=freq)
+
+
+def _resolve_session(session: Union[str, SessionAnchor, None]) -> Optional[SessionAnchor]:
+    if session is None or isinstance(session, SessionAnchor):
+        return session
+    anchor = SESSIONS.get(session)
+    if anchor is None:
+        raise ResampleError(f"Unbekannte Handelssitzung: {session}")
+    return anchor
+
+
+def _prepare_frame(df: pd.DataFrame, anchor: Optional[SessionAnchor], symbol: Optional[str] = None
+                   ) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """
+    Bringt eine OHLCV-Reihe auf einen sortierten DatetimeIndex
+
+    Zeitzonenbehaftete Indizes bleiben zeitzonenbehaftet und werden in die Zeitzone der Sitzung
+    umgerechnet, ohne Sitzung behalten sie ihre Zeitzone.
+
+    Returns:
+        Tuple: Normalisierte Daten und Zuordnung Feld -> Spaltenname
+    """
+    label = f" ({symbol})" if symbol is not None else ""
+    if not isinstance(df, pd.DataFrame):
+        raise ResampleError(f"Erwartet wird ein DataFrame{label}, erhalten: {type(df).__name__}")
+
+    if not isinstance(df.index, pd.DatetimeIndex):
+        if 'date' not in df.columns:
+            raise InvalidIndexError(f"DataFrame{label} hat keinen DatetimeIndex und keine 'date'-Spalte")
+        df = df.set_index('date')
+        try:
+            df.index = pd.to_datetime(df.index)
+        except (ValueError, TypeError) as e:
+            raise InvalidIndexError(f"Spalte 'date'{label} ist nicht in Zeitstempel konvertierbar: {e}") from e
+
+    columns = {col.lower(): col for col in df.columns if isinstance(col, str) and col.lower() in OHLCV_FIELDS}
+    missing = [field for field in OHLCV_FIELDS[:4] if field not in columns]
+    if missing:
+        raise MissingColumnsError(f"Fehlende OHLC-Spalten{label}: {missing}")
+
+    if df.index.tz is not None and anchor is not None:
+        df = df.set_axis(df.index.tz_convert(anchor.timezone), axis=0)
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind='stable')
+    return df, columns
+
+
+def _label_keys(frame: pd.DataFrame, labels: np.ndarray) -> np.ndarray:
+    """
+    Ordnet die Bucket-Starts (lokale Uhrzeit) einer Reihe eindeutigen Zeitpunkten zu
+
+    Bei zeitzonenbehafteten Reihen sind die Schlüssel UTC-Nanosekunden. Ein Bucket-Start, den
+    es beim Ende der Sommerzeit zweimal gibt, gehört zu dem Vorkommen, in das der Bar fällt,
+    sodass die doppelte Stunde zwei Buckets bleibt. Nicht existierende Starts werden auf den
+    nächsten gültigen Zeitpunkt verschoben.
+
+    Returns:
+        np.ndarray: Schlüssel je Bar als int64
+    """
+    tz = frame.index.tz
+    if tz is None:
+        return labels.view('int64')
+
+    # Nur die wenigen verschiedenen Bucket-Starts lokalisieren, nicht jeden Bar
+    unique, inverse = np.unique(labels, return_inverse=True)
+    localized = pd.DatetimeIndex(unique).tz_localize(tz, ambiguous='NaT', nonexistent='shift_forward')
+    keys = localized.as_unit('ns').asi8[inverse]
+    ambiguous = keys == pd.NaT.value
+    if ambiguous.any():
+        repeated = pd.DatetimeIndex(labels[ambiguous])
+        first = repeated.tz_localize(tz, ambiguous=np.ones(len(repeated), dtype=bool)).as_unit('ns').asi8
+        second = repeated.tz_localize(tz, ambiguous=np.zeros(len(repeated), dtype=bool)).as_unit('ns').asi8
+        bars = frame.index[ambiguous].as_unit('ns').asi8
+        keys[ambiguous] = np.where(bars >= second, second, first)
+    return keys
+
+
+def _aggregate(frames: List[pd.DataFrame], columns: List[Dict[str, str]], timeframe: str,
+               anchor: Optional[SessionAnchor]) -> Tuple[List[np.ndarray], Dict[str, np.ndarray], np.ndarray]:
+    """
+    Aggregiert alle Reihen in einem Durchlauf
+
+    Die Reihen werden hintereinander gelegt, jeder Bar per np.searchsorted einem Bucket
+    zugeordnet und jedes Segment (Symbol, Bucket) mit ufunc.reduceat aggregiert.
+
+    Returns:
+        Tuple: Bucket-Schlüssel je Reihe (siehe _label_keys), aggregierte Werte je Feld und
+        Segmentanzahl je Reihe
+    """
+    freq = get_timeframe_freq(timeframe)
+    shift = anchor.get_shift(freq) if anchor is not None else pd.Timedelta(0)
+    shift_ns = np.timedelta64(shift.value, 'ns')
+
+    lengths = np.array([len(frame) for frame in frames])
+    # Buckets werden in lokaler Uhrzeit gebildet (Mitternacht, Sitzungseröffnung)
+    local = [frame.index.tz_localize(None) if frame.index.tz is not None else frame.index for frame in frames]
+    timestamps = np.concatenate([index.values.astype('datetime64[ns]') for index in local]) + shift_ns
+    codes = np.repeat(np.arange(len(frames)), lengths)
+
+    boundaries = get_bucket_boundaries(pd.DatetimeIndex(timestamps), timeframe).values.astype('datetime64[ns]')
+    bucket_ids = np.searchsorted(boundaries, timestamps, side='right') - 1
+    bounds = np.cumsum(lengths)[:-1]
+    bar_labels = np.split(boundaries[bucket_ids] - shift_ns, bounds)
+    keys = np.concatenate([_label_keys(frame, labels) for frame, labels in zip(frames, bar_labels)])
+
+    # Ein neues Segment beginnt bei jedem Wechsel von Symbol oder Bucket
+    changes = (keys[1:] != keys[:-1]) | (codes[1:] != codes[:-1])
+    starts = np.flatnonzero(np.r_[True, changes])
+    ends = np.r_[starts[1:], len(timestamps)] - 1
+
+    def stacked(field):
+        return np.concatenate([frame[cols[field]].to_numpy(dtype=float) for frame, cols in zip(frames, columns)])
+
+    values = {
+        'open': stacked('open')[starts],
+        'high': np.fmax.reduceat(stacked('high'), starts),
+        'low': np.fmin.reduceat(stacked('low'), starts),
+        'close': stacked('close')[ends],
+    }
+    if all('volume' in cols for cols in columns):
+        values['volume'] = np.add.reduceat(np.nan_to_num(stacked('volume')), starts)
+
+    labels = keys[starts]
+    counts = np.bincount(codes[starts], minlength=len(frames))
+    return np.split(labels, np.cumsum(counts)[:-1]), values, counts
+
+
+def resample_ohlcv(data: Union[pd.DataFrame, Mapping[str, pd.DataFrame]], timeframe: str,
+                   session: Union[str, SessionAnchor, None] = None
+                   ) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """
+    Resampled OHLCV-Daten eines oder mehrerer Symbole auf einen gröberen Zeitrahmen
+
+    Alle Symbole werden in einem gemeinsamen Durchlauf über NumPy-Arrays aggregiert
+    (open = erster, high = Maximum, low = Minimum, close = letzter Wert, volume = Summe).
+    Buckets ohne Bars entfallen, der Index enthält den Startzeitpunkt jedes Buckets.
+    Zeitzonenbehaftete Daten werden in lokaler Uhrzeit gebündelt (mit Sitzung in deren Zeitzone,
+    sonst in der Zeitzone der Eingabe) und behalten einen zeitzonenbehafteten Index; die
+    doppelte Stunde beim Ende der Sommerzeit ergibt zwei Buckets.
+
+    Args:
+        data: DataFrame mit OHLCV-Spalten oder Dictionary Symbol -> DataFrame
+        timeframe: Ziel-Zeitrahmen (Schlüssel aus TIMEFRAME_FREQS)
+        session: Handelssitzung für die Verankerung (Schlüssel aus SESSIONS oder SessionAnchor)
+
+    Returns:
+        Union[pd.DataFrame, Dict[str, pd.DataFrame]]: Aggregierte Daten mit den Spaltennamen der Eingabe,
+        bei einem Dictionary ein Dictionary mit denselben Schlüsseln
+
+    Raises:
+        UnknownTimeframeError: Wenn der Zeitrahmen unbekannt ist
+        MissingColumnsError: Wenn OHLC-Spalten fehlen
+        InvalidIndexError: Wenn kein gültiger Zeitindex vorhanden ist
+        ResampleError: Bei einer unbekannten Sitzung oder ungültigen Eingaben
+    """
+    get_timeframe_freq(timeframe)
+    anchor = _resolve_session(session)
+
+    single = isinstance(data, pd.DataFrame)
+    items = {None: data} if single else dict(data)
+    prepared = {symbol: _prepare_frame(df, anchor, symbol) for symbol, df in items.items()}
+
+    non_empty = [symbol for symbol, (df, _) in prepared.items() if not df.empty]
+    results: Dict[Optional[str], pd.DataFrame] = {}
+    if non_empty:
+        frames = [prepared[symbol][0] for symbol in non_empty]
+        columns = [prepared[symbol][1] for symbol in non_empty]
+        labels, values, counts = _aggregate(frames, columns, timeframe, anchor)
+
+        offset = 0
+        for symbol, symbol_labels, count in zip(non_empty, labels, counts):
+            df, cols = prepared[symbol]
+            index = pd.DatetimeIndex(symbol_labels.view('datetime64[ns]'), name=df.index.name)
+            if df.index.tz is not None:
+                index = index.tz_localize('UTC').tz_convert(df.index.tz)
+            index = index.as_unit(df.index.unit)
+            results[symbol] = pd.DataFrame(
+                {cols[field]: field_values[offset:offset + count] for field, field_values in values.items()},
+                index=index,
+            )
+            offset += count
+
+    for symbol, (df, cols) in prepared.items():
+        if symbol not in results:
+            results[symbol] = df[[cols[field] for field in OHLCV_FIELDS if field in cols]].copy()
+
+    return results[None] if single else {symbol: results[symbol] for symbol in items}
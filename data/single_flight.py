@@ -0,0 +1,153 @@
+"""
+Zusammenfassen gleichzeitiger Datenabrufe (Single-Flight)
+Laufen mehrere Abrufe mit demselben Schlüssel gleichzeitig, führt nur der erste den Abruf aus;
+alle anderen warten und erhalten dasselbe Ergebnis. Über eine Lockdatei im Cache-Verzeichnis
+gilt das auch für Worker-Prozesse, die sich das Verzeichnis teilen: Der zweite Prozess wartet,
+bis der erste den Cache geschrieben hat, und liest ihn dann, statt erneut abzurufen.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.single_flight")
+
+LOCK_SUBDIR = 'locks'
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    Hält eine exklusive Sperre auf eine Lockdatei (prozessübergreifend)
+
+    Args:
+        path: Pfad der Lockdatei (wird bei Bedarf angelegt)
+    """
+    with open(path, 'a+b') as f:
+        if os.name == 'nt':
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == 'nt':
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Dedupliziert laufende Aufrufe nach Schlüssel
+
+    Die wartenden Aufrufer erhalten eine Kopie des Ergebnisses, wenn es eine copy()-Methode hat
+    (z.B. DataFrames), damit spätere Änderungen eines Aufrufers die anderen nicht betreffen.
+    Löst der Abruf eine Exception aus, erhalten alle Wartenden dieselbe Exception.
+    """
+
+    def __init__(self):
+        """
+        Initialisiert die Single-Flight-Gruppe
+        """
+        self._calls: Dict[Tuple[Optional[str], str], _Call] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key: str, func: Callable[[], Any], lock_dir: Optional[str] = None) -> Any:
+        """
+        Führt func aus, sofern nicht bereits ein Aufruf mit demselben Schlüssel läuft
+
+        Args:
+            key: Schlüssel des Abrufs, z.B. Symbol, Zeitrahmen und Zeitraum
+            func: Abruf ohne Argumente; sollte zuerst den Cache prüfen, damit ein Prozess, der
+                auf die Lockdatei gewartet hat, das Ergebnis des anderen Prozesses liest
+            lock_dir: Cache-Verzeichnis für die prozessübergreifende Lockdatei (optional)
+
+        Returns:
+            Any: Ergebnis von func
+        """
+        call_key = (str(lock_dir) if lock_dir is not None else None, key)
+        with self._lock:
+            call = self._calls.get(call_key)
+            if call is None:
+                call = self._calls[call_key] = _Call()
+                leader = True
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result.copy() if hasattr(call.result, 'copy') else call.result
+
+        try:
+            if lock_dir is not None:
+                with file_lock(self._get_lock_path(lock_dir, key)):
+                    call.result = func()
+            else:
+                call.result = func()
+            self.executed += 1
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[call_key]
+            if call.waiters:
+                logger.debug(f"{call.waiters} gleichzeitige Abrufe für {key} zusammengefasst")
+            call.done.set()
+        return call.result
+
+    @staticmethod
+    def _get_lock_path(lock_dir: str, key: str) -> str:
+        directory = os.path.join(str(lock_dir), LOCK_SUBDIR)
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, hashlib.sha1(key.encode()).hexdigest()[:20] + '.lock')
+
+
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """
+    Gibt die prozessweit geteilte Single-Flight-Gruppe zurück
+
+    Returns:
+        SingleFlight: Geteilte Instanz
+    """
+    global _single_flight
+    with _single_flight_lock:
+        if _single_flight is None:
+            _single_flight = SingleFlight()
+        return _single_flight
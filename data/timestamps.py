@@ -0,0 +1,115 @@
+"""
+Normalisierung von Zeitstempeln und Spaltennamen für alle Datenquellen
+Zeitzonen-Richtlinie des Projekts: Zeitreihen tragen einen sortierten DatetimeIndex ohne Zeitzone
+in lokaler Börsenzeit des Symbols (Zeitzone aus data.trading_calendar, z.B. America/New_York für
+US-Aktien und CME, UTC für Krypto). Das ist dieselbe Konvention, die Handelskalender, Resampler
+und Bar-Pyramide erwarten. Epoch-Sekunden und zeitzonenbehaftete Indizes werden vektorisiert
+umgerechnet, Spaltennamen im selben Schritt vereinheitlicht.
+"""
+
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from data.trading_calendar import TRADING_SESSIONS, get_exchange_for_symbol
+
+# Zeitzone, wenn kein Symbol bekannt ist
+DEFAULT_TIMEZONE = 'America/New_York'
+
+# Bekannte Spaltennamen (in Kleinschreibung) -> Name in Groß- bzw. Kleinschreibung
+COLUMN_NAMES = {
+    'open': ('Open', 'open'),
+    'high': ('High', 'high'),
+    'low': ('Low', 'low'),
+    'close': ('Close', 'close'),
+    'volume': ('Volume', 'volume'),
+    'adj close': ('Adj Close', 'adj_close'),
+    'adj_close': ('Adj Close', 'adj_close'),
+    'adjclose': ('Adj Close', 'adj_close'),
+    'dividends': ('Dividends', 'dividends'),
+    'stock splits': ('Splits', 'splits'),
+    'splits': ('Splits', 'splits'),
+}
+
+
+def get_symbol_timezone(symbol: Optional[str] = None) -> str:
+    """
+    Gibt die Zeitzone zurück, in der die Zeitstempel eines Symbols abgelegt werden
+
+    Args:
+        symbol: Symbol des Assets (ohne Angabe: DEFAULT_TIMEZONE)
+
+    Returns:
+        str: Name der Zeitzone, z.B. 'America/New_York'
+    """
+    if not symbol:
+        return DEFAULT_TIMEZONE
+    return TRADING_SESSIONS[get_exchange_for_symbol(symbol)]['timezone']
+
+
+def epoch_to_index(timestamps: Iterable, timezone: str = DEFAULT_TIMEZONE, name: Optional[str] = None) -> pd.DatetimeIndex:
+    """
+    Wandelt Epoch-Sekunden in einen zeitzonenfreien DatetimeIndex in lokaler Zeit um
+
+    Args:
+        timestamps: Epoch-Sekunden (Liste oder Array, fehlende Werte als None/NaN)
+        timezone: Zielzeitzone, z.B. get_symbol_timezone(symbol)
+        name: Name des Index
+
+    Returns:
+        pd.DatetimeIndex: Zeitstempel ohne Zeitzone
+    """
+    values = np.asarray(timestamps if timestamps is not None else [], dtype='float64')
+    index = pd.to_datetime(values, unit='s', utc=True).tz_convert(timezone).tz_localize(None)
+    return index.rename(name)
+
+
+def normalize_index(index, timezone: str = DEFAULT_TIMEZONE) -> pd.DatetimeIndex:
+    """
+    Bringt einen Index auf die Zeitzonen-Richtlinie des Projekts
+
+    Zeitzonenbehaftete Indizes werden in die Zielzeitzone umgerechnet und die Zeitzone entfernt;
+    zeitzonenfreie Indizes gelten bereits als lokale Zeit und bleiben unverändert.
+
+    Args:
+        index: Index oder Werte, die pd.to_datetime versteht
+        timezone: Zielzeitzone
+
+    Returns:
+        pd.DatetimeIndex: Zeitstempel ohne Zeitzone
+    """
+    if not isinstance(index, pd.DatetimeIndex):
+        name = getattr(index, 'name', None)
+        try:
+            converted = pd.to_datetime(index)
+        except ValueError:
+            # Gemischte UTC-Offsets (z.B. über eine Zeitumstellung) lassen sich nur über UTC parsen
+            converted = pd.to_datetime(index, utc=True)
+        index = pd.DatetimeIndex(converted, name=name)
+    if index.tz is not None:
+        index = index.tz_convert(timezone).tz_localize(None)
+    return index
+
+
+def normalize_frame(df: pd.DataFrame, timezone: str = DEFAULT_TIMEZONE, lowercase: bool = False) -> pd.DataFrame:
+    """
+    Normalisiert Index und Spaltennamen eines OHLCV-DataFrames in einem Schritt
+
+    Args:
+        df: DataFrame einer Datenquelle (z.B. yfinance mit zeitzonenbehaftetem Index)
+        timezone: Zielzeitzone, z.B. get_symbol_timezone(symbol)
+        lowercase: Spaltennamen in Kleinschreibung ('open', ...) statt 'Open', ...
+
+    Returns:
+        pd.DataFrame: DataFrame mit zeitzonenfreiem, sortiertem Index und einheitlichen Spalten
+    """
+    position = 1 if lowercase else 0
+    columns = {col: COLUMN_NAMES[col.lower()][position]
+               for col in df.columns if isinstance(col, str) and col.lower() in COLUMN_NAMES}
+    df = df.rename(columns=columns)
+    df.index = normalize_index(df.index, timezone)
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index(kind='stable')
+    return df
+
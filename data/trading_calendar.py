@@ -0,0 +1,212 @@
+"""
+Handelskalender für das Trading Dashboard
+Beschreibt die Handelszeiten der Börsen und erzeugt daraus vektorisiert die Zeitstempel-Raster
+für alle Zeitrahmen (Mock-Daten, Fallback-Daten, Lückenerkennung und Resampling)
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from data.resampler import SessionAnchor, get_timeframe_freq
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.trading_calendar")
+
+# Handelszeiten je Börse: Eröffnung und Schluss relativ zu Mitternacht des Handelstags
+# (eine negative Eröffnung beginnt am Vorabend) und die Wochentage mit Handel (Montag = 0)
+TRADING_SESSIONS = {
+    'US': {'timezone': 'America/New_York', 'open': '09:30', 'close': '16:00', 'weekdays': (0, 1, 2, 3, 4)},
+    # CME Globex: Sonntag 18:00 bis Freitag 17:00 mit täglicher Pause von 17:00 bis 18:00
+    'CME': {'timezone': 'America/New_York', 'open': '-06:00', 'close': '17:00', 'weekdays': (0, 1, 2, 3, 4)},
+    'FX': {'timezone': 'America/New_York', 'open': '-07:00', 'close': '17:00', 'weekdays': (0, 1, 2, 3, 4)},
+    'CRYPTO': {'timezone': 'UTC', 'open': '00:00', 'close': '24:00', 'weekdays': (0, 1, 2, 3, 4, 5, 6)},
+}
+
+
+def _parse_offset(value: str) -> pd.Timedelta:
+    sign = -1 if value.startswith('-') else 1
+    hours, minutes = (int(part) for part in value.lstrip('-').split(':'))
+    return sign * pd.Timedelta(hours=hours, minutes=minutes)
+
+
+class TradingCalendar:
+    """
+    Handelskalender einer Börse
+
+    Erzeugt DatetimeIndex-Raster in lokaler Börsenzeit (ohne Zeitzone) für beliebige Zeitrahmen.
+    Intraday-Bars beginnen mit der Sitzungseröffnung, Tages-Bars tragen das Datum des Handelstags,
+    Wochen- und Monats-Bars den ersten Tag der Woche bzw. des Monats. Feiertage werden nicht
+    berücksichtigt. Raster werden je (Zeitrahmen, Zeitraum) zwischengespeichert.
+    """
+
+    def __init__(self, exchange: str, max_cached_grids: int = 128):
+        """
+        Initialisiert den Handelskalender
+
+        Args:
+            exchange: Börse (Schlüssel aus TRADING_SESSIONS)
+            max_cached_grids: Maximale Anzahl zwischengespeicherter Raster
+
+        Raises:
+            ValueError: Wenn die Börse unbekannt ist
+        """
+        session = TRADING_SESSIONS.get(exchange)
+        if session is None:
+            raise ValueError(f"Unbekannte Börse für den Handelskalender: {exchange}")
+
+        self.exchange = exchange
+        self.timezone = session['timezone']
+        self.open_offset = _parse_offset(session['open'])
+        self.close_offset = _parse_offset(session['close'])
+        self.weekdays = session['weekdays']
+        self.max_cached_grids = max_cached_grids
+        self.hits = 0
+        self.misses = 0
+        self._grids: "OrderedDict[Tuple[str, pd.Timestamp, pd.Timestamp], pd.DatetimeIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_trading_days(self, start: Union[str, datetime], end: Union[str, datetime]) -> pd.DatetimeIndex:
+        """
+        Gibt die Handelstage im Zeitraum zurück
+
+        Args:
+            start: Startdatum
+            end: Enddatum
+
+        Returns:
+            pd.DatetimeIndex: Handelstage (Mitternacht)
+        """
+        days = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq='D')
+        return days[np.isin(days.dayofweek, self.weekdays)]
+
+    def get_session_anchor(self) -> SessionAnchor:
+        """
+        Gibt die Sitzungseröffnung für das Resampling (data.resampler) zurück
+
+        Returns:
+            SessionAnchor: Zeitzone und Eröffnungszeit der Börse
+        """
+        open_time = self.open_offset % pd.Timedelta(days=1)
+        hours, minutes = divmod(int(open_time.total_seconds()) // 60, 60)
+        return SessionAnchor(self.timezone, f"{hours:02d}:{minutes:02d}")
+
+    def _build_grid(self, freq: str, first_day: pd.Timestamp, last_day: pd.Timestamp) -> pd.DatetimeIndex:
+        # Einen Tag Rand, damit Sitzungen vom Vorabend bzw. bis in den Folgetag enthalten sind
+        days = self.get_trading_days(first_day - pd.Timedelta(days=1), last_day + pd.Timedelta(days=1))
+        if freq == '1D':
+            return days
+        if freq == 'W':
+            return pd.DatetimeIndex((days - pd.to_timedelta(days.dayofweek, unit='D')).unique())
+        if freq == 'MS':
+            return pd.DatetimeIndex(days.to_period('M').unique().to_timestamp())
+
+        # Intraday: Bars je Sitzung ab der Eröffnung, per Broadcasting für alle Tage auf einmal
+        step = pd.Timedelta(freq)
+        bars_per_session = int(np.ceil((self.close_offset - self.open_offset) / step))
+        opens = (days + self.open_offset).values.astype('datetime64[ns]')
+        offsets = (np.arange(bars_per_session) * step.value).astype('timedelta64[ns]')
+        return pd.DatetimeIndex((opens[:, None] + offsets[None, :]).ravel())
+
+    def get_index(self, interval: str, start: Union[str, datetime], end: Union[str, datetime]) -> pd.DatetimeIndex:
+        """
+        Erzeugt die Zeitstempel aller Bars eines Zeitrahmens im Zeitraum
+
+        Args:
+            interval: Zeitrahmen ('1m', '5m', '1h', '4h', '1d', '1w', '1mo', ...)
+            start: Beginn des Zeitraums (inklusive, bei Tagen und länger zählt das Datum)
+            end: Ende des Zeitraums (inklusive)
+
+        Returns:
+            pd.DatetimeIndex: Zeitstempel in lokaler Börsenzeit
+
+        Raises:
+            UnknownTimeframeError: Wenn der Zeitrahmen unbekannt ist
+        """
+        freq = get_timeframe_freq(interval)
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        key = (freq, start.normalize(), end.normalize())
+
+        with self._lock:
+            grid = self._grids.get(key)
+            if grid is not None:
+                self._grids.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if grid is None:
+            grid = self._build_grid(freq, *key[1:])
+            with self._lock:
+                self._grids[key] = grid
+                while len(self._grids) > self.max_cached_grids:
+                    self._grids.popitem(last=False)
+
+        # Tages-, Wochen- und Monats-Bars zählen ab dem Datum des Startzeitpunkts
+        if freq in ('1D', 'W', 'MS'):
+            start = start.normalize()
+        return grid[grid.searchsorted(start):grid.searchsorted(end, side='right')]
+
+    def find_gaps(self, index: pd.DatetimeIndex, interval: str) -> pd.DatetimeIndex:
+        """
+        Ermittelt fehlende Bars einer Zeitreihe gegenüber dem Kalender
+
+        Args:
+            index: Zeitstempel der vorhandenen Bars (lokale Börsenzeit)
+            interval: Zeitrahmen der Bars
+
+        Returns:
+            pd.DatetimeIndex: Erwartete, aber fehlende Zeitstempel
+        """
+        if len(index) == 0:
+            return pd.DatetimeIndex([])
+        if index.tz is not None:
+            index = index.tz_convert(self.timezone).tz_localize(None)
+        expected = self.get_index(interval, index.min(), index.max())
+        return expected[~expected.isin(index)]
+
+
+def get_exchange_for_symbol(symbol: str) -> str:
+    """
+    Ordnet einem Symbol die Börse für den Handelskalender zu
+
+    Args:
+        symbol: Symbol des Assets (z.B. "AAPL", "NQ=F", "BTC-USD", "EUR-USD")
+
+    Returns:
+        str: Börse (Schlüssel aus TRADING_SESSIONS)
+    """
+    if "BTC" in symbol or "ETH" in symbol:
+        return 'CRYPTO'
+    if "NQ" in symbol or symbol == "ES" or symbol.endswith("=F"):
+        return 'CME'
+    if any(currency in symbol for currency in ("USD", "EUR", "GBP", "JPY")):
+        return 'FX'
+    return 'US'
+
+
+# Globale Kalender je Börse
+_calendars: Dict[str, TradingCalendar] = {}
+_calendars_lock = threading.Lock()
+
+
+def get_trading_calendar(exchange: str = 'US') -> TradingCalendar:
+    """
+    Gibt den globalen Handelskalender einer Börse zurück und erstellt ihn bei Bedarf
+
+    Args:
+        exchange: Börse (Schlüssel aus TRADING_SESSIONS)
+
+    Returns:
+        TradingCalendar: Handelskalender
+    """
+    with _calendars_lock:
+        calendar = _calendars.get(exchange)
+        if calendar is None:
+            calendar = TradingCalendar(exchange)
+            _calendars[exchange] = calendar
+        return calendar
@@ -0,0 +1,21 @@
+"""
+gunicorn-Konfiguration für das Trading Dashboard
+
+Alle Werte können über Umgebungsvariablen mit dem Präfix TRADING_DASHBOARD_ angepasst werden
+(HOST, PORT, WORKERS, THREADS, PRELOAD, TIMEOUT).
+
+Start:
+    gunicorn -c gunicorn.conf.py wsgi:server
+"""
+
+from dashboard.server import get_server_options, post_fork  # noqa: F401
+
+_options = get_server_options()
+
+bind = f"{_options['host']}:{_options['port']}"
+workers = _options['workers']
+threads = _options['threads']
+worker_class = "gthread"
+preload_app = _options['preload']
+timeout = _options['timeout']
+accesslog = "-"
@@ -0,0 +1,246 @@
+"""
+Lasttest für das Trading Dashboard
+
+Schickt parallele Requests an einen laufenden Server und meldet Requests pro Sekunde sowie
+die Latenz-Perzentile (p50/p95) je Szenario. Das Callback-Szenario ruft einen Dash-Callback
+direkt über /_dash-update-component auf, wie es der Browser tut.
+
+Beispiel:
+    python run.py --prod --workers 4 --threads 4
+    python load_test.py --url http://localhost:8050 --requests 500 --concurrency 20
+    python load_test.py --interactions
+"""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import requests
+
+# Typische Benutzerinteraktionen für die Auswertung der Requests pro Interaktion
+INTERACTIONS = {
+    "Zeitrahmen wählen": "timeframe-1h.n_clicks",
+    "Chart-Typ wählen": "line-chart-button.n_clicks",
+    "Zeichenwerkzeug wählen": "trendline-button.n_clicks",
+    "Asset wählen": "asset-button.n_clicks",
+    "Live-Modus umschalten": "live-mode-switch.value",
+}
+
+# Standardwerte für Callback-Inputs, die der Browser beim Laden der Seite senden würde
+DEFAULT_VALUES = {
+    "symbol-input.value": "AAPL",
+    "active-timeframe-store.data": "1d",
+    "active-asset-store.data": "AAPL",
+    "data-source.value": "yahoo",
+    "drawing-data-store.data": [],
+}
+
+
+def summarize_latencies(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    """
+    Fasst die gemessenen Latenzen zusammen
+
+    Args:
+        latencies: Latenzen erfolgreicher Requests in Sekunden
+        errors: Anzahl fehlgeschlagener Requests
+        elapsed: Gesamtdauer des Szenarios in Sekunden
+
+    Returns:
+        Dict[str, float]: Anzahl, Fehler, Requests pro Sekunde und Latenzen in Millisekunden
+    """
+    values = np.array(latencies) * 1000 if latencies else np.array([np.nan])
+    total = len(latencies) + errors
+    return {
+        'requests': total,
+        'errors': errors,
+        'rps': total / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': float(np.percentile(values, 50)),
+        'p95_ms': float(np.percentile(values, 95)),
+        'max_ms': float(np.max(values)),
+    }
+
+
+def run_scenario(send: Callable[[requests.Session], requests.Response], num_requests: int,
+                 concurrency: int) -> Dict[str, float]:
+    """
+    Führt ein Szenario mit parallelen Requests aus
+
+    Args:
+        send: Funktion, die mit einer Session einen Request ausführt
+        num_requests: Anzahl der Requests
+        concurrency: Anzahl paralleler Clients
+
+    Returns:
+        Dict[str, float]: Zusammenfassung aus summarize_latencies
+    """
+    sessions = [requests.Session() for _ in range(concurrency)]
+
+    def timed(i: int) -> Optional[float]:
+        start = time.perf_counter()
+        try:
+            response = send(sessions[i % concurrency])
+            if response.status_code >= 400:
+                return None
+        except requests.RequestException:
+            return None
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed, range(num_requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = [r for r in results if r is not None]
+    return summarize_latencies(latencies, len(results) - len(latencies), elapsed)
+
+
+def _parse_id(component_id: str) -> Any:
+    return json.loads(component_id) if component_id.startswith("{") else component_id
+
+
+def _parse_outputs(output: str) -> List[Dict[str, Any]]:
+    parts = output[2:-2].split("...") if output.startswith("..") else [output]
+    outputs = []
+    for part in parts:
+        component_id, prop = part.rsplit(".", 1)
+        outputs.append({"id": _parse_id(component_id), "property": prop.split("@")[0]})
+    return outputs
+
+
+def _prop_key(component_id: Any, prop: str) -> str:
+    # Pattern-Matching-IDs werden über ihren Typ zusammengefasst (z.B. asset-button.n_clicks)
+    if isinstance(component_id, str) and component_id.startswith("{"):
+        component_id = json.loads(component_id)
+    if isinstance(component_id, dict):
+        component_id = component_id.get("type", json.dumps(component_id, sort_keys=True))
+    return f"{component_id}.{prop}"
+
+
+def count_server_requests(dependencies: List[Dict[str, Any]], prop_id: str, max_depth: int = 10) -> Dict[str, int]:
+    """
+    Zählt die Callback-Requests, die eine Benutzerinteraktion auslöst
+
+    Verfolgt die Kette ausgelöster Callbacks über den Abhängigkeitsgraphen. Clientseitige
+    Callbacks laufen im Browser und erzeugen keinen Request an den Server.
+
+    Args:
+        dependencies: Einträge aus /_dash-dependencies
+        prop_id: Geänderte Eigenschaft, z.B. "timeframe-1h.n_clicks" oder "asset-button.n_clicks"
+        max_depth: Maximale Länge der verfolgten Kette
+
+    Returns:
+        Dict[str, int]: Anzahl der Server- und Client-Callbacks
+    """
+    counts = {'server': 0, 'client': 0}
+    changed = {prop_id}
+    for _ in range(max_depth):
+        triggered = [
+            dependency for dependency in dependencies
+            if any(_prop_key(item["id"], item["property"]) in changed for item in dependency["inputs"])
+        ]
+        if not triggered:
+            break
+        changed = set()
+        for dependency in triggered:
+            counts['client' if dependency.get("clientside_function") else 'server'] += 1
+            changed.update(_prop_key(item["id"], item["property"]) for item in _parse_outputs(dependency["output"]))
+    return counts
+
+
+def build_callback_payload(dependency: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Erstellt den Request-Body für einen Callback aus /_dash-dependencies
+
+    Args:
+        dependency: Eintrag aus /_dash-dependencies
+
+    Returns:
+        Dict[str, Any]: Body für /_dash-update-component
+    """
+    output = dependency["output"]
+    outputs = _parse_outputs(output)
+    if not output.startswith(".."):
+        outputs = outputs[0]
+
+    def with_values(items):
+        return [
+            {"id": item["id"], "property": item["property"],
+             "value": DEFAULT_VALUES.get(f"{item['id']}.{item['property']}")}
+            for item in items
+        ]
+
+    inputs = with_values(dependency["inputs"])
+    return {
+        "output": output,
+        "outputs": outputs,
+        "inputs": inputs,
+        "state": with_values(dependency.get("state", [])),
+        "changedPropIds": [f"{inputs[0]['id']}.{inputs[0]['property']}"] if inputs else [],
+    }
+
+
+def find_dependency(base_url: str, output: str) -> Dict[str, Any]:
+    """
+    Sucht den Callback, der die angegebene Ausgabe (z.B. price-chart.figure) erzeugt
+
+    Args:
+        base_url: URL des Servers
+        output: Ausgabe im Format "<id>.<property>"
+
+    Returns:
+        Dict[str, Any]: Eintrag aus /_dash-dependencies
+
+    Raises:
+        ValueError: Wenn kein passender Callback existiert
+    """
+    dependencies = requests.get(f"{base_url}/_dash-dependencies", timeout=30).json()
+    for dependency in dependencies:
+        if output in dependency["output"].split("..."):
+            return dependency
+        if dependency["output"].strip(".") == output:
+            return dependency
+    raise ValueError(f"Kein Callback für die Ausgabe {output} gefunden")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lasttest für das Trading Dashboard")
+    parser.add_argument("--url", default="http://localhost:8050", help="URL des Servers")
+    parser.add_argument("--requests", type=int, default=200, help="Requests pro Szenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Anzahl paralleler Clients")
+    parser.add_argument("--output", default="price-chart.figure",
+                        help="Callback-Ausgabe für das Callback-Szenario")
+    parser.add_argument("--interactions", action="store_true",
+                        help="Nur die Server-Requests pro Benutzerinteraktion auswerten")
+    args = parser.parse_args()
+
+    base_url = args.url.rstrip("/")
+
+    if args.interactions:
+        dependencies = requests.get(f"{base_url}/_dash-dependencies", timeout=30).json()
+        print(f"{'Interaktion':<28}{'Server-Requests':>16}{'Client-Callbacks':>18}")
+        for name, prop_id in INTERACTIONS.items():
+            counts = count_server_requests(dependencies, prop_id)
+            print(f"{name:<28}{counts['server']:>16}{counts['client']:>18}")
+        return
+
+    payload = build_callback_payload(find_dependency(base_url, args.output))
+
+    scenarios = {
+        "health": lambda s: s.get(f"{base_url}/health", timeout=30),
+        "layout": lambda s: s.get(f"{base_url}/_dash-layout", timeout=30),
+        f"callback {args.output}": lambda s: s.post(f"{base_url}/_dash-update-component", json=payload, timeout=60),
+    }
+
+    print(f"Lasttest gegen {base_url}: {args.requests} Requests, {args.concurrency} parallel")
+    print(f"{'Szenario':<32}{'Requests':>10}{'Fehler':>8}{'RPS':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for name, send in scenarios.items():
+        stats = run_scenario(send, args.requests, args.concurrency)
+        print(f"{name:<32}{stats['requests']:>10}{stats['errors']:>8}{stats['rps']:>10.1f}"
+              f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['max_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 """
 Hauptskript zum Starten des Trading Dashboards
+
+Ohne Argumente wird der Flask-Entwicklungsserver gestartet. Mit --prod läuft die App über
+einen WSGI-Server mit mehreren Workern (gunicorn, unter Windows waitress).
 """
 
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -10,9 +14,37 @@ from pathlib import Path
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
 
-# Importiere die Dashboard-App
-from dashboard.app import app
+
+def parse_args():
+    """
+    Liest die Kommandozeilenargumente
+    """
+    parser = argparse.ArgumentParser(description="Startet das Trading Dashboard")
+    parser.add_argument("--prod", action="store_true", help="Produktionsserver (gunicorn/waitress) verwenden")
+    parser.add_argument("--host", default=None, help="Adresse des Servers (Standard: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=None, help="Port des Servers (Standard: 8050)")
+    parser.add_argument("--workers", type=int, default=None, help="Anzahl der Worker-Prozesse")
+    parser.add_argument("--threads", type=int, default=None, help="Anzahl der Threads pro Worker")
+    parser.add_argument("--no-preload", dest="preload", action="store_false", default=None,
+                        help="App erst in den Workern laden statt einmal vor dem Forken")
+    return parser.parse_args()
+
 
 if __name__ == "__main__":
-    print("Starte Trading Dashboard auf http://localhost:8050")
-    app.run(debug=True, host="0.0.0.0", port=8050)
+    args = parse_args()
+
+    if args.prod:
+        from dashboard.server import run_production_server
+        run_production_server(host=args.host, port=args.port, workers=args.workers,
+                              threads=args.threads, preload=args.preload)
+    else:
+        # Importiere die Dashboard-App
+        from dashboard.app import app
+        from dashboard.warmup import start_warmup
+
+        # Warm-up im Hintergrund, damit der Entwicklungsserver sofort startet
+        start_warmup(block=False)
+
+        port = args.port or 8050
+        print(f"Starte Trading Dashboard auf http://localhost:{port}")
+        app.run(debug=True, host=args.host or "0.0.0.0", port=port)
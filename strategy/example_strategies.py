@@ -6,6 +6,8 @@ Implementiert verschiedene Handelsstrategien basierend auf der Strategy-Basiskla
 import pandas as pd
 import numpy as np
 from strategy.strategy_base import Strategy
+from strategy.signals import (band_reentry_signals, crossover_signals, line_cross_signals, rolling_rsi,
+                              threshold_cross_signals)
 
 class MovingAverageCrossover(Strategy):
     """
@@ -48,20 +50,9 @@ class MovingAverageCrossover(Strategy):
         df['SMA_Short'] = df['Close'].rolling(window=short_window).mean()
         df['SMA_Long'] = df['Close'].rolling(window=long_window).mean()
         
-        # Initialisiere Signal-Spalte
-        df['Signal'] = 0
-        
-        # Generiere Signale
-        df['Signal'] = np.where(df['SMA_Short'] > df['SMA_Long'], 1, 0)
-        
-        # Generiere Handelssignale (1 für Kauf, -1 für Verkauf)
-        df['Position'] = df['Signal'].diff()
-        
-        # Ersetze NaN-Werte
-        df['Position'] = df['Position'].fillna(0)
-        
-        # Konvertiere zu Handelssignalen
-        df['Signal'] = np.where(df['Position'] > 0, 1, np.where(df['Position'] < 0, -1, 0))
+        # Generiere Handelssignale (1 für Kauf, -1 für Verkauf) beim Wechsel der Lage der Durchschnitte
+        df['Signal'] = crossover_signals(df['SMA_Short'], df['SMA_Long'])
+        df['Position'] = df['Signal'].astype(float)
         
         return df
     
@@ -161,27 +152,12 @@ class RSIStrategy(Strategy):
         oversold = self.parameters['oversold']
         
         # Berechne RSI
-        delta = df['Close'].diff()
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-        
-        avg_gain = gain.rolling(window=rsi_window).mean()
-        avg_loss = loss.rolling(window=rsi_window).mean()
-        
-        rs = avg_gain / avg_loss
-        df['RSI'] = 100 - (100 / (1 + rs))
-        
-        # Initialisiere Signal-Spalte
-        df['Signal'] = 0
+        df['RSI'] = rolling_rsi(df['Close'], rsi_window)
         
         # Generiere Signale
         # Kaufsignal, wenn RSI unter oversold ist und dann darüber steigt
         # Verkaufssignal, wenn RSI über overbought ist und dann darunter fällt
-        for i in range(1, len(df)):
-            if df['RSI'].iloc[i-1] < oversold and df['RSI'].iloc[i] >= oversold:
-                df['Signal'].iloc[i] = 1  # Kaufsignal
-            elif df['RSI'].iloc[i-1] > overbought and df['RSI'].iloc[i] <= overbought:
-                df['Signal'].iloc[i] = -1  # Verkaufssignal
+        df['Signal'] = threshold_cross_signals(df['RSI'], oversold, overbought)
                 
         return df
     
@@ -278,18 +254,11 @@ class MACDStrategy(Strategy):
         df['Signal_Line'] = df['MACD'].ewm(span=signal_window, adjust=False).mean()
         df['Histogram'] = df['MACD'] - df['Signal_Line']
         
-        # Initialisiere Signal-Spalte
-        df['Signal'] = 0
-        
         # Generiere Signale
         # Kaufsignal, wenn MACD die Signallinie von unten kreuzt
         # Verkaufssignal, wenn MACD die Signallinie von oben kreuzt
-        for i in range(1, len(df)):
-            if df['MACD'].iloc[i-1] < df['Signal_Line'].iloc[i-1] and df['MACD'].iloc[i] >= df['Signal_Line'].iloc[i]:
-                df['Signal'].iloc[i] = 1  # Kaufsignal
-            elif df['MACD'].iloc[i-1] > df['Signal_Line'].iloc[i-1] and df['MACD'].iloc[i] <= df['Signal_Line'].iloc[i]:
-                df['Signal'].iloc[i] = -1  # Verkaufssignal
-                
+        df['Signal'] = line_cross_signals(df['MACD'], df['Signal_Line'])
+        
         return df
     
     def calculate_stop_loss(self, data, index):
@@ -397,18 +366,11 @@ class BollingerBandsStrategy(Strategy):
         df['Upper_Band'] = df['Middle_Band'] + (df['Std_Dev'] * num_std)
         df['Lower_Band'] = df['Middle_Band'] - (df['Std_Dev'] * num_std)
         
-        # Initialisiere Signal-Spalte
-        df['Signal'] = 0
-        
         # Generiere Signale
         # Kaufsignal, wenn Preis die untere Band berührt oder unterschreitet und dann wieder darüber steigt
         # Verkaufssignal, wenn Preis die obere Band berührt oder überschreitet und dann wieder darunter fällt
-        for i in range(1, len(df)):
-            if df['Close'].iloc[i-1] <= df['Lower_Band'].iloc[i-1] and df['Close'].iloc[i] > df['Lower_Band'].iloc[i]:
-                df['Signal'].iloc[i] = 1  # Kaufsignal
-            elif df['Close'].iloc[i-1] >= df['Upper_Band'].iloc[i-1] and df['Close'].iloc[i] < df['Upper_Band'].iloc[i]:
-                df['Signal'].iloc[i] = -1  # Verkaufssignal
-                
+        df['Signal'] = band_reentry_signals(df['Close'], df['Lower_Band'], df['Upper_Band'])
+        
         return df
     
     def calculate_stop_loss(self, data, index):
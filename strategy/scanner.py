@@ -0,0 +1,270 @@
+"""
+Signal-Scanner für viele Symbole
+Legt die Schlusskurse eines Universums als ausgerichtete Matrix Zeit x Symbol ab und wertet die
+Bedingungen der Beispielstrategien für alle Symbole gleichzeitig spaltenweise aus. Neue Bars
+werden inkrementell ausgewertet, ohne die Historie neu zu berechnen.
+"""
+
+import logging
+from abc import ABC, abstractmethod
+from typing import Dict, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from strategy.example_strategies import BollingerBandsStrategy, MACDStrategy, MovingAverageCrossover, RSIStrategy
+from strategy.signals import band_reentry_signals, crossover_signals, line_cross_signals, threshold_cross_signals
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.scanner")
+
+SCAN_COLUMNS = ['symbol', 'strategy', 'signal', 'timestamp', 'close']
+
+
+class _WindowCondition(ABC):
+    """
+    Bedingung, die aus den letzten lookback Schlusskursen ausgewertet wird
+
+    scan() und update() werten jeweils die letzten beiden Bars aus; die Fenster-Matrix hat die
+    Form (lookback, Anzahl Symbole), die letzte Zeile ist der aktuelle Bar. Bedingungen mit
+    eigenem Zustand überschreiben scan(), um ihn aus der Historie aufzubauen.
+    """
+
+    lookback = 2
+
+    def scan(self, close: pd.DataFrame) -> np.ndarray:
+        """
+        Wertet die Bedingung auf der gesamten Historie aus
+
+        Args:
+            close: Schlusskurse (Zeit x Symbol)
+
+        Returns:
+            np.ndarray: Signal des letzten Bars je Symbol
+        """
+        return self.update(_tail(close.to_numpy(dtype=float), self.lookback))
+
+    def valid_columns(self, window: np.ndarray) -> np.ndarray:
+        """
+        Prüft je Symbol, ob alle Bars, die die Bedingung auswertet, einen Kurs haben
+
+        Symbole mit anderem Handelskalender haben im gemeinsamen Zeitindex Lücken; dort würden
+        fehlende Werte als Kreuzung gewertet.
+
+        Args:
+            window: Fenster der letzten Schlusskurse (mindestens lookback Zeilen, mindestens zwei)
+
+        Returns:
+            np.ndarray: True je Symbol ohne fehlende Werte im aktuellen und vorherigen Bar bzw. im Fenster
+        """
+        return ~np.isnan(window[-max(self.lookback, 2):]).any(axis=0)
+
+    @abstractmethod
+    def update(self, window: np.ndarray) -> np.ndarray:
+        """
+        Wertet die Bedingung für einen neuen Bar aus
+
+        Args:
+            window: Fenster der letzten lookback Schlusskurse (lookback x Symbol)
+
+        Returns:
+            np.ndarray: Signal des aktuellen Bars je Symbol
+        """
+        pass
+
+
+class _CrossoverCondition(_WindowCondition):
+    def __init__(self, strategy: MovingAverageCrossover):
+        self.short_window = strategy.parameters['short_window']
+        self.long_window = strategy.parameters['long_window']
+        self.lookback = max(self.short_window, self.long_window) + 1
+
+    def update(self, window: np.ndarray) -> np.ndarray:
+        fast = _rolling_pair(window, self.short_window, np.mean)
+        slow = _rolling_pair(window, self.long_window, np.mean)
+        return crossover_signals(fast, slow)[-1]
+
+
+class _RSICondition(_WindowCondition):
+    def __init__(self, strategy: RSIStrategy):
+        self.window = strategy.parameters['rsi_window']
+        self.oversold = strategy.parameters['oversold']
+        self.overbought = strategy.parameters['overbought']
+        self.lookback = self.window + 2
+
+    def update(self, window: np.ndarray) -> np.ndarray:
+        # Wie in rolling_rsi zählen fehlende Änderungen als 0
+        delta = np.diff(window, axis=0)
+        gain = _rolling_pair(np.where(delta > 0, delta, 0.0), self.window, np.mean)
+        loss = _rolling_pair(np.where(delta < 0, -delta, 0.0), self.window, np.mean)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - (100 / (1 + gain / loss))
+        return threshold_cross_signals(rsi, self.oversold, self.overbought)[-1]
+
+
+class _BollingerCondition(_WindowCondition):
+    def __init__(self, strategy: BollingerBandsStrategy):
+        self.window = strategy.parameters['window']
+        self.num_std = strategy.parameters['num_std']
+        self.lookback = self.window + 1
+
+    def update(self, window: np.ndarray) -> np.ndarray:
+        middle = _rolling_pair(window, self.window, np.mean)
+        std = _rolling_pair(window, self.window, lambda values, axis: np.std(values, axis=axis, ddof=1))
+        return band_reentry_signals(window[-2:], middle - std * self.num_std, middle + std * self.num_std)[-1]
+
+
+class _MACDCondition(_WindowCondition):
+    """
+    MACD-Bedingung; die EMAs werden je Symbol als Zustand fortgeschrieben
+    """
+
+    lookback = 1
+
+    def __init__(self, strategy: MACDStrategy):
+        self.alphas = [2.0 / (strategy.parameters[key] + 1) for key in ('fast', 'slow', 'signal')]
+        self.spans = [strategy.parameters[key] for key in ('fast', 'slow', 'signal')]
+        self.state = None
+
+    def scan(self, close: pd.DataFrame) -> np.ndarray:
+        fast, slow, signal = self.spans
+        ema_fast = close.ewm(span=fast, adjust=False).mean()
+        ema_slow = close.ewm(span=slow, adjust=False).mean()
+        macd = ema_fast - ema_slow
+        signal_line = _tail(macd.ewm(span=signal, adjust=False).mean().to_numpy(), 2)
+        macd = _tail(macd.to_numpy(), 2)
+        self.state = {'ema_fast': _tail(ema_fast.to_numpy(), 1)[-1], 'ema_slow': _tail(ema_slow.to_numpy(), 1)[-1],
+                      'macd': macd[-1], 'signal_line': signal_line[-1]}
+        return line_cross_signals(macd, signal_line)[-1]
+
+    def update(self, window: np.ndarray) -> np.ndarray:
+        close = window[-1]
+        alpha_fast, alpha_slow, alpha_signal = self.alphas
+        ema_fast = _ewm_step(self.state['ema_fast'], close, alpha_fast)
+        ema_slow = _ewm_step(self.state['ema_slow'], close, alpha_slow)
+        macd = ema_fast - ema_slow
+        signal_line = _ewm_step(self.state['signal_line'], macd, alpha_signal)
+        signal = line_cross_signals(np.vstack([self.state['macd'], macd]),
+                                    np.vstack([self.state['signal_line'], signal_line]))[-1]
+        self.state = {'ema_fast': ema_fast, 'ema_slow': ema_slow, 'macd': macd, 'signal_line': signal_line}
+        return signal
+
+
+_CONDITIONS = [
+    (MovingAverageCrossover, _CrossoverCondition),
+    (RSIStrategy, _RSICondition),
+    (MACDStrategy, _MACDCondition),
+    (BollingerBandsStrategy, _BollingerCondition),
+]
+
+
+def _tail(values: np.ndarray, rows: int) -> np.ndarray:
+    # Letzte rows Zeilen, bei zu kurzer Historie oben mit NaN aufgefüllt
+    if len(values) >= rows:
+        return values[len(values) - rows:]
+    padding = np.full((rows - len(values),) + values.shape[1:], np.nan)
+    return np.concatenate([padding, values])
+
+
+def _rolling_pair(window: np.ndarray, size: int, func) -> np.ndarray:
+    # Fensterwerte für den vorherigen und den aktuellen Bar
+    return np.vstack([func(window[-size - 1:-1], axis=0), func(window[-size:], axis=0)])
+
+
+def _ewm_step(previous: np.ndarray, value: np.ndarray, alpha: float) -> np.ndarray:
+    # Fehlende Werte übernehmen den letzten Stand, der erste Wert startet den EMA
+    updated = (1.0 - alpha) * previous + alpha * value
+    return np.where(np.isnan(value), previous, np.where(np.isnan(previous), value, updated))
+
+
+def _build_condition(strategy):
+    for strategy_class, condition_class in _CONDITIONS:
+        if isinstance(strategy, strategy_class):
+            return condition_class(strategy)
+    raise ValueError(f"Strategie wird vom Scanner nicht unterstützt: {type(strategy).__name__}")
+
+
+class SignalScanner:
+    """
+    Scanner für Kreuzungssignale der Beispielstrategien über ein Symbol-Universum
+
+    load() richtet die Schlusskurse aller Symbole auf einen gemeinsamen Zeitindex aus und wertet
+    den letzten Bar aus. update() nimmt danach je einen neuen Bar aller Symbole entgegen; der
+    Aufwand hängt nur von der Fenstergröße der Bedingungen und der Anzahl der Symbole ab.
+    """
+
+    def __init__(self, strategies: Optional[List] = None):
+        """
+        Initialisiert den Scanner
+
+        Args:
+            strategies: Strategie-Instanzen aus strategy.example_strategies, deren Parameter
+                verwendet werden (Standard: alle vier Beispielstrategien mit Standardparametern)
+
+        Raises:
+            ValueError: Wenn eine Strategie nicht unterstützt wird
+        """
+        if strategies is None:
+            strategies = [MovingAverageCrossover(), RSIStrategy(), MACDStrategy(), BollingerBandsStrategy()]
+        self.conditions = [(strategy.name, _build_condition(strategy)) for strategy in strategies]
+        # Mindestens der vorherige Bar, damit fehlende Werte dort erkannt werden
+        self.lookback = max([2] + [condition.lookback for _, condition in self.conditions])
+        self.symbols: List[str] = []
+        self.timestamp = None
+        self._window: Optional[np.ndarray] = None
+
+    def load(self, data: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
+        """
+        Lädt das Universum und gibt die Signale des letzten Bars zurück
+
+        Args:
+            data: Dictionary Symbol -> DataFrame mit Close-Spalte (Groß- oder Kleinschreibung)
+
+        Returns:
+            pd.DataFrame: Ausgelöste Signale (symbol, strategy, signal, timestamp, close)
+        """
+        closes = {}
+        for symbol, df in data.items():
+            columns = {col.lower(): col for col in df.columns if isinstance(col, str)}
+            closes[symbol] = df[columns['close']].astype(float)
+        close = pd.concat(closes, axis=1).sort_index()
+        logger.info(f"Scanner: {close.shape[1]} Symbole, {close.shape[0]} Bars geladen")
+
+        self.symbols = list(close.columns)
+        self.timestamp = close.index[-1]
+        self._window = _tail(close.to_numpy(dtype=float), self.lookback)
+        signals = {name: condition.scan(close) for name, condition in self.conditions}
+        return self._collect(signals)
+
+    def update(self, closes: Mapping[str, float], timestamp=None) -> pd.DataFrame:
+        """
+        Wertet einen neuen Bar aller Symbole aus
+
+        Args:
+            closes: Schlusskurse je Symbol; fehlende Symbole gelten als ohne Kurs
+            timestamp: Zeitstempel des Bars
+
+        Returns:
+            pd.DataFrame: Ausgelöste Signale (symbol, strategy, signal, timestamp, close)
+
+        Raises:
+            RuntimeError: Wenn noch kein Universum geladen wurde
+        """
+        if self._window is None:
+            raise RuntimeError("Scanner wurde noch nicht mit load() initialisiert")
+
+        row = pd.Series(closes, dtype=float).reindex(self.symbols).to_numpy()
+        self._window = np.vstack([self._window[1:], row])
+        self.timestamp = timestamp
+        signals = {name: condition.update(self._window) for name, condition in self.conditions}
+        return self._collect(signals)
+
+    def _collect(self, signals: Dict[str, np.ndarray]) -> pd.DataFrame:
+        close = self._window[-1]
+        rows = []
+        for name, condition in self.conditions:
+            # Symbole ohne Kurs im ausgewerteten Fenster lösen kein Signal aus
+            signal = np.where(condition.valid_columns(self._window), signals[name], 0)
+            for position in np.flatnonzero(signal):
+                rows.append((self.symbols[position], name, int(signal[position]), self.timestamp, close[position]))
+        return pd.DataFrame(rows, columns=SCAN_COLUMNS)
@@ -0,0 +1,113 @@
+"""
+Signalbedingungen der Beispielstrategien
+Vektorisierte Kreuzungsbedingungen über NumPy-Arrays. Die Zeit liegt auf Achse 0, sodass dieselben
+Funktionen eine einzelne Reihe (Strategien) und eine Matrix Zeit x Symbol (Scanner) auswerten.
+"""
+
+import numpy as np
+
+
+def _as_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=float)
+
+
+def _combine(buy: np.ndarray, sell: np.ndarray) -> np.ndarray:
+    # Signal am ersten Bar ist immer 0, Kaufsignale haben Vorrang
+    signal = np.zeros(buy.shape, dtype=int)
+    signal[1:] = np.where(buy[1:], 1, np.where(sell[1:], -1, 0))
+    return signal
+
+
+def rolling_rsi(close, window: int = 14):
+    """
+    Berechnet den RSI mit gleitenden Mittelwerten wie die RSI-Strategie
+
+    Args:
+        close: Schlusskurse als Series oder DataFrame (Spalten = Symbole)
+        window: Fenstergröße für den RSI
+
+    Returns:
+        RSI mit derselben Form wie close
+    """
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    rs = gain.rolling(window=window).mean() / loss.rolling(window=window).mean()
+    return 100 - (100 / (1 + rs))
+
+
+def crossover_signals(fast, slow) -> np.ndarray:
+    """
+    Kauf, wenn fast über slow wechselt, Verkauf, wenn fast wieder darunter fällt (MA-Crossover)
+
+    Args:
+        fast: Schnelle Linie
+        slow: Langsame Linie
+
+    Returns:
+        np.ndarray: 1 (Kauf), -1 (Verkauf) oder 0 je Bar
+    """
+    above = (_as_array(fast) > _as_array(slow)).astype(int)
+    signal = np.zeros(above.shape, dtype=int)
+    signal[1:] = above[1:] - above[:-1]
+    return signal
+
+
+def line_cross_signals(line, signal_line) -> np.ndarray:
+    """
+    Kauf, wenn line die Signallinie von unten erreicht, Verkauf bei Kreuzung von oben (MACD)
+
+    Args:
+        line: Linie, z.B. MACD
+        signal_line: Signallinie
+
+    Returns:
+        np.ndarray: 1 (Kauf), -1 (Verkauf) oder 0 je Bar
+    """
+    line, signal_line = _as_array(line), _as_array(signal_line)
+    buy = np.zeros(line.shape, dtype=bool)
+    sell = np.zeros(line.shape, dtype=bool)
+    buy[1:] = (line[:-1] < signal_line[:-1]) & (line[1:] >= signal_line[1:])
+    sell[1:] = (line[:-1] > signal_line[:-1]) & (line[1:] <= signal_line[1:])
+    return _combine(buy, sell)
+
+
+def threshold_cross_signals(values, lower: float, upper: float) -> np.ndarray:
+    """
+    Kauf, wenn values von unten über lower steigt, Verkauf, wenn values von oben unter upper fällt (RSI)
+
+    Args:
+        values: Indikatorwerte, z.B. RSI
+        lower: Untere Schwelle (überverkauft)
+        upper: Obere Schwelle (überkauft)
+
+    Returns:
+        np.ndarray: 1 (Kauf), -1 (Verkauf) oder 0 je Bar
+    """
+    values = _as_array(values)
+    buy = np.zeros(values.shape, dtype=bool)
+    sell = np.zeros(values.shape, dtype=bool)
+    buy[1:] = (values[:-1] < lower) & (values[1:] >= lower)
+    sell[1:] = (values[:-1] > upper) & (values[1:] <= upper)
+    return _combine(buy, sell)
+
+
+def band_reentry_signals(close, lower_band, upper_band) -> np.ndarray:
+    """
+    Kauf, wenn der Kurs vom unteren Band zurück ins Band steigt, Verkauf beim Rückfall unter das
+    obere Band (Bollinger Bands)
+
+    Args:
+        close: Schlusskurse
+        lower_band: Unteres Band
+        upper_band: Oberes Band
+
+    Returns:
+        np.ndarray: 1 (Kauf), -1 (Verkauf) oder 0 je Bar
+    """
+    close, lower_band, upper_band = _as_array(close), _as_array(lower_band), _as_array(upper_band)
+    buy = np.zeros(close.shape, dtype=bool)
+    sell = np.zeros(close.shape, dtype=bool)
+    buy[1:] = (close[:-1] <= lower_band[:-1]) & (close[1:] > lower_band[1:])
+    sell[1:] = (close[:-1] >= upper_band[:-1]) & (close[1:] < upper_band[1:])
+    return _combine(buy, sell)
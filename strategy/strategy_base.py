@@ -85,7 +85,8 @@ class Strategy(ABC):
         """
         return self.parameters
     
-    def optimize(self, data, param_grid, metric='total_return', backtest_engine=None):
+    def optimize(self, data, param_grid, metric='total_return', backtest_engine=None, progress_callback=None,
+                 checkpoint_dir=None):
         """
         Optimiert die Parameter der Strategie
         
@@ -94,6 +95,9 @@ class Strategy(ABC):
             param_grid (dict): Dictionary mit Parameternamen als Schlüssel und Listen von Werten
             metric (str): Metrik, die optimiert werden soll
             backtest_engine: Backtesting-Engine für die Optimierung
+            progress_callback (callable, optional): Wird nach jeder Kombination mit (erledigt, gesamt, Meldung) aufgerufen
+            checkpoint_dir (str, optional): Verzeichnis für das Checkpoint-Log des Sweeps; jede Kombination
+                wird sofort gespeichert und ein erneuter Aufruf mit derselben Spezifikation setzt dort fort
             
         Returns:
             tuple: (Beste Parameter, Beste Metrik, Alle Ergebnisse)
@@ -102,33 +106,54 @@ class Strategy(ABC):
             from backtesting.backtest_engine import BacktestEngine
             backtest_engine = BacktestEngine()
             
+        # Mit Ergebnisspeicher werden bereits berechnete Kombinationen übersprungen
+        result_store = getattr(backtest_engine, 'result_store', None)
+        if result_store is not None or checkpoint_dir is not None:
+            from backtesting.result_store import fingerprint_data
+            data_fingerprint = fingerprint_data(data)
+            
         # Generiere alle Parameterkombinationen
         import itertools
         param_names = list(param_grid.keys())
         param_values = list(param_grid.values())
         param_combinations = list(itertools.product(*param_values))
         
+        # Checkpoint-Log des Sweeps, abgeschlossene Kombinationen werden daraus übernommen
+        checkpoint = None
+        if checkpoint_dir is not None:
+            from backtesting.sweep_checkpoint import SweepCheckpoint
+            checkpoint = SweepCheckpoint(self._get_sweep_spec(param_grid, data_fingerprint, backtest_engine),
+                                         len(param_combinations), checkpoint_dir)
+        
         # Initialisiere Ergebnisse
         results = []
         best_metric_value = float('-inf')
         best_params = None
         
         # Teste jede Parameterkombination
-        for params in param_combinations:
+        for done, params in enumerate(param_combinations, start=1):
             # Setze Parameter
             param_dict = dict(zip(param_names, params))
             self.set_parameters(**param_dict)
             
-            # Führe Backtest durch
-            backtest_result = backtest_engine.run(data, self)
+            # Führe Backtest durch, sofern die Kombination nicht bereits gespeichert ist
+            metrics = None
+            if checkpoint is not None and checkpoint.is_done(done - 1):
+                metrics = checkpoint.get_result(done - 1)['metrics']
+            if metrics is None and result_store is not None:
+                metrics = result_store.get_metrics(backtest_engine.get_result_key(data, self, data_fingerprint=data_fingerprint))
+            if metrics is None:
+                metrics = backtest_engine.run(data, self)['metrics']
+            if checkpoint is not None and not checkpoint.is_done(done - 1):
+                checkpoint.record(done - 1, param_dict, metrics)
             
             # Extrahiere Metrik
-            metric_value = backtest_result['metrics'][metric]
+            metric_value = metrics[metric]
             
             # Speichere Ergebnis
             result = {
                 'params': param_dict,
-                'metrics': backtest_result['metrics']
+                'metrics': metrics
             }
             results.append(result)
             
@@ -136,9 +161,42 @@ class Strategy(ABC):
             if metric_value > best_metric_value:
                 best_metric_value = metric_value
                 best_params = param_dict
+            
+            if progress_callback is not None:
+                message = f"Kombination {done}/{len(param_combinations)}"
+                if checkpoint is not None:
+                    eta = checkpoint.status()['eta_seconds']
+                    message += f", Restzeit ca. {eta:.0f} s" if eta is not None else ""
+                progress_callback(done, len(param_combinations), message)
                 
         # Setze beste Parameter
         if best_params:
             self.set_parameters(**best_params)
             
         return best_params, best_metric_value, results
+    
+    def _get_sweep_spec(self, param_grid, data_fingerprint, backtest_engine):
+        """
+        Erstellt die Spezifikation eines Sweeps für das Checkpoint-Log
+        
+        Args:
+            param_grid (dict): Parameterraster
+            data_fingerprint (str): Fingerabdruck der Daten
+            backtest_engine: Backtesting-Engine
+            
+        Returns:
+            dict: Strategie, feste Attribute, Raster, Daten, Engine-Konfiguration und Code-Version
+        """
+        from backtesting.result_store import get_code_version
+
+        # Die im Raster variierten Parameter gehören nicht zu den festen Attributen
+        attributes = {key: value for key, value in vars(self).items() if key != 'parameters'}
+        attributes['parameters'] = {key: value for key, value in self.parameters.items() if key not in param_grid}
+        return {
+            'strategy': f"{type(self).__module__}.{type(self).__qualname__}",
+            'attributes': attributes,
+            'grid': {name: list(values) for name, values in param_grid.items()},
+            'data': data_fingerprint,
+            'engine': backtest_engine.get_config() if hasattr(backtest_engine, 'get_config') else type(backtest_engine).__qualname__,
+            'code': get_code_version(self),
+        }
@@ -17,6 +17,22 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.helpers import DateTimeUtils, DataUtils, ConfigUtils, CacheManager
 from data.data_source import DataSourceFactory
 from core.strategy import StrategyFactory
+from data.data_processor import DataProcessor
+from data.live_feed import BarRingBuffer, FakeLiveDataSource, LiveFeedPoller
+from backtesting.job_queue import JobQueue, run_backtest_job, JOB_CANCELLED, JOB_FAILED, JOB_FINISHED
+from data.bar_pyramid import BarPyramid, aggregate_ohlcv
+from data.resampler import resample_ohlcv, InvalidIndexError, MissingColumnsError, UnknownTimeframeError
+from data.trading_calendar import TradingCalendar, get_exchange_for_symbol
+from utils.range_index import PriceRangeIndex, RangeMinMax
+from backtesting.backtest_engine import BacktestEngine
+from backtesting.intrabar import IntrabarFillResolver, find_ambiguous_bars
+from backtesting.result_store import BacktestResultStore
+from backtesting.sweep_checkpoint import SweepCheckpoint, get_sweep_status, list_sweeps
+from data.indicator_pipeline import IndicatorPipeline
+from utils import kernels
+from strategy.scanner import SignalScanner
+from data.http_client import HttpClient, get_http_client
+from data.single_flight import SingleFlight
 
 # Logger konfigurieren
 logging.basicConfig(
@@ -30,6 +46,47 @@ logging.basicConfig(
 
 logger = logging.getLogger("trading_dashboard_tests")
 
+def _slow_job(steps, delay, progress_callback=None):
+    """
+    Hilfsjob für die Job-Queue-Tests, der regelmäßig Fortschritt meldet
+    """
+    import time
+    for step in range(steps):
+        time.sleep(delay)
+        progress_callback(step + 1, steps, "Schritt")
+    return steps
+
+def _single_flight_worker(directory):
+    """
+    Hilfsprozess für die Single-Flight-Tests: liest den Cache oder ruft langsam ab und schreibt ihn
+    """
+    import time
+    cache_file = os.path.join(directory, 'data.csv')
+
+    def fetch():
+        if os.path.exists(cache_file):
+            return 'cache'
+        time.sleep(0.3)
+        with open(os.path.join(directory, 'fetches.log'), 'a') as f:
+            f.write(f"{os.getpid()}\n")
+        with open(cache_file, 'w') as f:
+            f.write('data')
+        return 'upstream'
+
+    return SingleFlight().do('data', fetch, directory)
+
+def _wait_for_job(queue, job_id, timeout=30):
+    """
+    Wartet, bis ein Job nicht mehr wartet oder läuft
+    """
+    import time
+    deadline = time.time() + timeout
+    status = queue.get_status(job_id)
+    while status['status'] in ('queued', 'running') and time.time() < deadline:
+        time.sleep(0.05)
+        status = queue.get_status(job_id)
+    return status
+
 class TestDataSources(unittest.TestCase):
     """
     Tests für Datenquellen
@@ -328,6 +385,2207 @@ class TestStatePreservation(unittest.TestCase):
         metrics = strategy.get_performance_metrics()
         self.assertIsNotNone(metrics)
 
+class TestLiveFeed(unittest.TestCase):
+    """
+    Tests für den Live-Datenfeed
+    """
+
+    def test_ring_buffer_wraparound(self):
+        """
+        Testet, dass der Ring-Puffer die ältesten Bars überschreibt
+        """
+        buffer = BarRingBuffer(capacity=5)
+        start = datetime(2024, 1, 2, 9, 30)
+        for i in range(8):
+            buffer.append(start + timedelta(minutes=i),
+                          {'open': i, 'high': i + 1, 'low': i - 1, 'close': i, 'volume': 100})
+
+        frame = buffer.to_frame()
+        self.assertEqual(len(buffer), 5)
+        self.assertEqual(list(frame['close']), [3.0, 4.0, 5.0, 6.0, 7.0])
+        self.assertTrue(frame.index.is_monotonic_increasing)
+        self.assertEqual(buffer.last_timestamp, pd.Timestamp(start + timedelta(minutes=7)))
+        self.assertEqual(len(buffer.since(start + timedelta(minutes=5))), 2)
+
+    def test_poll_once_appends_only_new_bars(self):
+        """
+        Testet, dass der Poller nur neue Bars in den Puffer übernimmt
+        """
+        data_source = FakeLiveDataSource(history=50)
+        poller = LiveFeedPoller(data_source, timeframe='1m', capacity=100)
+        buffer = poller.subscribe('NQ=F')
+        self.assertEqual(len(buffer), 0)
+
+        self.assertEqual(poller.poll_once(), {'NQ=F': 50})
+        self.assertEqual(poller.poll_once(), {'NQ=F': 1})
+        self.assertEqual(poller.poll_once(), {'NQ=F': 1})
+        self.assertEqual(len(buffer), 52)
+        self.assertFalse(buffer.to_frame().index.has_duplicates)
+
+    def test_poll_yahoo_source(self):
+        """
+        Testet, dass jeder Abfragezyklus die Yahoo-API aufruft und nur neue echte Bars übernimmt
+        """
+        from data.circuit_breaker import YAHOO_API, get_circuit_breaker
+        from data.data_source import YahooFinanceDataSource
+
+        class StubApiClient:
+            def __init__(self):
+                self.calls = 0
+
+            def call_api(self, api, query):
+                # Gleitendes Fenster aus fünf 1-Minuten-Bars, je Aufruf eine Bar weiter
+                self.calls += 1
+                closes = [100.0 + self.calls + i for i in range(5)]
+                return {'chart': {'result': [{
+                    'timestamp': [1704205800 + 60 * (self.calls + i) for i in range(5)],
+                    'indicators': {'quote': [{'open': closes, 'high': closes, 'low': closes, 'close': closes,
+                                              'volume': [100] * 5}]},
+                }]}}
+
+        get_circuit_breaker(YAHOO_API).record_success()
+        api_client = StubApiClient()
+        poller = LiveFeedPoller(YahooFinanceDataSource(cache_enabled=False, api_client=api_client), timeframe='1m')
+        buffer = poller.subscribe('LIVEYAHOO')
+
+        self.assertEqual(poller.poll_once(), {'LIVEYAHOO': 5})
+        self.assertEqual(poller.poll_once(), {'LIVEYAHOO': 1})
+        self.assertEqual(api_client.calls, 2)
+        self.assertEqual(buffer.to_frame()['close'].tolist(), [101.0, 102.0, 103.0, 104.0, 105.0, 106.0])
+
+    def test_incremental_indicators_match_data_processor(self):
+        """
+        Testet, dass die inkrementellen Indikatoren mit dem DataProcessor übereinstimmen
+        """
+        df = FakeLiveDataSource(history=120, auto_advance=False).get_data('AAPL', '1m')
+        buffer = BarRingBuffer(capacity=200)
+        buffer.extend(df)
+        live = buffer.to_frame()
+
+        close = pd.DataFrame({'Close': df['close']})
+        expected = {
+            'SMA_20': DataProcessor.calculate_sma(close, 20),
+            'EMA_12': DataProcessor.calculate_ema(close, 12),
+            'RSI_14': DataProcessor.calculate_rsi(close, 14),
+        }
+        for name, series in expected.items():
+            np.testing.assert_allclose(live[name].values, series.values, rtol=1e-9, equal_nan=True)
+
+    def test_pollers_keyed_by_source_and_timeframe(self):
+        """
+        Testet, dass jede Kombination aus Datenquelle und Zeitrahmen einen eigenen Poller hat
+        """
+        from data.live_feed import get_live_poller
+
+        poller = get_live_poller(FakeLiveDataSource(), source_type='test-keyed', timeframe='1m')
+        self.assertIs(get_live_poller(source_type='test-keyed', timeframe='1m'), poller)
+        self.assertIsNot(get_live_poller(FakeLiveDataSource(), source_type='test-keyed', timeframe='1d'), poller)
+        self.assertEqual(get_live_poller(source_type='test-keyed', timeframe='1d').timeframe, '1d')
+
+    def test_idle_symbols_dropped(self):
+        """
+        Testet, dass der Poller nur Symbole ohne Abonnenten verwirft und ohne Symbole endet
+        """
+        import time
+        from dashboard.chart_callbacks import toggle_live_mode
+
+        poller = LiveFeedPoller(FakeLiveDataSource(history=5), poll_interval=0.01, idle_timeout=0.2)
+        poller.subscribe('AAPL')
+        poller.subscribe('MSFT')
+        poller.start()
+        try:
+            # Ein anderer Nutzer schaltet den Live-Modus ab, AAPL bleibt abonniert
+            self.assertTrue(toggle_live_mode(False))
+            deadline = time.time() + 5
+            while poller.get_buffer('MSFT') is not None and time.time() < deadline:
+                poller.subscribe('AAPL')
+                time.sleep(0.02)
+            self.assertIsNone(poller.get_buffer('MSFT'))
+            self.assertIsNotNone(poller.get_buffer('AAPL'))
+            self.assertTrue(poller.is_running)
+
+            deadline = time.time() + 5
+            while poller.is_running and time.time() < deadline:
+                time.sleep(0.02)
+            self.assertFalse(poller.is_running)
+            self.assertIsNone(poller.get_buffer('AAPL'))
+
+            poller.subscribe('AAPL')
+            poller.start()
+            self.assertTrue(poller.is_running)
+        finally:
+            poller.stop()
+
+    def test_stream_live_candles_patch(self):
+        """
+        Testet, dass der Live-Modus nur vorhandene Arrays je Trace erweitert und auf LIVE_WINDOW begrenzt
+        """
+        from unittest import mock
+        from dashboard import chart_callbacks
+        from data.live_feed import get_live_poller
+
+        def operations(patch):
+            return {(op['operation'], tuple(op['location'])): op['params'] for op in patch.to_plotly_json()['operations']}
+
+        source = FakeLiveDataSource(history=10, auto_advance=False)
+        poller = get_live_poller(source, source_type='test-stream', timeframe='5m', poll_interval=3600)
+        poller.subscribe('AAPL')
+        poller.poll_once()
+        chart = {'revision': 'r1', 'chart_type': 'candlestick'}
+        try:
+            with mock.patch.object(chart_callbacks, 'LIVE_WINDOW', 8):
+                patch, cursor = chart_callbacks.stream_live_candles(1, 'AAPL', '5m', 'test-stream', chart, None)
+                ops = operations(patch)
+                # Erster Tick: Arrays als Listen ersetzen und SMA/EMA einfügen
+                self.assertEqual(len(ops[('Assign', ('data', 0, 'open'))]['value']), 8)
+                self.assertIn(('Assign', ('data', 1, 'marker', 'color')), ops)
+                self.assertNotIn(('Assign', ('data', 0, 'y')), ops)
+                self.assertEqual(ops[('Insert', ('data',))]['index'], 3)
+                self.assertEqual(cursor['count'], 8)
+
+                source.advance('AAPL', '5m', 2)
+                poller.poll_once()
+                patch, cursor = chart_callbacks.stream_live_candles(2, 'AAPL', '5m', 'test-stream', chart, cursor)
+                ops = patch.to_plotly_json()['operations']
+                extended = {tuple(op['location']) for op in ops if op['operation'] == 'Extend'}
+                self.assertEqual(extended, {('data', 0, 'x'), ('data', 0, 'open'), ('data', 0, 'high'),
+                                            ('data', 0, 'low'), ('data', 0, 'close'), ('data', 1, 'x'),
+                                            ('data', 1, 'y'), ('data', 1, 'marker', 'color'),
+                                            ('data', 2, 'x'), ('data', 2, 'y'), ('data', 3, 'x'), ('data', 3, 'y')})
+                # Zwei neue Kerzen bei vollem Fenster verdrängen je Array zwei alte
+                deleted = [tuple(op['location']) for op in ops if op['operation'] == 'Delete']
+                self.assertEqual(deleted.count(('data', 0, 'open', 0)), 2)
+                self.assertEqual(cursor['count'], 8)
+
+                # Neu gezeichneter Linien-Chart: neu synchronisieren, nur x und y für Trace 0
+                line_chart = {'revision': 'r2', 'chart_type': 'line'}
+                patch, cursor = chart_callbacks.stream_live_candles(3, 'AAPL', '5m', 'test-stream', line_chart, cursor)
+                locations = {tuple(op['location']) for op in patch.to_plotly_json()['operations']}
+                self.assertIn(('data', 0, 'y'), locations)
+                self.assertNotIn(('data', 0, 'open'), locations)
+                self.assertEqual(cursor['revision'], 'r2')
+        finally:
+            poller.stop()
+
+class TestJobQueue(unittest.TestCase):
+    """
+    Tests für die Job-Queue der Hintergrund-Backtests
+    """
+
+    def setUp(self):
+        """
+        Vorbereitung für Tests
+        """
+        self.queue = JobQueue(max_workers=2, use_processes=False)
+
+    def tearDown(self):
+        """
+        Aufräumen nach Tests
+        """
+        self.queue.shutdown()
+
+    def test_backtest_job_result(self):
+        """
+        Testet, dass ein Backtest-Job ein serialisierbares Ergebnis liefert
+        """
+        job_id = self.queue.submit(run_backtest_job, 'ma_crossover', 'AAPL', data_source='mock')
+        status = _wait_for_job(self.queue, job_id)
+
+        self.assertEqual(status['status'], JOB_FINISHED)
+        self.assertEqual(status['progress'], 1.0)
+        result = self.queue.get_result(job_id)
+        self.assertIn('total_return', result['metrics'])
+        self.assertEqual(len(result['equity_curve']['dates']), len(result['equity_curve']['values']))
+
+    def test_cancel_running_job(self):
+        """
+        Testet den Abbruch eines laufenden Jobs
+        """
+        job_id = self.queue.submit(_slow_job, 200, 0.01)
+        self.assertTrue(self.queue.cancel(job_id))
+        status = _wait_for_job(self.queue, job_id)
+
+        self.assertEqual(status['status'], JOB_CANCELLED)
+        self.assertIsNone(self.queue.get_result(job_id))
+        self.assertFalse(self.queue.cancel(job_id))
+
+    def test_failed_job(self):
+        """
+        Testet, dass Fehler im Job im Status gemeldet werden
+        """
+        job_id = self.queue.submit(run_backtest_job, 'unbekannt', 'AAPL', data_source='mock')
+        status = _wait_for_job(self.queue, job_id)
+
+        self.assertEqual(status['status'], JOB_FAILED)
+        self.assertIn('unbekannt', status['error'])
+
+    def test_process_pool(self):
+        """
+        Testet die Ausführung im Prozess-Pool mit geteiltem Fortschritt
+        """
+        queue = JobQueue(max_workers=1, use_processes=True)
+        try:
+            job_id = queue.submit(_slow_job, 3, 0.01)
+            status = _wait_for_job(queue, job_id)
+            self.assertEqual(status['status'], JOB_FINISHED)
+            self.assertEqual(queue.get_result(job_id), 3)
+        finally:
+            queue.shutdown()
+
+    def test_status_shared_between_server_processes(self):
+        """
+        Testet, dass Status, Ergebnis und Abbruch über den geteilten Job-Speicher in jeder Queue ankommen
+        """
+        import tempfile
+        from backtesting.job_store import JobStore
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'jobs.sqlite')
+            # Zwei Queues mit eigenem Speicher-Objekt, wie in zwei gunicorn-Workern
+            worker_a = JobQueue(max_workers=1, use_processes=False, store=JobStore(path))
+            worker_b = JobQueue(max_workers=1, use_processes=False, store=JobStore(path))
+            try:
+                job_id = worker_a.submit(_slow_job, 3, 0.01)
+                status = _wait_for_job(worker_b, job_id)
+                self.assertEqual(status['status'], JOB_FINISHED)
+                self.assertEqual(worker_b.get_result(job_id), 3)
+
+                job_id = worker_a.submit(_slow_job, 500, 0.01)
+                self.assertTrue(worker_b.cancel(job_id))
+                self.assertEqual(_wait_for_job(worker_a, job_id)['status'], JOB_CANCELLED)
+                self.assertEqual([job['status'] for job in worker_b.list_jobs()], [JOB_CANCELLED, JOB_FINISHED])
+            finally:
+                worker_a.shutdown()
+                worker_b.shutdown()
+
+    def test_stale_jobs_of_dead_workers_fail(self):
+        """
+        Testet, dass Jobs beendeter Worker beim Start einer Queue als fehlgeschlagen markiert werden,
+        Jobs aktiver Worker aber nicht
+        """
+        import tempfile
+        import time
+        from backtesting.job_store import JOB_RUNNING, JobStore
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'jobs.sqlite')
+            store = JobStore(path)
+            # Job eines abgestürzten Workers: läuft laut Speicher, aber ohne weitere Heartbeats
+            store.create('dead', '_slow_job')
+            store.set_progress('dead', 1, 10)
+
+            worker_a = JobQueue(max_workers=1, use_processes=False, store=JobStore(path),
+                                heartbeat_interval=0.05, stale_timeout=0.3)
+            try:
+                job_id = worker_a.submit(_slow_job, 100, 0.01)
+                time.sleep(0.4)
+                worker_b = JobQueue(max_workers=1, use_processes=False, store=JobStore(path),
+                                    heartbeat_interval=0.05, stale_timeout=0.3)
+                dead = worker_b.get_status('dead')
+                self.assertEqual(dead['status'], JOB_FAILED)
+                self.assertIn('Worker', dead['error'])
+                self.assertEqual(worker_b.get_status(job_id)['status'], JOB_RUNNING)
+                self.assertEqual(_wait_for_job(worker_b, job_id)['status'], JOB_FINISHED)
+                worker_b.shutdown()
+            finally:
+                worker_a.shutdown()
+
+class TestProductionServer(unittest.TestCase):
+    """
+    Tests für den Produktionsserver
+    """
+
+    def test_health_endpoints(self):
+        """
+        Testet die Health- und Readiness-Endpunkte
+        """
+        from wsgi import server
+        client = server.test_client()
+
+        self.assertEqual(client.get('/health').get_json(), {'status': 'ok'})
+        response = client.get('/ready')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(response.get_json()['checks'].values()))
+        self.assertEqual(client.get('/_dash-layout').status_code, 200)
+
+    def test_env_settings_without_dashboard(self):
+        """
+        Testet, dass Daten- und Utility-Module ihre Einstellungen ohne das Dashboard lesen
+        """
+        import subprocess
+        import sys
+        from dashboard import server
+        from utils import settings
+
+        self.assertIs(server.get_env_setting, settings.get_env_setting)
+        modules = ['utils.kernels', 'utils.helpers', 'data.http_client', 'data.cache_policy',
+                   'data.circuit_breaker', 'data.history_loader', 'data.memory_cache']
+        code = (f"import sys\nfor name in {modules!r}:\n    __import__(name)\n"
+                "print(sorted(m for m in sys.modules if m.split('.')[0] == 'dashboard'))")
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(result.stdout.strip(), '[]')
+
+    def test_chart_callback_request(self):
+        """
+        Testet den Chart-Callback über /_dash-update-component, wie ihn der Browser aufruft
+        """
+        from wsgi import server
+        from load_test import build_callback_payload
+        client = server.test_client()
+        dependencies = client.get('/_dash-dependencies').get_json()
+        dependency = next(d for d in dependencies if 'price-chart.figure' in d['output'].strip('.').split('...'))
+
+        response = client.post('/_dash-update-component', json=build_callback_payload(dependency))
+
+        self.assertEqual(response.status_code, 200)
+        figure = response.get_json()['response']['price-chart']['figure']
+        self.assertEqual(figure['data'][0]['type'], 'candlestick')
+
+    def test_server_options_from_environment(self):
+        """
+        Testet, dass Argumente Vorrang vor Umgebungsvariablen haben
+        """
+        from dashboard.server import get_server_options
+        os.environ['TRADING_DASHBOARD_WORKERS'] = '3'
+        os.environ['TRADING_DASHBOARD_PRELOAD'] = 'false'
+        try:
+            options = get_server_options(threads=8)
+        finally:
+            del os.environ['TRADING_DASHBOARD_WORKERS']
+            del os.environ['TRADING_DASHBOARD_PRELOAD']
+
+        self.assertEqual(options['workers'], 3)
+        self.assertEqual(options['threads'], 8)
+        self.assertFalse(options['preload'])
+
+    def test_ui_callbacks_run_clientside(self):
+        """
+        Testet, dass reine UI-Interaktionen keine unnötigen Server-Requests auslösen
+        """
+        from wsgi import server
+        from load_test import count_server_requests
+        client = server.test_client()
+        dependencies = client.get('/_dash-dependencies').get_json()
+
+        # Nur der Chart-Callback mit echter Datenarbeit läuft auf dem Server
+        self.assertEqual(count_server_requests(dependencies, 'timeframe-1h.n_clicks')['server'], 1)
+        self.assertEqual(count_server_requests(dependencies, 'line-chart-button.n_clicks')['server'], 1)
+        self.assertEqual(count_server_requests(dependencies, 'asset-button.n_clicks')['server'], 1)
+        self.assertEqual(count_server_requests(dependencies, 'trendline-button.n_clicks'), {'server': 0, 'client': 1})
+        self.assertEqual(client.get('/assets/js/ui_callbacks.js').status_code, 200)
+
+    def test_summarize_latencies(self):
+        """
+        Testet die Auswertung des Lasttests
+        """
+        from load_test import summarize_latencies
+        stats = summarize_latencies([0.01] * 19 + [0.2], errors=1, elapsed=2.0)
+
+        self.assertEqual(stats['requests'], 21)
+        self.assertAlmostEqual(stats['rps'], 10.5)
+        self.assertAlmostEqual(stats['p50_ms'], 10.0)
+        self.assertGreater(stats['p95_ms'], 10.0)
+
+class TestChartDataCache(unittest.TestCase):
+    """
+    Tests für das Warm-up der Chart-Daten
+    """
+
+    def setUp(self):
+        """
+        Vorbereitung für Tests
+        """
+        from dashboard.warmup import ChartDataCache
+        self.cache = ChartDataCache(max_workers=2)
+
+    def tearDown(self):
+        """
+        Aufräumen nach Tests
+        """
+        self.cache.stop_refresh()
+
+    def test_warm_up_serves_from_memory(self):
+        """
+        Testet, dass vorgeladene Einträge ohne erneutes Laden geliefert werden
+        """
+        loaded = self.cache.warm_up(symbols=['AAPL', 'MSFT'], timeframes=['1h', '1d'])
+        self.assertEqual(loaded, 4)
+        self.assertTrue(self.cache.is_warm)
+
+        df = self.cache.get_data('AAPL', '1d')
+        self.assertIn('close', df.columns)
+        self.assertEqual(self.cache.get_stats()['hits'], 1)
+        self.assertEqual(self.cache.get_stats()['misses'], 0)
+
+        # Änderungen an der zurückgegebenen Kopie dürfen den Cache nicht verändern
+        df['close'] = 0
+        self.assertNotEqual(self.cache.get_data('AAPL', '1d')['close'].iloc[0], 0)
+
+    def test_entries_bounded(self):
+        """
+        Testet, dass der am längsten nicht verwendete Eintrag verdrängt wird
+        """
+        from dashboard.warmup import ChartDataCache
+
+        cache = ChartDataCache(max_workers=2, max_entries=2)
+        cache.get_data('AAPL', '1d')
+        cache.get_data('MSFT', '1d')
+        cache.get_data('AAPL', '1d')
+        cache.get_data('TSLA', '1d')
+        self.assertEqual(cache.get_stats()['entries'], 2)
+        cache.get_data('AAPL', '1d')
+        self.assertEqual(cache.get_stats()['hits'], 2)
+        cache.get_data('MSFT', '1d')
+        self.assertEqual(cache.get_stats()['misses'], 4)
+
+    def test_miss_loads_synchronously(self):
+        """
+        Testet, dass fehlende Einträge beim Abruf geladen werden
+        """
+        df = self.cache.get_data('TSLA', '1d')
+        self.assertFalse(df.empty)
+        self.assertEqual(self.cache.get_stats()['misses'], 1)
+        self.assertEqual(self.cache.get_stats()['entries'], 1)
+
+    def test_background_refresh(self):
+        """
+        Testet die regelmäßige Aktualisierung im Hintergrund
+        """
+        import time
+        self.cache.warm_up(symbols=['AAPL'], timeframes=['1d'])
+        loaded_at = self.cache._entries[('AAPL', '1d', 'yahoo')]['loaded_at']
+
+        self.cache.start_refresh(0.05)
+        deadline = time.time() + 10
+        while self.cache._entries[('AAPL', '1d', 'yahoo')]['loaded_at'] == loaded_at and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertGreater(self.cache._entries[('AAPL', '1d', 'yahoo')]['loaded_at'], loaded_at)
+
+class TestBarPyramid(unittest.TestCase):
+    """
+    Tests für die Bar-Pyramide
+    """
+
+    def setUp(self):
+        """
+        Vorbereitung für Tests
+        """
+        # Minutendaten mit Lücken (Nacht und Wochenende), wie bei Futures
+        index = pd.date_range('2024-01-04 09:30', '2024-01-10 16:00', freq='1min')
+        index = index[(index.hour >= 9) & (index.hour < 16) & (index.dayofweek < 5)]
+        rng = np.random.default_rng(7)
+        close = 100 + np.cumsum(rng.normal(0, 0.1, len(index)))
+        self.base = pd.DataFrame({
+            'Open': close + rng.normal(0, 0.05, len(index)),
+            'High': close + 0.2,
+            'Low': close - 0.2,
+            'Close': close,
+            'Volume': rng.integers(100, 1000, len(index)).astype(float),
+        }, index=index)
+
+    def _resample(self, df, freq):
+        agg = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+        return df.resample(freq).agg(agg).dropna(subset=['Open'])
+
+    def test_matches_pandas_resample(self):
+        """
+        Testet, dass die Aggregation pandas.resample entspricht
+        """
+        for timeframe, freq in [('5m', '5min'), ('1h', '1h'), ('4h', '4h'), ('1d', '1D')]:
+            expected = self._resample(self.base, freq)
+            result = aggregate_ohlcv(self.base, timeframe)
+            pd.testing.assert_frame_equal(result, expected, check_freq=False, check_names=False)
+
+        weekly = aggregate_ohlcv(self.base, '1w')
+        self.assertTrue((weekly.index.dayofweek == 0).all())
+        self.assertEqual(weekly['Volume'].sum(), self.base['Volume'].sum())
+
+    def test_derives_levels_from_base(self):
+        """
+        Testet das Ableiten und Zwischenspeichern der Zeitrahmen
+        """
+        pyramid = BarPyramid(self.base, '1m')
+        self.assertTrue(pyramid.supports('15m'))
+        self.assertFalse(BarPyramid(self.base.iloc[:0], '1h').supports('5m'))
+        self.assertRaises(ValueError, pyramid.get, '7m')
+
+        level = pyramid.get('15m')
+        self.assertEqual(pyramid.cached_levels(), ['15m'])
+        self.assertEqual(level['High'].iloc[0], self.base['High'].iloc[:15].max())
+
+        # Änderungen an der zurückgegebenen Kopie dürfen die Pyramide nicht verändern
+        level['Close'] = 0
+        self.assertNotEqual(pyramid.get('15m')['Close'].iloc[0], 0)
+
+    def test_incremental_append(self):
+        """
+        Testet, dass neue Basis-Bars dasselbe Ergebnis liefern wie eine vollständige Neuberechnung
+        """
+        split = len(self.base) - 137
+        pyramid = BarPyramid(self.base.iloc[:split], '1m')
+        for timeframe in ['5m', '1h', '1d', '1mo']:
+            pyramid.get(timeframe)
+
+        # Der letzte bekannte Bar wird mit neuen Werten erneut geliefert
+        update = self.base.iloc[split - 1:].copy()
+        update.iloc[0, update.columns.get_loc('High')] += 1
+        self.assertEqual(pyramid.append(update), len(update))
+
+        full = BarPyramid(update.combine_first(self.base), '1m')
+        for timeframe in ['5m', '1h', '1d', '1mo']:
+            pd.testing.assert_frame_equal(pyramid.get(timeframe), full.get(timeframe))
+        self.assertEqual(pyramid.append(self.base.iloc[:10]), 0)
+
+    def test_session_anchored_levels(self):
+        """
+        Testet, dass die Pyramide abgeleitete Bars an der Handelssitzung verankert, auch inkrementell
+        """
+        index = pd.date_range('2024-01-07 18:00', '2024-01-10 17:00', freq='1min')
+        close = np.linspace(100, 110, len(index))
+        base = pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+                             'Volume': np.ones(len(index))}, index=index)
+
+        split = len(base) - 500
+        pyramid = BarPyramid(base.iloc[:split], '1m', session='NQ')
+        for timeframe in ['4h', '1d']:
+            pyramid.get(timeframe)
+        pyramid.append(base.iloc[split:])
+
+        for timeframe in ['4h', '1d']:
+            expected = resample_ohlcv(base, timeframe, session='NQ')
+            pd.testing.assert_frame_equal(pyramid.get(timeframe), expected, check_freq=False, check_names=False)
+        daily = pyramid.get('1d')
+        self.assertTrue((daily.index.hour == 18).all())
+        self.assertEqual(aggregate_ohlcv(base, '1d', session='NQ').index[0], pd.Timestamp('2024-01-07 18:00'))
+
+    def test_nq_fetcher_uses_single_base_series(self):
+        """
+        Testet, dass der NQDataFetcher alle Minutenintervalle aus einem Abruf ableitet
+        """
+        import tempfile
+        from unittest import mock
+        from data.nq_integration import NQDataFetcher
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            fetcher = NQDataFetcher(cache_dir=cache_dir)
+            with mock.patch.object(NQDataFetcher, '_fetch_series', return_value=self.base) as fetch:
+                five = fetcher.get_nq_futures_data(interval='5m', range_val='5d')
+                three = NQDataFetcher(cache_dir=cache_dir).get_nq_futures_data(interval='3m', range_val='5d')
+                one = fetcher.get_nq_futures_data(interval='1m', range_val='1d')
+            self.assertEqual(fetch.call_count, 1)
+            self.assertEqual(fetch.call_args[0][:2], ('1m', '5d'))
+            self.assertEqual(fetcher.get_pyramid('1m', '5d').session, 'NQ')
+
+        # Der Zeitraum wird ab dem letzten Bar gezählt
+        start = self.base.index[-1] - pd.Timedelta(days=5)
+        expected = self._resample(self.base, '5min')
+        pd.testing.assert_frame_equal(five, expected[expected.index > start], check_freq=False, check_names=False)
+        self.assertEqual(three.index[1] - three.index[0], pd.Timedelta(minutes=3))
+        self.assertEqual(one.index[0].date(), self.base.index[-1].date())
+
+    def test_nq_pyramid_reloads_only_after_max_age_or_file_change(self):
+        """
+        Testet, dass eine alte Cache-Datei nicht bei jedem Aufruf einen neuen Abruf auslöst
+        """
+        import tempfile
+        import time
+        from unittest import mock
+        from data.nq_integration import NQDataFetcher
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            fetcher = NQDataFetcher(cache_dir=cache_dir)
+            cache_file = fetcher._get_cache_file('1m', '5d')
+            self.base.to_csv(cache_file)
+            old = time.time() - 7 * 24 * 3600
+            os.utime(cache_file, (old, old))
+
+            with mock.patch.object(NQDataFetcher, '_fetch_series', return_value=self.base) as fetch:
+                for _ in range(3):
+                    fetcher.get_pyramid('1m', '5d')
+                self.assertEqual(fetch.call_count, 1)
+
+                # Eine (z.B. im Hintergrund) neu geschriebene Cache-Datei wird übernommen
+                os.utime(cache_file, None)
+                fetcher.get_pyramid('1m', '5d')
+                fetcher.get_pyramid('1m', '5d')
+                self.assertEqual(fetch.call_count, 2)
+
+class TestResampler(unittest.TestCase):
+    """
+    Tests für den OHLCV-Resampler
+    """
+
+    def setUp(self):
+        """
+        Vorbereitung für Tests
+        """
+        rng = np.random.default_rng(11)
+        self.data = {}
+        for symbol, start in [('AAA', '2024-03-06 09:30'), ('BBB', '2024-03-07 13:07')]:
+            index = pd.date_range(start, periods=3000, freq='1min')
+            close = 50 + np.cumsum(rng.normal(0, 0.1, len(index)))
+            self.data[symbol] = pd.DataFrame({
+                'open': close, 'high': close + 0.1, 'low': close - 0.1, 'close': close,
+                'volume': rng.integers(1, 100, len(index)).astype(float),
+            }, index=index)
+
+    def test_multiple_symbols_match_pandas(self):
+        """
+        Testet, dass mehrere Symbole in einem Aufruf wie pandas.resample aggregiert werden
+        """
+        agg = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+        result = resample_ohlcv(self.data, '15m')
+        self.assertEqual(list(result), ['AAA', 'BBB'])
+        for symbol, df in self.data.items():
+            expected = df.resample('15min').agg(agg).dropna(subset=['open'])
+            pd.testing.assert_frame_equal(result[symbol], expected, check_freq=False, check_names=False)
+
+    def test_session_anchoring(self):
+        """
+        Testet die Verankerung der Tages-Bars an der NQ-Eröffnung um 18:00 Uhr New York
+        """
+        index = pd.date_range('2024-03-08 12:00', '2024-03-12 12:00', freq='1min', tz='America/New_York')
+        df = pd.DataFrame({'Open': 1.0, 'High': 2.0, 'Low': 0.5, 'Close': 1.5, 'Volume': 1.0},
+                          index=index.tz_convert('UTC'))
+
+        daily = resample_ohlcv(df, '1d', session='NQ')
+        self.assertEqual(str(daily.index.tz), 'America/New_York')
+        self.assertTrue((daily.index.hour == 18).all())
+        # Die Sitzung vom 8. März 18:00 Uhr bis 9. März 18:00 Uhr umfasst 24 Stunden
+        self.assertEqual(daily.loc['2024-03-08 18:00', 'Volume'], 1440)
+        self.assertEqual(daily['Volume'].sum(), len(df))
+
+        weekly = resample_ohlcv(df, '1w', session='NQ')
+        self.assertEqual(weekly.index[1], pd.Timestamp('2024-03-10 18:00', tz='America/New_York'))
+
+    def test_dst_fall_back(self):
+        """
+        Testet, dass die doppelte Stunde beim Ende der Sommerzeit zwei Bars bleibt, ohne NaT
+        """
+        index = pd.date_range('2024-11-02 22:00', '2024-11-03 12:00', freq='1min', tz='UTC', inclusive='left')
+        df = pd.DataFrame({'Open': 1.0, 'High': 2.0, 'Low': 0.5, 'Close': 1.5, 'Volume': 1.0}, index=index)
+        agg = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'}
+
+        hourly = resample_ohlcv(df, '1h', session='NQ')
+        self.assertFalse(hourly.index.hasnans)
+        self.assertEqual(str(hourly.index.tz), 'America/New_York')
+        self.assertTrue((hourly['Volume'] == 60).all())
+        self.assertEqual(len(hourly), 14)
+        repeated = hourly.index[hourly.index.tz_localize(None) == pd.Timestamp('2024-11-03 01:00')]
+        self.assertEqual([str(ts.utcoffset()) for ts in repeated], ['-1 day, 20:00:00', '-1 day, 19:00:00'])
+        daily = resample_ohlcv(df, '1d', session='NQ')
+        self.assertEqual(daily['Volume'].tolist(), [len(df)])
+
+        # Ohne Sitzung bleibt die Zeitzone der Eingabe erhalten
+        local = df.tz_convert('America/New_York')
+        for data in (df, local):
+            result = resample_ohlcv(data, '1h')
+            self.assertEqual(result.index.tz, data.index.tz)
+            expected = data.resample('1h').agg(agg).dropna(subset=['Open'])
+            pd.testing.assert_frame_equal(result, expected, check_freq=False)
+        pd.testing.assert_frame_equal(resample_ohlcv(local, '1d'), local.resample('1D').agg(agg),
+                                      check_freq=False)
+
+    def test_typed_errors(self):
+        """
+        Testet, dass Fehler nicht verschluckt, sondern als eigene Typen gemeldet werden
+        """
+        df = self.data['AAA']
+        self.assertRaises(UnknownTimeframeError, resample_ohlcv, df, '7m')
+        self.assertRaises(MissingColumnsError, resample_ohlcv, df.drop(columns=['low']), '5m')
+        self.assertRaises(InvalidIndexError, resample_ohlcv, df.reset_index(drop=True), '5m')
+        self.assertRaises(ValueError, DataUtils.resample_ohlc, df, '1y')
+
+        resampled = DataUtils.resample_ohlc(df.rename(columns=str.capitalize), '1h')
+        self.assertEqual(list(resampled.columns), ['open', 'high', 'low', 'close', 'volume'])
+
+class TestTradingCalendar(unittest.TestCase):
+    """
+    Tests für den Handelskalender
+    """
+
+    def test_session_grids(self):
+        """
+        Testet die Zeitstempel für US-Aktien, CME Globex und Krypto
+        """
+        us = TradingCalendar('US').get_index('5m', '2024-03-08', '2024-03-11 23:59')
+        self.assertEqual(len(us), 2 * 78)  # Freitag und Montag, je 09:30-16:00
+        self.assertEqual(us[0], pd.Timestamp('2024-03-08 09:30'))
+        self.assertEqual(us[-1], pd.Timestamp('2024-03-11 15:55'))
+
+        # Die Montagssitzung beginnt Sonntag 18:00, die tägliche Pause liegt zwischen 17:00 und 18:00
+        cme = TradingCalendar('CME').get_index('1h', '2024-03-09', '2024-03-11 23:59')
+        self.assertEqual(cme[0], pd.Timestamp('2024-03-10 18:00'))
+        self.assertNotIn(pd.Timestamp('2024-03-11 17:00'), cme)
+        self.assertIn(pd.Timestamp('2024-03-11 18:00'), cme)
+
+        crypto = TradingCalendar('CRYPTO').get_index('1d', '2024-03-08', '2024-03-11')
+        self.assertEqual(len(crypto), 4)
+        self.assertEqual(len(TradingCalendar('US').get_index('1d', '2024-03-08', '2024-03-11')), 2)
+
+    def test_grids_are_cached(self):
+        """
+        Testet, dass Raster je Zeitrahmen und Zeitraum wiederverwendet werden
+        """
+        calendar = TradingCalendar('US')
+        first = calendar.get_index('1m', '2024-01-02 10:00', '2024-01-31 12:00')
+        second = calendar.get_index('1m', '2024-01-02 11:00', '2024-01-31 15:00')
+        self.assertEqual((calendar.hits, calendar.misses), (1, 1))
+        self.assertEqual(second[0] - first[0], pd.Timedelta(hours=1))
+        self.assertRaises(UnknownTimeframeError, calendar.get_index, '7m', '2024-01-02', '2024-01-03')
+
+    def test_gaps_and_session_anchor(self):
+        """
+        Testet die Lückenerkennung und die Übergabe der Sitzung an den Resampler
+        """
+        calendar = TradingCalendar('CME')
+        index = calendar.get_index('1m', '2024-03-04 18:00', '2024-03-06 16:59')
+        missing = index[[10, 500]]
+        self.assertTrue(calendar.find_gaps(index.drop(missing), '1m').equals(missing))
+
+        df = pd.DataFrame({'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 1.0}, index=index)
+        daily = resample_ohlcv(df, '1d', session=calendar.get_session_anchor())
+        self.assertTrue((daily.index.hour == 18).all())
+        self.assertEqual(daily['volume'].tolist(), [23 * 60, 23 * 60])
+
+    def test_exchange_for_symbol(self):
+        """
+        Testet die Zuordnung von Symbolen zu Börsen
+        """
+        self.assertEqual(get_exchange_for_symbol('AAPL'), 'US')
+        self.assertEqual(get_exchange_for_symbol('NQ=F'), 'CME')
+        self.assertEqual(get_exchange_for_symbol('BTC-USD'), 'CRYPTO')
+        self.assertEqual(get_exchange_for_symbol('EUR-USD'), 'FX')
+
+class TestRangeIndex(unittest.TestCase):
+    """
+    Tests für den Bereichsindex und die ereignisgesteuerten Backtests
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.values = 100 + np.cumsum(rng.normal(size=1000))
+        self.values[[5, 300]] = np.nan
+        self.index = RangeMinMax(self.values, block_size=16)
+
+    def test_range_queries(self):
+        """
+        Testet Minimum und Maximum über beliebige Bereiche gegen NumPy
+        """
+        for start, end in [(0, 1000), (3, 17), (16, 32), (250, 777), (999, 1000), (10, 12)]:
+            self.assertEqual(self.index.min(start, end), np.nanmin(self.values[start:end]))
+            self.assertEqual(self.index.max(start, end), np.nanmax(self.values[start:end]))
+        self.assertTrue(np.isnan(self.index.min(5, 6)))
+        self.assertTrue(np.isnan(self.index.max(10, 10)))
+
+    def test_first_crossing(self):
+        """
+        Testet die Suche nach dem ersten Bar unter bzw. über einer Schwelle
+        """
+        for start in (0, 7, 300, 640):
+            for offset in (-15.0, -3.0, 0.0, 4.0, 25.0):
+                threshold = self.values[start + 1] + offset
+                below = np.flatnonzero(self.values[start:] <= threshold)
+                above = np.flatnonzero(self.values[start:] >= threshold)
+                self.assertEqual(self.index.first_below(start, threshold), start + below[0] if below.size else -1)
+                self.assertEqual(self.index.first_above(start, threshold), start + above[0] if above.size else -1)
+        self.assertEqual(self.index.first_below(0, np.nanmin(self.values) - 1), -1)
+        self.assertEqual(self.index.first_above(0, self.values[0], end=0), -1)
+
+    def test_support_resistance(self):
+        """
+        Testet Support und Widerstand über den Bereichsindex gegen die Berechnung am DataFrame
+        """
+        data = pd.DataFrame({'High': self.values + 1, 'Low': self.values - 1})
+        range_index = PriceRangeIndex(data)
+        self.assertEqual(DataProcessor.calculate_support_resistance(data, 20, range_index=range_index),
+                         DataProcessor.calculate_support_resistance(data, 20))
+        support, resistance = DataProcessor.calculate_support_resistance(data, 50, end=400, range_index=range_index)
+        self.assertEqual(support, data['Low'].iloc[350:400].min())
+        self.assertEqual(resistance, data['High'].iloc[350:400].max())
+
+    def test_backtest_engine_exits(self):
+        """
+        Testet Ausstiege der BacktestEngine über Verkaufssignal, Stop-Loss und Take-Profit
+        """
+        class FixedStrategy:
+            def generate_signals(self, data):
+                return pd.Series([0, 1, 0, 0, -1, 1, 0, 0, 1, 0, 0, 0], index=data.index)
+
+            def calculate_stop_loss(self, data, i):
+                return data['Close'].iloc[i] * 0.95
+
+            def calculate_take_profit(self, data, i):
+                return data['Close'].iloc[i] * 1.05
+
+        close = [100, 100, 101, 102, 103, 100, 99, 94, 100, 102, 106, 90]
+        data = pd.DataFrame({'Close': close}, index=pd.date_range('2024-01-01', periods=len(close), freq='D'))
+        results = BacktestEngine(initial_capital=1000.0, commission=0.0).run(data, FixedStrategy())
+
+        trades = results['trades']
+        self.assertEqual([t['exit_date'].day for t in trades], [5, 8, 11])
+        self.assertNotIn('exit_reason', trades[0])
+        self.assertEqual([t.get('exit_reason') for t in trades[1:]], ['stop_loss', 'take_profit'])
+        self.assertAlmostEqual(trades[1]['exit_price'], 95.0)
+        self.assertEqual(results['positions'].iloc[6], trades[1]['shares'])
+        self.assertEqual(results['positions'].iloc[7], 0)
+        self.assertAlmostEqual(results['equity_curve'].iloc[-1], results['equity_curve'].iloc[10])
+
+    def test_strategy_backtest_short(self):
+        """
+        Testet den gemeinsamen Strategie-Backtest mit Short-Trades und Schließung am Ende
+        """
+        strategy = StrategyFactory.create_strategy('rsi', {'sl_pct': 2.0, 'tp_pct': 4.0})
+        signals = [0, -1, 0, 0, 1, 0, 0]
+        strategy.generate_signals = lambda df: df.assign(signal=signals)
+        close = [100, 100, 99, 95, 101, 102, 103]
+        df = pd.DataFrame({'close': close}, index=pd.date_range('2024-01-01', periods=len(close), freq='D'))
+
+        results = strategy.backtest(df, initial_capital=1000.0)
+        trades = results['trades']
+        self.assertEqual([(t['type'], t['exit_reason']) for t in trades],
+                         [('short', 'take_profit'), ('long', 'end_of_backtest')])
+        self.assertAlmostEqual(trades[0]['exit_price'], 96.0)
+        self.assertEqual(len(results['equity_curve']), len(df))
+
+class TestIntrabarFill(unittest.TestCase):
+    """
+    Tests für die Intrabar-Auflösung von Stop-Loss und Take-Profit
+    """
+
+    class MinuteSource:
+        """
+        Datenquelle, die Minutendaten nur für angefragte Zeiträume liefert
+        """
+
+        def __init__(self, minutes):
+            self.minutes = minutes
+            self.calls = []
+
+        def get_data(self, symbol, timeframe, start_date=None, end_date=None):
+            self.calls.append((symbol, timeframe, start_date, end_date))
+            return self.minutes[(self.minutes.index >= start_date) & (self.minutes.index <= end_date)]
+
+    def setUp(self):
+        # Tag 3 berührt Stop-Loss (95) und Take-Profit (105), der Take-Profit fällt zuerst
+        index = pd.date_range('2024-01-01', periods=5, freq='D')
+        self.data = pd.DataFrame({
+            'Open': [100, 100, 100, 100, 100],
+            'High': [101, 101, 106, 101, 101],
+            'Low': [99, 99, 94, 99, 99],
+            'Close': [100, 100, 100, 100, 100],
+        }, index=index)
+        minute_index = pd.date_range('2024-01-03', periods=3, freq='1min')
+        self.minutes = pd.DataFrame({'high': [101, 106, 100], 'low': [99, 100, 94]}, index=minute_index)
+
+    def test_find_ambiguous_bars(self):
+        """
+        Testet die vektorisierte Erkennung mehrdeutiger Bars für Long- und Short-Positionen
+        """
+        self.assertEqual(find_ambiguous_bars(self.data, 95, 105).tolist(), [2])
+        self.assertEqual(find_ambiguous_bars(self.data, 105, 95, direction=-1).tolist(), [2])
+        self.assertEqual(find_ambiguous_bars(self.data, 90, 105).tolist(), [])
+
+    def test_resolve_loads_only_ambiguous_bars(self):
+        """
+        Testet, dass nur der Zeitraum des mehrdeutigen Bars geladen und zwischengespeichert wird
+        """
+        source = self.MinuteSource(self.minutes)
+        resolver = IntrabarFillResolver(source, 'NQ=F')
+        self.assertEqual(resolver.resolve(self.data, 2, 95, 105), 'take_profit')
+        self.assertEqual(resolver.resolve(self.data, 2, 105, 95, direction=-1), 'stop_loss')
+        self.assertEqual(resolver.resolve(self.data, 2, 95, 107), 'stop_loss')
+        self.assertEqual(len(source.calls), 1)
+        self.assertEqual(source.calls[0][2:], (pd.Timestamp('2024-01-03'), pd.Timestamp('2024-01-04')))
+        self.assertEqual(resolver.hits, 2)
+
+        # Ohne Intrabar-Daten wird konservativ der Stop-Loss angenommen
+        self.assertEqual(resolver.resolve(self.data, 4, 95, 105), 'stop_loss')
+
+    def test_window_source_fetched_once(self):
+        """
+        Testet, dass Quellen ohne Zeitraumabfragen (Yahoo) einmal ohne Zeitraum abgefragt werden
+        """
+        from data.circuit_breaker import YAHOO_API, get_circuit_breaker
+        from data.data_source import YahooFinanceDataSource
+
+        class MinuteApi:
+            def __init__(self):
+                self.queries = []
+
+            def call_api(self, api, query):
+                # Zwei Stunden Minutendaten ab 2024-01-02 15:00 UTC; in der ersten Stunde wird
+                # zuerst der Take-Profit erreicht, in der zweiten zuerst der Stop-Loss
+                self.queries.append(query)
+                high, low = [101.0] * 120, [99.0] * 120
+                high[10], low[20], low[70], high[80] = 106.0, 94.0, 94.0, 106.0
+                return {'chart': {'result': [{
+                    'timestamp': [1704207600 + 60 * i for i in range(120)],
+                    'indicators': {'quote': [{'open': [100.0] * 120, 'high': high, 'low': low,
+                                              'close': [100.0] * 120, 'volume': [1000] * 120}]},
+                }]}}
+
+        get_circuit_breaker(YAHOO_API).record_success()
+        api = MinuteApi()
+        resolver = IntrabarFillResolver(YahooFinanceDataSource(cache_enabled=False, api_client=api), 'AAPL')
+        self.assertFalse(resolver.range_queries)
+        # Yahoo-Daten liegen zeitzonenfrei in lokaler Zeit vor (10:00 New York = 15:00 UTC)
+        index = pd.date_range('2024-01-02 10:00', periods=3, freq='1h')
+        data = pd.DataFrame({'High': [106.0] * 3, 'Low': [94.0] * 3}, index=index)
+
+        self.assertEqual(resolver.resolve(data, 0, 95, 105), 'take_profit')
+        self.assertEqual(resolver.resolve(data, 1, 95, 105), 'stop_loss')
+        self.assertEqual(resolver.resolve(data, 1, 105, 95, direction=-1), 'take_profit')
+        # Außerhalb des Fensters wird konservativ der Stop-Loss angenommen
+        self.assertEqual(resolver.resolve(data, 2, 95, 105), 'stop_loss')
+        self.assertEqual(len(api.queries), 1)
+        self.assertEqual(resolver.fetches, 1)
+
+    def test_engines_use_resolver(self):
+        """
+        Testet BacktestEngine und Strategie-Backtest mit und ohne Resolver
+        """
+        class BuyOnce:
+            def generate_signals(self, data):
+                return pd.Series([0, 1, 0, 0, 0], index=data.index)
+
+            def calculate_stop_loss(self, data, i):
+                return 95.0
+
+            def calculate_take_profit(self, data, i):
+                return 105.0
+
+        engine = BacktestEngine(initial_capital=1000.0, commission=0.0)
+        self.assertEqual(engine.run(self.data, BuyOnce())['trades'], [])
+        resolver = IntrabarFillResolver(self.MinuteSource(self.minutes), 'NQ=F')
+        trades = engine.run(self.data, BuyOnce(), fill_resolver=resolver)['trades']
+        self.assertEqual([(t['exit_reason'], t['exit_price']) for t in trades], [('take_profit', 105.0)])
+
+        strategy = StrategyFactory.create_strategy('rsi', {'sl_pct': 5.0, 'tp_pct': 5.0})
+        strategy.generate_signals = lambda df: df.assign(signal=[0, 1, 0, 0, 0])
+        df = self.data.rename(columns=str.lower)
+        self.assertEqual(strategy.backtest(df)['trades'][0]['exit_reason'], 'end_of_backtest')
+        trades = strategy.backtest(df, fill_resolver=resolver)['trades']
+        self.assertEqual([t['exit_reason'] for t in trades], ['take_profit'])
+
+class TestResultStore(unittest.TestCase):
+    """
+    Tests für den persistenten Ergebnisspeicher
+    """
+
+    def setUp(self):
+        import tempfile
+        from strategy.example_strategies import MovingAverageCrossover
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.store = BacktestResultStore(os.path.join(self.temp_dir.name, 'results.sqlite'))
+        self.strategy_class = MovingAverageCrossover
+
+        rng = np.random.default_rng(11)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 600)))
+        self.data = pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+                                  'Volume': 1000.0}, index=pd.date_range('2024-01-01', periods=600, freq='h'))
+        self.data.attrs['symbol'] = 'TEST'
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_repeated_backtest_is_loaded(self):
+        """
+        Testet, dass ein wiederholter Backtest identisch aus dem Speicher geladen wird
+        """
+        engine = BacktestEngine(result_store=self.store)
+        first = engine.run(self.data, self.strategy_class(short_window=10, long_window=30))
+        second = engine.run(self.data, self.strategy_class(short_window=10, long_window=30))
+        self.assertEqual((self.store.hits, self.store.misses), (1, 1))
+        pd.testing.assert_series_equal(first['equity_curve'], second['equity_curve'])
+        pd.testing.assert_frame_equal(first['data'], second['data'])
+        self.assertEqual(first['trades'], second['trades'])
+        self.assertEqual(first['metrics'], second['metrics'])
+
+        # Andere Parameter, Engine-Konfiguration oder Daten ergeben neue Schlüssel
+        engine.run(self.data, self.strategy_class(short_window=5, long_window=30))
+        BacktestEngine(commission=0.002, result_store=self.store).run(self.data, self.strategy_class(10, 30))
+        engine.run(self.data.iloc[:-1], self.strategy_class(short_window=10, long_window=30))
+        self.assertEqual(self.store.count(), 4)
+
+    def test_sweep_skips_stored_points_and_query(self):
+        """
+        Testet, dass Sweeps gespeicherte Kombinationen überspringen, und die Abfrage nach Metrik
+        """
+        engine = BacktestEngine(result_store=self.store)
+        grid = {'short_window': [5, 10], 'long_window': [30, 60]}
+        best_params, best_value, results = self.strategy_class().optimize(self.data, grid, backtest_engine=engine)
+        self.assertEqual(self.store.count(), 4)
+
+        hits = self.store.hits
+        again = self.strategy_class().optimize(self.data, grid, backtest_engine=engine)
+        self.assertEqual(self.store.hits - hits, 4)
+        self.assertEqual(again[:2], (best_params, best_value))
+
+        top = self.store.query_top('total_return', symbol='TEST', limit=2)
+        self.assertEqual(len(top), 2)
+        self.assertEqual(top['total_return'].iloc[0], best_value)
+        self.assertEqual(top['params'].iloc[0], {**best_params})
+        self.assertTrue(self.store.query_top('sharpe_ratio', symbol='OTHER').empty)
+        self.assertRaises(ValueError, self.store.query_top, 'num_trades; DROP TABLE')
+
+    def test_object_columns_are_not_stored(self):
+        """
+        Testet, dass Ergebnisse mit Objekt-Spalten nicht abgelegt werden und das Archiv nur die Spalten enthält
+        """
+        import io
+        from backtesting.result_store import _encode_series
+
+        engine = BacktestEngine()
+        results = engine.run(self.data, self.strategy_class(short_window=10, long_window=30))
+        blob = _encode_series(results, self.data)
+        with np.load(io.BytesIO(blob), allow_pickle=False) as arrays:
+            self.assertNotIn('allow_pickle', arrays.files)
+            self.assertEqual(arrays['equity_curve'].dtype, np.float64)
+
+        labelled = dict(results, data=results['data'].assign(label=np.where(results['data']['Close'] > 100, 'hoch', 'tief')))
+        labelled['data']['label'] = labelled['data']['label'].astype(object)
+        self.assertIsNone(_encode_series(labelled, self.data))
+        self.assertFalse(self.store.save('key', labelled, self.data, self.strategy_class(), {}))
+        self.assertEqual(self.store.count(), 0)
+
+class TestSweepCheckpoint(unittest.TestCase):
+    """
+    Tests für Checkpoints und das Fortsetzen von Parameter-Sweeps
+    """
+
+    def setUp(self):
+        import tempfile
+        from strategy.example_strategies import MovingAverageCrossover
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.strategy_class = MovingAverageCrossover
+        self.grid = {'short_window': [5, 10, 20], 'long_window': [30, 60]}
+
+        rng = np.random.default_rng(5)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 500)))
+        self.data = pd.DataFrame({'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+                                  'Volume': 1000.0}, index=pd.date_range('2024-01-01', periods=500, freq='h'))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_interrupted_sweep_resumes(self):
+        """
+        Testet, dass ein abgebrochener Sweep nur die fehlenden Kombinationen nachrechnet
+        """
+        class Interrupted(Exception):
+            pass
+
+        def stop_after_four(done, total, message):
+            if done == 4:
+                raise Interrupted()
+
+        expected = self.strategy_class().optimize(self.data, self.grid)
+        with self.assertRaises(Interrupted):
+            self.strategy_class().optimize(self.data, self.grid, checkpoint_dir=self.temp_dir.name,
+                                           progress_callback=stop_after_four)
+
+        status = list_sweeps(self.temp_dir.name)
+        self.assertEqual(len(status), 1)
+        self.assertEqual((status[0]['completed'], status[0]['total'], status[0]['finished']), (4, 6, False))
+
+        engine = BacktestEngine()
+        runs = []
+        run = engine.run
+        engine.run = lambda *args, **kwargs: runs.append(args) or run(*args, **kwargs)
+        resumed = self.strategy_class().optimize(self.data, self.grid, backtest_engine=engine,
+                                                 checkpoint_dir=self.temp_dir.name)
+        self.assertEqual(len(runs), 2)
+        self.assertEqual(resumed, expected)
+        self.assertTrue(list_sweeps(self.temp_dir.name)[0]['finished'])
+
+    def test_code_change_starts_new_sweep(self):
+        """
+        Testet, dass eine geänderte Code-Version nicht die Ergebnisse eines alten Sweeps übernimmt
+        """
+        from backtesting import result_store
+
+        self.strategy_class().optimize(self.data, self.grid, checkpoint_dir=self.temp_dir.name)
+        module = self.strategy_class.__module__
+        result_store.get_code_version(self.strategy_class())
+        original = result_store._code_versions[module]
+        try:
+            # Simuliert eine Änderung am Quelltext der Strategie
+            result_store._code_versions[module] = 'geaendert'
+            self.strategy_class().optimize(self.data, self.grid, checkpoint_dir=self.temp_dir.name)
+        finally:
+            result_store._code_versions[module] = original
+
+        status = list_sweeps(self.temp_dir.name)
+        self.assertEqual(len(status), 2)
+        self.assertTrue(all(entry['finished'] for entry in status))
+
+    def test_log_and_status(self):
+        """
+        Testet das Append-only-Log, unvollständige Zeilen sowie Durchsatz und Restzeit
+        """
+        spec = {'grid': {'a': [1, 2, 3, 4, 5]}}
+        checkpoint = SweepCheckpoint(spec, 5, self.temp_dir.name)
+        checkpoint.record(0, {'a': 1}, {'total_return': 0.1})
+        checkpoint.record(1, {'a': 2}, {'total_return': float('inf')})
+        with open(checkpoint.path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "result", "index": 2, "par')
+
+        reopened = SweepCheckpoint(spec, 5, self.temp_dir.name)
+        self.assertEqual(reopened.path, checkpoint.path)
+        self.assertTrue(reopened.is_done(1))
+        self.assertFalse(reopened.is_done(2))
+        self.assertEqual(reopened.get_result(1)['metrics']['total_return'], float('inf'))
+
+        # Der Durchsatz wird nur aus der fortgesetzten Sitzung geschätzt
+        reopened.record(2, {'a': 3}, {'total_return': 0.2})
+        self.assertIsNone(reopened.status()['throughput'])
+        reopened.record(3, {'a': 4}, {'total_return': 0.3})
+
+        status = get_sweep_status(checkpoint.path)
+        self.assertEqual((status['completed'], status['total'], status['finished']), (4, 5, False))
+        self.assertGreater(status['throughput'], 0)
+        self.assertAlmostEqual(status['eta_seconds'], 1 / status['throughput'])
+
+
+class TestIndicatorPipeline(unittest.TestCase):
+    """
+    Tests für die deklarative Indikator-Pipeline
+    """
+
+    def setUp(self):
+        rng = np.random.default_rng(9)
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 400)))
+        spread = np.abs(rng.normal(0, 0.5, 400))
+        self.data = pd.DataFrame({'Open': close, 'High': close + spread, 'Low': close - spread, 'Close': close,
+                                  'Volume': 1000.0}, index=pd.date_range('2024-01-01', periods=400, freq='h'))
+
+    def test_default_set_matches_single_indicators(self):
+        """
+        Testet, dass der Standardsatz den einzeln berechneten Indikatoren entspricht
+        """
+        result = DataProcessor.add_indicators(self.data)
+        macd, signal, hist = DataProcessor.calculate_macd(self.data)
+        middle, upper, lower = DataProcessor.calculate_bollinger_bands(self.data)
+        expected = {
+            'SMA_200': DataProcessor.calculate_sma(self.data, window=200),
+            'EMA_26': DataProcessor.calculate_ema(self.data, window=26),
+            'RSI_14': DataProcessor.calculate_rsi(self.data, window=14),
+            'MACD': macd, 'MACD_Signal': signal, 'MACD_Hist': hist,
+            'BB_Middle': middle, 'BB_Upper': upper, 'BB_Lower': lower,
+            'ATR_14': DataProcessor.calculate_atr(self.data, window=14),
+        }
+        for column, series in expected.items():
+            pd.testing.assert_series_equal(result[column], series, check_names=False)
+        self.assertEqual(list(result.columns[:5]), list(self.data.columns))
+
+    def test_subset_and_shared_nodes(self):
+        """
+        Testet die Auswahl einzelner Indikatoren und die einmalige Berechnung gemeinsamer Knoten
+        """
+        pipeline = IndicatorPipeline(['EMA_12', 'MACD', 'SMA_20', 'BB'])
+        self.assertEqual(pipeline.columns, ['EMA_12', 'MACD', 'MACD_Signal', 'MACD_Hist', 'SMA_20',
+                                            'BB_Middle', 'BB_Upper', 'BB_Lower'])
+        self.assertEqual(pipeline.order.count('ema:12'), 1)
+        self.assertEqual(pipeline.order.count('macd:12:26'), 1)
+        self.assertEqual(pipeline.order.count('sma:20'), 1)
+        self.assertNotIn('true_range', pipeline.order)
+
+        result = DataProcessor.add_indicators(self.data, indicators=['RSI_7', 'BB_10_1.5'])
+        self.assertEqual(list(result.columns[5:]), ['RSI_7', 'BB_Middle_10_1.5', 'BB_Upper_10_1.5',
+                                                    'BB_Lower_10_1.5'])
+        pd.testing.assert_series_equal(result['RSI_7'], DataProcessor.calculate_rsi(self.data, window=7),
+                                       check_names=False)
+
+        # Erneutes Anwenden ersetzt vorhandene Spalten statt sie zu duplizieren
+        again = DataProcessor.add_indicators(result, indicators=['RSI_7'])
+        self.assertEqual(list(again.columns).count('RSI_7'), 1)
+
+        with self.assertRaises(ValueError):
+            IndicatorPipeline(['VWAP'])
+
+
+class TestKernels(unittest.TestCase):
+    """
+    Tests für die rekursiven Rechenkerne und ihre Backends
+    """
+
+    def setUp(self):
+        self.backend = kernels.get_kernel_backend()
+        rng = np.random.default_rng(11)
+        self.values = 100 + np.cumsum(rng.normal(0, 1, 2000))
+        self.values[:3] = np.nan
+        self.values[700] = np.nan
+
+    def tearDown(self):
+        kernels.set_kernel_backend(self.backend)
+
+    def test_backends_match_reference_loop(self):
+        """
+        Testet, dass alle Backends dieselben Werte wie die Referenzschleife liefern
+        """
+        # Fehlende Werte vor dem ersten Wert, im Startfenster und danach
+        gaps = self.values.copy()
+        gaps[[5, 9]] = np.nan
+        backends = ['numpy'] + (['numba'] if kernels.NUMBA_AVAILABLE else [])
+        for backend in backends:
+            kernels.set_kernel_backend(backend)
+            for values in (self.values, gaps):
+                for alpha, seed_window in [(2 / 13, 1), (1 / 14, 14), (2 / 27, 26)]:
+                    expected = kernels._ewma_loop(values, alpha, seed_window)
+                    np.testing.assert_allclose(kernels.ewma(values, alpha, seed_window), expected, rtol=1e-12)
+
+            # Der Startwert überspringt fehlende Werte im Startfenster
+            result = kernels.ewma([1.0, np.nan, 3.0, 4.0, 7.0], 1 / 3, 3)
+            np.testing.assert_allclose(result, [np.nan, np.nan, np.nan, 8 / 3, 8 / 3 * 2 / 3 + 7 / 3], rtol=1e-12)
+
+        # Ohne Startfenster entspricht der Kern ewm(adjust=False)
+        series = pd.Series(self.values[3:700])
+        np.testing.assert_allclose(kernels.ewma(series, 2 / 13), series.ewm(span=12, adjust=False).mean(),
+                                   rtol=1e-12)
+        self.assertTrue(np.isnan(kernels.ewma([1.0, 2.0], 0.5, 5)).all())
+
+        with self.assertRaises(ValueError):
+            kernels.set_kernel_backend('cuda')
+
+    def test_wilder_indicators(self):
+        """
+        Testet RSI und ATR nach Wilder sowie den EMA mit SMA-Startwert
+        """
+        data = pd.DataFrame({'Close': self.values[3:60]})
+        data['High'] = data['Close'] + 1.0
+        data['Low'] = data['Close'] - 1.0
+
+        rsi = DataProcessor.calculate_rsi(data, window=14, smoothing='wilder')
+        delta = data['Close'].diff().to_numpy()
+        gain, loss = np.clip(delta[1:15], 0, None).mean(), np.clip(-delta[1:15], 0, None).mean()
+        gain = (gain * 13 + max(delta[15], 0)) / 14
+        loss = (loss * 13 + max(-delta[15], 0)) / 14
+        self.assertTrue(rsi.iloc[:14].isna().all())
+        self.assertAlmostEqual(rsi.iloc[15], 100 - 100 / (1 + gain / loss))
+
+        atr = DataProcessor.calculate_atr(data, window=14, smoothing='wilder')
+        true_range = np.maximum(2.0, np.abs(np.diff(data['Close'].to_numpy())) + 1.0)
+        self.assertAlmostEqual(atr.iloc[13], np.concatenate(([2.0], true_range[:13])).mean())
+
+        ema = DataProcessor.calculate_ema(data, window=10, seed='sma')
+        self.assertTrue(ema.iloc[:9].isna().all())
+        self.assertAlmostEqual(ema.iloc[9], data['Close'].iloc[:10].mean())
+
+
+class TestSignalScanner(unittest.TestCase):
+    """
+    Tests für den Signal-Scanner über mehrere Symbole
+    """
+
+    def setUp(self):
+        from strategy.example_strategies import (BollingerBandsStrategy, MACDStrategy, MovingAverageCrossover,
+                                                 RSIStrategy)
+
+        self.strategies = [MovingAverageCrossover(5, 20), RSIStrategy(), MACDStrategy(), BollingerBandsStrategy()]
+        rng = np.random.default_rng(21)
+        index = pd.date_range('2024-01-01', periods=300, freq='5min')
+        self.data = {f"SYM{i}": pd.DataFrame({'Close': 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 300)))},
+                                             index=index) for i in range(20)}
+        # Ein Symbol ohne die letzten Bars, damit das Universum ausgerichtet werden muss
+        self.data['SYM0'] = self.data['SYM0'].iloc[:-5]
+
+    def expected_signals(self, data):
+        expected = set()
+        latest = max(df.index[-1] for df in data.values())
+        for symbol, df in data.items():
+            for strategy in self.strategies:
+                signals = strategy.generate_signals(df)
+                if signals.index[-1] == latest and signals['Signal'].iloc[-1]:
+                    expected.add((symbol, strategy.name, int(signals['Signal'].iloc[-1])))
+        return expected
+
+    def test_load_and_incremental_update(self):
+        """
+        Testet, dass Scan und inkrementelle Updates den Signalen der Einzelstrategien entsprechen
+        """
+        scanner = SignalScanner(self.strategies)
+        history = {symbol: df.iloc[:250] for symbol, df in self.data.items()}
+        result = scanner.load(history)
+        self.assertEqual(list(result.columns), ['symbol', 'strategy', 'signal', 'timestamp', 'close'])
+        self.assertEqual(set(zip(result['symbol'], result['strategy'], result['signal'])),
+                         self.expected_signals(history))
+
+        fired = 0
+        for bar in range(250, 280):
+            timestamp = self.data['SYM1'].index[bar]
+            closes = {symbol: df['Close'].iloc[bar] for symbol, df in self.data.items() if bar < len(df)}
+            result = scanner.update(closes, timestamp)
+            fired += len(result)
+            if bar % 3:
+                continue
+            current = {symbol: df.iloc[:bar + 1] for symbol, df in self.data.items()}
+            self.assertEqual(set(zip(result['symbol'], result['strategy'], result['signal'])),
+                             self.expected_signals(current))
+        self.assertGreater(fired, 0)
+
+    def test_invalid_usage(self):
+        """
+        Testet Fehler bei nicht unterstützten Strategien und Updates vor dem Laden
+        """
+        from strategy.strategy_base import Strategy
+
+        class CustomStrategy(Strategy):
+            def generate_signals(self, data):
+                return data
+
+        with self.assertRaises(ValueError):
+            SignalScanner([CustomStrategy()])
+        with self.assertRaises(RuntimeError):
+            SignalScanner(self.strategies).update({'SYM1': 100.0})
+
+    def test_missing_bars_do_not_fire(self):
+        """
+        Testet, dass Symbole ohne Bar im ausgewerteten Fenster keine Signale auslösen
+        """
+        index = pd.date_range('2024-01-01', periods=100, freq='5min')
+        up = pd.DataFrame({'Close': np.linspace(100, 200, 100)}, index=index)
+        scanner = SignalScanner(self.strategies)
+
+        # B hat keinen Bar zum letzten Zeitstempel
+        result = scanner.load({'A': up, 'B': up.iloc[:-1]})
+        self.assertNotIn('B', set(result['symbol']))
+        self.assertFalse(result['close'].isna().any())
+
+        for closes in ({'A': 201.0}, {'A': 202.0, 'B': 150.0}, {'A': 203.0, 'B': 90.0}):
+            result = scanner.update(closes, index[-1])
+            self.assertNotIn('B', set(result['symbol']))
+            self.assertFalse(result['close'].isna().any())
+
+    def test_condition_interface(self):
+        """
+        Testet, dass alle Bedingungen die abstrakte Schnittstelle des Scanners implementieren
+        """
+        from strategy.scanner import _WindowCondition
+
+        with self.assertRaises(TypeError):
+            _WindowCondition()
+        for _, condition in SignalScanner(self.strategies).conditions:
+            self.assertIsInstance(condition, _WindowCondition)
+
+
+class TestHttpClient(unittest.TestCase):
+    """
+    Tests für den gepoolten HTTP-Client und die Injektion der Clients in Datenquellen
+    """
+
+    def setUp(self):
+        import gzip
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        body = gzip.compress(json.dumps({'values': [{'close': '1.5'}]}).encode())
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                self.server.connections += 1
+
+            def do_GET(self):
+                self.server.paths.append(self.path)
+                self.send_response(200)
+                self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.server.connections = 0
+        self.server.paths = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connections_are_reused(self):
+        """
+        Testet Keep-alive, gzip-Dekodierung und die Umleitung auf den Stub-Server
+        """
+        client = HttpClient(pool_size=2, base_url=self.base_url)
+        for _ in range(5):
+            data = client.get_json("https://api.twelvedata.com/time_series", params={'symbol': 'NQ'})
+        client.close()
+
+        self.assertEqual(data, {'values': [{'close': '1.5'}]})
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(client.request_count, 5)
+        self.assertEqual(self.server.paths[-1], '/time_series?symbol=NQ')
+        self.assertIs(get_http_client(), get_http_client())
+
+    def test_injected_clients(self):
+        """
+        Testet, dass Datenquellen die übergebenen Clients verwenden
+        """
+        from data.data_source import YahooFinanceDataSource
+        from data.nq_integration import NQDataFetcher
+
+        class StubApiClient:
+            def __init__(self):
+                self.calls = []
+
+            def call_api(self, api, query):
+                self.calls.append((api, query['symbol']))
+                return {'chart': {'result': [{
+                    'timestamp': [1704099600, 1704186000],
+                    'indicators': {'quote': [{'open': [1.0, 2.0], 'high': [1.5, 2.5], 'low': [0.5, 1.5],
+                                              'close': [1.2, 2.2], 'volume': [10, 20]}]},
+                }]}}
+
+        api_client = StubApiClient()
+        source = YahooFinanceDataSource(cache_enabled=False, api_client=api_client)
+        data = source.get_data('AAPL', '1d')
+        self.assertEqual(api_client.calls, [('YahooFinance/get_stock_chart', 'AAPL')])
+        self.assertEqual(data['close'].tolist(), [1.2, 2.2])
+
+        import tempfile
+        http_client = HttpClient(base_url=self.base_url)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.assertIs(NQDataFetcher(cache_dir=cache_dir, http_client=http_client).http_client, http_client)
+        http_client.close()
+
+
+class TestSingleFlight(unittest.TestCase):
+    """
+    Tests für das Zusammenfassen gleichzeitiger Datenabrufe
+    """
+
+    def test_threads_share_one_call(self):
+        """
+        Testet, dass gleichzeitige Aufrufe mit demselben Schlüssel nur einen Abruf auslösen
+        """
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        group = SingleFlight()
+        calls = []
+        started = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return pd.DataFrame({'Close': [1.0, 2.0]})
+
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            futures = [executor.submit(group.do, 'AAPL_1d', fetch)]
+            started.wait()
+            futures += [executor.submit(group.do, 'AAPL_1d', fetch) for _ in range(5)]
+            results = [future.result() for future in futures]
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((group.executed, group.coalesced), (1, 5))
+        for result in results:
+            pd.testing.assert_frame_equal(result, results[0])
+        self.assertIsNot(results[1], results[0])
+
+        # Fehler werden an alle Wartenden weitergegeben, danach wird wieder neu abgerufen
+        def failing():
+            started.set()
+            time.sleep(0.2)
+            raise ValueError("upstream")
+
+        started.clear()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(group.do, 'AAPL_1d', failing)]
+            started.wait()
+            futures += [executor.submit(group.do, 'AAPL_1d', failing) for _ in range(2)]
+            for future in futures:
+                with self.assertRaises(ValueError):
+                    future.result()
+        self.assertEqual(len(group.do('AAPL_1d', fetch)), 2)
+
+    def test_processes_share_cache_directory(self):
+        """
+        Testet, dass Worker-Prozesse mit demselben Cache-Verzeichnis nur einmal abrufen
+        """
+        import multiprocessing
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as directory:
+            with multiprocessing.Pool(3) as pool:
+                results = pool.map(_single_flight_worker, [directory] * 3)
+            with open(os.path.join(directory, 'fetches.log')) as f:
+                fetches = f.read().split()
+
+        self.assertEqual(len(fetches), 1)
+        self.assertEqual(sorted(results), ['cache', 'cache', 'upstream'])
+
+    def test_data_source_coalesces_fetches(self):
+        """
+        Testet, dass gleichzeitige get_data-Aufrufe der Yahoo-Datenquelle einen API-Aufruf teilen
+        """
+        import threading
+        import time
+        from data.data_source import YahooFinanceDataSource
+
+        class SlowApiClient:
+            calls = 0
+
+            def call_api(self, api, query):
+                SlowApiClient.calls += 1
+                time.sleep(0.2)
+                return {'chart': {'result': [{
+                    'timestamp': [1704099600],
+                    'indicators': {'quote': [{'open': [1.0], 'high': [1.0], 'low': [1.0], 'close': [1.0],
+                                              'volume': [1]}]},
+                }]}}
+
+        source = YahooFinanceDataSource(cache_enabled=False, api_client=SlowApiClient())
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(source.get_data('MSFT', '1d')))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(SlowApiClient.calls, 1)
+        self.assertEqual([len(result) for result in results], [1, 1, 1, 1])
+
+
+class TestStaleWhileRevalidate(unittest.TestCase):
+    """
+    Tests für die Cache-Richtlinie mit Aktualisierung im Hintergrund
+    """
+
+    def test_policy_per_timeframe(self):
+        """
+        Testet Standardfenster, Überschreibungen und die Bewertung des Cache-Alters
+        """
+        from data import cache_policy
+
+        self.assertEqual(cache_policy.get_max_age('5m'), 3600)
+        self.assertEqual(cache_policy.get_max_age('1h'), 3600)
+        self.assertEqual(cache_policy.get_max_age('1wk'), 86400)
+        self.assertGreater(cache_policy.get_stale_ttl('1d'), cache_policy.get_stale_ttl('1m'))
+        self.assertEqual(cache_policy._parse_setting('1d=43200, 5m=300'), {'1d': 43200.0, '5m': 300.0})
+
+        cache_policy.set_cache_policy('7m', max_age=10, stale_ttl=20)
+        self.assertEqual(cache_policy.get_cache_state('7m', 5), cache_policy.FRESH)
+        self.assertEqual(cache_policy.get_cache_state('7m', 15), cache_policy.STALE)
+        self.assertEqual(cache_policy.get_cache_state('7m', 40), cache_policy.EXPIRED)
+        self.assertEqual(cache_policy.get_cache_state('7m', 15, max_age=60), cache_policy.FRESH)
+
+    def test_stale_data_served_and_refreshed(self):
+        """
+        Testet, dass veraltete Daten sofort geliefert und einmal im Hintergrund ersetzt werden
+        """
+        import tempfile
+        import threading
+        import time
+        from data.cache_policy import get_background_refresher
+        from data.data_fetcher import DataFetcher
+
+        release = threading.Event()
+
+        class SlowApiClient:
+            calls = 0
+
+            def call_api(self, api, query):
+                SlowApiClient.calls += 1
+                release.wait(5)
+                return {'chart': {'result': [{
+                    'timestamp': [1704099600, 1704186000],
+                    'indicators': {'quote': [{'open': [2.0, 3.0], 'high': [2.0, 3.0], 'low': [2.0, 3.0],
+                                              'close': [2.0, 3.0], 'volume': [1, 1]}],
+                                   'adjclose': [{'adjclose': [2.0, 3.0]}]},
+                }]}}
+
+        with tempfile.TemporaryDirectory() as directory:
+            fetcher = DataFetcher(cache_dir=directory, api_client=SlowApiClient())
+            cache_file = os.path.join(directory, 'MSFT_1d_1y.csv')
+            pd.DataFrame({'Close': [1.0]}, index=pd.to_datetime(['2024-01-01'])).to_csv(cache_file)
+            two_days_ago = time.time() - 2 * 86400
+            os.utime(cache_file, (two_days_ago, two_days_ago))
+
+            # Veraltete Daten kommen sofort, der Abruf läuft im Hintergrund
+            stale = fetcher.get_stock_data('MSFT', '1d', '1y')
+            self.assertEqual(stale['Close'].tolist(), [1.0])
+            self.assertEqual(fetcher.get_stock_data('MSFT', '1d', '1y')['Close'].tolist(), [1.0])
+
+            release.set()
+            deadline = time.time() + 5
+            while get_background_refresher().pending() and time.time() < deadline:
+                time.sleep(0.01)
+
+            self.assertEqual(SlowApiClient.calls, 1)
+            self.assertEqual(fetcher.get_stock_data('MSFT', '1d', '1y')['Close'].tolist(), [2.0, 3.0])
+            self.assertEqual(SlowApiClient.calls, 1)
+            self.assertEqual([name for name in os.listdir(directory) if name.endswith('.tmp')], [])
+
+            # Außerhalb des Stale-Fensters wird blockierend neu abgerufen
+            long_ago = time.time() - 30 * 86400
+            os.utime(cache_file, (long_ago, long_ago))
+            self.assertEqual(len(fetcher.get_stock_data('MSFT', '1d', '1y')), 2)
+            self.assertEqual(SlowApiClient.calls, 2)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """
+    Tests für Circuit Breaker und Last-known-good-Speicher
+    """
+
+    def tearDown(self):
+        """
+        Schließt den geteilten Breaker der Yahoo-Finance-API wieder
+        """
+        from data.circuit_breaker import YAHOO_API, get_circuit_breaker
+        get_circuit_breaker(YAHOO_API).record_success()
+
+    def test_state_transitions(self):
+        """
+        Testet Öffnen nach der Fehlerschwelle, Probeaufruf und Schließen
+        """
+        import time
+        from data.circuit_breaker import CircuitBreaker, CLOSED, HALF_OPEN, OPEN
+
+        breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=0.1)
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.rejected, 1)
+
+        # Nach der Wartezeit darf genau ein Probeaufruf durch; ein Fehler öffnet erneut
+        time.sleep(0.12)
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+        time.sleep(0.12)
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.failures, 0)
+
+    def test_last_known_good_served_while_open(self):
+        """
+        Testet, dass nach Ausfällen die letzten guten Daten ohne API-Aufruf geliefert werden
+        """
+        import time
+        from data.circuit_breaker import YAHOO_API, LastKnownGoodStore, get_circuit_breaker
+        from data.data_source import YahooFinanceDataSource
+
+        class FlakyApiClient:
+            calls = 0
+            failing = False
+
+            def call_api(self, api, query):
+                FlakyApiClient.calls += 1
+                if FlakyApiClient.failing:
+                    raise ConnectionError("upstream down")
+                return {'chart': {'result': [{
+                    'timestamp': [1704099600, 1704186000],
+                    'indicators': {'quote': [{'open': [1.0, 2.0], 'high': [1.0, 2.0], 'low': [1.0, 2.0],
+                                              'close': [1.0, 2.0], 'volume': [1, 1]}]},
+                }]}}
+
+        source = YahooFinanceDataSource(cache_enabled=False, api_client=FlakyApiClient())
+        good = source.get_data('LKGTEST', '1d')
+        self.assertEqual(good['close'].tolist(), [1.0, 2.0])
+
+        FlakyApiClient.failing = True
+        threshold = get_circuit_breaker(YAHOO_API).failure_threshold
+        for _ in range(threshold):
+            pd.testing.assert_frame_equal(source.get_data('LKGTEST', '1d'), good)
+        self.assertEqual(FlakyApiClient.calls, 1 + threshold)
+
+        # Breaker offen: kein weiterer API-Aufruf, Antwort direkt aus dem Speicher
+        start = time.perf_counter()
+        pd.testing.assert_frame_equal(source.get_data('LKGTEST', '1d'), good)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(FlakyApiClient.calls, 1 + threshold)
+
+        # Speicher ist begrenzt und liefert Kopien
+        store = LastKnownGoodStore(max_entries=2)
+        for key in ('a', 'b', 'c'):
+            store.put(key, good)
+        self.assertIsNone(store.get('a'))
+        self.assertIsNot(store.get('c'), store.get('c'))
+
+    def test_missing_symbols_do_not_open(self):
+        """
+        Testet, dass unbekannte Symbole den Breaker nicht öffnen, Ausfälle des Upstreams aber schon
+        """
+        import requests
+        from data.circuit_breaker import CLOSED, OPEN, YAHOO_API, get_circuit_breaker, is_upstream_failure
+        from data.data_source import YahooFinanceDataSource
+        from data.history_loader import TwelveDataError
+
+        class ApiClient:
+            error = None
+
+            def call_api(self, api, query):
+                if self.error is not None:
+                    raise self.error
+                return {'chart': {'result': None, 'error': {'code': 'Not Found', 'description': 'No data found'}}}
+
+        breaker = get_circuit_breaker(YAHOO_API)
+        client = ApiClient()
+        source = YahooFinanceDataSource(cache_enabled=False, api_client=client)
+        for i in range(breaker.failure_threshold + 2):
+            source.get_data(f'BADTICKER{i}', '1d')
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.failures, 0)
+
+        response = requests.Response()
+        response.status_code = 404
+        client.error = requests.HTTPError("404 Client Error", response=response)
+        for i in range(breaker.failure_threshold):
+            source.get_data(f'BADTICKER{i}', '1d')
+        self.assertEqual(breaker.state, CLOSED)
+
+        client.error = requests.ConnectTimeout("connect timeout")
+        for i in range(breaker.failure_threshold):
+            source.get_data(f'BADTICKER{i}', '1d')
+        self.assertEqual(breaker.state, OPEN)
+
+        response.status_code = 503
+        self.assertTrue(is_upstream_failure(requests.HTTPError("503 Server Error", response=response)))
+        self.assertTrue(is_upstream_failure(TimeoutError()))
+        self.assertFalse(is_upstream_failure(TwelveDataError("symbol not found", 400)))
+        self.assertFalse(is_upstream_failure(KeyError('chart')))
+
+    def test_fallback_data_generated_once(self):
+        """
+        Testet, dass synthetische Fallback-Daten konsistent sind und nur einmal erzeugt werden
+        """
+        from dashboard.error_handler import ErrorHandler
+
+        first = ErrorHandler.get_fallback_data("Sonstige", "1h")
+        second = ErrorHandler.get_fallback_data("Sonstige", "1h")
+        pd.testing.assert_frame_equal(first, second)
+        self.assertIsNot(first, second)
+        self.assertGreater(len(first), 0)
+        self.assertTrue((first['High'] >= first[['Open', 'Close']].max(axis=1)).all())
+        self.assertTrue((first['Low'] <= first[['Open', 'Close']].min(axis=1)).all())
+
+class TestHistoryLoader(unittest.TestCase):
+    """
+    Tests für den paginierten Twelve-Data-Loader gegen einen lokalen Fake-Server
+    """
+
+    def setUp(self):
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import parse_qs, urlsplit
+
+        origin = pd.Timestamp('2024-01-01')
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                query = {key: values[0] for key, values in parse_qs(urlsplit(self.path).query).items()}
+                with self.server.lock:
+                    self.server.requests += 1
+                    rate_limited = self.server.requests == 1
+                if rate_limited:
+                    payload = {'code': 429, 'message': 'API credits exhausted', 'status': 'error'}
+                else:
+                    # Wie Twelve Data: Start und Ende inklusive, neueste Bars zuerst
+                    index = pd.date_range(query['start_date'], query['end_date'], freq='1min')
+                    index = index[-int(query['outputsize']):][::-1]
+                    minutes = (index - origin) // pd.Timedelta(minutes=1)
+                    payload = {'values': [{'datetime': str(ts), 'open': str(m), 'high': str(m + 1),
+                                           'low': str(m - 1), 'close': str(m), 'volume': '10'}
+                                          for ts, m in zip(index, minutes)], 'status': 'ok'}
+                    if not len(index):
+                        payload = {'code': 400, 'message': 'No data is available on the specified dates.',
+                                   'status': 'error'}
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.server.requests = 0
+        self.server.lock = threading.Lock()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.client = HttpClient(pool_size=4, base_url=f"http://127.0.0.1:{self.server.server_address[1]}")
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _loader(self):
+        from data.history_loader import RateLimiter, TwelveDataHistoryLoader
+        return TwelveDataHistoryLoader(api_key='test', http_client=self.client, max_workers=4,
+                                       rate_limiter=RateLimiter(1000, per=1.0), page_size=100)
+
+    def test_load_merges_pages(self):
+        """
+        Testet Aufteilung, parallelen Abruf, Wiederholung nach Rate-Limit und Deduplizierung
+        """
+        loader = self._loader()
+        windows = loader.split_windows('1m', '2024-01-01', '2024-01-01 16:40')
+        self.assertEqual(len(windows), 11)
+        self.assertEqual(windows[0], (pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-01 01:39')))
+        self.assertEqual(windows[-1][1], pd.Timestamp('2024-01-01 16:40'))
+
+        df = loader.load('1m', '2024-01-01', '2024-01-01 16:40')
+        self.assertEqual(self.server.requests, 12)
+        self.assertEqual(list(df.columns), ['Open', 'High', 'Low', 'Close', 'Volume'])
+        self.assertEqual(len(df), 1001)
+        self.assertTrue(df.index.is_monotonic_increasing and df.index.is_unique)
+        self.assertEqual(df['Close'].tolist(), list(range(1001)))
+
+        # Fenster ohne Daten ergeben einen leeren DataFrame statt eines Fehlers
+        self.assertTrue(loader.fetch_window('1m', '2024-01-02', '2024-01-01').empty)
+        self.assertTrue(loader.load('1m', '2024-01-02', '2024-01-01').empty)
+        with self.assertRaises(ValueError):
+            loader.split_windows('7m', '2024-01-01', '2024-01-02')
+
+    def test_backfill_extends_cache_file(self):
+        """
+        Testet, dass backfill die vorhandene Cache-Datei ergänzt
+        """
+        import tempfile
+
+        loader = self._loader()
+        with tempfile.TemporaryDirectory() as directory:
+            cache_file = os.path.join(directory, 'NQ_Futures_1m_1mo.csv')
+            existing = pd.DataFrame({'Open': [-5.0, -1.0], 'High': [0.0, 0.0], 'Low': [0.0, 0.0],
+                                     'Close': [-5.0, -1.0], 'Volume': [1.0, 1.0]},
+                                    index=pd.DatetimeIndex(['2023-12-31 23:55', '2024-01-01 00:00'], name='datetime'))
+            existing.to_csv(cache_file)
+
+            loader.backfill('1m', '2024-01-01', '2024-01-01 03:00', cache_file)
+            merged = pd.read_csv(cache_file, index_col=0, parse_dates=True)
+
+        self.assertEqual(len(merged), 182)
+        self.assertEqual(merged['Close'].iloc[0], -5.0)
+        # Der neu geladene Bar ersetzt den vorhandenen
+        self.assertEqual(merged.loc['2024-01-01 00:00', 'Close'], 0.0)
+
+    def test_rate_limiter_spaces_requests(self):
+        """
+        Testet, dass der Rate-Limiter nach dem Burst die Anfragen verteilt
+        """
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        from data.history_loader import RateLimiter
+
+        limiter = RateLimiter(2, per=0.2)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(executor.map(lambda _: limiter.acquire(), range(6)))
+        self.assertGreaterEqual(time.perf_counter() - start, 0.35)
+
+class TestTimestamps(unittest.TestCase):
+    """
+    Tests für die Normalisierung von Zeitstempeln und Spaltennamen
+    """
+
+    def test_epoch_to_index(self):
+        from data.timestamps import epoch_to_index
+
+        # 2024-01-01 09:00 UTC und 2024-07-01 13:30 UTC (Winter- und Sommerzeit)
+        index = epoch_to_index([1704099600, 1719840600, None], 'America/New_York', name='date')
+        self.assertIsNone(index.tz)
+        self.assertEqual(index.name, 'date')
+        self.assertEqual(index[0], pd.Timestamp('2024-01-01 04:00'))
+        self.assertEqual(index[1], pd.Timestamp('2024-07-01 09:30'))
+        self.assertTrue(pd.isna(index[2]))
+        self.assertEqual(epoch_to_index([1704099600], 'UTC')[0], pd.Timestamp('2024-01-01 09:00'))
+        self.assertEqual(len(epoch_to_index([])), 0)
+
+    def test_symbol_timezone(self):
+        from data.timestamps import DEFAULT_TIMEZONE, get_symbol_timezone
+
+        self.assertEqual(get_symbol_timezone('AAPL'), 'America/New_York')
+        self.assertEqual(get_symbol_timezone('NQ=F'), 'America/New_York')
+        self.assertEqual(get_symbol_timezone('BTC-USD'), 'UTC')
+        self.assertEqual(get_symbol_timezone(), DEFAULT_TIMEZONE)
+
+    def test_normalize_frame(self):
+        from data.timestamps import normalize_frame
+
+        # Wie yfinance: zeitzonenbehafteter Index und 'Stock Splits'
+        index = pd.date_range('2024-03-08 14:30', periods=3, freq='1D', tz='UTC')[::-1]
+        df = pd.DataFrame({'Open': [1.0, 2.0, 3.0], 'Close': [1.5, 2.5, 3.5],
+                           'Stock Splits': [0.0, 0.0, 0.0]}, index=index)
+
+        result = normalize_frame(df, 'America/New_York')
+        self.assertEqual(list(result.columns), ['Open', 'Close', 'Splits'])
+        self.assertIsNone(result.index.tz)
+        self.assertTrue(result.index.is_monotonic_increasing)
+        # Zeitumstellung am 10.03.: 09:30 vorher, 10:30 danach
+        self.assertEqual(list(result.index.strftime('%m-%d %H:%M')), ['03-08 09:30', '03-09 09:30', '03-10 10:30'])
+        self.assertEqual(result['Open'].tolist(), [3.0, 2.0, 1.0])
+
+        lower = normalize_frame(df.rename(columns={'Open': 'open'}), 'UTC', lowercase=True)
+        self.assertEqual(list(lower.columns), ['open', 'close', 'splits'])
+        self.assertEqual(lower.index[0], pd.Timestamp('2024-03-08 14:30'))
+
+    def test_normalize_index_mixed_offsets(self):
+        from data.timestamps import normalize_index
+
+        index = normalize_index(pd.Index(['2024-03-10 01:00-05:00', '2024-03-10 03:00-04:00']))
+        self.assertEqual(list(index), [pd.Timestamp('2024-03-10 01:00'), pd.Timestamp('2024-03-10 03:00')])
+        naive = pd.DatetimeIndex(['2024-01-02 09:30'])
+        self.assertTrue(normalize_index(naive).equals(naive))
+
+
+class TestOHLCVSchema(unittest.TestCase):
+    """
+    Tests für das kanonische OHLCV-Schema und die Sichten in beiden Schreibweisen
+    """
+
+    def setUp(self):
+        index = pd.date_range('2024-01-02 14:30', periods=4, freq='1h', tz='UTC')
+        self.raw = pd.DataFrame({
+            'Open': [1, 2, 3, 4],
+            'High': [2.0, 3.0, 4.0, 5.0],
+            'Low': [0.5, 1.5, 2.5, 3.5],
+            'Close': [1.5, 2.5, 3.5, 4.5],
+            'Volume': [100.0, np.nan, 300.4, 400.0],
+            'Adj Close': [1.4, 2.4, 3.4, 4.4],
+        }, index=index)
+
+    def test_to_ohlcv(self):
+        from data.ohlcv import OHLCV_COLUMNS, is_ohlcv, to_ohlcv
+
+        df = to_ohlcv(self.raw)
+        self.assertEqual(tuple(df.columns), OHLCV_COLUMNS + ('adj_close',))
+        self.assertEqual(df['open'].dtype, np.float64)
+        self.assertEqual(df['volume'].dtype, np.int64)
+        self.assertEqual(df['volume'].tolist(), [100, 0, 300, 400])
+        self.assertEqual(df.index.name, 'date')
+        self.assertIsNone(df.index.tz)
+        self.assertEqual(df.index[0], pd.Timestamp('2024-01-02 09:30'))
+        self.assertTrue(is_ohlcv(df))
+        # Bereits kanonische Daten werden ohne Kopie zurückgegeben
+        self.assertIs(to_ohlcv(df), df)
+
+        compact = to_ohlcv(self.raw, price_dtype='float32')
+        self.assertEqual(compact['close'].dtype, np.float32)
+
+    def test_date_column(self):
+        from data.ohlcv import to_ohlcv
+
+        df = self.raw.tz_localize(None).reset_index(names='date')[::-1]
+        result = to_ohlcv(df)
+        self.assertNotIn('date', result.columns)
+        self.assertTrue(result.index.is_monotonic_increasing)
+
+        # Eine 'date'-Spalte neben dem DatetimeIndex entfällt
+        duplicated = self.raw.tz_localize(None)
+        duplicated['date'] = duplicated.index
+        self.assertNotIn('date', to_ohlcv(duplicated).columns)
+
+    def test_schema_errors(self):
+        from data.ohlcv import OHLCVSchemaError, to_ohlcv
+
+        with self.assertRaises(OHLCVSchemaError):
+            to_ohlcv(self.raw.drop(columns='Low'))
+        with self.assertRaises(OHLCVSchemaError):
+            to_ohlcv(self.raw.reset_index(drop=True).set_axis(['a', 'b', 'c', 'd']))
+        with self.assertRaises(OHLCVSchemaError):
+            to_ohlcv(self.raw, price_dtype='int64')
+
+    def test_views_share_data(self):
+        from data.ohlcv import lower_view, title_view, to_ohlcv
+
+        df = to_ohlcv(self.raw)
+        title = title_view(df)
+        self.assertEqual(list(title.columns), ['Open', 'High', 'Low', 'Close', 'Volume', 'Adj Close'])
+        self.assertTrue(np.shares_memory(title['Close'].to_numpy(), df['close'].to_numpy()))
+        self.assertEqual(list(df.columns), ['open', 'high', 'low', 'close', 'volume', 'adj_close'])
+
+        lower = lower_view(title)
+        self.assertEqual(list(lower.columns), list(df.columns))
+        self.assertTrue(np.shares_memory(lower['open'].to_numpy(), df['open'].to_numpy()))
+
+    def test_mock_data_is_canonical(self):
+        from dashboard.chart_utils import generate_mock_data
+        from data.ohlcv import is_ohlcv
+
+        df = generate_mock_data('AAPL', '1d')
+        self.assertTrue(is_ohlcv(df))
+        self.assertNotIn('date', df.columns)
+
+
+class TestDiskCache(unittest.TestCase):
+    """
+    Tests für den größenbegrenzten Daten-Cache mit SQLite-Index
+    """
+
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.TemporaryDirectory()
+        self.df = pd.DataFrame({'close': np.arange(50, dtype=float)},
+                               index=pd.date_range('2024-01-01', periods=50, name='date'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_index_metadata(self):
+        cache = CacheManager(self.directory.name)
+        self.assertIsNone(cache.get_cache_age('AAPL_1d'))
+        self.assertFalse(cache.is_cache_valid('AAPL_1d'))
+
+        self.assertTrue(cache.save_to_cache('AAPL_1d', self.df, ttl=3600))
+        entry = cache.index.get('AAPL_1d')
+        self.assertEqual(entry.size, os.path.getsize(cache.get_cache_file_path('AAPL_1d')))
+        self.assertEqual(entry.ttl, 3600)
+        self.assertLess(cache.get_cache_age('AAPL_1d'), 5)
+        self.assertTrue(cache.is_cache_valid('AAPL_1d'))
+        self.assertEqual([name for name in os.listdir(self.directory.name) if name.endswith('.tmp')], [])
+
+        # Ein anderer Prozess sieht denselben Index
+        self.assertEqual(CacheManager(self.directory.name).get_from_cache('AAPL_1d')['close'].tolist(),
+                         self.df['close'].tolist())
+
+        # Von außen gelöschte Dateien werden als Fehltreffer behandelt und aus dem Index entfernt
+        os.remove(entry.path)
+        self.assertIsNone(cache.get_from_cache('AAPL_1d'))
+        self.assertIsNone(cache.index.get('AAPL_1d'))
+
+    def test_lru_eviction(self):
+        import time
+
+        cache = CacheManager(self.directory.name)
+        cache.save_to_cache('a', self.df)
+        size = cache.index.get('a').size
+        cache.max_bytes = 2 * size
+        cache.save_to_cache('b', self.df)
+        time.sleep(0.01)
+
+        # Zugriff auf 'a' macht 'b' zum am längsten nicht verwendeten Eintrag
+        cache.get_from_cache('a')
+        cache.save_to_cache('c', self.df)
+        self.assertIsNone(cache.index.get('b'))
+        self.assertFalse(os.path.exists(cache.get_cache_file_path('b')))
+        self.assertIsNotNone(cache.get_from_cache('a'))
+        self.assertIsNotNone(cache.get_from_cache('c'))
+        self.assertLessEqual(cache.index.total_size(), cache.max_bytes)
+
+    def test_expired_entries_evicted_first(self):
+        cache = CacheManager(self.directory.name)
+        cache.save_to_cache('expired', self.df, ttl=0)
+        cache.save_to_cache('fresh', self.df, ttl=3600)
+        self.assertFalse(cache.is_cache_valid('expired'))
+
+        cache.max_bytes = cache.index.total_size() - 1
+        cache.save_to_cache('new', self.df, ttl=3600)
+        self.assertIsNone(cache.index.get('expired'))
+        self.assertIsNotNone(cache.index.get('new'))
+
+        self.assertTrue(cache.clear_cache())
+        self.assertEqual(cache.index.total_size(), 0)
+
+
+class TestMemoryCache(unittest.TestCase):
+    """
+    Tests für den In-Process-Cache (L1) vor dem Daten-Cache auf der Festplatte
+    """
+
+    def setUp(self):
+        self.df = pd.DataFrame({'close': np.arange(100, dtype=float), 'volume': np.arange(100)},
+                               index=pd.date_range('2024-01-01', periods=100, name='date'))
+
+    def test_read_only_entries(self):
+        from data.memory_cache import MemoryCache
+
+        cache = MemoryCache(max_bytes=1024 * 1024)
+        cache.put('a', self.df, ttl=60)
+        first = cache.get('a')
+        self.assertTrue(first.equals(self.df))
+        with self.assertRaises(ValueError):
+            first['close'].to_numpy()[0] = -1.0
+
+        # Neue Spalten und Zuweisungen betreffen nur die zurückgegebene Sicht
+        first['close'] = 0.0
+        first['extra'] = 1
+        second = cache.get('a')
+        self.assertEqual(second['close'].iloc[1], 1.0)
+        self.assertNotIn('extra', second.columns)
+
+    def test_byte_budget_and_ttl(self):
+        import time
+        from data.memory_cache import MemoryCache, frame_size
+
+        size = frame_size(self.df)
+        cache = MemoryCache(max_bytes=2 * size)
+        cache.put('a', self.df, ttl=60)
+        cache.put('b', self.df, ttl=60)
+        cache.get('a')
+        cache.put('c', self.df, ttl=60)
+
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        stats = cache.get_stats()
+        self.assertEqual(stats['entries'], 2)
+        self.assertEqual(stats['bytes'], 2 * size)
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual((stats['hits'], stats['misses']), (2, 1))
+        self.assertAlmostEqual(stats['hit_ratio'], 2 / 3)
+
+        cache.put('short', self.df.iloc[:10], ttl=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(cache.get('short'))
+        cache.put('huge', pd.concat([self.df] * 3), ttl=60)
+        self.assertIsNone(cache.get('huge'))
+
+    def test_data_source_serves_from_memory(self):
+        import tempfile
+        from data.data_source import MockDataSource
+        from data.memory_cache import get_memory_cache
+
+        with tempfile.TemporaryDirectory() as directory:
+            source = MockDataSource()
+            source.cache_manager = CacheManager(directory)
+            first = source.get_data('AAPL', '1d')
+
+            disk_reads = []
+            original = source.cache_manager.get_from_cache
+            source.cache_manager.get_from_cache = lambda key: disk_reads.append(key) or original(key)
+            hits = get_memory_cache().hits
+            second = source.get_data('AAPL', '1d')
+
+            self.assertEqual(disk_reads, [])
+            self.assertEqual(get_memory_cache().hits, hits + 1)
+            pd.testing.assert_frame_equal(first, second)
+
+            # Nach dem Leeren des Speichers wird wieder von der Festplatte gelesen
+            get_memory_cache().clear()
+            pd.testing.assert_frame_equal(source.get_data('AAPL', '1d'), first, check_freq=False)
+            self.assertEqual(len(disk_reads), 1)
+
+
 def run_tests():
     """
     Führt alle Tests aus
@@ -340,6 +2598,29 @@ def run_tests():
     test_suite.addTest(unittest.makeSuite(TestStrategies))
     test_suite.addTest(unittest.makeSuite(TestHelpers))
     test_suite.addTest(unittest.makeSuite(TestStatePreservation))
+    test_suite.addTest(unittest.makeSuite(TestLiveFeed))
+    test_suite.addTest(unittest.makeSuite(TestJobQueue))
+    test_suite.addTest(unittest.makeSuite(TestProductionServer))
+    test_suite.addTest(unittest.makeSuite(TestChartDataCache))
+    test_suite.addTest(unittest.makeSuite(TestBarPyramid))
+    test_suite.addTest(unittest.makeSuite(TestResampler))
+    test_suite.addTest(unittest.makeSuite(TestTradingCalendar))
+    test_suite.addTest(unittest.makeSuite(TestRangeIndex))
+    test_suite.addTest(unittest.makeSuite(TestIntrabarFill))
+    test_suite.addTest(unittest.makeSuite(TestResultStore))
+    test_suite.addTest(unittest.makeSuite(TestSweepCheckpoint))
+    test_suite.addTest(unittest.makeSuite(TestIndicatorPipeline))
+    test_suite.addTest(unittest.makeSuite(TestKernels))
+    test_suite.addTest(unittest.makeSuite(TestSignalScanner))
+    test_suite.addTest(unittest.makeSuite(TestHttpClient))
+    test_suite.addTest(unittest.makeSuite(TestSingleFlight))
+    test_suite.addTest(unittest.makeSuite(TestStaleWhileRevalidate))
+    test_suite.addTest(unittest.makeSuite(TestCircuitBreaker))
+    test_suite.addTest(unittest.makeSuite(TestHistoryLoader))
+    test_suite.addTest(unittest.makeSuite(TestTimestamps))
+    test_suite.addTest(unittest.makeSuite(TestOHLCVSchema))
+    test_suite.addTest(unittest.makeSuite(TestDiskCache))
+    test_suite.addTest(unittest.makeSuite(TestMemoryCache))
     
     # Führe Tests aus
     test_runner = unittest.TextTestRunner(verbosity=2)
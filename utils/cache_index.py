@@ -0,0 +1,195 @@
+"""
+Index für den Daten-Cache auf der Festplatte
+Eine SQLite-Tabelle hält je Cache-Eintrag Datei, Größe, Erstellungszeit, letzten Zugriff und
+TTL. Gültigkeitsprüfungen sind damit ein Zugriff über den Primärschlüssel statt
+os.path.exists und getmtime, und das Byte-Budget des Caches lässt sich über den Index der
+Zugriffszeiten in LRU-Reihenfolge durchsetzen.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.cache_index")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_access REAL NOT NULL,
+    ttl REAL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_last_access ON cache_entries (last_access);
+"""
+
+
+class CacheEntry(NamedTuple):
+    """
+    Metadaten eines Cache-Eintrags
+    """
+    key: str
+    path: str
+    size: int
+    created: float
+    last_access: float
+    ttl: Optional[float]
+
+    @property
+    def age(self) -> float:
+        """
+        Alter des Eintrags in Sekunden
+        """
+        return time.time() - self.created
+
+    @property
+    def is_expired(self) -> bool:
+        """
+        True, wenn die TTL des Eintrags abgelaufen ist
+        """
+        return self.ttl is not None and self.age >= self.ttl
+
+
+class CacheIndex:
+    """
+    SQLite-Index der Cache-Einträge
+
+    Jede Operation öffnet eine eigene Verbindung, der Index kann daher aus Threads und
+    Worker-Prozessen gleichzeitig genutzt werden.
+    """
+
+    def __init__(self, path):
+        """
+        Initialisiert den Index
+
+        Args:
+            path: Pfad der SQLite-Datei
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Öffnet eine Verbindung, führt den Block als Transaktion aus und schließt die Verbindung
+        """
+        conn = sqlite3.connect(str(self.path), timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        Gibt die Metadaten eines Eintrags zurück
+
+        Args:
+            key: Schlüssel des Eintrags
+
+        Returns:
+            Optional[CacheEntry]: Metadaten oder None
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM cache_entries WHERE key = ?", (key,)).fetchone()
+        return CacheEntry(*row) if row is not None else None
+
+    def put(self, key: str, path: str, size: int, ttl: Optional[float] = None) -> None:
+        """
+        Legt einen Eintrag an oder ersetzt ihn
+
+        Args:
+            key: Schlüssel des Eintrags
+            path: Pfad der Cache-Datei
+            size: Größe der Datei in Bytes
+            ttl: Lebensdauer in Sekunden (None: unbegrenzt)
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?, ?)",
+                         (key, str(path), int(size), now, now, ttl))
+
+    def touch(self, key: str) -> None:
+        """
+        Vermerkt einen Zugriff auf einen Eintrag
+
+        Args:
+            key: Schlüssel des Eintrags
+        """
+        with self._connect() as conn:
+            conn.execute("UPDATE cache_entries SET last_access = ? WHERE key = ?", (time.time(), key))
+
+    def remove(self, key: str) -> None:
+        """
+        Entfernt einen Eintrag aus dem Index
+
+        Args:
+            key: Schlüssel des Eintrags
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        """
+        Entfernt alle Einträge aus dem Index
+        """
+        with self._connect() as conn:
+            conn.execute("DELETE FROM cache_entries")
+
+    def total_size(self) -> int:
+        """
+        Gibt die Gesamtgröße aller Einträge zurück
+
+        Returns:
+            int: Größe in Bytes
+        """
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+
+    def evict(self, max_bytes: int, keep: Optional[str] = None) -> List[CacheEntry]:
+        """
+        Entfernt Einträge, bis die Gesamtgröße das Budget einhält
+
+        Abgelaufene Einträge werden immer entfernt, danach die am längsten nicht verwendeten.
+        Die Dateien der entfernten Einträge werden gelöscht.
+
+        Args:
+            max_bytes: Byte-Budget des Caches
+            keep: Schlüssel, der nicht verdrängt werden soll (z.B. der gerade geschriebene)
+
+        Returns:
+            List[CacheEntry]: Entfernte Einträge
+        """
+        now = time.time()
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM cache_entries ORDER BY last_access").fetchall()
+            entries = [CacheEntry(*row) for row in rows]
+            total = sum(entry.size for entry in entries)
+            evicted = []
+            for entry in entries:
+                expired = entry.ttl is not None and now - entry.created >= entry.ttl
+                if entry.key == keep or not (expired or total > max_bytes):
+                    continue
+                evicted.append(entry)
+                total -= entry.size
+            conn.executemany("DELETE FROM cache_entries WHERE key = ?", [(entry.key,) for entry in evicted])
+
+        for entry in evicted:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Cache-Datei {entry.path} konnte nicht gelöscht werden: {e}")
+        if evicted:
+            logger.info(f"{len(evicted)} Cache-Einträge verdrängt, {total} Bytes belegt")
+        return evicted
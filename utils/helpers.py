@@ -4,15 +4,24 @@ Utilities-Modul für gemeinsam genutzte Funktionen im Trading Dashboard
 
 import os
 import sys
+import threading
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import logging
 from typing import Dict, List, Optional, Union, Tuple, Any, Callable
 
+from utils.settings import get_env_setting
+from data.ohlcv import lower_view
+from data.resampler import resample_ohlcv
+from utils.cache_index import CacheIndex
+
 # Logger konfigurieren
 logger = logging.getLogger("trading_dashboard.utils")
 
+# Byte-Budget des Daten-Caches (Standard: 512 MB)
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
 class DateTimeUtils:
     """
     Hilfsfunktionen für Datums- und Zeitoperationen
@@ -97,86 +106,30 @@ class DataUtils:
     """
     
     @staticmethod
-    def resample_ohlc(df: pd.DataFrame, 
-                     timeframe: str) -> pd.DataFrame:
+    def resample_ohlc(df: Union[pd.DataFrame, Dict[str, pd.DataFrame]],
+                     timeframe: str,
+                     session: Optional[str] = None) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
         """
         Resampled OHLC-Daten auf einen neuen Zeitrahmen
-        
+
+        Alle Aggregationen laufen in einem Durchlauf über NumPy-Arrays (data.resampler).
+        Buckets werden mit ihrem Startzeitpunkt beschriftet, Wochen beginnen am Montag.
+
         Args:
-            df: DataFrame mit OHLC-Daten
+            df: DataFrame mit OHLC-Daten oder Dictionary Symbol -> DataFrame
             timeframe: Ziel-Zeitrahmen ('1h', '1d', '1w', '1mo', etc.)
-            
+            session: Optionale Handelssitzung für die Verankerung (z.B. 'NQ' für 18:00 Uhr New York)
+
         Returns:
-            pd.DataFrame: Resampled DataFrame
+            Union[pd.DataFrame, Dict[str, pd.DataFrame]]: Resampled Daten mit kleingeschriebenen Spaltennamen
+
+        Raises:
+            ResampleError: Bei unbekanntem Zeitrahmen, fehlenden Spalten oder fehlendem Zeitindex
         """
-        try:
-            # Stelle sicher, dass der Index ein DatetimeIndex ist
-            if not isinstance(df.index, pd.DatetimeIndex):
-                if 'date' in df.columns:
-                    df = df.set_index('date')
-                else:
-                    logger.error("DataFrame hat keinen DatetimeIndex und keine 'date'-Spalte")
-                    return df
-            
-            # Mapping von Zeitrahmen zu Pandas-Frequenz
-            freq_map = {
-                '1m': '1min',
-                '2m': '2min',
-                '5m': '5min',
-                '15m': '15min',
-                '30m': '30min',
-                '1h': '1H',
-                '1d': '1D',
-                '1w': '1W',
-                '1mo': '1M'
-            }
-            
-            freq = freq_map.get(timeframe)
-            if not freq:
-                logger.warning(f"Unbekannter Zeitrahmen: {timeframe}, verwende '1D'")
-                freq = '1D'
-            
-            # Standardisiere Spaltennamen
-            df_columns = df.columns.str.lower() if hasattr(df.columns, 'str') else df.columns
-            column_mapping = {}
-            
-            for col in df_columns:
-                if col in ['open', 'high', 'low', 'close', 'volume']:
-                    column_mapping[col] = col
-                elif col in ['Open', 'High', 'Low', 'Close', 'Volume']:
-                    column_mapping[col] = col.lower()
-            
-            # Erstelle ein neues DataFrame mit standardisierten Spaltennamen
-            new_df = pd.DataFrame()
-            for old_col, new_col in column_mapping.items():
-                if old_col in df.columns:
-                    new_df[new_col] = df[old_col]
-            
-            # Wenn keine Spalten gemappt wurden, verwende das Original-DataFrame
-            if new_df.empty:
-                new_df = df
-            
-            # Resample
-            resampled = pd.DataFrame()
-            if 'open' in new_df.columns:
-                resampled['open'] = new_df['open'].resample(freq).first()
-            if 'high' in new_df.columns:
-                resampled['high'] = new_df['high'].resample(freq).max()
-            if 'low' in new_df.columns:
-                resampled['low'] = new_df['low'].resample(freq).min()
-            if 'close' in new_df.columns:
-                resampled['close'] = new_df['close'].resample(freq).last()
-            if 'volume' in new_df.columns:
-                resampled['volume'] = new_df['volume'].resample(freq).sum()
-            
-            # Entferne NaN-Werte
-            resampled = resampled.dropna()
-            
-            return resampled
-        
-        except Exception as e:
-            logger.error(f"Fehler beim Resampling der Daten: {str(e)}")
-            return df
+        resampled = resample_ohlcv(df, timeframe, session=session)
+        if isinstance(resampled, pd.DataFrame):
+            return lower_view(resampled)
+        return {symbol: lower_view(frame) for symbol, frame in resampled.items()}
     
     @staticmethod
     def calculate_returns(prices: Union[pd.Series, np.ndarray, List[float]]) -> np.ndarray:
@@ -400,14 +353,21 @@ class ConfigUtils:
 class CacheManager:
     """
     Manager für das Caching von Daten
+    
+    Größe, Erstellungszeit, letzter Zugriff und TTL jedes Eintrags stehen in einem SQLite-Index
+    (utils.cache_index). Überschreitet der Cache sein Byte-Budget, werden abgelaufene und danach
+    die am längsten nicht verwendeten Einträge gelöscht.
     """
     
-    def __init__(self, cache_dir: str = None):
+    INDEX_FILE = 'cache_index.sqlite'
+    
+    def __init__(self, cache_dir: str = None, max_bytes: Optional[int] = None):
         """
         Initialisiert den Cache-Manager
         
         Args:
             cache_dir: Verzeichnis für Cache-Dateien
+            max_bytes: Byte-Budget (Standard: TRADING_DASHBOARD_CACHE_MAX_BYTES, 512 MB)
         """
         if cache_dir is None:
             self.cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'cache')
@@ -415,6 +375,9 @@ class CacheManager:
             self.cache_dir = cache_dir
         
         os.makedirs(self.cache_dir, exist_ok=True)
+        self.max_bytes = max_bytes if max_bytes is not None else get_env_setting(
+            "CACHE_MAX_BYTES", DEFAULT_CACHE_MAX_BYTES, int)
+        self.index = CacheIndex(os.path.join(self.cache_dir, self.INDEX_FILE))
     
     def get_cache_file_path(self, key: str) -> str:
         """
@@ -441,14 +404,21 @@ class CacheManager:
         Returns:
             bool: True, wenn die Cache-Datei gültig ist, sonst False
         """
-        cache_file = self.get_cache_file_path(key)
-        
-        if not os.path.exists(cache_file):
-            return False
+        entry = self.index.get(key)
+        return entry is not None and not entry.is_expired and entry.age < max_age_seconds
+    
+    def get_cache_age(self, key: str) -> Optional[float]:
+        """
+        Gibt das Alter eines Cache-Eintrags zurück
         
-        # Prüfe das Alter der Datei
-        file_age = datetime.now() - datetime.fromtimestamp(os.path.getmtime(cache_file))
-        return file_age.total_seconds() < max_age_seconds
+        Args:
+            key: Schlüssel für die Cache-Datei
+            
+        Returns:
+            Optional[float]: Alter in Sekunden oder None, wenn kein Eintrag existiert
+        """
+        entry = self.index.get(key)
+        return entry.age if entry is not None else None
     
     def get_from_cache(self, key: str) -> Optional[pd.DataFrame]:
         """
@@ -460,24 +430,30 @@ class CacheManager:
         Returns:
             Optional[pd.DataFrame]: DataFrame mit den Daten oder None, wenn nicht im Cache
         """
-        cache_file = self.get_cache_file_path(key)
-        
-        if not os.path.exists(cache_file):
+        entry = self.index.get(key)
+        if entry is None:
             return None
         
         try:
-            return pd.read_csv(cache_file, index_col=0, parse_dates=True)
+            df = pd.read_csv(entry.path, index_col=0, parse_dates=True)
+        except FileNotFoundError:
+            # Datei wurde verdrängt oder von außen gelöscht
+            self.index.remove(key)
+            return None
         except Exception as e:
             logger.error(f"Fehler beim Laden aus dem Cache: {str(e)}")
             return None
+        self.index.touch(key)
+        return df
     
-    def save_to_cache(self, key: str, df: pd.DataFrame) -> bool:
+    def save_to_cache(self, key: str, df: pd.DataFrame, ttl: Optional[float] = None) -> bool:
         """
-        Speichert Daten im Cache
+        Speichert Daten im Cache und setzt das Byte-Budget durch
         
         Args:
             key: Schlüssel für die Cache-Datei
             df: DataFrame mit den zu speichernden Daten
+            ttl: Lebensdauer des Eintrags in Sekunden (None: unbegrenzt)
             
         Returns:
             bool: True, wenn erfolgreich gespeichert, sonst False
@@ -485,12 +461,36 @@ class CacheManager:
         cache_file = self.get_cache_file_path(key)
         
         try:
-            df.to_csv(cache_file)
+            self.write_csv_atomic(df, cache_file)
+            self.index.put(key, cache_file, os.path.getsize(cache_file), ttl)
+            if self.index.total_size() > self.max_bytes:
+                self.index.evict(self.max_bytes, keep=key)
             return True
         except Exception as e:
             logger.error(f"Fehler beim Speichern im Cache: {str(e)}")
             return False
     
+    @staticmethod
+    def write_csv_atomic(df: pd.DataFrame, path) -> None:
+        """
+        Schreibt ein DataFrame als CSV, ohne dass Leser eine halb geschriebene Datei sehen
+        
+        Die Daten werden zuerst in eine temporäre Datei im selben Verzeichnis geschrieben, die
+        dann per os.replace die alte Datei ersetzt.
+        
+        Args:
+            df: DataFrame mit den zu speichernden Daten
+            path: Zielpfad
+        """
+        path = str(path)
+        temp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            df.to_csv(temp_file)
+            os.replace(temp_file, path)
+        finally:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+    
     def clear_cache(self, key: str = None) -> bool:
         """
         Löscht Cache-Dateien
@@ -503,11 +503,13 @@ class CacheManager:
         """
         try:
             if key is not None:
+                self.index.remove(key)
                 cache_file = self.get_cache_file_path(key)
                 if os.path.exists(cache_file):
                     os.remove(cache_file)
             else:
                 # Lösche alle Dateien im Cache-Verzeichnis
+                self.index.clear()
                 for file_name in os.listdir(self.cache_dir):
                     if file_name.endswith('.csv'):
                         os.remove(os.path.join(self.cache_dir, file_name))
@@ -0,0 +1,154 @@
+"""
+Rekursive Rechenkerne mit optionaler JIT-Kompilierung
+Wilder-Glättung und EMAs mit eigenem Startwert hängen jeweils vom vorherigen Wert ab und lassen
+sich nicht direkt mit NumPy vektorisieren. Ist Numba installiert, werden die Schleifen kompiliert;
+sonst wird ein gleichwertiger vektorisierter pandas-Pfad verwendet.
+"""
+
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.settings import get_env_setting
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.kernels")
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    NUMBA_AVAILABLE = False
+
+KERNEL_BACKENDS = ('auto', 'numba', 'numpy')
+
+_backend = None
+_compiled = {}
+_lock = threading.Lock()
+
+
+def set_kernel_backend(name: str) -> str:
+    """
+    Wählt das Backend der Rechenkerne
+
+    Args:
+        name: 'auto' (Numba, falls installiert), 'numba' oder 'numpy'
+
+    Returns:
+        str: Tatsächlich verwendetes Backend ('numba' oder 'numpy')
+
+    Raises:
+        ValueError: Wenn der Name unbekannt ist
+    """
+    global _backend
+    name = name.strip().lower()
+    if name not in KERNEL_BACKENDS:
+        raise ValueError(f"Unbekanntes Kernel-Backend: {name} (erlaubt: {', '.join(KERNEL_BACKENDS)})")
+    if name == 'numba' and not NUMBA_AVAILABLE:
+        logger.warning("Numba ist nicht installiert, verwende das NumPy-Backend")
+    _backend = 'numba' if name != 'numpy' and NUMBA_AVAILABLE else 'numpy'
+    return _backend
+
+
+def get_kernel_backend() -> str:
+    """
+    Gibt das aktive Backend zurück (beim ersten Aufruf aus TRADING_DASHBOARD_KERNEL_BACKEND)
+
+    Returns:
+        str: 'numba' oder 'numpy'
+    """
+    if _backend is None:
+        set_kernel_backend(get_env_setting("KERNEL_BACKEND", "auto"))
+    return _backend
+
+
+def _ewma_loop(values, alpha, seed_window):
+    # Referenzschleife; wird unverändert von Numba kompiliert
+    n = values.shape[0]
+    out = np.full(n, np.nan)
+    needed = max(seed_window, 1)
+
+    # Startwert: Mittelwert der ersten seed_window gültigen Werte, fehlende Werte zählen nicht
+    total = 0.0
+    count = 0
+    i = 0
+    while i < n and count < needed:
+        if not np.isnan(values[i]):
+            total += values[i]
+            count += 1
+        i += 1
+    if count < needed:
+        return out
+
+    average = total / needed
+    out[i - 1] = average
+    for j in range(i, n):
+        value = values[j]
+        if not np.isnan(value):
+            average = (1.0 - alpha) * average + alpha * value
+        out[j] = average
+    return out
+
+
+def _ewma_vectorized(values, alpha, seed_window):
+    n = len(values)
+    needed = max(seed_window, 1)
+    valid = np.flatnonzero(~np.isnan(values))
+    out = np.full(n, np.nan)
+    if len(valid) < needed:
+        return out
+
+    # Startwert beim letzten der ersten seed_window gültigen Werte einsetzen und den Rest über
+    # ewm(adjust=False) rekursiv glätten
+    first = valid[needed - 1] + 1
+    seeded = values[first - 1:].copy()
+    seeded[0] = values[valid[:needed]].mean()
+    out[first - 1:] = pd.Series(seeded).ewm(alpha=alpha, adjust=False, ignore_na=True).mean().to_numpy()
+    return out
+
+
+def _get_compiled(name, func):
+    with _lock:
+        if name not in _compiled:
+            _compiled[name] = numba.njit(cache=True)(func)
+        return _compiled[name]
+
+
+def ewma(values, alpha: float, seed_window: int = 1) -> np.ndarray:
+    """
+    Exponentiell gewichteter gleitender Mittelwert mit wählbarem Startwert
+
+    Der Startwert ist der Mittelwert der ersten seed_window gültigen Werte (1: erster Wert wie
+    bei ewm(adjust=False)) und steht beim letzten dieser Werte; fehlende Werte innerhalb des
+    Startfensters werden übersprungen. Danach gilt avg = (1 - alpha) * avg + alpha * x, fehlende
+    Werte übernehmen den vorherigen Mittelwert. Alle Backends folgen dieser Regel.
+
+    Args:
+        values: Eingangswerte (Array oder Series)
+        alpha: Glättungsfaktor zwischen 0 und 1
+        seed_window: Anzahl der Werte für den Startwert
+
+    Returns:
+        np.ndarray: Geglättete Werte, NaN vor dem Startwert
+    """
+    values = np.asarray(values, dtype=float)
+    if get_kernel_backend() == 'numba':
+        return _get_compiled('ewma', _ewma_loop)(values, float(alpha), int(seed_window))
+    return _ewma_vectorized(values, float(alpha), int(seed_window))
+
+
+def wilder_smooth(values, window: int) -> np.ndarray:
+    """
+    Wilder-Glättung (RMA), wie sie für RSI und ATR nach Wilder verwendet wird
+
+    Args:
+        values: Eingangswerte (Array oder Series)
+        window: Periode; Startwert ist der Mittelwert der ersten window Werte
+
+    Returns:
+        np.ndarray: Geglättete Werte
+    """
+    return ewma(values, 1.0 / window, window)
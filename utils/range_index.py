@@ -0,0 +1,228 @@
+"""
+Bereichsabfragen für Preisreihen
+Vorberechnete Minimum-/Maximum-Strukturen, mit denen Backtests direkt zum ersten Bar springen,
+an dem ein Stop-Loss oder Take-Profit erreicht wird, statt jeden Bar einzeln zu prüfen
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Logger konfigurieren
+logger = logging.getLogger("trading_dashboard.range_index")
+
+
+def _build_sparse_table(values: np.ndarray, op) -> List[np.ndarray]:
+    """
+    Erstellt eine Sparse Table: Ebene k enthält op über je 2**k aufeinanderfolgende Werte
+    """
+    table = [values]
+    span = 1
+    while 2 * span <= len(values):
+        previous = table[-1]
+        table.append(op(previous[:-span], previous[span:]))
+        span *= 2
+    return table
+
+
+class RangeMinMax:
+    """
+    Minimum und Maximum über beliebige Bereiche einer Zeitreihe
+
+    Die Reihe wird in Blöcke fester Größe zerlegt. Über die Block-Minima und -Maxima liegt eine
+    Sparse Table, sodass Bereichsabfragen und die Suche nach dem ersten Wert unter bzw. über
+    einer Schwelle O(log n) Schritte benötigen. Der Speicherbedarf bleibt bei O(n).
+    NaN-Werte werden ignoriert.
+    """
+
+    def __init__(self, values, block_size: int = 64):
+        """
+        Initialisiert den Index
+
+        Args:
+            values: Werte als Array, Liste oder Series
+            block_size: Anzahl Werte je Block
+        """
+        values = np.asarray(values, dtype=float)
+        missing = np.isnan(values)
+        self.block_size = block_size
+        self._min_values = np.where(missing, np.inf, values)
+        self._max_values = np.where(missing, -np.inf, values)
+
+        num_blocks = -(-len(values) // block_size)
+        padded = num_blocks * block_size - len(values)
+        block_min = np.pad(self._min_values, (0, padded), constant_values=np.inf).reshape(num_blocks, block_size)
+        block_max = np.pad(self._max_values, (0, padded), constant_values=-np.inf).reshape(num_blocks, block_size)
+        self._min_table = _build_sparse_table(block_min.min(axis=1), np.minimum)
+        self._max_table = _build_sparse_table(block_max.max(axis=1), np.maximum)
+
+    def __len__(self) -> int:
+        return len(self._min_values)
+
+    @staticmethod
+    def _query_blocks(table: List[np.ndarray], first: int, last: int, op) -> float:
+        # Zwei sich überlappende Zweierpotenz-Bereiche decken [first, last) ab
+        level = (last - first).bit_length() - 1
+        return op(table[level][first], table[level][last - (1 << level)])
+
+    def _query(self, start: int, end: Optional[int], values: np.ndarray, table: List[np.ndarray], op,
+               empty: float) -> float:
+        end = len(values) if end is None else min(end, len(values))
+        start = max(start, 0)
+        if start >= end:
+            return np.nan
+
+        first_block = -(-start // self.block_size)
+        last_block = end // self.block_size
+        if first_block >= last_block:
+            result = op.reduce(values[start:end])
+        else:
+            result = self._query_blocks(table, first_block, last_block, op)
+            head = values[start:first_block * self.block_size]
+            tail = values[last_block * self.block_size:end]
+            result = op(result, op.reduce(head, initial=empty))
+            result = op(result, op.reduce(tail, initial=empty))
+        return float(result) if np.isfinite(result) else np.nan
+
+    def min(self, start: int = 0, end: Optional[int] = None) -> float:
+        """
+        Minimum im Bereich [start, end)
+
+        Args:
+            start: Erste Position
+            end: Position nach dem letzten Wert (Standard: Ende der Reihe)
+
+        Returns:
+            float: Minimum oder NaN, wenn der Bereich leer ist
+        """
+        return self._query(start, end, self._min_values, self._min_table, np.minimum, np.inf)
+
+    def max(self, start: int = 0, end: Optional[int] = None) -> float:
+        """
+        Maximum im Bereich [start, end)
+
+        Args:
+            start: Erste Position
+            end: Position nach dem letzten Wert (Standard: Ende der Reihe)
+
+        Returns:
+            float: Maximum oder NaN, wenn der Bereich leer ist
+        """
+        return self._query(start, end, self._max_values, self._max_table, np.maximum, -np.inf)
+
+    def _find_first(self, start: int, end: Optional[int], values: np.ndarray, table: List[np.ndarray],
+                    passes) -> int:
+        end = len(values) if end is None else min(end, len(values))
+        start = max(start, 0)
+        if start >= end:
+            return -1
+
+        # Rest des ersten Blocks direkt prüfen
+        block = start // self.block_size
+        segment_end = min((block + 1) * self.block_size, end)
+        hits = np.flatnonzero(passes(values[start:segment_end]))
+        if hits.size:
+            return start + int(hits[0])
+
+        # Über die Sparse Table alle Blöcke überspringen, die die Schwelle sicher nicht erreichen
+        block += 1
+        num_blocks = -(-end // self.block_size)
+        for level in range(len(table) - 1, -1, -1):
+            span = 1 << level
+            if block + span <= num_blocks and not passes(table[level][block]):
+                block += span
+        if block >= num_blocks:
+            return -1
+
+        offset = block * self.block_size
+        hits = np.flatnonzero(passes(values[offset:min(offset + self.block_size, end)]))
+        return offset + int(hits[0]) if hits.size else -1
+
+    def first_below(self, start: int, threshold: float, end: Optional[int] = None) -> int:
+        """
+        Sucht die erste Position ab start, deren Wert kleiner oder gleich der Schwelle ist
+
+        Args:
+            start: Erste zu prüfende Position
+            threshold: Schwelle (z.B. Stop-Loss einer Long-Position)
+            end: Position nach dem letzten zu prüfenden Wert (Standard: Ende der Reihe)
+
+        Returns:
+            int: Position oder -1, wenn die Schwelle nicht erreicht wird
+        """
+        return self._find_first(start, end, self._min_values, self._min_table, lambda v: v <= threshold)
+
+    def first_above(self, start: int, threshold: float, end: Optional[int] = None) -> int:
+        """
+        Sucht die erste Position ab start, deren Wert größer oder gleich der Schwelle ist
+
+        Args:
+            start: Erste zu prüfende Position
+            threshold: Schwelle (z.B. Take-Profit einer Long-Position)
+            end: Position nach dem letzten zu prüfenden Wert (Standard: Ende der Reihe)
+
+        Returns:
+            int: Position oder -1, wenn die Schwelle nicht erreicht wird
+        """
+        return self._find_first(start, end, self._max_values, self._max_table, lambda v: v >= threshold)
+
+
+class PriceRangeIndex:
+    """
+    Bereichsindizes für Low, High und Close eines OHLC-DataFrames
+
+    Die Indizes werden beim ersten Zugriff erstellt. Spaltennamen dürfen groß oder klein
+    geschrieben sein.
+    """
+
+    def __init__(self, data: pd.DataFrame, block_size: int = 64):
+        """
+        Initialisiert den Index
+
+        Args:
+            data: DataFrame mit OHLC-Daten
+            block_size: Anzahl Werte je Block
+        """
+        self.data = data
+        self.block_size = block_size
+        self._columns = {col.lower(): col for col in data.columns if isinstance(col, str)}
+        self._indexes: Dict[str, RangeMinMax] = {}
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def get(self, field: str) -> RangeMinMax:
+        """
+        Gibt den Index für eine Spalte zurück
+
+        Args:
+            field: 'low', 'high' oder 'close'
+
+        Returns:
+            RangeMinMax: Index der Spalte
+
+        Raises:
+            KeyError: Wenn die Spalte fehlt
+        """
+        index = self._indexes.get(field)
+        if index is None:
+            column = self._columns.get(field)
+            if column is None:
+                raise KeyError(f"Spalte '{field}' fehlt für den Bereichsindex")
+            index = RangeMinMax(self.data[column].to_numpy(dtype=float), self.block_size)
+            self._indexes[field] = index
+        return index
+
+    @property
+    def low(self) -> RangeMinMax:
+        return self.get('low')
+
+    @property
+    def high(self) -> RangeMinMax:
+        return self.get('high')
+
+    @property
+    def close(self) -> RangeMinMax:
+        return self.get('close')
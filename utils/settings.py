@@ -0,0 +1,31 @@
+"""
+Einstellungen aus Umgebungsvariablen
+Alle Schichten (Daten, Hilfsfunktionen, Dashboard, Server) lesen ihre Konfiguration über
+get_env_setting, ohne dafür Dashboard- oder Server-Module importieren zu müssen
+"""
+
+import os
+from typing import Any
+
+# Präfix der Umgebungsvariablen
+ENV_PREFIX = "TRADING_DASHBOARD_"
+
+
+def get_env_setting(name: str, default: Any, cast=str) -> Any:
+    """
+    Liest eine Einstellung aus der Umgebungsvariable TRADING_DASHBOARD_<name>
+
+    Args:
+        name: Name der Einstellung ohne Präfix
+        default: Standardwert, wenn die Variable nicht gesetzt ist
+        cast: Zieltyp (str, int, float oder bool)
+
+    Returns:
+        Any: Wert der Einstellung
+    """
+    value = os.environ.get(ENV_PREFIX + name)
+    if value is None or value == "":
+        return default
+    if cast is bool:
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return cast(value)
@@ -0,0 +1,23 @@
+"""
+WSGI-Einstiegspunkt für den Produktionsbetrieb des Trading Dashboards
+
+Beispiel:
+    gunicorn -c gunicorn.conf.py wsgi:server
+    waitress-serve --port=8050 wsgi:server
+"""
+
+import os
+import sys
+
+# Füge den Projektpfad zum Systempfad hinzu
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(current_dir)
+
+# Importiere die Dashboard-App; mit preload_app geschieht dies einmal vor dem Forken der Worker
+from dashboard.app import app, server  # noqa: E402
+from dashboard.warmup import start_warmup  # noqa: E402
+
+# Daten der Watchlist vorladen, bevor Requests angenommen werden (abschaltbar über TRADING_DASHBOARD_WARMUP=0)
+start_warmup(block=True)
+
+application = server